@@ -0,0 +1,334 @@
+"""Replay-Benchmark für AutoMod.process_message
+
+Spielt einen Nachrichtenstrom durch die AutoMod-Engine, ohne Discord:
+Nachrichten, Autoren, Kanäle und Server sind schlanke Stellvertreter mit
+genau den Attributen, die AutoMod liest. Der Strom ist entweder synthetisch
+(viele Server und User, gemischte Längen, Emojis, Links, CAPS, Spam- und
+Flood-Bursts, optional Raids) oder eine aufgezeichnete JSONL-Datei:
+
+    {"t": 12.5, "guild": 1, "channel": 10, "author": 4711, "content": "hallo"}
+
+Aufruf aus dem Projektverzeichnis:
+
+    python -m benchmarks.automod_bench
+    python -m benchmarks.automod_bench --messages 500000 --raids 3
+    python -m benchmarks.automod_bench --record stream.jsonl      # synthetischen Strom speichern
+    python -m benchmarks.automod_bench --replay stream.jsonl --output automod.json
+
+Die Zeitstempel des Stroms laufen über eine virtuelle Uhr, die für die
+Zeitfenster (utils.ratelimit, utils.raid) eingesetzt wird. So verhalten
+sich Spam-Fenster und Raid-Erkennung wie bei der echten Nachrichtenrate,
+auch wenn der Benchmark viel schneller abspielt. Gemessen werden:
+
+- Durchsatz (Nachrichten pro Sekunde CPU-Zeit) und Verstöße pro Typ
+- Kosten und Trefferquote jeder Regel (RuleEngine.stats)
+- Wachstum der Verlaufsstrukturen über den Lauf (Einträge und Speicher per
+  tracemalloc, in einem zweiten Durchlauf, damit das Tracing den Durchsatz
+  nicht verfälscht)
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+with contextlib.redirect_stdout(sys.stderr):
+    import utils.raid
+    import utils.ratelimit
+    from benchmarks.features_bench import build_corpus
+    from utils.automod import AutoMod
+
+GUILD_BASE = 100_000_000_000_000_000
+USER_BASE = 200_000_000_000_000_000
+CHANNEL_BASE = 300_000_000_000_000_000
+
+BANNED_WORDS = ("idiot", "spast", "hurensohn", "wichser", "scheiß", "noob", "depp", "trottel")
+BANNED_LINKS = ("discord.gg", "grabify.link", "*.ru", "bit.ly/free", "free-nitro.com", "steamcommunlty.com")
+SPAM_LINES = ("KAUFT JETZT BEI MIR!!!", "free nitro hier: free-nitro.com/claim", "😂😂😂😂😂😂😂😂😂😂",
+              "join discord.gg/spamserver", "hallo", "hallo", "hallo")
+RAID_LINE = "@everyone FREE NITRO für alle: steamcommunlty.com/gift {}"
+
+
+class VirtualClock:
+    """Ersetzt time.monotonic() in den Zeitfenster-Modulen durch die Zeit des Stroms"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    @contextlib.contextmanager
+    def installed(self, *modules):
+        originals = [module.time for module in modules]
+        for module in modules:
+            module.time = self
+        try:
+            yield self
+        finally:
+            for module, original in zip(modules, originals):
+                module.time = original
+
+
+# Stellvertreter für die discord.py-Objekte (nur was AutoMod liest)
+
+class FakePermissions:
+    __slots__ = ("administrator",)
+
+    def __init__(self, administrator: bool = False):
+        self.administrator = administrator
+
+
+class FakeGuild:
+    __slots__ = ("id",)
+
+    def __init__(self, guild_id: int):
+        self.id = guild_id
+
+
+class FakeChannel:
+    __slots__ = ("id", "name", "mention")
+
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+        self.name = f"kanal-{channel_id % 1000}"
+        self.mention = f"<#{channel_id}>"
+
+
+class FakeAuthor:
+    __slots__ = ("id", "name", "mention", "bot", "roles", "guild_permissions")
+
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.name = f"user{user_id % 100_000}"
+        self.mention = f"<@{user_id}>"
+        self.bot = False
+        self.roles = []
+        self.guild_permissions = FakePermissions()
+
+
+class FakeMessage:
+    __slots__ = ("id", "content", "guild", "channel", "author")
+
+    def __init__(self, message_id: int, content: str, guild: FakeGuild, channel: FakeChannel, author: FakeAuthor):
+        self.id = message_id
+        self.content = content
+        self.guild = guild
+        self.channel = channel
+        self.author = author
+
+
+def synthetic_stream(messages: int, guilds: int, users: int, rate: float, spam_share: float,
+                     raids: int, seed: int) -> Iterator[Dict[str, Any]]:
+    """Erzeugt einen Nachrichtenstrom mit typischer Verteilung
+
+    Aktivität pro User folgt grob einem Potenzgesetz (wenige Vielschreiber),
+    ein Anteil ``spam_share`` der Nachrichten stammt aus Spam-/Flood-Bursts
+    einzelner User, ``raids`` Raids (viele neue Accounts, gleicher Text)
+    verteilen sich über den Lauf.
+    """
+    rnd = random.Random(seed)
+    corpus = build_corpus(min(messages, 20_000), seed)
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(users)]
+    user_pool = rnd.choices(range(users), weights=weights, k=min(messages, 200_000))
+    raid_at = sorted(rnd.randrange(messages) for _ in range(raids))
+
+    t = 0.0
+    emitted = 0
+    burst: List[Dict[str, Any]] = []
+    while emitted < messages:
+        t += rnd.expovariate(rate)
+        if burst:
+            event = burst.pop()
+            event["t"] = t
+        elif raid_at and emitted >= raid_at[0]:
+            raid_at.pop(0)
+            guild = rnd.randrange(guilds)
+            accounts = rnd.randint(20, 80)
+            burst = [{"guild": guild, "channel": guild * 10, "author": users + rnd.randrange(1_000_000),
+                      "content": RAID_LINE.format(rnd.randrange(10_000))} for _ in range(accounts)]
+            continue
+        elif rnd.random() < spam_share / 6:
+            # Ein User schickt 6-12 Nachrichten kurz hintereinander, oft dieselbe
+            author = rnd.randrange(users)
+            guild = author % guilds
+            line = rnd.choice(SPAM_LINES)
+            burst = [{"guild": guild, "channel": guild * 10 + 1, "author": author,
+                      "content": line if rnd.random() < 0.7 else rnd.choice(corpus)}
+                     for _ in range(rnd.randint(6, 12))]
+            continue
+        else:
+            author = user_pool[emitted % len(user_pool)]
+            guild = author % guilds
+            content = corpus[emitted % len(corpus)]
+            if rnd.random() < 0.01:
+                content += " " + rnd.choice(BANNED_WORDS)
+            event = {"t": t, "guild": guild, "channel": guild * 10 + rnd.randrange(5),
+                     "author": author, "content": content}
+        emitted += 1
+        yield event
+
+
+def read_stream(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def build_messages(events: Iterable[Dict[str, Any]]) -> List[tuple]:
+    """Wandelt den Strom in (Zeit, FakeMessage) um; Objekte werden wie bei discord.py wiederverwendet"""
+    guilds: Dict[int, FakeGuild] = {}
+    channels: Dict[int, FakeChannel] = {}
+    authors: Dict[int, FakeAuthor] = {}
+    messages = []
+    for index, event in enumerate(events):
+        guild_id = GUILD_BASE + event["guild"]
+        channel_id = CHANNEL_BASE + event["channel"]
+        user_id = USER_BASE + event["author"]
+        guild = guilds.get(guild_id) or guilds.setdefault(guild_id, FakeGuild(guild_id))
+        channel = channels.get(channel_id) or channels.setdefault(channel_id, FakeChannel(channel_id))
+        author = authors.get(user_id) or authors.setdefault(user_id, FakeAuthor(user_id))
+        messages.append((event["t"], FakeMessage(index, event["content"], guild, channel, author)))
+    return messages
+
+
+def configure(automod: AutoMod, guild_ids: Iterable[int]):
+    """Aktiviert AutoMod mit typischen Filterlisten auf allen Servern"""
+    for guild_id in guild_ids:
+        automod.enabled_guilds.add(guild_id)
+        for word in BANNED_WORDS:
+            automod.banned_words[guild_id].add(word)
+        for link in BANNED_LINKS:
+            automod.banned_links[guild_id].add(link)
+
+
+def history_sizes(automod: AutoMod) -> Dict[str, int]:
+    """Einträge in den Verlaufsstrukturen, die mit der Laufzeit wachsen könnten"""
+    raid_guilds = automod.raid._guilds
+    return {
+        "spam_windows": len(automod.message_windows),
+        "repeat_keys": len(automod.repeat_messages),
+        "repeat_timers": len(automod.repeat_messages._wheel),
+        "raid_fingerprints": sum(len(state.fingerprints) for state in raid_guilds.values()),
+    }
+
+
+async def replay(messages: List[tuple], checkpoints: int = 0) -> Dict[str, Any]:
+    """Spielt alle Nachrichten ab; mit ``checkpoints`` werden zusätzlich Speicherstände erfasst"""
+    automod = AutoMod()
+    configure(automod, {message.guild.id for _, message in messages})
+    violations: Dict[str, int] = {}
+
+    # Durchsetzung ist nicht Teil der Messung: Sammel-Löschungen im Lockdown nur zählen
+    def submit(message, violation_type):
+        key = f"{violation_type}_retroactive"
+        violations[key] = violations.get(key, 0) + 1
+    automod.enforcement.submit = submit
+    samples = []
+    every = max(1, len(messages) // checkpoints) if checkpoints else 0
+
+    clock = VirtualClock()
+    with clock.installed(utils.ratelimit, utils.raid):
+        if checkpoints:
+            tracemalloc.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+        started = time.process_time()
+        for index, (t, message) in enumerate(messages, start=1):
+            clock.now = t
+            violation = await automod.process_message(message)
+            if violation:
+                violations[violation] = violations.get(violation, 0) + 1
+            if every and index % every == 0:
+                samples.append({
+                    "messages": index,
+                    "stream_seconds": round(t, 1),
+                    "traced_kib": round((tracemalloc.get_traced_memory()[0] - baseline) / 1024, 1),
+                    **history_sizes(automod),
+                })
+        elapsed = time.process_time() - started
+        if checkpoints:
+            tracemalloc.stop()
+
+    return {
+        "cpu_seconds": round(elapsed, 3),
+        "messages_per_second": round(len(messages) / elapsed) if elapsed else None,
+        "us_per_message": round(elapsed / len(messages) * 1_000_000, 2),
+        "violations": dict(sorted(violations.items(), key=lambda item: -item[1])),
+        "rules": automod.rules.stats(),
+        "rule_order": automod.rules.order(),
+        "lockdowns": sum(1 for state in automod.raid._guilds.values() if state.lockdown_since is not None),
+        "history": samples or history_sizes(automod),
+    }
+
+
+def parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay-Benchmark für AutoMod.process_message")
+    parser.add_argument("--messages", type=int, default=100_000, help="Länge des synthetischen Stroms")
+    parser.add_argument("--guilds", type=int, default=50)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--rate", type=float, default=50.0, help="Nachrichten pro Sekunde im Strom")
+    parser.add_argument("--spam-share", type=float, default=0.05, help="Anteil der Nachrichten aus Spam-Bursts")
+    parser.add_argument("--raids", type=int, default=1, help="Anzahl Raids im synthetischen Strom")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--replay", help="Aufgezeichneten Strom (JSONL) statt des synthetischen abspielen")
+    parser.add_argument("--record", help="Synthetischen Strom als JSONL speichern und beenden")
+    parser.add_argument("--checkpoints", type=int, default=10, help="Speicherstände im zweiten Durchlauf (0 = aus)")
+    parser.add_argument("--output", help="JSON in diese Datei statt auf stdout schreiben")
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.replay:
+        events = list(read_stream(args.replay))
+    else:
+        events = list(synthetic_stream(args.messages, args.guilds, args.users, args.rate,
+                                       args.spam_share, args.raids, args.seed))
+
+    if args.record:
+        with open(args.record, "w", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        print(f"✅ {len(events)} Nachrichten gespeichert: {args.record}", file=sys.stderr)
+        return 0
+
+    messages = build_messages(events)
+    print(f"▶️ Spiele {len(messages)} Nachrichten ab ({messages[-1][0]:.0f} s Stream-Zeit)", file=sys.stderr)
+    with contextlib.redirect_stdout(sys.stderr):
+        results = await replay(messages)
+        print(f"⏱️ {results['messages_per_second']} Nachrichten/s, {results['us_per_message']} µs/Nachricht",
+              file=sys.stderr)
+        if args.checkpoints:
+            memory = await replay(messages, args.checkpoints)
+            results["history"] = memory["history"]
+
+    report = json.dumps({
+        "meta": {
+            "source": args.replay or "synthetic",
+            "messages": len(messages),
+            "stream_seconds": round(messages[-1][0], 1),
+            "guilds": len({message.guild.id for _, message in messages}),
+            "users": len({message.author.id for _, message in messages}),
+            "seed": args.seed,
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }, indent=2, ensure_ascii=False)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+        print(f"✅ Ergebnisse gespeichert: {args.output}", file=sys.stderr)
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
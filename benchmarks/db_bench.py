@@ -0,0 +1,418 @@
+"""Micro-Benchmarks für die Datenbankschicht (utils/db.py)
+
+Baut eine synthetische Datenbank in der Größe eines großen Bots (Standard:
+100 Server, 1 Mio. Warnungen, 200k Tickets, 50k Events, 10k Streamer) und
+misst die häufigsten Lese- und Schreibpfade unter paralleler asyncio-Last.
+Das Ergebnis (p50/p99-Latenz und Durchsatz pro Operation) wird als JSON
+ausgegeben. Aufruf aus dem Projektverzeichnis:
+
+    python -m benchmarks.db_bench                      # volle Größe
+    python -m benchmarks.db_bench --scale 0.01         # schneller Durchlauf
+    python -m benchmarks.db_bench --variants pooled,naive --output bench.json
+
+Varianten:
+    pooled  -> utils.db.Database (Verbindungspool, WAL, Group Commit)
+    naive   -> eine neue Verbindung und ein Commit pro Abfrage (altes Design)
+
+Die Fixture wird mit sqlite3 direkt befüllt und nicht mitgemessen. Mit
+--db und --reuse lässt sich eine bereits erzeugte Datenbank wiederverwenden.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiosqlite
+
+# config.py meldet beim Import den Token-Status auf stdout, das gehört nicht ins JSON
+with contextlib.redirect_stdout(sys.stderr):
+    from utils.db import Database, get_pool
+    from utils.migrations import migrate
+    from utils.queries import QUERIES
+
+# Größen bei --scale 1.0
+FULL_SIZES: Dict[str, int] = {
+    "guilds": 100,
+    "users": 50_000,
+    "warnings": 1_000_000,
+    "tickets": 200_000,
+    "events": 50_000,
+    "participants": 500_000,
+    "streamers": 10_000,
+    "subscriptions": 50_000,
+    "reaction_roles": 5_000,
+}
+
+# Snowflake-ähnliche IDs, damit die Werte so groß sind wie echte Discord-IDs
+GUILD_BASE = 100_000_000_000_000_000
+USER_BASE = 200_000_000_000_000_000
+CHANNEL_BASE = 300_000_000_000_000_000
+MESSAGE_BASE = 400_000_000_000_000_000
+ROLE_BASE = 500_000_000_000_000_000
+
+EMOJIS = ("✅", "❌", "🎮", "🎵", "📢")
+
+
+def scaled_sizes(scale: float) -> Dict[str, int]:
+    """Skaliert die Fixture-Größen (mindestens ein Eintrag pro Tabelle)"""
+    return {name: max(1, int(size * scale)) for name, size in FULL_SIZES.items()}
+
+
+# Fixture
+
+def _fill(conn: sqlite3.Connection, sizes: Dict[str, int], rnd: random.Random):
+    """Befüllt die Tabellen mit zufälligen, aber reproduzierbaren Daten"""
+    guilds, users = sizes["guilds"], sizes["users"]
+
+    def guild():
+        return GUILD_BASE + rnd.randrange(guilds)
+
+    def user():
+        return USER_BASE + rnd.randrange(users)
+
+    conn.executemany(
+        "INSERT INTO warnings (user_id, user_name, guild_id, reason, moderator_id, moderator_name, timestamp) "
+        "VALUES (?, ?, ?, ?, ?, ?, datetime('now', ?))",
+        ((user(), "user", guild(), "Spam", USER_BASE, "mod", f"-{i % 10_000} minutes")
+         for i in range(sizes["warnings"]))
+    )
+
+    # Etwa jedes zehnte Ticket ist noch offen
+    conn.executemany(
+        "INSERT INTO tickets (ticket_id, guild_id, channel_id, user_id, title, status) VALUES (?, ?, ?, ?, ?, ?)",
+        ((f"bench-{i}", guild(), CHANNEL_BASE + i, user(), "Support", "open" if i % 10 == 0 else "closed")
+         for i in range(sizes["tickets"]))
+    )
+
+    conn.executemany(
+        "INSERT INTO events (guild_id, channel_id, creator_id, title, start_time) "
+        "VALUES (?, ?, ?, ?, datetime('now', ?))",
+        ((guild(), CHANNEL_BASE, user(), "Event", f"{rnd.randrange(-720, 720)} hours")
+         for _ in range(sizes["events"]))
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO event_participants (event_id, user_id, status) VALUES (?, ?, ?)",
+        ((1 + rnd.randrange(sizes["events"]), user(), rnd.choice(("accepted", "declined", "maybe")))
+         for _ in range(sizes["participants"]))
+    )
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO twitch_streamers (streamer_name, guild_id, user_id) VALUES (?, ?, ?)",
+        ((f"streamer{i}", GUILD_BASE + i % guilds, str(i)) for i in range(sizes["streamers"]))
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO twitch_subscriptions (user_id, guild_id, streamer_name) VALUES (?, ?, ?)",
+        ((user(), GUILD_BASE + i % guilds, f"streamer{i % sizes['streamers']}")
+         for i in range(sizes["subscriptions"]))
+    )
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO reaction_roles (message_id, emoji, role_id, guild_id, channel_id, description) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        ((MESSAGE_BASE + i // len(EMOJIS), EMOJIS[i % len(EMOJIS)], ROLE_BASE + i,
+          GUILD_BASE + i % guilds, CHANNEL_BASE, "Rolle")
+         for i in range(sizes["reaction_roles"]))
+    )
+
+
+async def build_fixture(path: str, sizes: Dict[str, int], seed: int = 1):
+    """Legt die Datenbank mit dem aktuellen Schema an und befüllt sie"""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    async with aiosqlite.connect(path) as conn:
+        await migrate(conn)
+        await conn.commit()
+
+    started = time.perf_counter()
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        with conn:
+            _fill(conn, sizes, random.Random(seed))
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    print(f"🏗️ Fixture erstellt in {time.perf_counter() - started:.1f}s: {path}", file=sys.stderr)
+
+
+# Varianten
+
+class ConnectionPerQuery:
+    """Das ursprüngliche Design: pro Abfrage eine Verbindung, pro Schreibzugriff ein Commit"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+    async def execute(self, query: str, params: tuple = ()):
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(query, params)
+            await db.commit()
+            return cursor
+
+    async def fetch_all(self, query: str, params: tuple = ()):
+        async with aiosqlite.connect(self.db_path) as db:
+            async with db.execute(query, params) as cursor:
+                return await cursor.fetchall()
+
+    async def fetch_one(self, query: str, params: tuple = ()):
+        async with aiosqlite.connect(self.db_path) as db:
+            async with db.execute(query, params) as cursor:
+                return await cursor.fetchone()
+
+    async def close(self):
+        pass
+
+
+class Pooled(Database):
+    """utils.db.Database mit Abbau des Pools nach dem Lauf"""
+
+    async def close(self):
+        await get_pool(self.db_path).close()
+
+
+VARIANTS: Dict[str, Callable[[str], object]] = {
+    "pooled": Pooled,
+    "naive": ConnectionPerQuery,
+}
+
+
+# Operationen (gleicher SQL-Text wie im Bot, siehe utils.queries)
+
+Operation = Callable[[object, random.Random, Dict[str, int]], Awaitable[object]]
+
+
+def _guild(rnd, sizes):
+    return GUILD_BASE + rnd.randrange(sizes["guilds"])
+
+
+def _user(rnd, sizes):
+    return USER_BASE + rnd.randrange(sizes["users"])
+
+
+async def warning_insert(db, rnd, sizes):
+    await db.execute(
+        "INSERT INTO warnings (user_id, user_name, guild_id, reason, moderator_id, moderator_name) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (_user(rnd, sizes), "user", _guild(rnd, sizes), "Benchmark", USER_BASE, "mod")
+    )
+
+
+async def warning_count(db, rnd, sizes):
+    await db.fetch_one(QUERIES["warning_count"].sql, (_user(rnd, sizes), _guild(rnd, sizes)))
+
+
+async def warnings_for_user(db, rnd, sizes):
+    await db.fetch_all(QUERIES["warnings_for_user"].sql, (_user(rnd, sizes), _guild(rnd, sizes)))
+
+
+async def ticket_open(db, rnd, sizes):
+    guild, user = _guild(rnd, sizes), _user(rnd, sizes)
+    if await db.fetch_one(QUERIES["open_ticket_for_user"].sql, (guild, user)):
+        return
+    await db.execute(
+        "INSERT INTO tickets (ticket_id, guild_id, channel_id, user_id, title, status) VALUES (?, ?, ?, ?, ?, ?)",
+        (uuid.uuid4().hex, guild, CHANNEL_BASE + rnd.randrange(10**9), user, "Benchmark", "open")
+    )
+
+
+async def ticket_by_channel(db, rnd, sizes):
+    await db.fetch_one(QUERIES["open_ticket_by_channel"].sql, (CHANNEL_BASE + rnd.randrange(sizes["tickets"]),))
+
+
+async def event_join(db, rnd, sizes):
+    await db.execute(
+        QUERIES["set_participation"].sql,
+        (1 + rnd.randrange(sizes["events"]), _user(rnd, sizes), "accepted")
+    )
+
+
+async def event_accepted_count(db, rnd, sizes):
+    await db.fetch_one(QUERIES["accepted_count"].sql, (1 + rnd.randrange(sizes["events"]),))
+
+
+async def upcoming_events(db, rnd, sizes):
+    await db.fetch_all(QUERIES["upcoming_events"].sql, (_guild(rnd, sizes), time.strftime("%Y-%m-%d %H:%M:%S")))
+
+
+async def reaction_role_lookup(db, rnd, sizes):
+    message_id = MESSAGE_BASE + rnd.randrange(max(1, sizes["reaction_roles"] // len(EMOJIS)))
+    await db.fetch_all(QUERIES["reaction_roles_for_message"].sql, (message_id,))
+
+
+async def stream_subscribers(db, rnd, sizes):
+    streamer = rnd.randrange(sizes["streamers"])
+    await db.fetch_all(
+        QUERIES["stream_subscribers"].sql,
+        (GUILD_BASE + streamer % sizes["guilds"], f"streamer{streamer}")
+    )
+
+
+OPERATIONS: Dict[str, Operation] = {
+    "warning_insert": warning_insert,
+    "warning_count": warning_count,
+    "warnings_for_user": warnings_for_user,
+    "ticket_open": ticket_open,
+    "ticket_by_channel": ticket_by_channel,
+    "event_join": event_join,
+    "event_accepted_count": event_accepted_count,
+    "upcoming_events": upcoming_events,
+    "reaction_role_lookup": reaction_role_lookup,
+    "stream_subscribers": stream_subscribers,
+}
+
+
+# Messung
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Perzentil per Nearest-Rank auf einer sortierten Liste"""
+    index = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], wall: float) -> Dict[str, float]:
+    """Fasst Latenzen (Sekunden) zu Millisekunden-Kennzahlen zusammen"""
+    latencies.sort()
+    return {
+        "ops": len(latencies),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "ops_per_s": round(len(latencies) / wall, 1),
+    }
+
+
+async def run_load(db, operations: List[Tuple[str, Operation]], total: int, concurrency: int,
+                   sizes: Dict[str, int], seed: int) -> Tuple[Dict[str, List[float]], float]:
+    """Führt ``total`` Operationen mit ``concurrency`` parallelen Tasks aus
+
+    Bei mehreren Operationen wählt jeder Aufruf zufällig eine davon (gemischte Last).
+    """
+    latencies: Dict[str, List[float]] = {name: [] for name, _ in operations}
+    remaining = total
+
+    async def worker(worker_id: int):
+        nonlocal remaining
+        rnd = random.Random(seed * 1000 + worker_id)
+        while remaining > 0:
+            remaining -= 1
+            name, operation = rnd.choice(operations)
+            started = time.perf_counter()
+            await operation(db, rnd, sizes)
+            latencies[name].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return latencies, time.perf_counter() - started
+
+
+async def bench_variant(variant: str, path: str, names: List[str], args, sizes: Dict[str, int]) -> Dict[str, Dict]:
+    """Misst jede Operation einzeln und anschließend alle gemischt"""
+    db = VARIANTS[variant](path)
+    results = {}
+    try:
+        # Aufwärmen (Pool öffnen, Seiten in den Cache laden)
+        await run_load(db, [(name, OPERATIONS[name]) for name in names], args.concurrency, args.concurrency,
+                       sizes, args.seed)
+
+        for name in names:
+            latencies, wall = await run_load(db, [(name, OPERATIONS[name])], args.ops, args.concurrency,
+                                             sizes, args.seed)
+            results[name] = summarize(latencies[name], wall)
+            print(f"⏱️ {variant:<7} {name:<22} p50 {results[name]['p50_ms']:>8.3f} ms  "
+                  f"p99 {results[name]['p99_ms']:>8.3f} ms  {results[name]['ops_per_s']:>9.1f} ops/s",
+                  file=sys.stderr)
+
+        latencies, wall = await run_load(db, [(name, OPERATIONS[name]) for name in names],
+                                         args.ops * len(names), args.concurrency, sizes, args.seed)
+        combined = [value for values in latencies.values() for value in values]
+        results["mixed"] = summarize(combined, wall)
+        results["mixed"]["per_operation"] = {
+            name: summarize(values, wall) for name, values in latencies.items() if values
+        }
+        print(f"⏱️ {variant:<7} {'mixed':<22} p50 {results['mixed']['p50_ms']:>8.3f} ms  "
+              f"p99 {results['mixed']['p99_ms']:>8.3f} ms  {results['mixed']['ops_per_s']:>9.1f} ops/s",
+              file=sys.stderr)
+    finally:
+        await db.close()
+    return results
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmarks für utils/db.py")
+    parser.add_argument("--scale", type=float, default=1.0, help="Faktor für die Fixture-Größe (Standard: 1.0)")
+    parser.add_argument("--ops", type=int, default=2000, help="Operationen pro Messung")
+    parser.add_argument("--concurrency", type=int, default=32, help="parallele asyncio-Tasks")
+    parser.add_argument("--variants", default="pooled,naive", help=f"kommagetrennt aus: {', '.join(VARIANTS)}")
+    parser.add_argument("--operations", default=",".join(OPERATIONS), help="kommagetrennte Auswahl")
+    parser.add_argument("--db", help="Pfad der Fixture (Standard: temporäres Verzeichnis)")
+    parser.add_argument("--reuse", action="store_true", help="vorhandene Fixture unter --db nicht neu bauen")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="JSON in diese Datei statt auf stdout schreiben")
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    variants = [name for name in args.variants.split(",") if name]
+    names = [name for name in args.operations.split(",") if name]
+    unknown = [name for name in variants if name not in VARIANTS] + [name for name in names if name not in OPERATIONS]
+    if unknown:
+        print(f"❌ Unbekannt: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    sizes = scaled_sizes(args.scale)
+    # Statusmeldungen von Pool und Migrationen nach stderr, stdout bleibt reines JSON
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(sys.stderr):
+        path = args.db or os.path.join(tmp, "bench.db")
+        if not (args.reuse and os.path.exists(path)):
+            await build_fixture(path, sizes, args.seed)
+
+        # Jede Variante bekommt eine eigene Kopie, damit Schreibzugriffe sich nicht beeinflussen
+        results = {}
+        for variant in variants:
+            copy = os.path.join(tmp, f"{variant}.db")
+            source = sqlite3.connect(path)
+            target = sqlite3.connect(copy)
+            try:
+                source.backup(target)
+            finally:
+                source.close()
+                target.close()
+            results[variant] = await bench_variant(variant, copy, names, args, sizes)
+
+    report = json.dumps({
+        "meta": {
+            "scale": args.scale,
+            "sizes": sizes,
+            "ops": args.ops,
+            "concurrency": args.concurrency,
+            "sqlite": sqlite3.sqlite_version,
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }, indent=2)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+        print(f"✅ Ergebnisse gespeichert: {args.output}", file=sys.stderr)
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
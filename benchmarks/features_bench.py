@@ -0,0 +1,146 @@
+"""Micro-Benchmark für die Merkmalsberechnung der AutoMod-Prüfungen
+
+Vergleicht die CPU-Zeit pro Nachricht zwischen den bisherigen Einzel-
+Prüfungen (jede Prüfung schreibt klein, zählt und sucht für sich) und
+utils.message_features.MessageFeatures auf einem synthetischen, aber
+realistischen Chat-Korpus (kurze Nachrichten, Umlaute, Emojis,
+Discord-Emojis, Links, gelegentliches CAPS). Aufruf:
+
+    python -m benchmarks.features_bench
+    python -m benchmarks.features_bench --messages 50000 --output features.json
+
+Gemessen wird der Fall ohne Verstoß, in dem jede Prüfung läuft.
+"""
+import argparse
+import contextlib
+import json
+import platform
+import random
+import re
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+with contextlib.redirect_stdout(sys.stderr):
+    from utils.message_features import MessageFeatures
+
+WORDS = (
+    "hallo", "leute", "wer", "ist", "heute", "abend", "dabei", "ich", "bin", "gleich", "wieder", "da",
+    "das", "war", "echt", "gut", "gg", "lol", "nice", "danke", "schön", "grüße", "müde", "später",
+    "spiel", "runde", "noch", "eine", "server", "voice", "stream", "morgen", "über", "für", "jetzt",
+)
+EMOJIS = ("😀", "😂", "👍", "🔥", "❤️", "🎉", "😅")
+CUSTOM_EMOJIS = ("<:pepe:123456789012345678>", "<a:party:234567890123456789>")
+LINKS = ("https://youtu.be/dQw4w9WgXcQ", "discord.gg/abcdef", "https://www.twitch.tv/streamer",
+         "github.com/user/repo/issues/12")
+
+
+def build_corpus(count: int, seed: int = 1) -> List[str]:
+    """Erzeugt ``count`` Chat-Nachrichten mit typischer Verteilung"""
+    rnd = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        words = [rnd.choice(WORDS) for _ in range(max(1, int(rnd.expovariate(1 / 7))))]
+        if rnd.random() < 0.3:
+            words[0] = words[0].capitalize()
+        if rnd.random() < 0.05:
+            words = [word.upper() for word in words]
+        if rnd.random() < 0.15:
+            words.append(rnd.choice(EMOJIS) * rnd.randint(1, 3))
+        if rnd.random() < 0.05:
+            words.append(rnd.choice(CUSTOM_EMOJIS))
+        if rnd.random() < 0.04:
+            words.insert(rnd.randrange(len(words) + 1), rnd.choice(LINKS))
+        corpus.append(" ".join(words) + rnd.choice(("", "", "!", "?", "...")))
+    return corpus
+
+
+# Bisherige Implementierung (Stand vor der gemeinsamen Merkmalsberechnung)
+
+def legacy_checks(content: str):
+    # check_banned_words
+    lower = content.lower()
+
+    # check_banned_links
+    lower = content.lower()
+    urls = re.findall(r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+', lower)
+    domain_pattern = r'(?:www\.)?([a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}'
+    domains = re.findall(domain_pattern, lower)
+    links = urls + [''.join(domain) for domain in domains]
+
+    # check_excessive_caps
+    upper = alpha = 0
+    if len(content) >= 8:
+        upper = sum(1 for c in content if c.isupper())
+        alpha = sum(1 for c in content if c.isalpha())
+
+    # check_excessive_emojis
+    emojis = 0
+    if len(content) >= 8:
+        emoji_pattern = re.compile(r'<a?:[a-zA-Z0-9_]+:\d+>|[\U00010000-\U0010ffff]')
+        emojis = len(emoji_pattern.findall(content))
+
+    return lower, links, upper, alpha, emojis
+
+
+def shared_features(content: str):
+    features = MessageFeatures(content)
+    if features.length >= 8:
+        return features.lower, features.links, features.upper_count, features.alpha_count, features.emoji_count
+    return features.lower, features.links, 0, 0, 0
+
+
+VARIANTS: Dict[str, Callable[[str], object]] = {
+    "before": legacy_checks,
+    "after": shared_features,
+}
+
+
+def measure(function: Callable[[str], object], corpus: List[str], repeat: int) -> float:
+    """Beste CPU-Zeit pro Nachricht in Mikrosekunden über ``repeat`` Durchläufe"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.process_time()
+        for content in corpus:
+            function(content)
+        best = min(best, time.process_time() - started)
+    return best / len(corpus) * 1_000_000
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark der AutoMod-Merkmalsberechnung")
+    parser.add_argument("--messages", type=int, default=20000, help="Größe des Korpus")
+    parser.add_argument("--repeat", type=int, default=5, help="Durchläufe (der beste zählt)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="JSON in diese Datei statt auf stdout schreiben")
+    args = parser.parse_args(argv)
+
+    corpus = build_corpus(args.messages, args.seed)
+    results = {}
+    for name, function in VARIANTS.items():
+        results[name] = {"cpu_us_per_message": round(measure(function, corpus, args.repeat), 3)}
+        print(f"⏱️ {name:<7} {results[name]['cpu_us_per_message']:>8.3f} µs/Nachricht", file=sys.stderr)
+    results["speedup"] = round(results["before"]["cpu_us_per_message"] / results["after"]["cpu_us_per_message"], 2)
+
+    report = json.dumps({
+        "meta": {
+            "messages": args.messages,
+            "repeat": args.repeat,
+            "mean_length": round(sum(map(len, corpus)) / len(corpus), 1),
+            "non_ascii_share": round(sum(not content.isascii() for content in corpus) / len(corpus), 3),
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }, indent=2)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+        print(f"✅ Ergebnisse gespeichert: {args.output}", file=sys.stderr)
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
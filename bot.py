@@ -1,7 +1,12 @@
+import logging
 import discord
 from discord.ext import commands
 from config import DISCORD_TOKEN
-from utils.db import init_db
+from utils.db import init_db, close_db
+from utils.logging_setup import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
 
 # Bot-Konfiguration mit allen notwendigen Intents
 intents = discord.Intents.default()
@@ -12,7 +17,22 @@ intents.bans = True           # Für Ban-bezogene Aktionen
 intents.reactions = True      # Für Regelakzeptanz
 intents.guild_scheduled_events = True  # Korrekter Name für den Intent
 
-bot = commands.Bot(command_prefix='!', intents=intents)
+class DiscordBot(commands.Bot):
+    async def setup_hook(self):
+        # Läuft genau einmal vor dem ersten Verbindungsaufbau
+        await init_db()
+        await load_extensions()
+
+    async def close(self):
+        # Ausstehende AutoMod-Aktionen abarbeiten, solange die Verbindung noch steht
+        automod = getattr(self, "automod", None)
+        if automod is not None:
+            await automod.close()
+        await super().close()
+        # Datenbank-Pool erst nach dem Trennen schließen, damit keine Cog mehr schreibt
+        await close_db()
+
+bot = DiscordBot(command_prefix='!', intents=intents)
 
 # Cogs laden
 async def load_extensions():
@@ -27,9 +47,9 @@ async def load_extensions():
         await bot.load_extension("cogs.event_planner")
         await bot.load_extension("cogs.ticket_system")
         await bot.load_extension("cogs.twitch_integration")
-        print("✅ Alle Extensions wurden geladen!")
+        logger.info("✅ Alle Extensions wurden geladen!")
     except Exception as e:
-        print(f"❌ Fehler beim Laden der Extensions: {e}")
+        logger.error(f"❌ Fehler beim Laden der Extensions: {e}")
 
 # Globaler Error Handler für fehlende Berechtigungen
 @bot.event
@@ -42,14 +62,12 @@ async def on_command_error(ctx, error):
         pass
     else:
         # Andere Fehler normal ausgeben
-        print(f"Fehler bei Ausführung eines Befehls: {error}")
+        logger.error(f"Fehler bei Ausführung eines Befehls: {error}")
     
 @bot.event
 async def on_ready():
-    # Datenbank initialisieren
-    await init_db()
-    # Extensions laden
-    await load_extensions()
-    print(f'Bot ist online als {bot.user.name} und Befehle sind geladen!')
+    # on_ready feuert nach jedem Reconnect erneut, daher hier keine Initialisierung
+    logger.info(f'Bot ist online als {bot.user.name} und Befehle sind geladen!')
 
-bot.run(DISCORD_TOKEN)
\ No newline at end of file
+# Logging ist oben bereits eingerichtet, discord.py soll keinen eigenen Handler anhängen
+bot.run(DISCORD_TOKEN, log_handler=None)
\ No newline at end of file
@@ -1,28 +1,30 @@
+import logging
 import discord
 from discord.ext import commands
-from utils.automod import AutoMod
+from utils.automod import get_automod
 from typing import Optional, Union
 import re
 import asyncio
 from utils.permissions import is_admin
 
+logger = logging.getLogger(__name__)
+
 class AutoModCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.automod = AutoMod(bot)
+        # Gemeinsame Instanz, die auch ModerationCommands nutzt
+        self.automod = get_automod(bot)
     
     async def cog_load(self):
         """Wird beim Laden der Cog ausgeführt"""
         try:
             # Initialisiere AutoMod
             await self.automod.setup(self.bot)
-            print("✅ AutoMod wurde initialisiert")
+            logger.info("✅ AutoMod wurde initialisiert")
         except Exception as e:
-            print(f"❌ Fehler beim Initialisieren von AutoMod: {e}")
-        
-        # Füge den Event-Listener für Nachrichten hinzu
-        self.bot.add_listener(self.on_message, "on_message")
+            logger.error(f"❌ Fehler beim Initialisieren von AutoMod: {e}")
     
+    # Einziger on_message-Listener für AutoMod (wird von add_cog registriert)
     @commands.Cog.listener()
     async def on_message(self, message):
         """Verarbeitet eingehende Nachrichten für AutoMod"""
@@ -36,10 +38,15 @@ class AutoModCommands(commands.Cog):
             
             # Wenn ein Verstoß erkannt wurde, führe eine Aktion aus
             if violation_type:
-                print(f"🚨 AutoMod-Verstoß erkannt: {violation_type} von {message.author.name}")
+                logger.info("🚨 AutoMod-Verstoß erkannt: %s von %s", violation_type, message.author.name)
                 await self.automod.take_action(message, violation_type)
         except Exception as e:
-            print(f"❌ Fehler bei der AutoMod-Verarbeitung: {e}")
+            logger.exception("❌ Fehler bei der AutoMod-Verarbeitung: %s", e)
+    
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        """Zählt Beitritte für die Raid-Erkennung"""
+        await self.automod.record_join(member)
     
     @commands.group(name="automod", invoke_without_command=True)
     @is_admin()
@@ -69,7 +76,11 @@ class AutoModCommands(commands.Cog):
                 "`!automod links <an/aus>` - Link-Filter\n"
                 "`!automod caps <an/aus> [schwelle]` - CAPS-Filter\n"
                 "`!automod emoji <an/aus> [schwelle]` - Emoji-Filter\n"
-                "`!automod flood <an/aus> [nachrichten] [sekunden]` - Flood-Filter"
+                "`!automod flood <an/aus> [nachrichten] [sekunden]` - Flood-Filter\n"
+                "`!automod rule <regel> <an/aus>` - Schaltet eine Prüfregel an oder aus\n"
+                "`!automod rules` - Zeigt alle Prüfregeln mit Statistik\n"
+                "`!automod queue` - Zeigt die Warteschlange für Löschungen, Warnungen und Logs\n"
+                "`!automod raid [ende]` - Zeigt die Raid-Erkennung bzw. beendet den Lockdown"
             ),
             inline=False
         )
@@ -160,6 +171,13 @@ class AutoModCommands(commands.Cog):
             inline=False
         )
         
+        if status["lockdown"]:
+            embed.add_field(
+                name="Raid-Lockdown",
+                value="🚨 Aktiv - Details mit `!automod raid`",
+                inline=False
+            )
+        
         # Log-Kanal
         log_channel = ctx.guild.get_channel(status["log_channel"]) if status["log_channel"] else None
         embed.add_field(
@@ -185,6 +203,10 @@ class AutoModCommands(commands.Cog):
         flood_messages, flood_interval = status["flood_settings"]
         filter_status.append(f"**Flood-Filter:** {flood_messages} gleiche Nachrichten in {flood_interval} Sekunden")
         
+        # Abgeschaltete Regeln
+        if status["disabled_rules"]:
+            filter_status.append(f"**Abgeschaltete Regeln:** {', '.join(status['disabled_rules'])}")
+        
         embed.add_field(
             name="Filter-Einstellungen",
             value="\n".join(filter_status),
@@ -398,6 +420,142 @@ class AutoModCommands(commands.Cog):
             
             await ctx.send(embed=embed)
     
+    @automod.command(name="rule")
+    @is_admin()
+    async def automod_rule(self, ctx, rule: str, status: str):
+        """Schaltet eine Prüfregel für diesen Server an oder aus"""
+        if status.lower() not in ["an", "aus", "on", "off"]:
+            await ctx.send("❌ Status muss 'an' oder 'aus' sein!")
+            return
+        
+        rule = rule.lower()
+        if rule not in self.automod.rules.names():
+            await ctx.send(f"❌ Unbekannte Regel! Verfügbar: {', '.join(self.automod.rules.names())}")
+            return
+        
+        enabled = status.lower() in ["an", "on"]
+        await self.automod.set_rule_enabled(ctx.guild.id, rule, enabled)
+        
+        embed = discord.Embed(
+            title=f"✅ Regel {'aktiviert' if enabled else 'deaktiviert'}",
+            description=f"Die Regel `{rule}` ist für diesen Server jetzt {'aktiv' if enabled else 'abgeschaltet'}.",
+            color=discord.Color.green() if enabled else discord.Color.red()
+        )
+        
+        await ctx.send(embed=embed)
+    
+    @automod.command(name="rules")
+    @is_admin()
+    async def automod_rules(self, ctx):
+        """Zeigt alle Prüfregeln in Ausführungsreihenfolge mit Statistik"""
+        lines = []
+        for position, stats in enumerate(self.automod.rules.stats(), start=1):
+            active = "✅" if self.automod.rules.is_enabled(ctx.guild.id, stats["name"]) else "❌"
+            if stats["calls"]:
+                details = f"{stats['calls']} Prüfungen, {stats['hit_rate']:.2%} Treffer, Ø {stats['avg_us']} µs"
+            else:
+                details = "noch keine Prüfungen"
+            lines.append(f"{position}. {active} `{stats['name']}` - {details}")
+        
+        embed = discord.Embed(
+            title="🧩 AutoMod-Regeln",
+            description="\n".join(lines),
+            color=discord.Color.blue()
+        )
+        embed.set_footer(text="Günstige Regeln mit hoher Trefferquote laufen zuerst; Spam und Flood immer zuletzt")
+        
+        await ctx.send(embed=embed)
+    
+    @automod.command(name="queue")
+    @is_admin()
+    async def automod_queue(self, ctx):
+        """Zeigt Tiefe, Verzögerung und Zähler der Durchsetzungs-Warteschlange"""
+        stats = self.automod.enforcement.stats()
+        
+        embed = discord.Embed(
+            title="📬 AutoMod-Warteschlange",
+            color=discord.Color.blue()
+        )
+        embed.add_field(
+            name="Ausstehend",
+            value=(
+                f"**Gesamt:** {stats['depth']}\n"
+                f"**Löschungen:** {stats['pending_deletions']}\n"
+                f"**Warnungen:** {stats['pending_warnings']}\n"
+                f"**Log-Einträge:** {stats['pending_log_entries']}"
+            ),
+            inline=True
+        )
+        embed.add_field(
+            name="Verzögerung",
+            value=(
+                f"**Älteste offene:** {stats['oldest_pending_s']} s\n"
+                f"**Zuletzt:** {stats['last_lag_s']} s\n"
+                f"**Ø:** {stats['avg_lag_s']} s\n"
+                f"**Max:** {stats['max_lag_s']} s"
+            ),
+            inline=True
+        )
+        embed.add_field(
+            name="Seit dem Start",
+            value=(
+                f"**Verstöße:** {stats.get('submitted', 0)}\n"
+                f"**Gelöscht:** {stats.get('deleted', 0)} "
+                f"({stats.get('bulk_deletes', 0)} Bulk, {stats.get('single_deletes', 0)} einzeln)\n"
+                f"**Warnungen:** {stats.get('warnings_sent', 0)} gesendet, "
+                f"{stats.get('warnings_suppressed', 0)} zusammengefasst\n"
+                f"**Log-Nachrichten:** {stats.get('log_messages', 0)}\n"
+                f"**Fehler:** {stats.get('errors', 0)}"
+            ),
+            inline=False
+        )
+        
+        await ctx.send(embed=embed)
+    
+    @automod.command(name="raid")
+    @is_admin()
+    async def automod_raid(self, ctx, action: Optional[str] = None):
+        """Zeigt den Zustand der Raid-Erkennung oder beendet den Lockdown"""
+        if action and action.lower() in ["ende", "aus", "off", "end"]:
+            if not self.automod.raid.in_lockdown(ctx.guild.id):
+                await ctx.send("ℹ️ Der Server ist nicht im Lockdown.")
+                return
+            self.automod.raid.release(ctx.guild.id, f"Manuell beendet von {ctx.author}")
+            await ctx.send("✅ Lockdown beendet, AutoMod prüft wieder normal.")
+            return
+        
+        status = self.automod.raid.status(ctx.guild.id)
+        embed = discord.Embed(
+            title="🚨 Raid-Erkennung",
+            color=discord.Color.red() if status["lockdown"] else discord.Color.blue()
+        )
+        
+        if status["lockdown"]:
+            embed.description = (
+                f"**Lockdown aktiv** seit {status['lockdown_for_s']} Sekunden ({status['reason']})\n"
+                f"Seitdem {status['lockdown_messages']} Nachrichten und {status['lockdown_joins']} Beitritte, "
+                f"{status['flagged_contents']} markierte Inhalte.\n"
+                "Beenden mit `!automod raid ende`"
+            )
+        else:
+            embed.description = "Kein Lockdown aktiv."
+        
+        if "message_rate" in status:
+            embed.add_field(
+                name="Nachrichten",
+                value=(f"{status['message_rate']} pro {status['message_bucket_s']:.0f} s "
+                       f"(normal: {status['message_baseline']})"),
+                inline=True
+            )
+            embed.add_field(
+                name="Beitritte",
+                value=(f"{status['join_rate']} pro {status['join_bucket_s']:.0f} s "
+                       f"(normal: {status['join_baseline']})"),
+                inline=True
+            )
+        
+        await ctx.send(embed=embed)
+    
     @automod.command(name="addword")
     @is_admin()
     async def automod_addword(self, ctx, *, word: str):
@@ -669,53 +827,4 @@ class AutoModCommands(commands.Cog):
         await ctx.send(embed=embed)
 
 async def setup(bot):
-    # Füge die Tabellen zur Datenbank hinzu
-    from utils.db import Database
-    db = Database()
-    
-    # AutoMod-Konfigurationstabelle
-    await db.execute('''
-        CREATE TABLE IF NOT EXISTS automod_config (
-            guild_id INTEGER PRIMARY KEY,
-            enabled INTEGER DEFAULT 0,
-            log_channel_id INTEGER
-        )
-    ''')
-    
-    # AutoMod-Whitelist-Tabelle
-    await db.execute('''
-        CREATE TABLE IF NOT EXISTS automod_whitelist (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            guild_id INTEGER NOT NULL,
-            role_id INTEGER,
-            channel_id INTEGER,
-            type TEXT NOT NULL,
-            UNIQUE(guild_id, role_id, type),
-            UNIQUE(guild_id, channel_id, type)
-        )
-    ''')
-    
-    # AutoMod-Filter-Tabelle
-    await db.execute('''
-        CREATE TABLE IF NOT EXISTS automod_filter (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            guild_id INTEGER NOT NULL,
-            word TEXT NOT NULL,
-            type TEXT NOT NULL,
-            UNIQUE(guild_id, word, type)
-        )
-    ''')
-    
-    # AutoMod-Einstellungen-Tabelle
-    await db.execute('''
-        CREATE TABLE IF NOT EXISTS automod_settings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            guild_id INTEGER NOT NULL,
-            setting_type TEXT NOT NULL,
-            value TEXT NOT NULL,
-            UNIQUE(guild_id, setting_type)
-        )
-    ''')
-    
-    # Registriere die Cog
-    await bot.add_cog(AutoModCommands(bot)) 
\ No newline at end of file
+    await bot.add_cog(AutoModCommands(bot))
@@ -1,17 +1,71 @@
+import logging
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 import asyncio
 import sys
 import os
 import datetime
+import time
 import pytz
-from typing import Optional, Union
-import sqlite3
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 # Pfad zum Hauptverzeichnis hinzufügen, um utils zu importieren
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from utils.db import Database
+from utils.config_cache import cache_stats
 from utils.permissions import is_admin
+from utils.queries import EventRosterRow
+from utils.scheduler import DeadlineScheduler
+from config import EVENT_REFRESH_WINDOW, EVENT_REMINDER_OFFSETS
+
+logger = logging.getLogger(__name__)
+
+# Reaktionen, mit denen man auf Event-Nachrichten den Teilnahmestatus setzt
+RSVP_REACTIONS = {"✅": "accepted", "❌": "declined", "❓": "maybe"}
+
+# Bestätigungstext pro Status (DM nach einer Reaktion)
+RSVP_STATUS_TEXT = {
+    "accepted": "zugesagt zu",
+    "declined": "abgesagt für",
+    "maybe": "dich als unsicher markiert für"
+}
+
+# So viele Nachrichten pro Kanal werden beim einmaligen Nachtragen alter Event-Nachrichten durchsucht
+BACKFILL_HISTORY_LIMIT = 100
+
+# Teilnehmerlisten im Speicher: so viele Events, so viele Sekunden lang
+ROSTER_CACHE_SIZE = 256
+ROSTER_CACHE_TTL = 300.0
+
+def footer_event_id(footer_text: Optional[str]) -> Optional[int]:
+    """Liest die Event-ID aus einem Embed-Footer ("Event ID: 3 | Erstellt von ...")"""
+    if not footer_text or not footer_text.startswith("Event ID:"):
+        return None
+    try:
+        return int(footer_text.split("Event ID:")[1].split("|")[0].strip())
+    except ValueError:
+        return None
+
+_OFFSET_UNITS = {"d": 1440, "h": 60, "m": 1}
+
+
+def parse_reminder_offset(text: str) -> int:
+    """Wandelt "1d", "24h", "10m" oder "90" (Minuten) in Minuten um"""
+    text = text.strip().lower()
+    unit = _OFFSET_UNITS.get(text[-1:])
+    minutes = int(text[:-1]) * unit if unit else int(text)
+    if minutes <= 0:
+        raise ValueError(f"Ungültiger Abstand: {text}")
+    return minutes
+
+
+def format_reminder_offset(minutes: int) -> str:
+    """Gegenstück zu parse_reminder_offset (1440 -> "1d", 90 -> "90m")"""
+    for suffix, unit in _OFFSET_UNITS.items():
+        if minutes % unit == 0:
+            return f"{minutes // unit}{suffix}"
+
 
 # Hilfsfunktion zum Finden der richtigen Enums
 def find_enums():
@@ -22,7 +76,7 @@ def find_enums():
     elif hasattr(discord, 'GuildScheduledEventEntityType'):
         entity_type = discord.GuildScheduledEventEntityType.external
     else:
-        print("WARNUNG: EntityType konnte nicht gefunden werden")
+        logger.warning("EntityType konnte nicht gefunden werden")
         
     # Suche PrivacyLevel
     privacy_level = None
@@ -31,131 +85,480 @@ def find_enums():
     elif hasattr(discord, 'GuildScheduledEventPrivacyLevel'):
         privacy_level = discord.GuildScheduledEventPrivacyLevel.guild_only
     else:
-        print("WARNUNG: PrivacyLevel konnte nicht gefunden werden")
+        logger.warning("PrivacyLevel konnte nicht gefunden werden")
     
     return entity_type, privacy_level
 
+class EventRoster:
+    """Zeilen von event_roster für ein Event samt aufgelöster Anzeigenamen
+
+    Die Namen pro Status werden beim ersten Rendern einmal über
+    guild.get_member aufgelöst und danach wiederverwendet.
+    """
+
+    __slots__ = ("rows", "loaded_at", "_names")
+
+    def __init__(self, rows: List[EventRosterRow]):
+        self.rows = rows
+        self.loaded_at = time.monotonic()
+        self._names: Optional[Dict[str, List[str]]] = None
+
+    @property
+    def event(self) -> EventRosterRow:
+        return self.rows[0]
+
+    def has_participants(self) -> bool:
+        return self.rows[0].user_id is not None
+
+    def names(self, guild: discord.Guild) -> Dict[str, List[str]]:
+        """Anzeigenamen der (noch vorhandenen) Mitglieder pro Status"""
+        if self._names is None:
+            names = {"accepted": [], "declined": [], "maybe": []}
+            for row in self.rows:
+                if row.user_id is None or row.status not in names:
+                    continue
+                member = guild.get_member(row.user_id)
+                if member:
+                    names[row.status].append(member.display_name)
+            self._names = names
+        return self._names
+
+
+class RosterCache:
+    """Teilnehmerlisten der zuletzt benutzten Events im Speicher
+
+    Alle Schreibwege des Eventplaners tragen den neuen Stand ein (put) oder
+    verwerfen ihn (invalidate). Nach ROSTER_CACHE_TTL Sekunden wird ein
+    Eintrag trotzdem neu geladen, damit geänderte Anzeigenamen nachziehen.
+
+    Jede Invalidierung erhöht ``generation``. Ein put mit ``since`` (dem
+    Stand vor dem Lesen) wird verworfen, wenn das Event seitdem invalidiert
+    wurde, die gelesenen Zeilen also veraltet sein können.
+    """
+
+    def __init__(self, db: Database, size: int = ROSTER_CACHE_SIZE, ttl: float = ROSTER_CACHE_TTL):
+        self.db = db
+        self.size = size
+        self.ttl = ttl
+        self._rosters: "OrderedDict[int, EventRoster]" = OrderedDict()
+        self.generation = 0
+        # event_id -> Stand der letzten Invalidierung; ältere Einträge fallen
+        # heraus und gelten dann als zum Stand _floor invalidiert
+        self._invalidated: "OrderedDict[int, int]" = OrderedDict()
+        self._floor = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, event_id: int) -> Optional[EventRoster]:
+        """Teilnehmerliste eines Events (None, wenn es das Event nicht gibt)"""
+        roster = self._rosters.get(event_id)
+        if roster is not None and time.monotonic() - roster.loaded_at < self.ttl:
+            self._rosters.move_to_end(event_id)
+            self.hits += 1
+            return roster
+        
+        self.misses += 1
+        since = self.generation
+        rows = await self.db.q.event_roster(event_id)
+        if not rows:
+            self._rosters.pop(event_id, None)
+            return None
+        return self.put(event_id, rows, since)
+
+    def put(self, event_id: int, rows: List[EventRosterRow], since: Optional[int] = None) -> EventRoster:
+        """Trägt einen neuen Stand ein und gibt ihn zurück
+
+        Mit ``since`` wird der Stand nur zurückgegeben, wenn das Event nach
+        diesem Stand invalidiert wurde. Ein inzwischen gespeicherter Eintrag
+        fliegt dann ebenfalls heraus, weil ihm dieser Stand fehlen kann.
+        """
+        roster = EventRoster(rows)
+        if since is not None and self._invalidated.get(event_id, self._floor) > since:
+            self._rosters.pop(event_id, None)
+            return roster
+        self._rosters[event_id] = roster
+        self._rosters.move_to_end(event_id)
+        if len(self._rosters) > self.size:
+            self._rosters.popitem(last=False)
+        return roster
+
+    def invalidate(self, event_id: int):
+        self._rosters.pop(event_id, None)
+        self.generation += 1
+        self._invalidated[event_id] = self.generation
+        self._invalidated.move_to_end(event_id)
+        if len(self._invalidated) > self.size:
+            _, self._floor = self._invalidated.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._rosters)
+
+
+class _DirtyEvent:
+    """Gesammelter Zustand eines Events bis zum nächsten Flush"""
+
+    __slots__ = ("guild", "rsvps", "sources")
+
+    def __init__(self, guild: discord.Guild):
+        self.guild = guild
+        # user_id -> (member, status); bei mehreren Reaktionen gilt die letzte
+        self.rsvps: Dict[int, Tuple[discord.Member, str]] = {}
+        # Nachrichten, auf die reagiert wurde (neben der Ankündigung mit zu bearbeiten)
+        self.sources: Dict[int, discord.PartialMessage] = {}
+
+
+class EventRefresher:
+    """Sammelt Teilnahmeänderungen und bearbeitet Event-Nachrichten gebündelt
+
+    Eine Reaktion markiert ihr Event nur als geändert. Spätestens ``window``
+    Sekunden nach der ersten Markierung werden alle gesammelten Zusagen in
+    einer Transaktion geschrieben, jede betroffene Nachricht einmal mit dem
+    aktuellen Stand bearbeitet und jeder User einmal per DM benachrichtigt.
+    So bleibt auch ein Ansturm auf ein beliebtes Event unter dem
+    Edit-Limit von Discord pro Nachricht.
+    """
+
+    def __init__(self, planner: "EventPlanner", window: float = EVENT_REFRESH_WINDOW):
+        self.planner = planner
+        self.window = window
+        self._dirty: Dict[int, _DirtyEvent] = {}
+        self._task: Optional[asyncio.Task] = None
+        # Ein Flush liest, schreibt und rendert am Stück (keine Überschneidung mit dem nächsten)
+        self._lock = asyncio.Lock()
+        self._closing = asyncio.Event()
+        self.flushes = 0
+        self.rsvps_written = 0
+        self.edits = 0
+
+    def _entry(self, guild: discord.Guild, event_id: int) -> _DirtyEvent:
+        entry = self._dirty.get(event_id)
+        if entry is None:
+            entry = self._dirty[event_id] = _DirtyEvent(guild)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_later())
+        return entry
+
+    def submit(self, guild: discord.Guild, member: discord.Member, event_id: int, status: str,
+               source: Optional[discord.PartialMessage] = None):
+        """Merkt eine Teilnahmeänderung per Reaktion für den nächsten Flush vor"""
+        entry = self._entry(guild, event_id)
+        entry.rsvps.pop(member.id, None)  # neu einreihen: Reihenfolge der letzten Reaktion
+        entry.rsvps[member.id] = (member, status)
+        if source is not None:
+            entry.sources[source.id] = source
+
+    def mark(self, guild: discord.Guild, event_id: int):
+        """Markiert ein Event zum Neuzeichnen (z.B. nach einer Änderung per Befehl)"""
+        self._entry(guild, event_id)
+
+    def pending(self) -> int:
+        return sum(len(entry.rsvps) for entry in self._dirty.values())
+
+    async def _flush_later(self):
+        try:
+            try:
+                await asyncio.wait_for(self._closing.wait(), self.window)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+        finally:
+            # Während des Flushs eingegangene (oder zurückgestellte) Änderungen
+            # haben keinen eigenen Task gestartet, weil dieser noch lief
+            # (beim Entladen übernimmt close() den letzten Flush)
+            if self._dirty and not self._closing.is_set():
+                self._task = asyncio.create_task(self._flush_later())
+
+    def _requeue(self, dirty: Dict[int, _DirtyEvent]):
+        """Stellt nicht gespeicherte Änderungen für den nächsten Flush zurück"""
+        for event_id, entry in dirty.items():
+            newer = self._dirty.get(event_id)
+            if newer is not None:
+                # Reaktionen aus der Zwischenzeit sind neuer und gewinnen
+                for user_id, rsvp in newer.rsvps.items():
+                    entry.rsvps.pop(user_id, None)
+                    entry.rsvps[user_id] = rsvp
+                entry.sources.update(newer.sources)
+            self._dirty[event_id] = entry
+
+    async def flush(self):
+        """Schreibt alle gesammelten Änderungen und bearbeitet die Event-Nachrichten"""
+        dirty, self._dirty = self._dirty, {}
+        if not dirty:
+            return
+
+        notices: List[Tuple[discord.Member, str, Optional[discord.abc.Messageable]]] = []
+        async with self._lock:
+            # Befehle schreiben am Refresher vorbei und invalidieren nur: ein
+            # danach veralteter Stand wird unten nicht in den Cache übernommen
+            since = self.planner.rosters.generation
+            rosters = {}
+            rows = []
+            for event_id, entry in dirty.items():
+                roster = await self.planner.rosters.get(event_id)
+                if roster is None:
+                    continue
+                rosters[event_id] = self._apply(event_id, entry, roster.rows, rows, notices)
+
+            try:
+                if rows:
+                    await self.planner.db.q.set_participation.many(rows)
+            except Exception as e:
+                logger.error(f"❌ Teilnahmen konnten nicht gespeichert werden, neuer Versuch im nächsten Fenster: {e}")
+                self._requeue(dirty)
+                return
+
+            self.flushes += 1
+            self.rsvps_written += len(rows)
+            for event_id, roster_rows in rosters.items():
+                entry = dirty[event_id]
+                roster = self.planner.rosters.put(event_id, roster_rows, since)
+                await self.planner.edit_event_messages(entry.guild, event_id, roster, entry.sources.values())
+
+        for member, text, fallback in notices:
+            try:
+                await member.send(text)
+            except Exception:
+                if fallback:
+                    try:
+                        await fallback.send(f"{member.mention}, {text}")
+                    except discord.HTTPException:
+                        pass
+
+    def _apply(self, event_id: int, entry: _DirtyEvent, roster: List[EventRosterRow],
+               rows: List[Tuple[int, int, str]], notices: list) -> List[EventRosterRow]:
+        """Wendet die gesammelten Änderungen auf den Stand aus der Datenbank an
+
+        Gibt die aktualisierten Zeilen zurück (zum Rendern ohne zweite Abfrage)
+        und ergänzt die zu schreibenden Zeilen und die Benachrichtigungen.
+        """
+        event = roster[0]
+        guild = entry.guild
+        statuses = {row.user_id: row.status for row in roster if row.user_id is not None}
+        accepted = sum(1 for status in statuses.values() if status == "accepted")
+
+        for member, status in entry.rsvps.values():
+            previous = statuses.get(member.id)
+            if previous == status:
+                continue
+
+            # Überprüfe, ob das Event voll ist (nur für Zusagen)
+            if status == "accepted" and 0 < event.max_participants <= accepted:
+                notices.append((member, f"❌ Das Event **{event.title}** auf **{guild.name}** ist bereits voll!",
+                                guild.get_channel(event.channel_id)))
+                continue
+
+            accepted += (status == "accepted") - (previous == "accepted")
+            statuses.pop(member.id, None)
+            statuses[member.id] = status
+            rows.append((event_id, member.id, status))
+            notices.append((member, f"✅ Du hast {RSVP_STATUS_TEXT[status]} dem Event **{event.title}** auf **{guild.name}**.", None))
+
+        if not statuses:
+            return roster[:1]
+        return [event._replace(user_id=user_id, status=status) for user_id, status in statuses.items()]
+
+    async def close(self):
+        """Schreibt ausstehende Änderungen sofort (beim Entladen der Cog)"""
+        self._closing.set()
+        if self._task:
+            await self._task
+        await self.flush()
+
+
 class EventPlanner(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = Database()
-        self.reminder_task = self.event_reminder.start()
+        # Ein Eintrag pro Erinnerung: (event_id, Minuten vor Beginn) -> Zeitpunkt
+        self.reminders = DeadlineScheduler(self.send_reminder, name="event-reminders")
         self.timezone = pytz.timezone('Europe/Berlin')  # Standard-Zeitzone für Deutschland
+        # message_id -> event_id aller Event-Nachrichten; Reaktionen auf andere
+        # Nachrichten werden so ohne API-Aufruf und ohne Datenbankzugriff verworfen
+        self.event_messages: Dict[int, int] = {}
+        self._backfilled = False
+        self.rosters = RosterCache(self.db)
+        self.refresher = EventRefresher(self)
     
-    def cog_unload(self):
-        self.event_reminder.cancel()
+    async def cog_load(self):
+        """Lädt den Nachrichten-Index der Event-Nachrichten"""
+        # Nachrichten beendeter (oder gelöschter) Events werden nicht mehr gebraucht
+        await self.db.q.prune_event_messages(datetime.datetime.now(self.timezone).isoformat())
+        rows = await self.db.q.event_message_index()
+        self.event_messages = {row.message_id: row.event_id for row in rows}
+        logger.info(f"📅 {len(self.event_messages)} Event-Nachrichten im Index")
+        await self.load_reminders()
+        self.reminders.start()
     
-    async def initialize_database(self):
-        """Initialisiert die Datenbanktabellen für den Eventplaner"""
-        # Tabelle für Events
-        await self.db.execute('''
-        CREATE TABLE IF NOT EXISTS events (
-            event_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            guild_id INTEGER NOT NULL,
-            channel_id INTEGER NOT NULL,
-            creator_id INTEGER NOT NULL,
-            title TEXT NOT NULL,
-            description TEXT,
-            location TEXT,
-            start_time TIMESTAMP NOT NULL,
-            end_time TIMESTAMP,
-            max_participants INTEGER DEFAULT 0,
-            reminder_sent BOOLEAN DEFAULT FALSE,
-            discord_event_id TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
-        
-        # Tabelle für Teilnehmer
-        await self.db.execute('''
-        CREATE TABLE IF NOT EXISTS event_participants (
-            event_id INTEGER,
-            user_id INTEGER,
-            status TEXT NOT NULL,  -- 'accepted', 'declined', 'maybe'
-            joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (event_id, user_id),
-            FOREIGN KEY (event_id) REFERENCES events (event_id) ON DELETE CASCADE
-        )
-        ''')
-        
-        print("✅ Eventplaner-Datenbanktabellen initialisiert")
+    async def cog_unload(self):
+        await self.reminders.close()
+        await self.refresher.close()
     
     @commands.Cog.listener()
     async def on_ready(self):
-        await self.initialize_database()
-        print("✅ Eventplaner bereit!")
+        logger.info("✅ Eventplaner bereit!")
+        if not self._backfilled:
+            self._backfilled = True
+            await self.backfill_event_messages()
     
-    @tasks.loop(minutes=5.0)
-    async def event_reminder(self):
-        """Sendet Erinnerungen für bevorstehende Events"""
-        try:
-            # Finde Events, die in 30 Minuten beginnen und für die noch keine Erinnerung gesendet wurde
-            now = datetime.datetime.now(self.timezone)
-            reminder_time = now + datetime.timedelta(minutes=30)
-            
-            # Finde passende Events
-            events = await self.db.fetch_all('''
-            SELECT event_id, guild_id, channel_id, title, start_time, description, location 
-            FROM events 
-            WHERE start_time <= ? AND start_time >= ? AND reminder_sent = FALSE
-            ''', (reminder_time.isoformat(), now.isoformat()))
-            
-            for event in events:
-                event_id, guild_id, channel_id, title, start_time, description, location = event
-                
-                # Hole Teilnehmer, die zugesagt haben
-                participants = await self.db.fetch_all('''
-                SELECT user_id FROM event_participants 
-                WHERE event_id = ? AND status = 'accepted'
-                ''', (event_id,))
-                
-                guild = self.bot.get_guild(int(guild_id))
-                if not guild:
-                    continue
-                
-                channel = guild.get_channel(int(channel_id))
-                if not channel:
-                    continue
-                
-                # Erstelle Embed für die Erinnerung
-                embed = discord.Embed(
-                    title=f"⏰ Erinnerung: {title}",
-                    description=f"Das Event beginnt in 30 Minuten!\n\n{description}",
-                    color=discord.Color.gold()
-                )
-                
-                if location:
-                    embed.add_field(name="Ort", value=location, inline=False)
-                
-                embed.add_field(
-                    name="Startzeit", 
-                    value=f"<t:{int(datetime.datetime.fromisoformat(start_time).timestamp())}:F>",
-                    inline=False
-                )
-                
-                # Erwähne Teilnehmer
-                mentions = []
-                for participant in participants:
-                    user_id = participant[0]
-                    mentions.append(f"<@{user_id}>")
-                
-                if mentions:
-                    mention_text = " ".join(mentions)
-                    await channel.send(content=f"Erinnerung für: {mention_text}", embed=embed)
-                else:
-                    await channel.send(embed=embed)
-                
-                # Markiere Event als erinnert
-                await self.db.execute('''
-                UPDATE events SET reminder_sent = TRUE WHERE event_id = ?
-                ''', (event_id,))
+    async def register_event_message(self, message: discord.Message, event_id: int, announcement: bool = False):
+        """Merkt sich eine gepostete Event-Nachricht (Speicher und Datenbank)
+
+        Die Ankündigung beim Erstellen wird zusätzlich in events.message_id
+        gespeichert und bei Teilnahmeänderungen direkt bearbeitet. Von den
+        Anzeigen per ``!event show`` bleibt nur die neueste im Index, damit er
+        pro Event höchstens zwei Nachrichten enthält.
+        """
+        if announcement:
+            await self.db.q.set_event_message(message, event_id)
+            self.rosters.invalidate(event_id)
+        else:
+            roster = await self.rosters.get(event_id)
+            keep = roster.event.message_id if roster else None
+            for message_id in [mid for mid, eid in self.event_messages.items() if eid == event_id and mid != keep]:
+                del self.event_messages[message_id]
+            await self.db.q.forget_event_copies(event_id, keep)
         
-        except Exception as e:
-            print(f"Fehler beim Senden von Event-Erinnerungen: {e}")
+        self.event_messages[message.id] = event_id
+        await self.db.q.register_event_message(message, event_id, message.guild, message.channel)
+    
+    async def forget_event(self, event_id: int):
+        """Entfernt alle Nachrichten eines Events aus dem Index"""
+        for message_id in [mid for mid, eid in self.event_messages.items() if eid == event_id]:
+            del self.event_messages[message_id]
+        await self.db.q.forget_event_messages(event_id)
+    
+    async def backfill_event_messages(self):
+        """Trägt Nachrichten kommender Events nach, die vor dem Index gepostet wurden
+
+        Läuft einmal nach dem Start. Danach stehen die Events im Index und
+        werden nicht erneut gesucht.
+        """
+        now = datetime.datetime.now(self.timezone).isoformat()
+        events = await self.db.q.unindexed_upcoming_events(now)
+        if not events:
+            return
+        
+        wanted: Dict[int, Set[int]] = {}
+        for event in events:
+            wanted.setdefault(event.channel_id, set()).add(event.event_id)
+        
+        found = 0
+        for channel_id, event_ids in wanted.items():
+            channel = self.bot.get_channel(channel_id)
+            if not channel:
+                continue
+            try:
+                async for message in channel.history(limit=BACKFILL_HISTORY_LIMIT):
+                    if message.author != self.bot.user or not message.embeds:
+                        continue
+                    event_id = footer_event_id(message.embeds[0].footer.text)
+                    if event_id in event_ids:
+                        # Die neueste Event-Nachricht im Kanal des Events wird zur Ankündigung
+                        event_ids.discard(event_id)
+                        await self.register_event_message(message, event_id, announcement=True)
+                        found += 1
+            except discord.HTTPException as e:
+                logger.warning(f"⚠️ Event-Nachrichten in Kanal {channel_id} konnten nicht gelesen werden: {e}")
+        
+        if found:
+            logger.info(f"📅 {found} ältere Event-Nachrichten in den Index übernommen")
+    
+    async def load_reminders(self):
+        """Plant alle noch nicht gesendeten Erinnerungen aus der Datenbank ein"""
+        offsets: Dict[Tuple[int, str], List[int]] = {}
+        for row in await self.db.q.pending_event_reminders():
+            offsets.setdefault((row.event_id, row.start_time), []).append(row.offset_minutes)
+        
+        for (event_id, start_time), event_offsets in offsets.items():
+            await self.schedule_reminders(event_id, start_time, event_offsets)
+        logger.info(f"⏰ {len(self.reminders)} Event-Erinnerungen geplant")
+    
+    async def schedule_reminders(self, event_id: int, start_time: str, offsets: List[int]):
+        """Plant die Erinnerungen eines Events (ersetzt bereits geplante)
+
+        Liegen mehrere Erinnerungen schon in der Vergangenheit (z.B. nach
+        einer Downtime), wird nur die letzte davon sofort gesendet; die
+        früheren gelten als erledigt. Hat das Event bereits begonnen, entfällt
+        die Erinnerung ganz.
+        """
+        self.cancel_reminders(event_id)
+        start = datetime.datetime.fromisoformat(start_time).timestamp()
+        now = time.time()
+        
+        missed = [offset for offset in offsets if start - offset * 60 <= now]
+        for offset in offsets:
+            if offset not in missed:
+                self.reminders.schedule((event_id, offset), start - offset * 60)
+        
+        if missed:
+            if start > now:
+                self.reminders.schedule((event_id, min(missed)), now)
+            else:
+                await self.db.q.mark_event_reminders_sent(event_id, min(missed))
+    
+    def cancel_reminders(self, event_id: int):
+        """Entfernt alle geplanten Erinnerungen eines Events"""
+        for key in self.reminders.keys():
+            if key[0] == event_id:
+                self.reminders.cancel(key)
+    
+    async def reschedule_reminders(self, event_id: int):
+        """Plant ein Event nach einer Zeitänderung neu (alle Erinnerungen wieder offen)"""
+        event = await self.db.q.reminder_event(event_id)
+        if not event:
+            return self.cancel_reminders(event_id)
+        await self.db.q.reset_event_reminders(event_id)
+        offsets = [row.offset_minutes for row in await self.db.q.event_reminder_offsets(event_id)]
+        await self.schedule_reminders(event_id, event.start_time, offsets)
     
-    @event_reminder.before_loop
-    async def before_reminder(self):
+    async def send_reminder(self, key: Tuple[int, int]):
+        """Sendet eine fällige Erinnerung (Callback des Zeitplaners)"""
+        event_id, offset = key
         await self.bot.wait_until_ready()
+        
+        event = await self.db.q.reminder_event(event_id)
+        if not event:
+            return
+        
+        # Erledigt diese und alle früheren Erinnerungen des Events, auch wenn das Senden scheitert
+        await self.db.q.mark_event_reminders_sent(event_id, offset)
+        
+        guild = self.bot.get_guild(event.guild_id)
+        channel = guild.get_channel(event.channel_id) if guild else None
+        if not channel:
+            return
+        
+        # Hole Teilnehmer, die zugesagt haben
+        participants = await self.db.q.accepted_participants(event_id)
+        start_timestamp = int(datetime.datetime.fromisoformat(event.start_time).timestamp())
+        
+        # Erstelle Embed für die Erinnerung
+        embed = discord.Embed(
+            title=f"⏰ Erinnerung: {event.title}",
+            description=f"Das Event beginnt <t:{start_timestamp}:R>!\n\n{event.description}",
+            color=discord.Color.gold()
+        )
+        
+        if event.location:
+            embed.add_field(name="Ort", value=event.location, inline=False)
+        
+        embed.add_field(
+            name="Startzeit", 
+            value=f"<t:{start_timestamp}:F>",
+            inline=False
+        )
+        
+        # Erwähne Teilnehmer
+        mentions = [f"<@{user_id}>" for user_id in participants]
+        
+        try:
+            if mentions:
+                mention_text = " ".join(mentions)
+                await channel.send(content=f"Erinnerung für: {mention_text}", embed=embed)
+            else:
+                await channel.send(embed=embed)
+        except discord.HTTPException as e:
+            logger.error(f"Fehler beim Senden der Erinnerung für Event {event_id}: {e}")
     
     # Event-Befehle
     @commands.group(name="event", aliases=["events"], invoke_without_command=True)
@@ -165,11 +568,13 @@ class EventPlanner(commands.Cog):
     
     @event_cmd.command(name="create")
     @is_admin()
-    async def create_event(self, ctx, title: str, date: str, time: str, *, description: str = "Keine Beschreibung"):
+    async def create_event(self, ctx, title: str, date: str,
+                           start_clock: str = commands.parameter(displayed_name="time"), *,
+                           description: str = "Keine Beschreibung"):
         """Erstellt ein neues Event"""
         try:
             # Parsen des Datums und der Zeit
-            event_datetime_str = f"{date} {time}"
+            event_datetime_str = f"{date} {start_clock}"
             event_datetime = datetime.datetime.strptime(event_datetime_str, "%Y-%m-%d %H:%M")
             event_datetime = self.timezone.localize(event_datetime)
             
@@ -185,7 +590,7 @@ class EventPlanner(commands.Cog):
             INSERT INTO events 
             (guild_id, channel_id, creator_id, title, description, start_time, end_time) 
             VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (str(ctx.guild.id), str(ctx.channel.id), str(ctx.author.id), title, description, 
+            ''', (ctx.guild.id, ctx.channel.id, ctx.author.id, title, description, 
                   event_datetime.isoformat(), end_datetime.isoformat()))
             
             # Die gerade erstellte Event-ID abrufen
@@ -193,10 +598,14 @@ class EventPlanner(commands.Cog):
             SELECT event_id FROM events 
             WHERE guild_id = ? AND creator_id = ? AND title = ? 
             ORDER BY created_at DESC LIMIT 1
-            ''', (str(ctx.guild.id), str(ctx.author.id), title))
+            ''', (ctx.guild.id, ctx.author.id, title))
             
             event_id = event_id_result[0] if event_id_result else 0
             
+            # Erinnerungen mit den Standard-Abständen anlegen und einplanen
+            await self.db.q.add_event_reminder.many([(event_id, offset) for offset in EVENT_REMINDER_OFFSETS])
+            await self.schedule_reminders(event_id, event_datetime.isoformat(), EVENT_REMINDER_OFFSETS)
+            
             # Erstelle auch ein Discord-Event
             try:
                 # Finde die richtigen Enums
@@ -219,11 +628,11 @@ class EventPlanner(commands.Cog):
                 # Speichere Discord Event ID in der Datenbank
                 await self.db.execute('''
                 UPDATE events SET discord_event_id = ? WHERE event_id = ?
-                ''', (str(discord_event.id), event_id))
+                ''', (discord_event.id, event_id))
                 
                 discord_event_info = f"Discord-Event wurde erstellt! [Zum Event](<https://discord.com/events/{ctx.guild.id}/{discord_event.id}>)"
             except Exception as e:
-                print(f"Fehler beim Erstellen des Discord-Events: {e}")
+                logger.error(f"Fehler beim Erstellen des Discord-Events: {e}")
                 discord_event_info = f"Discord-Event konnte nicht erstellt werden. Fehler: {e}"
             
             # Event-Nachricht erstellen und senden
@@ -237,6 +646,7 @@ class EventPlanner(commands.Cog):
             )
             
             event_message = await ctx.send(embed=embed)
+            await self.register_event_message(event_message, event_id, announcement=True)
             
             # Reaktionen hinzufügen für Teilnahme
             await event_message.add_reaction("✅")  # Zusagen
@@ -261,7 +671,7 @@ class EventPlanner(commands.Cog):
         # Überprüfe, ob das Event existiert
         event = await self.db.fetch_one('''
         SELECT * FROM events WHERE event_id = ? AND guild_id = ?
-        ''', (event_id, str(ctx.guild.id)))
+        ''', (event_id, ctx.guild.id))
         
         if not event:
             return await ctx.send("❌ Event wurde nicht gefunden!")
@@ -300,6 +710,7 @@ class EventPlanner(commands.Cog):
                 await self.db.execute('''
                 UPDATE events SET start_time = ? WHERE event_id = ?
                 ''', (new_datetime.isoformat(), event_id))
+                await self.reschedule_reminders(event_id)
                 await ctx.send(f"✅ Datum des Events wurde zu **{new_value}** geändert.")
             
             elif parameter == "time":
@@ -323,6 +734,7 @@ class EventPlanner(commands.Cog):
                 await self.db.execute('''
                 UPDATE events SET start_time = ? WHERE event_id = ?
                 ''', (new_datetime.isoformat(), event_id))
+                await self.reschedule_reminders(event_id)
                 await ctx.send(f"✅ Zeit des Events wurde zu **{new_value}** geändert.")
             
             elif parameter == "location":
@@ -351,6 +763,7 @@ class EventPlanner(commands.Cog):
                 return
             
             # Aktualisiere die Event-Anzeige
+            self.rosters.invalidate(event_id)
             await self.show_event(ctx, event_id)
             
             # Discord-Event aktualisieren
@@ -372,7 +785,7 @@ class EventPlanner(commands.Cog):
                         
                         # Suche das Discord-Event
                         for scheduled_event in await ctx.guild.fetch_scheduled_events():
-                            if str(scheduled_event.id) == discord_event_id[0]:
+                            if scheduled_event.id == discord_event_id[0]:
                                 # Aktualisiere je nach bearbeitetem Parameter
                                 if parameter == "title":
                                     await scheduled_event.edit(name=new_value)
@@ -384,7 +797,7 @@ class EventPlanner(commands.Cog):
                                     await scheduled_event.edit(location=new_value)
                                 break
                 except Exception as e:
-                    print(f"Fehler beim Aktualisieren des Discord-Events: {e}")
+                    logger.error(f"Fehler beim Aktualisieren des Discord-Events: {e}")
         
         except Exception as e:
             await ctx.send(f"❌ Fehler beim Bearbeiten des Events: {e}")
@@ -394,11 +807,11 @@ class EventPlanner(commands.Cog):
     async def delete_event(self, ctx, event_id: int):
         """Löscht ein Event"""
         try:
-            # Prüfe, ob das Event existiert und prüfe beide Formate für guild_id
+            # Prüfe, ob das Event existiert
             event = await self.db.fetch_one('''
             SELECT event_id, discord_event_id FROM events 
-            WHERE event_id = ? AND (guild_id = ? OR guild_id = ?)
-            ''', (event_id, str(ctx.guild.id), int(ctx.guild.id)))
+            WHERE event_id = ? AND guild_id = ?
+            ''', (event_id, ctx.guild.id))
             
             if not event:
                 # Versuche herauszufinden, ob das Event überhaupt existiert
@@ -412,12 +825,16 @@ class EventPlanner(commands.Cog):
             # Lösche das Event aus der Datenbank
             await self.db.execute('DELETE FROM events WHERE event_id = ?', (event_id,))
             await self.db.execute('DELETE FROM event_participants WHERE event_id = ?', (event_id,))
+            await self.forget_event(event_id)
+            self.rosters.invalidate(event_id)
+            await self.db.q.clear_event_reminders(event_id)
+            self.cancel_reminders(event_id)
             
             # Versuche, das Discord-Event zu löschen (falls vorhanden)
             discord_event_id = event[1]
             if discord_event_id:
                 try:
-                    scheduled_event = await ctx.guild.fetch_scheduled_event(int(discord_event_id))
+                    scheduled_event = await ctx.guild.fetch_scheduled_event(discord_event_id)
                     if scheduled_event:
                         await scheduled_event.delete()
                         await ctx.send(f"✅ Event mit ID {event_id} und zugehöriges Discord-Event wurden gelöscht!")
@@ -431,82 +848,60 @@ class EventPlanner(commands.Cog):
         except Exception as e:
             await ctx.send(f"❌ Fehler beim Löschen des Events: {e}")
     
-    @event_cmd.command(name="show", aliases=["info"])
-    async def show_event(self, ctx, event_id: int):
-        """Zeigt Details zu einem Event an"""
-        # Event-Details abrufen
-        event = await self.db.fetch_one('''
-        SELECT event_id, guild_id, creator_id, title, description, location, start_time, end_time, max_participants
-        FROM events WHERE event_id = ? AND guild_id = ?
-        ''', (event_id, str(ctx.guild.id)))
+    @event_cmd.command(name="reminders", aliases=["erinnerungen"])
+    @is_admin()
+    async def event_reminders(self, ctx, event_id: int, *offsets: str):
+        """Zeigt oder setzt die Erinnerungen eines Events
         
-        if not event:
+        Abstände vor Beginn in Tagen (d), Stunden (h) oder Minuten (m)
+        Beispiel: !event reminders 1 24h 1h 10m
+        """
+        event = await self.db.q.reminder_event(event_id)
+        if not event or event.guild_id != ctx.guild.id:
             return await ctx.send("❌ Event wurde nicht gefunden!")
         
-        event_id, guild_id, creator_id, title, description, location, start_time, end_time, max_participants = event
-        
-        # Ersteller des Events ermitteln
-        creator = ctx.guild.get_member(int(creator_id))
-        creator_name = creator.display_name if creator else "Unbekannt"
-        
-        # Teilnehmer abrufen
-        participants = await self.db.fetch_all('''
-        SELECT user_id, status FROM event_participants WHERE event_id = ?
-        ''', (event_id,))
-        
-        # Event-Embed erstellen
-        embed = self.create_event_embed(
-            title=title,
-            description=description,
-            start_time=datetime.datetime.fromisoformat(start_time),
-            end_time=datetime.datetime.fromisoformat(end_time) if end_time else None,
-            location=location,
-            creator_name=creator_name,
-            max_participants=max_participants,
-            event_id=event_id
-        )
-        
-        # Teilnehmerlisten erstellen
-        accepted = []
-        declined = []
-        maybe = []
-        
-        for participant in participants:
-            user_id, status = participant
-            member = ctx.guild.get_member(int(user_id))
-            if not member:
-                continue
+        if offsets:
+            try:
+                minutes = sorted({parse_reminder_offset(offset) for offset in offsets}, reverse=True)
+            except ValueError:
+                return await ctx.send("❌ Ungültiger Abstand! Beispiel: `!event reminders 1 24h 1h 10m`")
             
-            if status == "accepted":
-                accepted.append(member.display_name)
-            elif status == "declined":
-                declined.append(member.display_name)
-            elif status == "maybe":
-                maybe.append(member.display_name)
+            async with self.db.transaction() as tx:
+                await tx.execute("DELETE FROM event_reminders WHERE event_id = ?", (event_id,))
+                await tx.executemany(
+                    "INSERT INTO event_reminders (event_id, offset_minutes, sent) VALUES (?, ?, FALSE)",
+                    [(event_id, offset) for offset in minutes])
+            await self.schedule_reminders(event_id, event.start_time, minutes)
         
-        # Teilnehmerlisten dem Embed hinzufügen
-        if accepted:
-            embed.add_field(
-                name=f"✅ Zusagen ({len(accepted)})",
-                value="\n".join(accepted[:10]) + (f"\n... und {len(accepted) - 10} weitere" if len(accepted) > 10 else ""),
-                inline=True
-            )
+        rows = await self.db.q.event_reminder_offsets(event_id)
+        if not rows:
+            return await ctx.send(f"⏰ Für das Event **{event.title}** sind keine Erinnerungen eingestellt.")
         
-        if declined:
-            embed.add_field(
-                name=f"❌ Absagen ({len(declined)})",
-                value="\n".join(declined[:10]) + (f"\n... und {len(declined) - 10} weitere" if len(declined) > 10 else ""),
-                inline=True
-            )
+        lines = []
+        for row in rows:
+            due = self.reminders.due_at((event_id, row.offset_minutes))
+            if row.sent:
+                state = "gesendet"
+            elif due:
+                state = f"<t:{int(due)}:R>"
+            else:
+                state = "entfällt"
+            lines.append(f"`{format_reminder_offset(row.offset_minutes)}` vorher: {state}")
+        await ctx.send(f"⏰ Erinnerungen für **{event.title}**:\n" + "\n".join(lines))
+    
+    @event_cmd.command(name="show", aliases=["info"])
+    async def show_event(self, ctx, event_id: int):
+        """Zeigt Details zu einem Event an"""
+        # Event-Details und Teilnehmer abrufen
+        roster = await self.rosters.get(event_id)
         
-        if maybe:
-            embed.add_field(
-                name=f"❓ Vielleicht ({len(maybe)})",
-                value="\n".join(maybe[:10]) + (f"\n... und {len(maybe) - 10} weitere" if len(maybe) > 10 else ""),
-                inline=True
-            )
+        if not roster or roster.event.guild_id != ctx.guild.id:
+            return await ctx.send("❌ Event wurde nicht gefunden!")
+        
+        embed = self.render_event_embed(ctx.guild, event_id, roster)
         
         message = await ctx.send(embed=embed)
+        await self.register_event_message(message, event_id)
         
         # Reaktionen hinzufügen für Teilnahme
         await message.add_reaction("✅")  # Zusagen
@@ -518,12 +913,7 @@ class EventPlanner(commands.Cog):
         """Listet alle aktiven Events auf"""
         # Aktuelle Events abrufen (die noch nicht vorbei sind)
         now = datetime.datetime.now(self.timezone).isoformat()
-        events = await self.db.fetch_all('''
-        SELECT event_id, title, start_time, creator_id
-        FROM events 
-        WHERE guild_id = ? AND start_time >= ?
-        ORDER BY start_time ASC
-        ''', (str(ctx.guild.id), now))
+        events = await self.db.q.upcoming_events(ctx.guild, now)
         
         if not events:
             return await ctx.send("📅 Es sind keine aktiven Events geplant.")
@@ -535,21 +925,14 @@ class EventPlanner(commands.Cog):
         )
         
         for event in events:
-            event_id, title, start_time, creator_id = event
-            creator = ctx.guild.get_member(int(creator_id))
+            # Die Zusagen zählt die Datenbank mit (events.accepted_count)
+            event_id, title, start_time, creator_id, count = event
+            creator = ctx.guild.get_member(creator_id)
             creator_name = creator.display_name if creator else "Unbekannt"
             
             start_time_dt = datetime.datetime.fromisoformat(start_time)
             timestamp = int(start_time_dt.timestamp())
             
-            # Teilnehmer zählen
-            participants_count = await self.db.fetch_one('''
-            SELECT COUNT(*) FROM event_participants 
-            WHERE event_id = ? AND status = 'accepted'
-            ''', (event_id,))
-            
-            count = participants_count[0] if participants_count else 0
-            
             embed.add_field(
                 name=f"ID {event_id}: {title}",
                 value=f"📆 <t:{timestamp}:F>\n"
@@ -581,7 +964,7 @@ class EventPlanner(commands.Cog):
         # Überprüfe, ob das Event existiert
         event = await self.db.fetch_one('''
         SELECT title, max_participants FROM events WHERE event_id = ? AND guild_id = ?
-        ''', (event_id, str(ctx.guild.id)))
+        ''', (event_id, ctx.guild.id))
         
         if not event:
             return await ctx.send("❌ Event wurde nicht gefunden!")
@@ -590,19 +973,14 @@ class EventPlanner(commands.Cog):
         
         # Überprüfe, ob das Event voll ist (nur für Zusagen)
         if status == "accepted" and max_participants > 0:
-            current_participants = await self.db.fetch_one('''
-            SELECT COUNT(*) FROM event_participants 
-            WHERE event_id = ? AND status = 'accepted'
-            ''', (event_id,))
+            accepted = await self.db.q.accepted_count(event_id) or 0
             
-            if current_participants and current_participants[0] >= max_participants:
+            if accepted >= max_participants:
                 return await ctx.send(f"❌ Das Event **{title}** ist bereits voll!")
         
         # Aktualisiere oder füge Teilnahme hinzu
-        await self.db.execute('''
-        INSERT OR REPLACE INTO event_participants (event_id, user_id, status)
-        VALUES (?, ?, ?)
-        ''', (event_id, str(ctx.author.id), status))
+        await self.db.q.set_participation(event_id, ctx.author, status)
+        self.rosters.invalidate(event_id)
         
         status_text = {
             "accepted": "zugesagt",
@@ -612,13 +990,16 @@ class EventPlanner(commands.Cog):
         
         await ctx.send(f"✅ Du hast für das Event **{title}** {status_text[status]}.")
         
-        # Aktualisiere die Event-Anzeige
+        # Aktualisiere die Event-Anzeige (die Ankündigung beim nächsten Flush)
+        self.refresher.mark(ctx.guild, event_id)
         await self.show_event(ctx, event_id)
     
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload):
         """Reagiert auf Reaktionen bei Event-Nachrichten"""
-        if payload.user_id == self.bot.user.id:
+        # Reaktionen auf andere Nachrichten kosten nur diesen Lookup
+        event_id = self.event_messages.get(payload.message_id)
+        if event_id is None or payload.user_id == self.bot.user.id:
             return
         
         channel = self.bot.get_channel(payload.channel_id)
@@ -626,177 +1007,111 @@ class EventPlanner(commands.Cog):
             return
         
         try:
-            message = await channel.fetch_message(payload.message_id)
-            if not message.embeds or not message.embeds[0].title or not message.embeds[0].footer.text:
-                return
-            
-            # Überprüfe, ob es sich um eine Event-Nachricht handelt
-            footer_text = message.embeds[0].footer.text
-            if not "Event ID:" in footer_text:
-                return
+            # Entferne die Reaktion des Benutzers (ohne die Nachricht zu laden)
+            message = channel.get_partial_message(payload.message_id)
+            await message.remove_reaction(payload.emoji, discord.Object(id=payload.user_id))
             
-            # Extrahiere die Event-ID (sicherer Ansatz)
-            try:
-                event_id_part = footer_text.split("Event ID:")[1].split("|")[0].strip()
-                event_id = int(event_id_part)
-            except (IndexError, ValueError):
-                print(f"❌ Konnte Event-ID nicht aus Footer extrahieren: '{footer_text}'")
-                return
-            
-            # Überprüfe, ob das Event existiert
-            event = await self.db.fetch_one('''
-            SELECT title FROM events WHERE event_id = ?
-            ''', (event_id,))
-            
-            if not event:
+            # Verarbeite die Reaktion
+            status = RSVP_REACTIONS.get(str(payload.emoji))
+            if status is None:
                 return
             
-            # Entferne die Reaktion des Benutzers
-            user = self.bot.get_user(payload.user_id)
-            if user:
-                await message.remove_reaction(payload.emoji, user)
-            
-            # Verarbeite die Reaktion
             guild = self.bot.get_guild(payload.guild_id)
-            member = guild.get_member(payload.user_id)
-            
-            if str(payload.emoji) == "✅":
-                await self.update_participation_by_reaction(guild, member, event_id, "accepted")
-            elif str(payload.emoji) == "❌":
-                await self.update_participation_by_reaction(guild, member, event_id, "declined")
-            elif str(payload.emoji) == "❓":
-                await self.update_participation_by_reaction(guild, member, event_id, "maybe")
+            member = payload.member or guild.get_member(payload.user_id)
+            if member:
+                # Schreiben, Benachrichtigen und Neuzeichnen übernimmt der nächste Flush
+                self.refresher.submit(guild, member, event_id, status, message)
         
         except Exception as e:
-            print(f"Fehler bei der Verarbeitung der Reaktion: {e}")
+            logger.error(f"Fehler bei der Verarbeitung der Reaktion: {e}")
     
-    async def update_participation_by_reaction(self, guild, member, event_id, status):
-        """Aktualisiert den Teilnahmestatus eines Benutzers via Reaktion"""
-        if not member:
-            return
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        """Entfernt gelöschte Event-Nachrichten aus dem Index"""
+        if self.event_messages.pop(payload.message_id, None) is not None:
+            await self.db.q.forget_event_message(payload.message_id)
+    
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload):
+        """Entfernt per Sammel-Löschung entfernte Event-Nachrichten aus dem Index"""
+        deleted = [(mid,) for mid in payload.message_ids if self.event_messages.pop(mid, None) is not None]
+        if deleted:
+            await self.db.q.forget_event_message.many(deleted)
+    
+    async def edit_event_messages(self, guild, event_id: int, roster: EventRoster, sources=()):
+        """Bearbeitet die Ankündigung eines Events (und die Nachrichten ``sources``) direkt
+
+        Die Nachrichten werden nicht geladen, sondern als PartialMessage über
+        ihre gespeicherte ID bearbeitet.
+        """
+        event = roster.event
+        embed = self.render_event_embed(guild, event_id, roster)
         
-        # Überprüfe, ob das Event existiert
-        event = await self.db.fetch_one('''
-        SELECT title, max_participants, channel_id FROM events WHERE event_id = ?
-        ''', (event_id,))
+        targets = {source.id: source for source in sources}
+        if event.message_id and event.message_id not in targets:
+            channel = guild.get_channel(event.channel_id)
+            if channel:
+                targets[event.message_id] = channel.get_partial_message(event.message_id)
         
-        if not event:
-            return
+        for message in targets.values():
+            try:
+                await message.edit(embed=embed)
+                self.refresher.edits += 1
+            except discord.NotFound:
+                # Nachricht wurde gelöscht: aus Index und Event austragen
+                if self.event_messages.pop(message.id, None) is not None:
+                    await self.db.q.forget_event_message(message.id)
+                if message.id == event.message_id:
+                    await self.db.q.set_event_message(None, event_id)
+                    self.rosters.invalidate(event_id)
+            except discord.HTTPException as e:
+                logger.error(f"Fehler beim Aktualisieren der Event-Nachricht {message.id}: {e}")
+    
+    def render_event_embed(self, guild, event_id: int, roster: EventRoster) -> discord.Embed:
+        """Erstellt das Event-Embed samt Teilnehmerlisten aus dem Roster-Cache"""
+        event = roster.event
+        creator = guild.get_member(event.creator_id)
+        creator_name = creator.display_name if creator else "Unbekannt"
         
-        title, max_participants, channel_id = event
-        channel = guild.get_channel(int(channel_id))
+        embed = self.create_event_embed(
+            title=event.title,
+            description=event.description,
+            start_time=datetime.datetime.fromisoformat(event.start_time),
+            end_time=datetime.datetime.fromisoformat(event.end_time) if event.end_time else None,
+            location=event.location,
+            creator_name=creator_name,
+            max_participants=event.max_participants,
+            event_id=event_id
+        )
         
-        # Überprüfe, ob das Event voll ist (nur für Zusagen)
-        if status == "accepted" and max_participants > 0:
-            current_participants = await self.db.fetch_one('''
-            SELECT COUNT(*) FROM event_participants 
-            WHERE event_id = ? AND status = 'accepted' AND user_id != ?
-            ''', (event_id, str(member.id)))
-            
-            if current_participants and current_participants[0] >= max_participants:
-                try:
-                    await member.send(f"❌ Das Event **{title}** auf **{guild.name}** ist bereits voll!")
-                except:
-                    if channel:
-                        await channel.send(f"{member.mention}, das Event **{title}** ist bereits voll!")
-                return
+        names = roster.names(guild)
+        accepted = names["accepted"]
+        declined = names["declined"]
+        maybe = names["maybe"]
         
-        # Aktualisiere oder füge Teilnahme hinzu
-        await self.db.execute('''
-        INSERT OR REPLACE INTO event_participants (event_id, user_id, status)
-        VALUES (?, ?, ?)
-        ''', (event_id, str(member.id), status))
+        # Teilnehmerlisten dem Embed hinzufügen
+        if accepted:
+            embed.add_field(
+                name=f"✅ Zusagen ({len(accepted)})",
+                value="\n".join(accepted[:10]) + (f"\n... und {len(accepted) - 10} weitere" if len(accepted) > 10 else ""),
+                inline=True
+            )
         
-        status_text = {
-            "accepted": "zugesagt zu",
-            "declined": "abgesagt für",
-            "maybe": "dich als unsicher markiert für"
-        }
+        if declined:
+            embed.add_field(
+                name=f"❌ Absagen ({len(declined)})",
+                value="\n".join(declined[:10]) + (f"\n... und {len(declined) - 10} weitere" if len(declined) > 10 else ""),
+                inline=True
+            )
         
-        try:
-            await member.send(f"✅ Du hast {status_text[status]} dem Event **{title}** auf **{guild.name}**.")
-        except:
-            pass
-        
-        # Aktualisiere die Event-Nachricht, falls der Kanal noch existiert
-        if channel:
-            # Erzeuge und sende ein aktualisiertes Embed
-            event_details = await self.db.fetch_one('''
-            SELECT creator_id, title, description, location, start_time, end_time, max_participants
-            FROM events WHERE event_id = ?
-            ''', (event_id,))
-            
-            if not event_details:
-                return
-            
-            creator_id, title, description, location, start_time, end_time, max_participants = event_details
-            
-            # Suche nach der letzten Event-Nachricht im Kanal
-            async for message in channel.history(limit=50):
-                if message.author == self.bot.user and message.embeds:
-                    for embed in message.embeds:
-                        if embed.footer.text == f"Event ID: {event_id}":
-                            # Update this message
-                            creator = guild.get_member(int(creator_id))
-                            creator_name = creator.display_name if creator else "Unbekannt"
-                            
-                            new_embed = self.create_event_embed(
-                                title=title,
-                                description=description,
-                                start_time=datetime.datetime.fromisoformat(start_time),
-                                end_time=datetime.datetime.fromisoformat(end_time) if end_time else None,
-                                location=location,
-                                creator_name=creator_name,
-                                max_participants=max_participants,
-                                event_id=event_id
-                            )
-                            
-                            # Teilnehmerlisten erstellen
-                            participants = await self.db.fetch_all('''
-                            SELECT user_id, status FROM event_participants WHERE event_id = ?
-                            ''', (event_id,))
-                            
-                            accepted = []
-                            declined = []
-                            maybe = []
-                            
-                            for participant in participants:
-                                user_id, p_status = participant
-                                p_member = guild.get_member(int(user_id))
-                                if not p_member:
-                                    continue
-                                
-                                if p_status == "accepted":
-                                    accepted.append(p_member.display_name)
-                                elif p_status == "declined":
-                                    declined.append(p_member.display_name)
-                                elif p_status == "maybe":
-                                    maybe.append(p_member.display_name)
-                            
-                            # Teilnehmerlisten dem Embed hinzufügen
-                            if accepted:
-                                new_embed.add_field(
-                                    name=f"✅ Zusagen ({len(accepted)})",
-                                    value="\n".join(accepted[:10]) + (f"\n... und {len(accepted) - 10} weitere" if len(accepted) > 10 else ""),
-                                    inline=True
-                                )
-                            
-                            if declined:
-                                new_embed.add_field(
-                                    name=f"❌ Absagen ({len(declined)})",
-                                    value="\n".join(declined[:10]) + (f"\n... und {len(declined) - 10} weitere" if len(declined) > 10 else ""),
-                                    inline=True
-                                )
-                            
-                            if maybe:
-                                new_embed.add_field(
-                                    name=f"❓ Vielleicht ({len(maybe)})",
-                                    value="\n".join(maybe[:10]) + (f"\n... und {len(maybe) - 10} weitere" if len(maybe) > 10 else ""),
-                                    inline=True
-                                )
-                            
-                            await message.edit(embed=new_embed)
-                            return
+        if maybe:
+            embed.add_field(
+                name=f"❓ Vielleicht ({len(maybe)})",
+                value="\n".join(maybe[:10]) + (f"\n... und {len(maybe) - 10} weitere" if len(maybe) > 10 else ""),
+                inline=True
+            )
+        
+        return embed
     
     def create_event_embed(self, title, description, start_time, creator=None, creator_name=None, 
                           end_time=None, location=None, max_participants=0, event_id=None):
@@ -854,41 +1169,22 @@ class EventPlanner(commands.Cog):
     @event_cmd.command(name="participants", aliases=["teilnehmer"])
     async def list_participants(self, ctx, event_id: int):
         """Zeigt nur die Teilnehmerliste eines Events an"""
-        # Event-Details abrufen
-        event = await self.db.fetch_one('''
-        SELECT title FROM events WHERE event_id = ? AND guild_id = ?
-        ''', (event_id, str(ctx.guild.id)))
+        # Event-Details und Teilnehmer aus dem Roster-Cache
+        roster = await self.rosters.get(event_id)
         
-        if not event:
+        if not roster or roster.event.guild_id != ctx.guild.id:
             return await ctx.send("❌ Event wurde nicht gefunden!")
         
-        title = event[0]
+        title = roster.event.title
         
-        # Teilnehmer abrufen
-        participants = await self.db.fetch_all('''
-        SELECT user_id, status FROM event_participants WHERE event_id = ?
-        ''', (event_id,))
-        
-        if not participants:
+        if not roster.has_participants():
             return await ctx.send(f"📋 Für das Event **{title}** (ID: {event_id}) haben sich noch keine Teilnehmer angemeldet.")
         
-        # Teilnehmer nach Status sortieren
-        accepted = []
-        declined = []
-        maybe = []
-        
-        for participant in participants:
-            user_id, status = participant
-            member = ctx.guild.get_member(int(user_id))
-            if not member:
-                continue
-            
-            if status == "accepted":
-                accepted.append(member.display_name)
-            elif status == "declined":
-                declined.append(member.display_name)
-            elif status == "maybe":
-                maybe.append(member.display_name)
+        # Teilnehmer nach Status sortiert
+        names = roster.names(ctx.guild)
+        accepted = names["accepted"]
+        declined = names["declined"]
+        maybe = names["maybe"]
         
         # Embed erstellen
         embed = discord.Embed(
@@ -935,7 +1231,26 @@ class EventPlanner(commands.Cog):
             all_events = await self.db.fetch_all("SELECT event_id, guild_id, title, discord_event_id FROM events")
             
             debug_info = f"**Datenbank-Debug:**\n"
-            debug_info += f"Datenbankpfad: {db_path}\n\n"
+            debug_info += f"Datenbankpfad: {db_path}\n"
+            
+            # Verbindungspool-Statistiken
+            stats = self.db.stats()
+            debug_info += (f"Pool: {stats['readers']} Leser ({stats['idle_readers']} frei), 1 Schreiber | "
+                           f"Wartezeit Ø Lesen {stats['reader_wait_avg_ms']:.2f} ms, "
+                           f"Ø Schreiben {stats['writer_wait_avg_ms']:.2f} ms\n")
+            
+            # Konfigurations-Caches (Treffer/Fehlgriffe pro Tabelle)
+            for table, cache in cache_stats().items():
+                debug_info += f"Cache {table}: {cache['rows']} Server, {cache['hits']} Treffer, {cache['misses']} Fehlgriffe\n"
+            refresher = self.refresher
+            debug_info += (f"Teilnehmerlisten: {len(self.rosters)} im Cache, {self.rosters.hits} Treffer, "
+                           f"{self.rosters.misses} Fehlgriffe\n")
+            debug_info += (f"Event-Refresh: {refresher.flushes} Flushes, {refresher.rsvps_written} Teilnahmen geschrieben, "
+                           f"{refresher.edits} Bearbeitungen, {refresher.pending()} ausstehend\n")
+            next_due = self.reminders.next_due()
+            debug_info += (f"Erinnerungen: {len(self.reminders)} geplant, {self.reminders.fired} gesendet"
+                           + (f", nächste <t:{int(next_due)}:R>" if next_due else "") + "\n")
+            debug_info += "\n"
             
             debug_info += f"**Alle Events ({len(all_events)}):**\n"
             for event in all_events:
@@ -944,7 +1259,7 @@ class EventPlanner(commands.Cog):
             # Nach Guild-ID filtern
             filtered_events = await self.db.fetch_all(
                 "SELECT event_id, guild_id FROM events WHERE guild_id = ?", 
-                (str(ctx.guild.id),)
+                (ctx.guild.id,)
             )
             
             debug_info += f"\n**Events mit guild_id {ctx.guild.id} ({len(filtered_events)}):**\n"
@@ -969,43 +1284,4 @@ class EventPlanner(commands.Cog):
             await ctx.send(f"Fehler beim Debugging: {e}")
 
 async def setup(bot):
-    # Erst die Datenbank initialisieren
-    event_db = Database()
-    
-    # Erstelle die Tabellen für den Eventplaner
-    try:
-        await event_db.execute('''
-        CREATE TABLE IF NOT EXISTS events (
-            event_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            guild_id INTEGER NOT NULL,
-            channel_id INTEGER NOT NULL,
-            creator_id INTEGER NOT NULL,
-            title TEXT NOT NULL,
-            description TEXT,
-            location TEXT,
-            start_time TIMESTAMP NOT NULL,
-            end_time TIMESTAMP,
-            max_participants INTEGER DEFAULT 0,
-            reminder_sent BOOLEAN DEFAULT FALSE,
-            discord_event_id TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
-        
-        await event_db.execute('''
-        CREATE TABLE IF NOT EXISTS event_participants (
-            event_id INTEGER,
-            user_id INTEGER,
-            status TEXT NOT NULL,
-            joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (event_id, user_id),
-            FOREIGN KEY (event_id) REFERENCES events (event_id) ON DELETE CASCADE
-        )
-        ''')
-        
-        print("✅ Eventplaner-Datenbanktabellen initialisiert")
-    except Exception as e:
-        print(f"❌ Fehler beim Initialisieren der Eventplaner-Datenbank: {e}")
-    
-    # Jetzt können wir den Cog hinzufügen
-    await bot.add_cog(EventPlanner(bot)) 
\ No newline at end of file
+    await bot.add_cog(EventPlanner(bot))
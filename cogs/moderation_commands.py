@@ -1,41 +1,40 @@
+import logging
 import discord
 from discord.ext import commands
 import datetime
 import asyncio
-from utils.db import init_db, DB_PATH
-import aiosqlite
-import json
-from utils.automod import AutoMod
+from utils.db import Database
+from utils.automod import get_automod
 from utils.mod_logger import ModLogger
 from discord.ext.commands import MemberNotFound, BadArgument
 import re
 from utils.permissions import is_admin
 
+logger = logging.getLogger(__name__)
+
 class ModerationCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.automod = AutoMod(bot)
+        self.automod = get_automod(bot)
         self.logger = ModLogger(bot)
+        self.db = Database()
         
     async def cog_load(self):
         """Wird beim Laden der Cog ausgeführt"""
         try:
-            # Initialisiere zuerst die Datenbank
-            await init_db()
-            # Dann lade die Mod-Channels
+            # Lade die Mod-Channels
             await self.logger.load_mod_channels()
-            # Initialisiere AutoMod
+            # Initialisiere AutoMod (gemeinsame Instanz, lädt nur beim ersten Mal)
             await self.automod.setup(self.bot)
         except Exception as e:
-            print(f"Fehler beim Initialisieren der Moderation: {e}")
+            logger.error(f"Fehler beim Initialisieren der Moderation: {e}")
 
     @commands.command()
     @is_admin()
     async def setlogchannel(self, ctx, channel: discord.TextChannel = None):
         """Setzt den Logging-Kanal"""
         channel = channel or ctx.channel
-        self.logger.log_channels[ctx.guild.id] = channel.id
-        self.logger.save_log_channels()
+        await self.logger.set_mod_channel(ctx.guild.id, channel.id)
         await ctx.send(f"Logging-Kanal wurde auf {channel.mention} gesetzt!")
 
     @commands.command()
@@ -56,13 +55,11 @@ class ModerationCommands(commands.Cog):
 
         try:
             # Speichere Verwarnung in der Datenbank
-            async with aiosqlite.connect(DB_PATH) as db:
-                await db.execute('''
-                    INSERT INTO warnings 
-                    (user_id, user_name, guild_id, reason, moderator_id, moderator_name)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (member.id, str(member), ctx.guild.id, reason, ctx.author.id, str(ctx.author)))
-                await db.commit()
+            await self.db.execute('''
+                INSERT INTO warnings 
+                (user_id, user_name, guild_id, reason, moderator_id, moderator_name)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (member.id, str(member), ctx.guild.id, reason, ctx.author.id, str(ctx.author)))
 
             # Benachrichtige den User
             try:
@@ -78,118 +75,100 @@ class ModerationCommands(commands.Cog):
                 await ctx.send("⚠️ Der User konnte nicht per DM benachrichtigt werden.")
 
             # Log die Aktion
-            async with aiosqlite.connect(DB_PATH) as db:
-                async with db.execute('SELECT COUNT(*) FROM warnings WHERE user_id = ? AND guild_id = ?', 
-                                    (member.id, ctx.guild.id)) as cursor:
-                    warning_count = (await cursor.fetchone())[0]
+            warning_count = await self.db.q.warning_count(member, ctx.guild) or 0
 
             # Sende Log-Nachricht
-            async with aiosqlite.connect(DB_PATH) as db:
-                async with db.execute('SELECT mod_log_channel_id FROM channel_config WHERE guild_id = ?', 
-                                    (ctx.guild.id,)) as cursor:
-                    row = await cursor.fetchone()
-                    if row and row[0]:
-                        log_channel = ctx.guild.get_channel(row[0])
-                        if log_channel:
-                            embed = discord.Embed(
-                                title="⚠️ Verwarnung ausgesprochen",
-                                color=discord.Color.yellow(),
-                                timestamp=datetime.datetime.now(datetime.timezone.utc)
-                            )
-                            embed.add_field(name="User", value=f"{member.mention} ({member.id})")
-                            embed.add_field(name="Moderator", value=f"{ctx.author.mention} ({ctx.author.id})")
-                            embed.add_field(name="Grund", value=reason, inline=False)
-                            embed.add_field(name="Verwarnungen", value=f"Dies ist Verwarnung #{warning_count}")
-                            await log_channel.send(embed=embed)
+            log_channel_id = await self.logger.get_mod_channel_id(ctx.guild.id)
+            if log_channel_id:
+                log_channel = ctx.guild.get_channel(log_channel_id)
+                if log_channel:
+                    embed = discord.Embed(
+                        title="⚠️ Verwarnung ausgesprochen",
+                        color=discord.Color.yellow(),
+                        timestamp=datetime.datetime.now(datetime.timezone.utc)
+                    )
+                    embed.add_field(name="User", value=f"{member.mention} ({member.id})")
+                    embed.add_field(name="Moderator", value=f"{ctx.author.mention} ({ctx.author.id})")
+                    embed.add_field(name="Grund", value=reason, inline=False)
+                    embed.add_field(name="Verwarnungen", value=f"Dies ist Verwarnung #{warning_count}")
+                    await log_channel.send(embed=embed)
 
             # Bestätige die Verwarnung
             await ctx.send(f"✅ {member.mention} wurde verwarnt! (Verwarnung #{warning_count})")
 
         except Exception as e:
-            print(f"Fehler beim Verwarnen: {e}")
+            logger.error(f"Fehler beim Verwarnen: {e}")
             await ctx.send("❌ Es ist ein Fehler aufgetreten!")
 
     @commands.command()
     @is_admin()
     async def warnings(self, ctx, user: discord.Member):
         """Zeigt alle Verwarnungen eines Users"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            async with db.execute('''
-                SELECT reason, moderator_name, timestamp 
-                FROM warnings 
-                WHERE user_id = ? AND guild_id = ?
-                ORDER BY timestamp DESC
-            ''', (user.id, ctx.guild.id)) as cursor:
-                warnings = await cursor.fetchall()
-
-            if not warnings:
-                await ctx.send(f"{user.mention} hat keine Verwarnungen.")
-                return
+        warnings = await self.db.q.warnings_for_user(user, ctx.guild)
 
-            embed = discord.Embed(
-                title=f"⚠️ Verwarnungen für {user.name}",
-                color=discord.Color.yellow()
-            )
+        if not warnings:
+            await ctx.send(f"{user.mention} hat keine Verwarnungen.")
+            return
 
-            for i, (reason, mod_name, timestamp) in enumerate(warnings, 1):
-                embed.add_field(
-                    name=f"Verwarnung {i} | {timestamp}",
-                    value=f"**Grund:** {reason or 'Kein Grund angegeben'}\n"
-                          f"**Moderator:** {mod_name}",
-                    inline=False
-                )
+        embed = discord.Embed(
+            title=f"⚠️ Verwarnungen für {user.name}",
+            color=discord.Color.yellow()
+        )
 
-            embed.set_footer(text=f"Insgesamt {len(warnings)} Verwarnung(en)")
-            await ctx.send(embed=embed)
+        for i, (reason, mod_name, timestamp) in enumerate(warnings, 1):
+            embed.add_field(
+                name=f"Verwarnung {i} | {timestamp}",
+                value=f"**Grund:** {reason or 'Kein Grund angegeben'}\n"
+                      f"**Moderator:** {mod_name}",
+                inline=False
+            )
+
+        embed.set_footer(text=f"Insgesamt {len(warnings)} Verwarnung(en)")
+        await ctx.send(embed=embed)
 
     @commands.command()
     @is_admin()
     async def delwarn(self, ctx, user: discord.Member, warn_id: int):
         """Löscht eine bestimmte Verwarnung eines Users"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            # Prüfe ob die Verwarnung existiert
-            async with db.execute('''
-                SELECT id FROM warnings 
-                WHERE user_id = ? AND guild_id = ?
-                ORDER BY timestamp DESC
-            ''', (user.id, ctx.guild.id)) as cursor:
-                warnings = await cursor.fetchall()
-                
-                if not warnings or warn_id > len(warnings):
-                    await ctx.send("❌ Diese Verwarnung existiert nicht!")
-                    return
-
-                # Lösche die Verwarnung
-                warning_db_id = warnings[warn_id - 1][0]
-                await db.execute('DELETE FROM warnings WHERE id = ?', (warning_db_id,))
-                await db.commit()
-
-            embed = discord.Embed(
-                title="✅ Verwarnung gelöscht",
-                description=f"Verwarnung {warn_id} wurde von {user.mention} entfernt.",
-                color=discord.Color.green()
-            )
-            await ctx.send(embed=embed)
+        # Prüfe ob die Verwarnung existiert
+        warnings = await self.db.fetch_all('''
+            SELECT id FROM warnings 
+            WHERE user_id = ? AND guild_id = ?
+            ORDER BY timestamp DESC
+        ''', (user.id, ctx.guild.id))
+
+        if not warnings or warn_id > len(warnings):
+            await ctx.send("❌ Diese Verwarnung existiert nicht!")
+            return
 
-            # Log die Aktion
-            await self.logger.log_mod_action(
-                ctx.guild,
-                "Verwarnung gelöscht",
-                user=user,
-                moderator=ctx.author,
-                content=f"Verwarnung {warn_id} wurde entfernt"
-            )
+        # Lösche die Verwarnung
+        warning_db_id = warnings[warn_id - 1][0]
+        await self.db.execute('DELETE FROM warnings WHERE id = ?', (warning_db_id,))
+
+        embed = discord.Embed(
+            title="✅ Verwarnung gelöscht",
+            description=f"Verwarnung {warn_id} wurde von {user.mention} entfernt.",
+            color=discord.Color.green()
+        )
+        await ctx.send(embed=embed)
+
+        # Log die Aktion
+        await self.logger.log_mod_action(
+            ctx.guild,
+            "Verwarnung gelöscht",
+            user=user,
+            moderator=ctx.author,
+            content=f"Verwarnung {warn_id} wurde entfernt"
+        )
 
     @commands.command()
     @is_admin()
     async def clearwarnings(self, ctx, member: discord.Member):
         """Löscht alle Verwarnungen eines Mitglieds"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute('''
-                DELETE FROM warnings 
-                WHERE user_id = ? AND guild_id = ?
-            ''', (member.id, ctx.guild.id))
-            await db.commit()
+        await self.db.execute('''
+            DELETE FROM warnings 
+            WHERE user_id = ? AND guild_id = ?
+        ''', (member.id, ctx.guild.id))
 
         await ctx.send(f"Alle Verwarnungen von {member.mention} wurden gelöscht.")
 
@@ -358,29 +337,27 @@ class ModerationCommands(commands.Cog):
             )
 
             # Speichere in Datenbank
-            async with aiosqlite.connect(DB_PATH) as db:
-                await db.execute('''
-                    INSERT INTO timeouts (
-                        user_id,
-                        user_name,
-                        guild_id,
-                        moderator_id,
-                        moderator_name,
-                        duration_minutes,
-                        reason,
-                        expires_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    member.id,
-                    f"{member.name}#{member.discriminator}",
-                    ctx.guild.id,
-                    ctx.author.id,
-                    f"{ctx.author.name}#{ctx.author.discriminator}",
+            await self.db.execute('''
+                INSERT INTO timeouts (
+                    user_id,
+                    user_name,
+                    guild_id,
+                    moderator_id,
+                    moderator_name,
                     duration_minutes,
                     reason,
-                    expires_at.isoformat()
-                ))
-                await db.commit()
+                    expires_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                member.id,
+                f"{member.name}#{member.discriminator}",
+                ctx.guild.id,
+                ctx.author.id,
+                f"{ctx.author.name}#{ctx.author.discriminator}",
+                duration_minutes,
+                reason,
+                expires_at.isoformat()
+            ))
 
         except ValueError:
             await ctx.send("❌ Die Dauer muss eine gültige Zahl sein!")
@@ -443,37 +420,29 @@ class ModerationCommands(commands.Cog):
             await member.kick(reason=reason)
 
             # Log-Nachricht senden
-            async with aiosqlite.connect(DB_PATH) as db:
-                async with db.execute('SELECT mod_log_channel_id FROM channel_config WHERE guild_id = ?', 
-                                    (ctx.guild.id,)) as cursor:
-                    row = await cursor.fetchone()
-                    if row and row[0]:
-                        log_channel = ctx.guild.get_channel(row[0])
-                        if log_channel:
-                            embed = discord.Embed(
-                                title="🚫 Mitglied gekickt",
-                                color=discord.Color.red(),
-                                timestamp=datetime.datetime.now(datetime.timezone.utc)
-                            )
-                            embed.add_field(name="User", value=f"{member} ({member.id})")
-                            embed.add_field(name="Moderator", value=f"{ctx.author.mention} ({ctx.author.id})")
-                            embed.add_field(name="Grund", value=reason, inline=False)
-                            
-                            # Verwarnungshistorie hinzufügen
-                            async with db.execute('''
-                                SELECT COUNT(*) 
-                                FROM warnings 
-                                WHERE user_id = ? AND guild_id = ?
-                            ''', (member.id, ctx.guild.id)) as warning_cursor:
-                                warning_count = (await warning_cursor.fetchone())[0]
-                                if warning_count > 0:
-                                    embed.add_field(
-                                        name="Verwarnungen", 
-                                        value=f"Der User hatte {warning_count} Verwarnung(en)",
-                                        inline=False
-                                    )
-                            
-                            await log_channel.send(embed=embed)
+            log_channel_id = await self.logger.get_mod_channel_id(ctx.guild.id)
+            if log_channel_id:
+                log_channel = ctx.guild.get_channel(log_channel_id)
+                if log_channel:
+                    embed = discord.Embed(
+                        title="🚫 Mitglied gekickt",
+                        color=discord.Color.red(),
+                        timestamp=datetime.datetime.now(datetime.timezone.utc)
+                    )
+                    embed.add_field(name="User", value=f"{member} ({member.id})")
+                    embed.add_field(name="Moderator", value=f"{ctx.author.mention} ({ctx.author.id})")
+                    embed.add_field(name="Grund", value=reason, inline=False)
+                    
+                    # Verwarnungshistorie hinzufügen
+                    warning_count = await self.db.q.warning_count(member, ctx.guild) or 0
+                    if warning_count > 0:
+                        embed.add_field(
+                            name="Verwarnungen", 
+                            value=f"Der User hatte {warning_count} Verwarnung(en)",
+                            inline=False
+                        )
+                    
+                    await log_channel.send(embed=embed)
 
             # Bestätigung senden
             await ctx.send(f"✅ {member} wurde vom Server gekickt!")
@@ -481,7 +450,7 @@ class ModerationCommands(commands.Cog):
         except discord.Forbidden:
             await ctx.send("❌ Ich habe keine Berechtigung, diesen User zu kicken!")
         except Exception as e:
-            print(f"Fehler beim Kicken: {e}")
+            logger.error(f"Fehler beim Kicken: {e}")
             await ctx.send("❌ Es ist ein Fehler aufgetreten!")
 
     @commands.command()
@@ -531,27 +500,25 @@ class ModerationCommands(commands.Cog):
             await member.ban(reason=reason)
 
             # Speichere in Datenbank
-            async with aiosqlite.connect(DB_PATH) as db:
-                await db.execute('''
-                    INSERT INTO bans (
-                        user_id,
-                        user_name,
-                        guild_id,
-                        moderator_id,
-                        moderator_name,
-                        reason,
-                        is_temporary
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    member.id,
-                    f"{member.name}#{member.discriminator}",
-                    ctx.guild.id,
-                    ctx.author.id,
-                    f"{ctx.author.name}#{ctx.author.discriminator}",
+            await self.db.execute('''
+                INSERT INTO bans (
+                    user_id,
+                    user_name,
+                    guild_id,
+                    moderator_id,
+                    moderator_name,
                     reason,
-                    False
-                ))
-                await db.commit()
+                    is_temporary
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                member.id,
+                f"{member.name}#{member.discriminator}",
+                ctx.guild.id,
+                ctx.author.id,
+                f"{ctx.author.name}#{ctx.author.discriminator}",
+                reason,
+                False
+            ))
 
             await ctx.send(embed=embed)
 
@@ -564,72 +531,47 @@ class ModerationCommands(commands.Cog):
     @is_admin()
     async def modlogs(self, ctx, user: discord.Member):
         """Zeigt alle Moderationsaktionen für einen User"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            embed = discord.Embed(
-                title=f"📋 Moderations-Log für {user.name}",
-                color=discord.Color.blue()
-            )
-
-            # Warnungen abrufen
-            async with db.execute('''
-                SELECT reason, moderator_name, timestamp 
-                FROM warnings 
-                WHERE user_id = ? AND guild_id = ?
-                ORDER BY timestamp DESC
-            ''', (user.id, ctx.guild.id)) as cursor:
-                warnings = await cursor.fetchall()
-                if warnings:
-                    warns_text = ""
-                    for reason, mod, time in warnings:
-                        warns_text += f"• {time} von {mod}: {reason or 'Kein Grund'}\n"
-                    embed.add_field(name="⚠️ Verwarnungen", value=warns_text, inline=False)
-
-            # Timeouts abrufen
-            async with db.execute('''
-                SELECT reason, moderator_name, duration_minutes, timestamp 
-                FROM timeouts 
-                WHERE user_id = ? AND guild_id = ?
-                ORDER BY timestamp DESC
-            ''', (user.id, ctx.guild.id)) as cursor:
-                timeouts = await cursor.fetchall()
-                if timeouts:
-                    timeouts_text = ""
-                    for reason, mod, duration, time in timeouts:
-                        timeouts_text += f"• {time} von {mod} für {duration}min: {reason or 'Kein Grund'}\n"
-                    embed.add_field(name="🔇 Timeouts", value=timeouts_text, inline=False)
-
-            # Kicks abrufen
-            async with db.execute('''
-                SELECT reason, moderator_name, timestamp 
-                FROM kicks 
-                WHERE user_id = ? AND guild_id = ?
-                ORDER BY timestamp DESC
-            ''', (user.id, ctx.guild.id)) as cursor:
-                kicks = await cursor.fetchall()
-                if kicks:
-                    kicks_text = ""
-                    for reason, mod, time in kicks:
-                        kicks_text += f"• {time} von {mod}: {reason or 'Kein Grund'}\n"
-                    embed.add_field(name="👢 Kicks", value=kicks_text, inline=False)
-
-            # Bans abrufen
-            async with db.execute('''
-                SELECT reason, moderator_name, timestamp 
-                FROM bans 
-                WHERE user_id = ? AND guild_id = ?
-                ORDER BY timestamp DESC
-            ''', (user.id, ctx.guild.id)) as cursor:
-                bans = await cursor.fetchall()
-                if bans:
-                    bans_text = ""
-                    for reason, mod, time in bans:
-                        bans_text += f"• {time} von {mod}: {reason or 'Kein Grund'}\n"
-                    embed.add_field(name="🔨 Bans", value=bans_text, inline=False)
-
-            if not any([warnings, timeouts, kicks, bans]):
-                embed.description = "Keine Moderationsaktionen gefunden."
-
-            await ctx.send(embed=embed)
+        embed = discord.Embed(
+            title=f"📋 Moderations-Log für {user.name}",
+            color=discord.Color.blue()
+        )
+
+        # Warnungen abrufen
+        warnings = await self.db.q.warnings_for_user(user, ctx.guild)
+        if warnings:
+            warns_text = ""
+            for reason, mod, time in warnings:
+                warns_text += f"• {time} von {mod}: {reason or 'Kein Grund'}\n"
+            embed.add_field(name="⚠️ Verwarnungen", value=warns_text, inline=False)
+
+        # Timeouts abrufen
+        timeouts = await self.db.q.timeout_log_for_user(user, ctx.guild)
+        if timeouts:
+            timeouts_text = ""
+            for reason, mod, duration, time in timeouts:
+                timeouts_text += f"• {time} von {mod} für {duration}min: {reason or 'Kein Grund'}\n"
+            embed.add_field(name="🔇 Timeouts", value=timeouts_text, inline=False)
+
+        # Kicks abrufen
+        kicks = await self.db.q.kicks_for_user(user, ctx.guild)
+        if kicks:
+            kicks_text = ""
+            for reason, mod, time in kicks:
+                kicks_text += f"• {time} von {mod}: {reason or 'Kein Grund'}\n"
+            embed.add_field(name="👢 Kicks", value=kicks_text, inline=False)
+
+        # Bans abrufen
+        bans = await self.db.q.bans_for_user(user, ctx.guild)
+        if bans:
+            bans_text = ""
+            for reason, mod, time in bans:
+                bans_text += f"• {time} von {mod}: {reason or 'Kein Grund'}\n"
+            embed.add_field(name="🔨 Bans", value=bans_text, inline=False)
+
+        if not any([warnings, timeouts, kicks, bans]):
+            embed.description = "Keine Moderationsaktionen gefunden."
+
+        await ctx.send(embed=embed)
 
     @commands.command()
     @is_admin()
@@ -639,17 +581,11 @@ class ModerationCommands(commands.Cog):
             await ctx.send("Filter-Typ muss 'word' oder 'link' sein!")
             return
 
+        # Über AutoMod speichern, damit der Filter sofort in der gemeinsamen Instanz greift
         if filter_type == 'word':
-            self.automod.banned_words.append(word)
+            await self.automod.add_banned_word(ctx.guild.id, word)
         else:
-            self.automod.banned_links.append(word)
-
-        # Speichere aktualisierte Filter
-        with open('data/word_filters.json', 'w') as f:
-            json.dump({
-                "banned_words": self.automod.banned_words,
-                "banned_links": self.automod.banned_links
-            }, f, indent=4)
+            await self.automod.add_banned_link(ctx.guild.id, word)
 
         await ctx.send(f"{filter_type.capitalize()} wurde zum Filter hinzugefügt!")
 
@@ -657,11 +593,12 @@ class ModerationCommands(commands.Cog):
     @is_admin()
     async def viewlogs(self, ctx, limit: int = 10):
         """Zeigt die letzten Moderations-Logs"""
-        if ctx.guild.id not in self.logger.log_channels:
+        log_channel_id = await self.logger.get_mod_channel_id(ctx.guild.id)
+        if not log_channel_id:
             await ctx.send("Es wurde noch kein Logging-Kanal eingerichtet!")
             return
 
-        channel = self.bot.get_channel(self.logger.log_channels[ctx.guild.id])
+        channel = self.bot.get_channel(log_channel_id)
         if not channel:
             await ctx.send("Der Logging-Kanal wurde nicht gefunden!")
             return
@@ -682,89 +619,69 @@ class ModerationCommands(commands.Cog):
     @is_admin()
     async def activetimeouts(self, ctx):
         """Zeigt alle aktiven Timeouts auf dem Server"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            # Zeige aktive Timeouts auf dem Server
-            now = datetime.datetime.now().isoformat()
-            async with db.execute('''
-                SELECT user_name, reason, moderator_name, expires_at 
-                FROM timeouts 
-                WHERE guild_id = ? AND expires_at > ?
-                ORDER BY expires_at ASC
-            ''', (ctx.guild.id, now)) as cursor:
-                active_timeouts = await cursor.fetchall()
-
-            if not active_timeouts:
-                await ctx.send("Es gibt derzeit keine aktiven Timeouts.")
-                return
+        # Zeige aktive Timeouts auf dem Server
+        now = datetime.datetime.now().isoformat()
+        active_timeouts = await self.db.q.active_timeouts(ctx.guild, now)
 
-            embed = discord.Embed(
-                title="🔇 Aktive Timeouts",
-                color=discord.Color.orange()
-            )
+        if not active_timeouts:
+            await ctx.send("Es gibt derzeit keine aktiven Timeouts.")
+            return
 
-            for timeout in active_timeouts:
-                user_name, reason, mod_name, expires = timeout
-                embed.add_field(
-                    name=f"Timeout für {user_name}",
-                    value=f"**Grund:** {reason or 'Kein Grund angegeben'}\n"
-                          f"**Moderator:** {mod_name}\n"
-                          f"**Läuft ab:** {expires}",
-                    inline=False
-                )
+        embed = discord.Embed(
+            title="🔇 Aktive Timeouts",
+            color=discord.Color.orange()
+        )
 
-            await ctx.send(embed=embed)
+        for timeout in active_timeouts:
+            user_name, reason, mod_name, expires = timeout
+            embed.add_field(
+                name=f"Timeout für {user_name}",
+                value=f"**Grund:** {reason or 'Kein Grund angegeben'}\n"
+                      f"**Moderator:** {mod_name}\n"
+                      f"**Läuft ab:** {expires}",
+                inline=False
+            )
+
+        await ctx.send(embed=embed)
 
     @commands.command()
     @is_admin()
     async def timeouts(self, ctx, user: discord.Member):
         """Zeigt die Timeout-Historie eines Users"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            async with db.execute('''
-                SELECT reason, moderator_name, duration_minutes, timestamp, expires_at 
-                FROM timeouts 
-                WHERE user_id = ? AND guild_id = ?
-                ORDER BY timestamp DESC LIMIT 10
-            ''', (user.id, ctx.guild.id)) as cursor:
-                timeouts = await cursor.fetchall()
-
-            if not timeouts:
-                await ctx.send(f"{user.mention} hatte bisher keine Timeouts.")
-                return
+        timeouts = await self.db.q.timeouts_for_user(user, ctx.guild)
 
-            embed = discord.Embed(
-                title=f"🔇 Timeout-Historie für {user.name}",
-                color=discord.Color.orange()
-            )
+        if not timeouts:
+            await ctx.send(f"{user.mention} hatte bisher keine Timeouts.")
+            return
 
-            for timeout in timeouts:
-                reason, mod_name, duration, timestamp, expires = timeout
-                embed.add_field(
-                    name=f"Timeout vom {timestamp}",
-                    value=f"**Grund:** {reason or 'Kein Grund angegeben'}\n"
-                          f"**Moderator:** {mod_name}\n"
-                          f"**Dauer:** {duration} Minuten\n"
-                          f"**Abgelaufen:** {expires}",
-                    inline=False
-                )
+        embed = discord.Embed(
+            title=f"🔇 Timeout-Historie für {user.name}",
+            color=discord.Color.orange()
+        )
 
-            await ctx.send(embed=embed)
+        for timeout in timeouts:
+            reason, mod_name, duration, timestamp, expires = timeout
+            embed.add_field(
+                name=f"Timeout vom {timestamp}",
+                value=f"**Grund:** {reason or 'Kein Grund angegeben'}\n"
+                      f"**Moderator:** {mod_name}\n"
+                      f"**Dauer:** {duration} Minuten\n"
+                      f"**Abgelaufen:** {expires}",
+                inline=False
+            )
+
+        await ctx.send(embed=embed)
 
     @commands.command()
     @is_admin()
     async def setmodlog(self, ctx, channel: discord.TextChannel):
         """Setzt den Kanal für Moderations-Logs"""
         try:
-            async with aiosqlite.connect(DB_PATH) as db:
-                await db.execute('''
-                    INSERT OR REPLACE INTO channel_config 
-                    (guild_id, mod_log_channel_id) 
-                    VALUES (?, ?)
-                ''', (ctx.guild.id, channel.id))
-                await db.commit()
+            await self.logger.set_mod_channel(ctx.guild.id, channel.id)
             
             await ctx.send(f"✅ Mod-Log Kanal wurde auf {channel.mention} gesetzt!")
         except Exception as e:
-            print(f"Fehler beim Setzen des Mod-Log Kanals: {e}")
+            logger.error(f"Fehler beim Setzen des Mod-Log Kanals: {e}")
             await ctx.send("❌ Es ist ein Fehler aufgetreten!")
 
 async def setup(bot):
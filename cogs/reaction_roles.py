@@ -1,3 +1,4 @@
+import logging
 import discord
 from discord.ext import commands
 import os
@@ -10,18 +11,17 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from utils.db import Database
 from utils.permissions import is_admin  # Importiere die neue Berechtigungsprüfung
 
+logger = logging.getLogger(__name__)
+
 class ReactionRoles(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = Database()
 
-    def get_reaction_roles(self, message_id: str) -> Dict[str, str]:
+    async def get_reaction_roles(self, message_id: int) -> Dict[str, int]:
         """Lädt die Reaction Roles für eine bestimmte Nachricht"""
-        results = self.db.fetch_all_sync(
-            'SELECT emoji, role_id FROM reaction_roles WHERE message_id = ?', 
-            (message_id,)
-        )
-        return {row[0]: row[1] for row in results}
+        results = await self.db.q.reaction_roles_for_message(message_id)
+        return {row.emoji: row.role_id for row in results}
 
     @commands.group(name="reactionrole", aliases=["rr"])
     @is_admin()  # Ersetze @commands.has_permissions(administrator=True)
@@ -44,11 +44,11 @@ class ReactionRoles(commands.Cog):
         
         # Speichere die Reaction Role in der Datenbank
         await self.db.insert('reaction_roles', {
-            'message_id': str(message.id),
+            'message_id': message.id,
             'emoji': emoji,
-            'role_id': str(role.id),
-            'guild_id': str(ctx.guild.id),
-            'channel_id': str(ctx.channel.id),
+            'role_id': role.id,
+            'guild_id': ctx.guild.id,
+            'channel_id': ctx.channel.id,
             'description': beschreibung
         })
 
@@ -64,14 +64,7 @@ class ReactionRoles(commands.Cog):
     @reaction_role.command(name="list")
     async def list_reaction_roles(self, ctx):
         """Listet alle aktiven Reaction Roles auf"""
-        roles = await self.db.fetch_all(
-            '''
-            SELECT message_id, emoji, role_id, description 
-            FROM reaction_roles 
-            WHERE guild_id = ?
-            ''', 
-            (str(ctx.guild.id),)
-        )
+        roles = await self.db.q.reaction_roles_for_guild(ctx.guild)
 
         if not roles:
             await ctx.send("❌ Keine aktiven Reaction Roles gefunden!")
@@ -82,12 +75,12 @@ class ReactionRoles(commands.Cog):
             color=discord.Color.blue()
         )
         
-        for message_id, emoji, role_id, description in roles:
-            role = ctx.guild.get_role(int(role_id))
+        for rr in roles:
+            role = ctx.guild.get_role(rr.role_id)
             role_name = role.name if role else "Gelöschte Rolle"
             embed.add_field(
-                name=f"Message ID: {message_id}",
-                value=f"Emoji: {emoji}\nRolle: {role_name}\nBeschreibung: {description}",
+                name=f"Message ID: {rr.message_id}",
+                value=f"Emoji: {rr.emoji}\nRolle: {role_name}\nBeschreibung: {rr.description}",
                 inline=False
             )
 
@@ -96,36 +89,36 @@ class ReactionRoles(commands.Cog):
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload):
         """Event Handler für das Hinzufügen von Reaktionen"""
-        reaction_roles = self.get_reaction_roles(str(payload.message_id))
+        reaction_roles = await self.get_reaction_roles(payload.message_id)
         emoji = str(payload.emoji)
         
         if emoji in reaction_roles:
             guild = self.bot.get_guild(payload.guild_id)
-            role = guild.get_role(int(reaction_roles[emoji]))
+            role = guild.get_role(reaction_roles[emoji])
             member = guild.get_member(payload.user_id)
             
             if member and not member.bot:
                 try:
                     await member.add_roles(role)
                 except discord.HTTPException:
-                    print(f"Fehler beim Hinzufügen der Rolle {role.name} zu {member.name}")
+                    logger.error(f"Fehler beim Hinzufügen der Rolle {role.name} zu {member.name}")
 
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload):
         """Event Handler für das Entfernen von Reaktionen"""
-        reaction_roles = self.get_reaction_roles(str(payload.message_id))
+        reaction_roles = await self.get_reaction_roles(payload.message_id)
         emoji = str(payload.emoji)
         
         if emoji in reaction_roles:
             guild = self.bot.get_guild(payload.guild_id)
-            role = guild.get_role(int(reaction_roles[emoji]))
+            role = guild.get_role(reaction_roles[emoji])
             member = guild.get_member(payload.user_id)
             
             if member and not member.bot:
                 try:
                     await member.remove_roles(role)
                 except discord.HTTPException:
-                    print(f"Fehler beim Entfernen der Rolle {role.name} von {member.name}")
+                    logger.error(f"Fehler beim Entfernen der Rolle {role.name} von {member.name}")
 
 async def setup(bot):
     await bot.add_cog(ReactionRoles(bot)) 
\ No newline at end of file
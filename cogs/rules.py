@@ -1,25 +1,23 @@
 import discord
 from discord.ext import commands
-import aiosqlite
-from utils.db import DB_PATH
+from utils.db import Database
 import datetime
 from utils.permissions import is_admin
 
 class Rules(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.db = Database()
 
     @commands.group(invoke_without_command=True)
     async def rules(self, ctx):
         """Zeigt die Serverregeln an"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            async with db.execute('''
-                SELECT rule_number, rule_title, rule_content 
-                FROM server_rules 
-                WHERE guild_id = ? 
-                ORDER BY rule_number
-            ''', (ctx.guild.id,)) as cursor:
-                rules = await cursor.fetchall()
+        rules = await self.db.fetch_all('''
+            SELECT rule_number, rule_title, rule_content 
+            FROM server_rules 
+            WHERE guild_id = ? 
+            ORDER BY rule_number
+        ''', (ctx.guild.id,))
 
         if not rules:
             return await ctx.send("""
@@ -60,13 +58,11 @@ Nutze folgende Befehle:
             title = title.strip()
             content = content.strip()
 
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute('''
-                INSERT OR REPLACE INTO server_rules 
-                (guild_id, rule_number, rule_title, rule_content, last_edited_by, last_edited_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (ctx.guild.id, number, title, content, ctx.author.id, datetime.datetime.now()))
-            await db.commit()
+        await self.db.execute('''
+            INSERT OR REPLACE INTO server_rules 
+            (guild_id, rule_number, rule_title, rule_content, last_edited_by, last_edited_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (ctx.guild.id, number, title, content, ctx.author.id, datetime.datetime.now()))
 
         await ctx.send(f"✅ Regel {number} wurde hinzugefügt!")
 
@@ -74,12 +70,10 @@ Nutze folgende Befehle:
     @is_admin()
     async def remove_rule(self, ctx, number: int):
         """Entfernt eine Regel"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute('''
-                DELETE FROM server_rules 
-                WHERE guild_id = ? AND rule_number = ?
-            ''', (ctx.guild.id, number))
-            await db.commit()
+        await self.db.execute('''
+            DELETE FROM server_rules 
+            WHERE guild_id = ? AND rule_number = ?
+        ''', (ctx.guild.id, number))
 
         await ctx.send(f"✅ Regel {number} wurde entfernt!")
 
@@ -93,13 +87,11 @@ Nutze folgende Befehle:
             title = title.strip()
             content = content.strip()
 
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute('''
-                UPDATE server_rules 
-                SET rule_title = ?, rule_content = ?, last_edited_by = ?, last_edited_at = ?
-                WHERE guild_id = ? AND rule_number = ?
-            ''', (title, content, ctx.author.id, datetime.datetime.now(), ctx.guild.id, number))
-            await db.commit()
+        await self.db.execute('''
+            UPDATE server_rules 
+            SET rule_title = ?, rule_content = ?, last_edited_by = ?, last_edited_at = ?
+            WHERE guild_id = ? AND rule_number = ?
+        ''', (title, content, ctx.author.id, datetime.datetime.now(), ctx.guild.id, number))
 
         await ctx.send(f"✅ Regel {number} wurde aktualisiert!")
 
@@ -109,14 +101,12 @@ Nutze folgende Befehle:
         """Sendet die Regeln in einen bestimmten Kanal"""
         channel = channel or ctx.channel
 
-        async with aiosqlite.connect(DB_PATH) as db:
-            async with db.execute('''
-                SELECT rule_number, rule_title, rule_content 
-                FROM server_rules 
-                WHERE guild_id = ? 
-                ORDER BY rule_number
-            ''', (ctx.guild.id,)) as cursor:
-                rules = await cursor.fetchall()
+        rules = await self.db.fetch_all('''
+            SELECT rule_number, rule_title, rule_content 
+            FROM server_rules 
+            WHERE guild_id = ? 
+            ORDER BY rule_number
+        ''', (ctx.guild.id,))
 
         if not rules:
             return await ctx.send("❌ Es wurden noch keine Regeln festgelegt!")
@@ -1,75 +1,38 @@
+import logging
 import discord
 from discord.ext import commands
 import asyncio
 import sys
 import os
-import sqlite3
 
 # Füge das Hauptverzeichnis zum Pfad hinzu, damit wir utils importieren können
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from utils.db import Database
+from utils.config_cache import config_cache
 from utils.permissions import is_admin
 
+logger = logging.getLogger(__name__)
+
 class TempChannels(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         # Verwende die DB-Klasse statt direkter SQLite-Verbindung
         self.db = Database()
+        self.configs = config_cache("temp_voice_config")
         
         # Korrekter Variablenname
         self.active_channels = {}
         self.creator_channels = {}
-        self.bot.loop.create_task(self.initialize_database())
         self.bot.loop.create_task(self.load_creator_channels())
         self.bot.loop.create_task(self.check_empty_channels())
     
-    async def initialize_database(self):
-        """Initialisiert die Datenbanktabellen"""
-        # Warte, bis der Bot bereit ist
-        await self.bot.wait_until_ready()
-        
-        # Erstelle die Tabellen, falls sie nicht existieren
-        await self.db.execute('''
-        CREATE TABLE IF NOT EXISTS temp_voice_config (
-            guild_id INTEGER PRIMARY KEY,
-            creator_channel_id INTEGER,
-            category_id INTEGER,
-            user_limit INTEGER DEFAULT 1,
-            default_privacy TEXT DEFAULT 'public'
-        )
-        ''')
-        
-        await self.db.execute('''
-        CREATE TABLE IF NOT EXISTS temp_voice_channels (
-            channel_id INTEGER PRIMARY KEY,
-            guild_id INTEGER,
-            owner_id INTEGER,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            privacy TEXT DEFAULT 'public'
-        )
-        ''')
-        
-        print("✅ Temporäre Kanäle Datenbanktabellen initialisiert")
-    
     async def load_creator_channels(self):
         """Lädt die Erstellungskanäle aus der Datenbank."""
         await asyncio.sleep(1)  # Warte kurz, bis der Bot vollständig gestartet ist
         
-        try:
-            # Verwende die richtige Methode für die DB-Klasse
-            results = await self.db.fetch_all(
-                "SELECT guild_id, creator_channel_id, category_id, user_limit, default_privacy FROM temp_voice_config"
-            )
-        except Exception as e:
-            print(f"Fehler beim Laden der Erstellungskanäle: {e}")
-            # Versuche alternative Spaltennamen
-            try:
-                results = await self.db.fetch_all(
-                    "SELECT guild_id, channel_id, category_id, max_per_user, default_privacy FROM temp_voice_config"
-                )
-            except Exception as e2:
-                print(f"Alternativer Versuch fehlgeschlagen: {e2}")
-                results = []
+        results = await self.db.fetch_all(
+            "SELECT guild_id, creator_channel_id, category_id, user_limit, default_privacy FROM temp_voice_config"
+        )
         
         for row in results:
             guild_id, creator_channel_id, category_id, user_limit, default_privacy = row
@@ -80,21 +43,10 @@ class TempChannels(commands.Cog):
                 "default_privacy": default_privacy
             }
         
-        try:
-            # Lade auch aktive Kanäle
-            active_channels = await self.db.fetch_all(
-                "SELECT channel_id, guild_id, owner_id, privacy FROM temp_voice_channels"
-            )
-        except Exception as e:
-            print(f"Fehler beim Laden der aktiven Kanäle: {e}")
-            # Versuche alternative Spaltennamen
-            try:
-                active_channels = await self.db.fetch_all(
-                    "SELECT channel_id, guild_id, creator_id, privacy FROM temp_voice_channels"
-                )
-            except Exception as e2:
-                print(f"Alternativer Versuch fehlgeschlagen: {e2}")
-                active_channels = []
+        # Lade auch aktive Kanäle
+        active_channels = await self.db.fetch_all(
+            "SELECT channel_id, guild_id, owner_id, privacy FROM temp_voice_channels"
+        )
         
         for row in active_channels:
             channel_id, guild_id, owner_id, privacy = row
@@ -104,7 +56,7 @@ class TempChannels(commands.Cog):
                 "privacy": privacy
             }
         
-        print(f"✅ Temporäre Kanäle geladen: {len(self.creator_channels)} Erstellungskanäle, {len(self.active_channels)} aktive temporäre Kanäle")
+        logger.info(f"✅ Temporäre Kanäle geladen: {len(self.creator_channels)} Erstellungskanäle, {len(self.active_channels)} aktive temporäre Kanäle")
     
     async def check_empty_channels(self):
         """Überprüft regelmäßig, ob temporäre Kanäle leer sind und löscht sie gegebenenfalls."""
@@ -130,7 +82,7 @@ class TempChannels(commands.Cog):
                         )
                         self.active_channels.pop(channel_id, None)
             except Exception as e:
-                print(f"Fehler beim Überprüfen leerer Kanäle: {e}")
+                logger.error(f"Fehler beim Überprüfen leerer Kanäle: {e}")
             
             await asyncio.sleep(60)  # Überprüfe alle 60 Sekunden
     
@@ -197,33 +149,13 @@ class TempChannels(commands.Cog):
             category=category
         )
         
-        # Überprüfe die Spalten in der Datenbank
-        try:
-            # Speichere in der Datenbank
-            await self.db.execute(
-                '''
-                INSERT OR REPLACE INTO temp_voice_config 
-                (guild_id, creator_channel_id, category_id, user_limit, default_privacy) 
-                VALUES (?, ?, ?, ?, ?)
-                ''',
-                (str(ctx.guild.id), str(channel.id), str(category.id), "3", "public")
-            )
-        except Exception as e:
-            print(f"Fehler beim Speichern in der Datenbank: {e}")
-            # Versuche alternative Spaltennamen
-            try:
-                await self.db.execute(
-                    '''
-                    INSERT OR REPLACE INTO temp_voice_config 
-                    (guild_id, channel_id, category_id, max_per_user, default_privacy) 
-                    VALUES (?, ?, ?, ?, ?)
-                    ''',
-                    (str(ctx.guild.id), str(channel.id), str(category.id), "3", "public")
-                )
-            except Exception as e2:
-                print(f"Alternativer Versuch fehlgeschlagen: {e2}")
-                await ctx.send("❌ Fehler beim Einrichten des Systems. Bitte kontaktiere den Administrator.")
-                return
+        # Speichere in der Datenbank
+        await self.configs.update(ctx.guild.id, {
+            "creator_channel_id": channel.id,
+            "category_id": category.id,
+            "user_limit": 3,
+            "default_privacy": "public"
+        })
         
         # Aktualisiere das Dictionary
         self.creator_channels[channel.id] = {
@@ -255,7 +187,7 @@ class TempChannels(commands.Cog):
     async def set_category(self, ctx, *, category_name: str):
         """Setzt die Kategorie für temporäre Sprachkanäle"""
         # Prüfe, ob das System eingerichtet ist
-        if ctx.guild.id not in self.creator_channels:
+        if not await self.configs.get(ctx.guild.id):
             return await ctx.send("❌ Das System für temporäre Sprachkanäle ist noch nicht eingerichtet. Nutze `!tempvoice setup`.")
         
         # Erstelle oder finde die Kategorie
@@ -264,10 +196,7 @@ class TempChannels(commands.Cog):
             category = await ctx.guild.create_category(category_name)
         
         # Aktualisiere in der Datenbank
-        await self.db.execute(
-            'UPDATE temp_voice_config SET category_id = ? WHERE guild_id = ?',
-            (str(category.id), str(ctx.guild.id))
-        )
+        await self.configs.update(ctx.guild.id, {"category_id": category.id}, upsert=False)
         
         await ctx.send(f"✅ Kategorie für temporäre Sprachkanäle wurde auf `{category_name}` gesetzt!")
     
@@ -276,17 +205,14 @@ class TempChannels(commands.Cog):
     async def set_limit(self, ctx, limit: int):
         """Setzt das Limit für temporäre Kanäle pro Benutzer"""
         # Prüfe, ob das System eingerichtet ist
-        if ctx.guild.id not in self.creator_channels:
+        if not await self.configs.get(ctx.guild.id):
             return await ctx.send("❌ Das System für temporäre Sprachkanäle ist noch nicht eingerichtet. Nutze `!tempvoice setup`.")
         
         if limit < 1 or limit > 10:
             return await ctx.send("❌ Das Limit muss zwischen 1 und 10 liegen.")
         
         # Aktualisiere in der Datenbank
-        await self.db.execute(
-            'UPDATE temp_voice_config SET user_limit = ? WHERE guild_id = ?',
-            (str(limit), str(ctx.guild.id))
-        )
+        await self.configs.update(ctx.guild.id, {"user_limit": limit}, upsert=False)
         
         await ctx.send(f"✅ Limit für temporäre Sprachkanäle pro Benutzer wurde auf `{limit}` gesetzt!")
     
@@ -295,7 +221,7 @@ class TempChannels(commands.Cog):
     async def set_default_privacy(self, ctx, privacy: str):
         """Setzt die Standard-Privatsphäre-Einstellung für neue Kanäle (public, locked, hidden)"""
         # Prüfe, ob das System eingerichtet ist
-        if ctx.guild.id not in self.creator_channels:
+        if not await self.configs.get(ctx.guild.id):
             return await ctx.send("❌ Das System für temporäre Sprachkanäle ist noch nicht eingerichtet. Nutze `!tempvoice setup`.")
         
         privacy = privacy.lower()
@@ -303,10 +229,7 @@ class TempChannels(commands.Cog):
             return await ctx.send("❌ Gültige Einstellungen sind: `public`, `locked`, `hidden`")
         
         # Aktualisiere in der Datenbank
-        await self.db.execute(
-            'UPDATE temp_voice_config SET default_privacy = ? WHERE guild_id = ?',
-            (privacy, str(ctx.guild.id))
-        )
+        await self.configs.update(ctx.guild.id, {"default_privacy": privacy}, upsert=False)
         
         await ctx.send(f"✅ Standard-Privatsphäre für neue temporäre Kanäle wurde auf `{privacy}` gesetzt!")
     
@@ -542,17 +465,14 @@ class TempChannels(commands.Cog):
         
         # Prüfe, ob der Benutzer einem Erstellungskanal beigetreten ist
         if after.channel and after.channel.id in self.creator_channels:
-            # Hole Konfiguration aus der Datenbank
-            result = await self.db.fetch_one(
-                'SELECT category_id, user_limit, default_privacy FROM temp_voice_config WHERE guild_id = ?',
-                (str(member.guild.id),)
-            )
+            # Hole Konfiguration aus dem Cache
+            config = await self.configs.get(member.guild.id)
             
-            if not result:
+            if not config:
                 return
             
-            category_id, user_limit, default_privacy = result
-            category = member.guild.get_channel(int(category_id))
+            category_id, user_limit, default_privacy = config.category_id, config.user_limit, config.default_privacy
+            category = member.guild.get_channel(category_id)
             
             # Prüfe, ob der Benutzer das Limit erreicht hat
             user_channels = 0
@@ -611,29 +531,14 @@ class TempChannels(commands.Cog):
                 await member.move_to(new_channel)
                 
                 # Speichere den Kanal in der Datenbank
-                try:
-                    await self.db.execute(
-                        '''
-                        INSERT INTO temp_voice_channels 
-                        (channel_id, guild_id, owner_id, privacy) 
-                        VALUES (?, ?, ?, ?)
-                        ''',
-                        (str(new_channel.id), str(member.guild.id), str(member.id), default_privacy)
-                    )
-                except Exception as e:
-                    print(f"Fehler beim Speichern des Kanals in der Datenbank: {e}")
-                    # Versuche alternative Spaltennamen
-                    try:
-                        await self.db.execute(
-                            '''
-                            INSERT INTO temp_voice_channels 
-                            (channel_id, guild_id, creator_id, privacy) 
-                            VALUES (?, ?, ?, ?)
-                            ''',
-                            (str(new_channel.id), str(member.guild.id), str(member.id), default_privacy)
-                        )
-                    except Exception as e2:
-                        print(f"Alternativer Versuch fehlgeschlagen: {e2}")
+                await self.db.execute(
+                    '''
+                    INSERT INTO temp_voice_channels 
+                    (channel_id, guild_id, owner_id, privacy) 
+                    VALUES (?, ?, ?, ?)
+                    ''',
+                    (new_channel.id, member.guild.id, member.id, default_privacy)
+                )
                 
                 # Aktualisiere das Dictionary
                 self.active_channels[new_channel.id] = {
@@ -642,7 +547,7 @@ class TempChannels(commands.Cog):
                     "privacy": default_privacy
                 }
                 
-                print(f"✅ Temporärer Kanal {channel_name} erstellt von {member.name} (Privatsphäre: {default_privacy})")
+                logger.info(f"✅ Temporärer Kanal {channel_name} erstellt von {member.name} (Privatsphäre: {default_privacy})")
                 
                 # Sende eine Willkommensnachricht
                 try:
@@ -679,14 +584,14 @@ class TempChannels(commands.Cog):
                     pass  # Ignoriere Fehler beim Senden der DM
                 
             except discord.HTTPException as e:
-                print(f"❌ Fehler beim Erstellen des temporären Kanals: {e}")
+                logger.error(f"❌ Fehler beim Erstellen des temporären Kanals: {e}")
         
         # Prüfe, ob ein temporärer Kanal leer geworden ist
         if before.channel and before.channel.id in self.active_channels:
             if len(before.channel.members) == 0:
                 try:
                     await before.channel.delete(reason="Temporärer Kanal ist leer")
-                    print(f"🗑️ Temporärer Kanal {before.channel.name} gelöscht (leer)")
+                    logger.info(f"🗑️ Temporärer Kanal {before.channel.name} gelöscht (leer)")
                     
                     # Lösche aus der Datenbank
                     await self.db.execute(
@@ -698,41 +603,7 @@ class TempChannels(commands.Cog):
                     self.active_channels.pop(before.channel.id, None)
                     
                 except discord.HTTPException as e:
-                    print(f"❌ Fehler beim Löschen des Kanals {before.channel.id}: {e}")
+                    logger.error(f"❌ Fehler beim Löschen des Kanals {before.channel.id}: {e}")
 
 async def setup(bot):
-    # Überprüfe, ob die Tabellen bereits existieren, bevor du sie erstellst
-    db = Database()
-    
-    # Prüfe, ob die Tabellen existieren
-    try:
-        await db.fetch_one("SELECT 1 FROM temp_voice_config LIMIT 1")
-        print("✅ Tabelle temp_voice_config existiert bereits")
-    except Exception:
-        print("⚠️ Erstelle Tabelle temp_voice_config...")
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS temp_voice_config (
-                guild_id INTEGER PRIMARY KEY,
-                creator_channel_id INTEGER,
-                category_id INTEGER,
-                user_limit INTEGER DEFAULT 1,
-                default_privacy TEXT DEFAULT 'public'
-            )
-        ''')
-    
-    try:
-        await db.fetch_one("SELECT 1 FROM temp_voice_channels LIMIT 1")
-        print("✅ Tabelle temp_voice_channels existiert bereits")
-    except Exception:
-        print("⚠️ Erstelle Tabelle temp_voice_channels...")
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS temp_voice_channels (
-                channel_id INTEGER PRIMARY KEY,
-                guild_id INTEGER,
-                owner_id INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                privacy TEXT DEFAULT 'public'
-            )
-        ''')
-    
-    await bot.add_cog(TempChannels(bot)) 
\ No newline at end of file
+    await bot.add_cog(TempChannels(bot))
@@ -1,3 +1,4 @@
+import logging
 import discord
 from discord.ext import commands
 import sys
@@ -9,56 +10,21 @@ from typing import Optional, Union
 # Pfad zum Hauptverzeichnis hinzufügen, um utils zu importieren
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from utils.db import Database
+from utils.config_cache import config_cache
 from utils.permissions import is_admin
 
+logger = logging.getLogger(__name__)
+
 class TicketSystem(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = Database()
-        self.ticket_categories = {}  # Cache für Ticket-Kategorien pro Server
-        self.support_roles = {}      # Cache für Support-Rollen pro Server
+        # Ticket-Konfiguration pro Server (Write-Through-Cache)
+        self.configs = config_cache("ticket_config")
     
     @commands.Cog.listener()
     async def on_ready(self):
-        await self.initialize_database()
-        print("✅ Ticket-System bereit!")
-    
-    async def initialize_database(self):
-        """Initialisiert die Datenbanktabellen für das Ticket-System"""
-        try:
-            # Tabelle für Ticket-Konfiguration
-            await self.db.execute('''
-            CREATE TABLE IF NOT EXISTS ticket_config (
-                guild_id TEXT PRIMARY KEY,
-                category_id TEXT,
-                log_channel_id TEXT,
-                support_role_id TEXT,
-                ticket_counter INTEGER DEFAULT 0,
-                archive_category_id TEXT,
-                enabled BOOLEAN DEFAULT 0,
-                welcome_message TEXT DEFAULT 'Willkommen beim Support! Beschreibe dein Anliegen so detailliert wie möglich.'
-            )
-            ''')
-            
-            # Tabelle für Tickets
-            await self.db.execute('''
-            CREATE TABLE IF NOT EXISTS tickets (
-                ticket_id TEXT PRIMARY KEY,
-                guild_id TEXT,
-                channel_id TEXT,
-                user_id TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                closed_at TIMESTAMP,
-                closed_by TEXT,
-                status TEXT DEFAULT 'open',
-                title TEXT,
-                archived BOOLEAN DEFAULT 0
-            )
-            ''')
-            
-            print("✅ Ticket-System-Datenbanktabellen initialisiert")
-        except Exception as e:
-            print(f"❌ Fehler bei der Initialisierung der Ticket-System-Datenbanktabellen: {e}")
+        logger.info("✅ Ticket-System bereit!")
     
     @commands.group(name="ticket", invoke_without_command=True)
     async def ticket_cmd(self, ctx):
@@ -101,12 +67,7 @@ class TicketSystem(commands.Cog):
         """Richtet das Ticket-System für den Server ein"""
         try:
             # Prüfe, ob bereits eine Konfiguration existiert
-            config = await self.db.fetch_one(
-                "SELECT enabled FROM ticket_config WHERE guild_id = ?",
-                (str(ctx.guild.id),)
-            )
-            
-            if config:
+            if await self.configs.get(ctx.guild.id):
                 return await ctx.send("⚠️ Das Ticket-System ist bereits eingerichtet. Verwende die einzelnen Befehle, um die Einstellungen zu ändern.")
             
             # Erstelle eine neue Kategorie für Tickets
@@ -128,12 +89,12 @@ class TicketSystem(commands.Cog):
             )
             
             # Füge Konfiguration in die Datenbank ein
-            await self.db.execute(
-                """INSERT INTO ticket_config 
-                (guild_id, category_id, log_channel_id, ticket_counter, enabled) 
-                VALUES (?, ?, ?, ?, ?)""",
-                (str(ctx.guild.id), str(category.id), str(log_channel.id), 0, 1)
-            )
+            await self.configs.update(ctx.guild.id, {
+                "category_id": category.id,
+                "log_channel_id": log_channel.id,
+                "ticket_counter": 0,
+                "enabled": 1
+            })
             
             embed = discord.Embed(
                 title="✅ Ticket-System eingerichtet",
@@ -166,11 +127,7 @@ class TicketSystem(commands.Cog):
     @is_admin()
     async def set_ticket_category(self, ctx, category: discord.CategoryChannel):
         """Legt die Kategorie für Tickets fest"""
-        await self.db.execute(
-            "UPDATE ticket_config SET category_id = ? WHERE guild_id = ?",
-            (str(category.id), str(ctx.guild.id))
-        )
-        self.ticket_categories[ctx.guild.id] = category.id
+        await self.configs.update(ctx.guild.id, {"category_id": category.id}, upsert=False)
         await ctx.send(f"✅ Ticket-Kategorie wurde auf **{category.name}** gesetzt!")
     
     @ticket_cmd.command(name="role")
@@ -182,22 +139,11 @@ class TicketSystem(commands.Cog):
         
         try:
             # Prüfe, ob Konfiguration existiert
-            config = await self.db.fetch_one(
-                "SELECT enabled FROM ticket_config WHERE guild_id = ?",
-                (str(ctx.guild.id),)
-            )
-            
-            if not config:
+            if not await self.configs.get(ctx.guild.id):
                 return await ctx.send("❌ Das Ticket-System ist noch nicht eingerichtet. Verwende `!ticket setup` zuerst.")
             
             # Aktualisiere Support-Rolle
-            await self.db.execute(
-                "UPDATE ticket_config SET support_role_id = ? WHERE guild_id = ?",
-                (str(role.id), str(ctx.guild.id))
-            )
-            
-            # Aktualisiere Cache
-            self.support_roles[ctx.guild.id] = str(role.id)
+            await self.configs.update(ctx.guild.id, {"support_role_id": role.id}, upsert=False)
             
             await ctx.send(f"✅ Support-Rolle wurde auf {role.mention} gesetzt.")
             
@@ -216,10 +162,7 @@ class TicketSystem(commands.Cog):
     @is_admin()
     async def set_log_channel(self, ctx, channel: discord.TextChannel):
         """Legt den Log-Kanal fest"""
-        await self.db.execute(
-            "UPDATE ticket_config SET log_channel_id = ? WHERE guild_id = ?",
-            (str(channel.id), str(ctx.guild.id))
-        )
+        await self.configs.update(ctx.guild.id, {"log_channel_id": channel.id}, upsert=False)
         await ctx.send(f"✅ Log-Kanal wurde auf {channel.mention} gesetzt!")
     
     @ticket_cmd.command(name="archive")
@@ -234,26 +177,20 @@ class TicketSystem(commands.Cog):
             # Support-Rolle kann Archiv nur lesen
             support_role_id = await self.get_support_role_id(ctx.guild.id)
             if support_role_id:
-                support_role = ctx.guild.get_role(int(support_role_id))
+                support_role = ctx.guild.get_role(support_role_id)
                 if support_role:
                     await category.set_permissions(
                         support_role, read_messages=True, send_messages=False
                     )
         
-        await self.db.execute(
-            "UPDATE ticket_config SET archive_category_id = ? WHERE guild_id = ?",
-            (str(category.id), str(ctx.guild.id))
-        )
+        await self.configs.update(ctx.guild.id, {"archive_category_id": category.id}, upsert=False)
         await ctx.send(f"✅ Archiv-Kategorie wurde auf **{category.name}** gesetzt!")
     
     @ticket_cmd.command(name="message")
     @is_admin()
     async def set_welcome_message(self, ctx, *, message: str):
         """Legt die Willkommensnachricht für Tickets fest"""
-        await self.db.execute(
-            "UPDATE ticket_config SET welcome_message = ? WHERE guild_id = ?",
-            (message, str(ctx.guild.id))
-        )
+        await self.configs.update(ctx.guild.id, {"welcome_message": message}, upsert=False)
         await ctx.send(f"✅ Willkommensnachricht für Tickets wurde aktualisiert!")
     
     @ticket_cmd.command(name="panel")
@@ -265,15 +202,12 @@ class TicketSystem(commands.Cog):
         
         try:
             # Prüfe, ob Konfiguration existiert
-            config = await self.db.fetch_one(
-                "SELECT enabled, support_role_id FROM ticket_config WHERE guild_id = ?",
-                (str(ctx.guild.id),)
-            )
+            config = await self.configs.get(ctx.guild.id)
             
-            if not config or not config[0]:
+            if not config or not config.enabled:
                 return await ctx.send("❌ Das Ticket-System ist noch nicht eingerichtet. Verwende `!ticket setup` zuerst.")
             
-            if not config[1]:
+            if not config.support_role_id:
                 return await ctx.send("❌ Es wurde noch keine Support-Rolle festgelegt. Verwende `!ticket role @rolle` zuerst.")
             
             # Erstelle Embed für das Panel
@@ -326,7 +260,7 @@ class TicketSystem(commands.Cog):
             except discord.errors.HTTPException as e:
                 if "already been acknowledged" not in str(e):
                     # Nur Fehler loggen, die nicht mit bereits bestätigten Interaktionen zu tun haben
-                    print(f"Fehler bei Interaktion: {e}")
+                    logger.error(f"Fehler bei Interaktion: {e}")
     
     @ticket_cmd.command(name="create")
     async def create_ticket(self, ctx, *, title: str = "Kein Titel angegeben"):
@@ -337,41 +271,32 @@ class TicketSystem(commands.Cog):
         """Erstellt ein neues Ticket für einen Benutzer"""
         try:
             # Überprüfe Konfiguration
-            config = await self.db.fetch_one(
-                "SELECT category_id, support_role_id, ticket_counter, welcome_message, enabled FROM ticket_config WHERE guild_id = ?", 
-                (str(guild.id),)
-            )
+            config = await self.configs.get(guild.id)
             
-            if not config or not config[4]:  # enabled prüfen
+            if not config or not config.enabled:
                 response = "❌ Das Ticket-System ist für diesen Server nicht aktiviert!"
                 return await self.respond(ctx, interaction, response)
             
-            category_id, support_role_id, counter, welcome_msg, _ = config
-            category = guild.get_channel(int(category_id))
-            support_role = guild.get_role(int(support_role_id))
+            counter, welcome_msg = config.ticket_counter, config.welcome_message
+            category = guild.get_channel(config.category_id)
+            support_role = guild.get_role(config.support_role_id)
             
             if not category or not support_role:
                 response = "❌ Ticket-Kategorie oder Support-Rolle nicht gefunden!"
                 return await self.respond(ctx, interaction, response)
             
             # Prüfe, ob der Benutzer bereits ein offenes Ticket hat
-            existing_ticket = await self.db.fetch_one(
-                "SELECT channel_id FROM tickets WHERE guild_id = ? AND user_id = ? AND status = 'open'",
-                (str(guild.id), str(user.id))
-            )
+            existing_channel_id = await self.db.q.open_ticket_for_user(guild, user)
             
-            if existing_ticket:
-                channel = guild.get_channel(int(existing_ticket[0]))
+            if existing_channel_id:
+                channel = guild.get_channel(existing_channel_id)
                 if channel:
                     response = f"❌ Du hast bereits ein offenes Ticket: {channel.mention}!"
                     return await self.respond(ctx, interaction, response)
             
             # Erhöhe Ticket-Zähler
             counter += 1
-            await self.db.execute(
-                "UPDATE ticket_config SET ticket_counter = ? WHERE guild_id = ?",
-                (counter, str(guild.id))
-            )
+            await self.configs.update(guild.id, {"ticket_counter": counter}, upsert=False)
             
             # Erstelle Ticket-ID
             ticket_id = f"{counter:04d}"
@@ -421,7 +346,7 @@ class TicketSystem(commands.Cog):
                 """INSERT INTO tickets 
                 (ticket_id, guild_id, channel_id, user_id, title, status) 
                 VALUES (?, ?, ?, ?, ?, ?)""",
-                (ticket_id, str(guild.id), str(channel.id), str(user.id), title, "open")
+                (ticket_id, guild.id, channel.id, user.id, title, "open")
             )
             
             # Logge Ticket-Erstellung
@@ -443,10 +368,7 @@ class TicketSystem(commands.Cog):
     async def close_ticket(self, ctx, *, reason: str = "Kein Grund angegeben"):
         """Schließt ein Ticket"""
         # Prüfe, ob der Kanal ein Ticket ist
-        ticket = await self.db.fetch_one(
-            "SELECT ticket_id, user_id FROM tickets WHERE channel_id = ? AND status = 'open'",
-            (str(ctx.channel.id),)
-        )
+        ticket = await self.db.q.open_ticket_by_channel(ctx.channel)
         
         if not ticket:
             return await ctx.send("❌ Dieser Kanal ist kein offenes Ticket!")
@@ -454,7 +376,7 @@ class TicketSystem(commands.Cog):
         ticket_id, user_id = ticket
         
         # Prüfe Berechtigung (entweder Ersteller, Support oder Admin)
-        is_creator = str(ctx.author.id) == user_id
+        is_creator = ctx.author.id == user_id
         is_support = await self.is_support(ctx.author)
         
         if not (is_creator or is_support):
@@ -482,7 +404,7 @@ class TicketSystem(commands.Cog):
             """UPDATE tickets 
             SET status = 'closed', closed_at = CURRENT_TIMESTAMP, closed_by = ? 
             WHERE ticket_id = ? AND guild_id = ?""",
-            (str(closer.id), ticket_id, str(guild.id))
+            (closer.id, ticket_id, guild.id)
         )
         
         # Erstelle Abschluss-Embed
@@ -512,7 +434,7 @@ class TicketSystem(commands.Cog):
         )
         
         if ticket_data:
-            user_id = int(ticket_data[0])
+            user_id = ticket_data[0]
             user = guild.get_member(user_id)
             
             if user:
@@ -533,17 +455,14 @@ class TicketSystem(commands.Cog):
             channel = interaction.channel
             
             # Hole Archiv-Kategorie
-            config = await self.db.fetch_one(
-                "SELECT archive_category_id FROM ticket_config WHERE guild_id = ?", 
-                (str(guild.id),)
-            )
+            config = await self.configs.get(guild.id)
             
-            if not config or not config[0]:
+            if not config or not config.archive_category_id:
                 return await interaction.response.send_message(
                     "❌ Es wurde keine Archiv-Kategorie eingerichtet!", ephemeral=True
                 )
             
-            archive_category = guild.get_channel(int(config[0]))
+            archive_category = guild.get_channel(config.archive_category_id)
             if not archive_category:
                 return await interaction.response.send_message(
                     "❌ Die Archiv-Kategorie wurde nicht gefunden!", ephemeral=True
@@ -558,7 +477,7 @@ class TicketSystem(commands.Cog):
             # Updatee Ticket-Status in der Datenbank
             await self.db.execute(
                 "UPDATE tickets SET archived = 1 WHERE ticket_id = ? AND guild_id = ?",
-                (ticket_id, str(guild.id))
+                (ticket_id, guild.id)
             )
             
             # Sende Bestätigung
@@ -601,7 +520,7 @@ class TicketSystem(commands.Cog):
             # Ticket aus Datenbank löschen
             await self.db.execute(
                 "DELETE FROM tickets WHERE ticket_id = ? AND guild_id = ?",
-                (ticket_id, str(guild.id))
+                (ticket_id, guild.id)
             )
             
             # Wartezeit für die Benutzer, um die Nachricht zu lesen
@@ -623,10 +542,7 @@ class TicketSystem(commands.Cog):
     async def add_user_to_ticket(self, ctx, user: discord.Member):
         """Fügt einen Benutzer zu einem Ticket hinzu"""
         # Prüfe, ob der Kanal ein Ticket ist
-        ticket = await self.db.fetch_one(
-            "SELECT ticket_id, user_id FROM tickets WHERE channel_id = ? AND status = 'open'",
-            (str(ctx.channel.id),)
-        )
+        ticket = await self.db.q.open_ticket_by_channel(ctx.channel)
         
         if not ticket:
             return await ctx.send("❌ Dieser Kanal ist kein offenes Ticket!")
@@ -634,7 +550,7 @@ class TicketSystem(commands.Cog):
         ticket_id, creator_id = ticket
         
         # Prüfe Berechtigung (entweder Ersteller oder Support)
-        is_creator = str(ctx.author.id) == creator_id
+        is_creator = ctx.author.id == creator_id
         is_support = await self.is_support(ctx.author)
         
         if not (is_creator or is_support):
@@ -664,10 +580,7 @@ class TicketSystem(commands.Cog):
     async def remove_user_from_ticket(self, ctx, user: discord.Member):
         """Entfernt einen Benutzer aus einem Ticket"""
         # Prüfe, ob der Kanal ein Ticket ist
-        ticket = await self.db.fetch_one(
-            "SELECT ticket_id, user_id FROM tickets WHERE channel_id = ? AND status = 'open'",
-            (str(ctx.channel.id),)
-        )
+        ticket = await self.db.q.open_ticket_by_channel(ctx.channel)
         
         if not ticket:
             return await ctx.send("❌ Dieser Kanal ist kein offenes Ticket!")
@@ -675,11 +588,11 @@ class TicketSystem(commands.Cog):
         ticket_id, creator_id = ticket
         
         # Verhindere Entfernung des Ticketerstellers
-        if str(user.id) == creator_id:
+        if user.id == creator_id:
             return await ctx.send("❌ Der Ersteller des Tickets kann nicht entfernt werden!")
         
         # Prüfe Berechtigung (entweder Ersteller oder Support)
-        is_creator = str(ctx.author.id) == creator_id
+        is_creator = ctx.author.id == creator_id
         is_support = await self.is_support(ctx.author)
         
         if not (is_creator or is_support):
@@ -713,16 +626,10 @@ class TicketSystem(commands.Cog):
     @commands.has_permissions(manage_messages=True)
     async def list_tickets(self, ctx, status: str = "all"):
         """Listet alle aktiven Tickets auf"""
-        status_filter = ""
-        if status.lower() == "open":
-            status_filter = "WHERE status = 'open'"
-        elif status.lower() == "closed":
-            status_filter = "WHERE status = 'closed'"
-        
-        tickets = await self.db.fetch_all(
-            f"SELECT ticket_id, channel_id, user_id, title, created_at, status FROM tickets {status_filter} AND guild_id = ? ORDER BY created_at DESC LIMIT 25",
-            (str(ctx.guild.id),)
-        )
+        if status.lower() in ("open", "closed"):
+            tickets = await self.db.q.tickets_by_status(ctx.guild, status.lower())
+        else:
+            tickets = await self.db.q.tickets_for_guild(ctx.guild)
         
         if not tickets:
             return await ctx.send(f"❌ Keine {status} Tickets gefunden!")
@@ -736,10 +643,10 @@ class TicketSystem(commands.Cog):
         for ticket in tickets:
             ticket_id, channel_id, user_id, title, created_at, status = ticket
             
-            channel = ctx.guild.get_channel(int(channel_id))
+            channel = ctx.guild.get_channel(channel_id)
             channel_txt = f"{channel.mention}" if channel else "Kanal gelöscht"
             
-            user = ctx.guild.get_member(int(user_id))
+            user = ctx.guild.get_member(user_id)
             user_txt = f"{user.mention}" if user else f"Nutzer nicht mehr auf dem Server (ID: {user_id})"
             
             embed.add_field(
@@ -759,20 +666,15 @@ class TicketSystem(commands.Cog):
         """Erstellt ein Transcript eines Tickets"""
         # Falls kein ticket_id angegeben wurde, aktuelle Kanal-ID verwenden
         if not ticket_id:
-            ticket = await self.db.fetch_one(
-                "SELECT ticket_id FROM tickets WHERE channel_id = ?",
-                (str(ctx.channel.id if ctx else interaction.channel.id),)
-            )
+            ticket_id = await self.db.q.ticket_by_channel(ctx.channel if ctx else interaction.channel)
             
-            if not ticket:
+            if not ticket_id:
                 if return_file:
                     return None
                 return await ctx.send("❌ Dieser Kanal ist kein Ticket!")
-            
-            ticket_id = ticket[0]
         
         # Prüfe, ob Ticket existiert
-        guild_id = str(ctx.guild.id if ctx else interaction.guild.id)
+        guild_id = ctx.guild.id if ctx else interaction.guild.id
         ticket_data = await self.db.fetch_one(
             "SELECT channel_id FROM tickets WHERE ticket_id = ? AND guild_id = ?",
             (ticket_id, guild_id)
@@ -785,7 +687,7 @@ class TicketSystem(commands.Cog):
         
         channel_id = ticket_data[0]
         guild = ctx.guild if ctx else interaction.guild
-        channel = guild.get_channel(int(channel_id))
+        channel = guild.get_channel(channel_id)
         
         if not channel:
             if return_file:
@@ -850,28 +752,28 @@ class TicketSystem(commands.Cog):
         # Gesamtzahl der Tickets
         total = await self.db.fetch_one(
             "SELECT COUNT(*) FROM tickets WHERE guild_id = ?",
-            (str(ctx.guild.id),)
+            (ctx.guild.id,)
         )
         stats["total"] = total[0] if total else 0
         
         # Offene Tickets
         open_tickets = await self.db.fetch_one(
             "SELECT COUNT(*) FROM tickets WHERE guild_id = ? AND status = 'open'",
-            (str(ctx.guild.id),)
+            (ctx.guild.id,)
         )
         stats["open"] = open_tickets[0] if open_tickets else 0
         
         # Geschlossene Tickets
         closed_tickets = await self.db.fetch_one(
             "SELECT COUNT(*) FROM tickets WHERE guild_id = ? AND status = 'closed'",
-            (str(ctx.guild.id),)
+            (ctx.guild.id,)
         )
         stats["closed"] = closed_tickets[0] if closed_tickets else 0
         
         # Archivierte Tickets
         archived_tickets = await self.db.fetch_one(
             "SELECT COUNT(*) FROM tickets WHERE guild_id = ? AND archived = 1",
-            (str(ctx.guild.id),)
+            (ctx.guild.id,)
         )
         stats["archived"] = archived_tickets[0] if archived_tickets else 0
         
@@ -882,7 +784,7 @@ class TicketSystem(commands.Cog):
             WHERE guild_id = ? AND closed_by IS NOT NULL 
             GROUP BY closed_by 
             ORDER BY count DESC LIMIT 5""",
-            (str(ctx.guild.id),)
+            (ctx.guild.id,)
         )
         
         # Erstelle Embed
@@ -899,7 +801,7 @@ class TicketSystem(commands.Cog):
         if top_support:
             top_text = ""
             for supporter_id, count in top_support:
-                supporter = ctx.guild.get_member(int(supporter_id))
+                supporter = ctx.guild.get_member(supporter_id)
                 name = supporter.display_name if supporter else f"Unbekannt ({supporter_id})"
                 top_text += f"{name}: {count} Tickets\n"
             
@@ -917,39 +819,25 @@ class TicketSystem(commands.Cog):
         if not support_role_id:
             return False
         
-        support_role = member.guild.get_role(int(support_role_id))
+        support_role = member.guild.get_role(support_role_id)
         if not support_role:
             return False
         
         return support_role in member.roles
     
     async def get_support_role_id(self, guild_id):
-        """Holt die Support-Rollen-ID aus dem Cache oder der Datenbank"""
-        if guild_id in self.support_roles:
-            return self.support_roles[guild_id]
-        
-        result = await self.db.fetch_one(
-            "SELECT support_role_id FROM ticket_config WHERE guild_id = ?", 
-            (str(guild_id),)
-        )
-        
-        if result and result[0]:
-            self.support_roles[guild_id] = result[0]
-            return result[0]
-        
-        return None
+        """Holt die Support-Rollen-ID aus dem Konfigurations-Cache"""
+        config = await self.configs.get(guild_id)
+        return config.support_role_id if config else None
     
     async def log_ticket_action(self, guild, title, description, user=None):
         """Loggt eine Ticket-Aktion im Log-Kanal"""
-        config = await self.db.fetch_one(
-            "SELECT log_channel_id FROM ticket_config WHERE guild_id = ?", 
-            (str(guild.id),)
-        )
+        config = await self.configs.get(guild.id)
         
-        if not config or not config[0]:
+        if not config or not config.log_channel_id:
             return
         
-        log_channel = guild.get_channel(int(config[0]))
+        log_channel = guild.get_channel(config.log_channel_id)
         if not log_channel:
             return
         
@@ -977,19 +865,16 @@ class TicketSystem(commands.Cog):
     
     async def get_log_channel(self, guild_id):
         """Holt den Log-Kanal für ein Guild"""
-        config = await self.db.fetch_one(
-            "SELECT log_channel_id FROM ticket_config WHERE guild_id = ?", 
-            (str(guild_id),)
-        )
+        config = await self.configs.get(guild_id)
         
-        if not config or not config[0]:
+        if not config or not config.log_channel_id:
             return None
         
-        guild = self.bot.get_guild(int(guild_id))
+        guild = self.bot.get_guild(guild_id)
         if not guild:
             return None
         
-        log_channel = guild.get_channel(int(config[0]))
+        log_channel = guild.get_channel(config.log_channel_id)
         return log_channel
 
 
@@ -1049,7 +934,7 @@ class TicketPanelView(discord.ui.View):
             modal = TicketCreateModal(self.cog)
             await interaction.response.send_modal(modal)
         except Exception as e:
-            print(f"Fehler beim Erstellen des Modals: {e}")
+            logger.error(f"Fehler beim Erstellen des Modals: {e}")
 
 class TicketCreateModal(discord.ui.Modal, title="Support-Ticket erstellen"):
     """Modal zum Erstellen eines Tickets"""
@@ -1109,7 +994,7 @@ class TicketControlPanel(discord.ui.View):
         # Finde Ticket-Informationen
         ticket = await self.cog.db.fetch_one(
             "SELECT ticket_id, user_id FROM tickets WHERE channel_id = ? AND status = 'open'",
-            (str(interaction.channel.id),)
+            (interaction.channel.id,)
         )
         
         if not ticket:
@@ -1119,7 +1004,7 @@ class TicketControlPanel(discord.ui.View):
             )
         
         ticket_id, creator_id = ticket
-        is_ticket_creator = str(interaction.user.id) == creator_id
+        is_ticket_creator = interaction.user.id == creator_id
         
         if not (is_support or is_ticket_creator):
             return await interaction.response.send_message(
@@ -1146,7 +1031,7 @@ class TicketControlPanel(discord.ui.View):
         # Finde Ticket-Informationen
         ticket = await self.cog.db.fetch_one(
             "SELECT user_id FROM tickets WHERE channel_id = ? AND status = 'open'",
-            (str(interaction.channel.id),)
+            (interaction.channel.id,)
         )
         
         if not ticket:
@@ -1155,7 +1040,7 @@ class TicketControlPanel(discord.ui.View):
                 ephemeral=True
             )
         
-        is_ticket_creator = str(interaction.user.id) == ticket[0]
+        is_ticket_creator = interaction.user.id == ticket[0]
         
         if not (is_support or is_ticket_creator):
             return await interaction.response.send_message(
@@ -1272,7 +1157,7 @@ class TicketCloseConfirm(discord.ui.View):
             # Hole Ticket-Informationen
             ticket_data = await self.cog.db.fetch_one(
                 "SELECT channel_id, user_id, title FROM tickets WHERE ticket_id = ? AND guild_id = ?",
-                (self.ticket_id, str(interaction.guild.id))
+                (self.ticket_id, interaction.guild.id)
             )
             
             if not ticket_data:
@@ -1285,7 +1170,7 @@ class TicketCloseConfirm(discord.ui.View):
                 """UPDATE tickets 
                 SET status = 'closed', closed_at = CURRENT_TIMESTAMP, closed_by = ? 
                 WHERE ticket_id = ? AND guild_id = ?""",
-                (str(interaction.user.id), self.ticket_id, str(interaction.guild.id))
+                (interaction.user.id, self.ticket_id, interaction.guild.id)
             )
             
             # Sende Abschlussnachricht
@@ -1309,7 +1194,7 @@ class TicketCloseConfirm(discord.ui.View):
             )
             
             # Benachrichtige Ticket-Ersteller
-            creator = interaction.guild.get_member(int(user_id))
+            creator = interaction.guild.get_member(user_id)
             if creator:
                 try:
                     creator_embed = discord.Embed(
@@ -1364,22 +1249,19 @@ class TicketArchiveView(discord.ui.View):
             # Hole Ticket-Informationen
             ticket_data = await self.cog.db.fetch_one(
                 "SELECT channel_id FROM tickets WHERE ticket_id = ? AND guild_id = ?",
-                (self.ticket_id, str(interaction.guild.id))
+                (self.ticket_id, interaction.guild.id)
             )
             
             if not ticket_data:
                 return await interaction.followup.send("❌ Ticket nicht gefunden!")
             
             # Hole Archiv-Kategorie
-            config = await self.cog.db.fetch_one(
-                "SELECT archive_category_id FROM ticket_config WHERE guild_id = ?",
-                (str(interaction.guild.id),)
-            )
+            config = await self.cog.configs.get(interaction.guild.id)
             
-            if not config or not config[0]:
+            if not config or not config.archive_category_id:
                 return await interaction.followup.send("❌ Es wurde keine Archiv-Kategorie eingerichtet!")
             
-            archive_category = interaction.guild.get_channel(int(config[0]))
+            archive_category = interaction.guild.get_channel(config.archive_category_id)
             if not archive_category:
                 return await interaction.followup.send("❌ Die Archiv-Kategorie existiert nicht mehr!")
             
@@ -1392,7 +1274,7 @@ class TicketArchiveView(discord.ui.View):
             # Aktualisiere Ticket-Status in der Datenbank
             await self.cog.db.execute(
                 "UPDATE tickets SET archived = 1 WHERE ticket_id = ? AND guild_id = ?",
-                (self.ticket_id, str(interaction.guild.id))
+                (self.ticket_id, interaction.guild.id)
             )
             
             # Deaktiviere alle Buttons
@@ -1457,7 +1339,7 @@ class TicketDeleteConfirm(discord.ui.View):
             # Hole Ticket-Informationen
             ticket_data = await self.cog.db.fetch_one(
                 "SELECT channel_id, title FROM tickets WHERE ticket_id = ? AND guild_id = ?",
-                (self.ticket_id, str(interaction.guild.id))
+                (self.ticket_id, interaction.guild.id)
             )
             
             if not ticket_data:
@@ -1487,11 +1369,11 @@ class TicketDeleteConfirm(discord.ui.View):
             # Lösche Ticket aus der Datenbank
             await self.cog.db.execute(
                 "DELETE FROM tickets WHERE ticket_id = ? AND guild_id = ?",
-                (self.ticket_id, str(interaction.guild.id))
+                (self.ticket_id, interaction.guild.id)
             )
             
             # Lösche den Kanal
-            channel = interaction.guild.get_channel(int(channel_id))
+            channel = interaction.guild.get_channel(channel_id)
             if channel:
                 await channel.delete(reason=f"Ticket #{self.ticket_id} gelöscht von {interaction.user.name}")
             
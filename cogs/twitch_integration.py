@@ -1,9 +1,9 @@
+import logging
 import discord
 from discord.ext import commands, tasks
 import aiohttp
 import asyncio
 from datetime import datetime, timedelta
-import traceback
 import sys
 import os
 from typing import Dict, List, Optional
@@ -12,12 +12,16 @@ from config import TWITCH_CLIENT_ID, TWITCH_CLIENT_SECRET
 # Füge das Hauptverzeichnis zum Pfad hinzu, damit wir utils importieren können
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from utils.db import Database
+from utils.config_cache import config_cache
 from utils.permissions import is_admin
 
+logger = logging.getLogger(__name__)
+
 class TwitchIntegration(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = Database()
+        self.configs = config_cache("twitch_config")
         self.client_id = TWITCH_CLIENT_ID
         self.client_secret = TWITCH_CLIENT_SECRET
         self.access_token = None
@@ -45,12 +49,12 @@ class TwitchIntegration(commands.Cog):
         if config:
             self.client_id = config[0]
             self.client_secret = config[1]
-            print("✅ Twitch API-Konfiguration geladen")
+            logger.info("✅ Twitch API-Konfiguration geladen")
     
     async def get_access_token(self):
         """Holt ein neues Access-Token von der Twitch API"""
         if not self.client_id or not self.client_secret:
-            print("❌ Twitch API-Konfiguration fehlt")
+            logger.error("❌ Twitch API-Konfiguration fehlt")
             return False
             
         if self.access_token and self.token_expires and datetime.now() < self.token_expires:
@@ -72,10 +76,10 @@ class TwitchIntegration(commands.Cog):
                         self.token_expires = datetime.now() + timedelta(seconds=data["expires_in"] - 100)
                         return self.access_token
                     else:
-                        print(f"❌ Fehler beim Abrufen des Access-Tokens: {response.status}")
+                        logger.error(f"❌ Fehler beim Abrufen des Access-Tokens: {response.status}")
                         return None
         except Exception as e:
-            print(f"❌ Fehler beim Abrufen des Access-Tokens: {e}")
+            logger.error(f"❌ Fehler beim Abrufen des Access-Tokens: {e}")
             return None
     
     @tasks.loop(minutes=5.0)
@@ -86,6 +90,9 @@ class TwitchIntegration(commands.Cog):
         if not token:
             return
 
+        # Änderungen werden gesammelt und am Ende in einer Transaktion geschrieben
+        id_updates = []
+        stream_updates = []
         try:
             streamers = await self.db.fetch_all(
                 "SELECT streamer_name, guild_id, last_stream_id, user_id FROM twitch_streamers"
@@ -105,22 +112,21 @@ class TwitchIntegration(commands.Cog):
             # Für jede Guild die Streamer überprüfen
             for guild_id, guild_streamers in guilds_streamers.items():
                 # Konfiguration für diese Guild laden
-                config = await self.db.fetch_one(
-                    "SELECT announcement_channel_id, announcement_message, ping_role_id, enabled FROM twitch_config WHERE guild_id = ?",
-                    (guild_id,)
-                )
+                config = await self.configs.get(guild_id)
                 
-                if not config or not config[3]:  # Wenn nicht aktiviert
+                if not config or not config.enabled:  # Wenn nicht aktiviert
                     continue
                     
-                channel_id, message_template, ping_role_id, _ = config
+                channel_id = config.announcement_channel_id
+                message_template = config.announcement_message
+                ping_role_id = config.ping_role_id
                 
                 # Channel und Guild Objekte abrufen
-                guild = self.bot.get_guild(int(guild_id))
+                guild = self.bot.get_guild(guild_id)
                 if not guild:
                     continue
                     
-                channel = guild.get_channel(int(channel_id)) if channel_id else None
+                channel = guild.get_channel(channel_id) if channel_id else None
                 if not channel:
                     continue
                 
@@ -148,11 +154,8 @@ class TwitchIntegration(commands.Cog):
                                 if response.status == 200:
                                     data = await response.json()
                                     for user in data["data"]:
-                                        # Streamer-ID in der Datenbank aktualisieren
-                                        await self.db.execute(
-                                            "UPDATE twitch_streamers SET user_id = ? WHERE streamer_name = ? AND guild_id = ?",
-                                            (user["id"], user["login"], guild_id)
-                                        )
+                                        # Streamer-ID für die Datenbank vormerken
+                                        id_updates.append((user["id"], user["login"], guild_id))
                                         user_ids.append(user["id"])
                     
                     # Streamer-Status abfragen
@@ -183,11 +186,8 @@ class TwitchIntegration(commands.Cog):
                                     ping_role_id, streamer_name
                                 )
                                 
-                                # Letzten Stream-ID aktualisieren
-                                await self.db.execute(
-                                    "UPDATE twitch_streamers SET last_stream_id = ?, last_online = ? WHERE streamer_name = ? AND guild_id = ?",
-                                    (stream_id, datetime.now(), streamer_name, guild_id)
-                                )
+                                # Letzten Stream-ID vormerken
+                                stream_updates.append((stream_id, datetime.now(), streamer_name, guild_id))
                             
                             # Status für Cache aktualisieren
                             self.live_streamers[f"{guild_id}:{streamer_name}"] = True
@@ -196,8 +196,29 @@ class TwitchIntegration(commands.Cog):
                             if f"{guild_id}:{streamer_name}" in self.live_streamers:
                                 del self.live_streamers[f"{guild_id}:{streamer_name}"]
         except Exception as e:
-            print(f"❌ Fehler beim Überprüfen der Streams: {str(e)}")
-            traceback.print_exc()
+            logger.exception(f"❌ Fehler beim Überprüfen der Streams: {str(e)}")
+        finally:
+            # Auch nach einem Fehler speichern, sonst würden gesendete Ankündigungen wiederholt
+            await self.save_stream_state(id_updates, stream_updates)
+    
+    async def save_stream_state(self, id_updates, stream_updates):
+        """Schreibt die gesammelten Streamer-Änderungen eines Durchlaufs in einer Transaktion"""
+        if not id_updates and not stream_updates:
+            return
+        try:
+            async with self.db.transaction() as tx:
+                if id_updates:
+                    await tx.executemany(
+                        "UPDATE twitch_streamers SET user_id = ? WHERE streamer_name = ? AND guild_id = ?",
+                        id_updates
+                    )
+                if stream_updates:
+                    await tx.executemany(
+                        "UPDATE twitch_streamers SET last_stream_id = ?, last_online = ? WHERE streamer_name = ? AND guild_id = ?",
+                        stream_updates
+                    )
+        except Exception as e:
+            logger.error(f"❌ Fehler beim Speichern der Streamer-Daten: {str(e)}")
     
     async def announce_stream(self, guild, channel, stream_data, message_template, ping_role_id, streamer_name):
         """Sendet eine Ankündigung, wenn ein Streamer online geht"""
@@ -205,7 +226,7 @@ class TwitchIntegration(commands.Cog):
             # Ping-Rolle Erwähnung
             role_mention = ""
             if ping_role_id:
-                role = guild.get_role(int(ping_role_id))
+                role = guild.get_role(ping_role_id)
                 if role:
                     role_mention = role.mention + " "
             
@@ -219,14 +240,11 @@ class TwitchIntegration(commands.Cog):
             )
             
             # Abonnenten für diesen Streamer
-            subscribers = await self.db.fetch_all(
-                "SELECT user_id FROM twitch_subscriptions WHERE guild_id = ? AND streamer_name = ?",
-                (str(guild.id), streamer_name)
-            )
+            subscribers = await self.db.q.stream_subscribers(guild, streamer_name)
             
             subscriber_mentions = ""
             if subscribers:
-                subscriber_mentions = " ".join([f"<@{sub[0]}>" for sub in subscribers])
+                subscriber_mentions = " ".join(f"<@{user_id}>" for user_id in subscribers)
             
             # Embed erstellen
             embed = discord.Embed(
@@ -259,7 +277,7 @@ class TwitchIntegration(commands.Cog):
             await channel.send(content=content, embed=embed)
             
         except Exception as e:
-            print(f"❌ Fehler beim Ankündigen des Streams: {str(e)}")
+            logger.error(f"❌ Fehler beim Ankündigen des Streams: {str(e)}")
     
     @commands.group(name="twitch", invoke_without_command=True)
     async def twitch_cmd(self, ctx):
@@ -314,26 +332,14 @@ class TwitchIntegration(commands.Cog):
     async def setup_twitch(self, ctx):
         """Richtet die Twitch-Integration ein"""
         # Überprüfen, ob bereits konfiguriert
-        config = await self.db.fetch_one(
-            "SELECT client_id, client_secret, announcement_channel_id FROM twitch_config WHERE guild_id = ?",
-            (str(ctx.guild.id),)
-        )
+        config = await self.configs.get(ctx.guild.id)
         
-        if config and all(config):
+        if config and all((config.client_id, config.client_secret, config.announcement_channel_id)):
             await ctx.send("✅ Die Twitch-Integration ist bereits eingerichtet. Verwende `!twitch api` oder andere Kommandos, um Einstellungen anzupassen.")
             return
         
         # Grundkonfiguration erstellen oder aktualisieren
-        if config:
-            await self.db.execute(
-                "UPDATE twitch_config SET enabled = 1 WHERE guild_id = ?",
-                (str(ctx.guild.id),)
-            )
-        else:
-            await self.db.execute(
-                "INSERT INTO twitch_config (guild_id, enabled) VALUES (?, 1)",
-                (str(ctx.guild.id),)
-            )
+        await self.configs.update(ctx.guild.id, {"enabled": 1})
         
         # Setup-Anleitung senden
         embed = discord.Embed(
@@ -382,21 +388,11 @@ class TwitchIntegration(commands.Cog):
             pass
             
         # In Datenbank speichern
-        config = await self.db.fetch_one(
-            "SELECT 1 FROM twitch_config WHERE guild_id = ?",
-            (str(ctx.guild.id),)
-        )
-        
-        if config:
-            await self.db.execute(
-                "UPDATE twitch_config SET client_id = ?, client_secret = ? WHERE guild_id = ?",
-                (client_id, client_secret, str(ctx.guild.id))
-            )
-        else:
-            await self.db.execute(
-                "INSERT INTO twitch_config (guild_id, client_id, client_secret, enabled) VALUES (?, ?, ?, 1)",
-                (str(ctx.guild.id), client_id, client_secret)
-            )
+        values = {"client_id": client_id, "client_secret": client_secret}
+        if not await self.configs.get(ctx.guild.id):
+            # Neue Konfigurationen sind direkt aktiv
+            values["enabled"] = 1
+        await self.configs.update(ctx.guild.id, values)
         
         # API-Zugangsdaten aktualisieren
         self.client_id = client_id
@@ -413,21 +409,11 @@ class TwitchIntegration(commands.Cog):
     @is_admin()
     async def set_announcement_channel(self, ctx, channel: discord.TextChannel):
         """Legt den Kanal für Stream-Ankündigungen fest"""
-        config = await self.db.fetch_one(
-            "SELECT 1 FROM twitch_config WHERE guild_id = ?",
-            (str(ctx.guild.id),)
-        )
-        
-        if config:
-            await self.db.execute(
-                "UPDATE twitch_config SET announcement_channel_id = ? WHERE guild_id = ?",
-                (str(channel.id), str(ctx.guild.id))
-            )
-        else:
-            await self.db.execute(
-                "INSERT INTO twitch_config (guild_id, announcement_channel_id, enabled) VALUES (?, ?, 1)",
-                (str(ctx.guild.id), str(channel.id))
-            )
+        values = {"announcement_channel_id": channel.id}
+        if not await self.configs.get(ctx.guild.id):
+            # Neue Konfigurationen sind direkt aktiv
+            values["enabled"] = 1
+        await self.configs.update(ctx.guild.id, values)
         
         await ctx.send(f"✅ Stream-Ankündigungen werden jetzt in {channel.mention} gesendet.")
     
@@ -435,10 +421,7 @@ class TwitchIntegration(commands.Cog):
     @is_admin()
     async def set_announcement_message(self, ctx, *, message: str):
         """Legt die Nachricht fest, die bei Stream-Start gesendet wird"""
-        await self.db.execute(
-            "UPDATE twitch_config SET announcement_message = ? WHERE guild_id = ?",
-            (message, str(ctx.guild.id))
-        )
+        await self.configs.update(ctx.guild.id, {"announcement_message": message}, upsert=False)
         
         # Beispielformatierung zeigen
         formatted = message.format(
@@ -456,16 +439,10 @@ class TwitchIntegration(commands.Cog):
     async def set_ping_role(self, ctx, role: discord.Role = None):
         """Legt die Rolle fest, die bei Stream-Start gepingt wird"""
         if role:
-            await self.db.execute(
-                "UPDATE twitch_config SET ping_role_id = ? WHERE guild_id = ?",
-                (str(role.id), str(ctx.guild.id))
-            )
+            await self.configs.update(ctx.guild.id, {"ping_role_id": role.id}, upsert=False)
             await ctx.send(f"✅ Die Rolle {role.mention} wird jetzt bei Stream-Ankündigungen gepingt.")
         else:
-            await self.db.execute(
-                "UPDATE twitch_config SET ping_role_id = NULL WHERE guild_id = ?",
-                (str(ctx.guild.id),)
-            )
+            await self.configs.update(ctx.guild.id, {"ping_role_id": None}, upsert=False)
             await ctx.send("✅ Bei Stream-Ankündigungen wird keine Rolle mehr gepingt.")
     
     @twitch_cmd.command(name="add")
@@ -477,7 +454,7 @@ class TwitchIntegration(commands.Cog):
         # Prüfen, ob Streamer bereits existiert
         exists = await self.db.fetch_one(
             "SELECT 1 FROM twitch_streamers WHERE streamer_name = ? AND guild_id = ?",
-            (streamer_name, str(ctx.guild.id))
+            (streamer_name, ctx.guild.id)
         )
         
         if exists:
@@ -508,7 +485,7 @@ class TwitchIntegration(commands.Cog):
                     # Streamer zur Datenbank hinzufügen
                     await self.db.execute(
                         "INSERT INTO twitch_streamers (streamer_name, guild_id, user_id) VALUES (?, ?, ?)",
-                        (streamer_name, str(ctx.guild.id), user_id)
+                        (streamer_name, ctx.guild.id, user_id)
                     )
                     
                     await ctx.send(f"✅ Der Streamer `{data['data'][0]['display_name']}` wurde zur Überwachungsliste hinzugefügt.")
@@ -524,13 +501,13 @@ class TwitchIntegration(commands.Cog):
         # Aus Datenbank entfernen
         success = await self.db.execute(
             "DELETE FROM twitch_streamers WHERE streamer_name = ? AND guild_id = ?",
-            (streamer_name, str(ctx.guild.id))
+            (streamer_name, ctx.guild.id)
         )
         
         # Auch alle Abonnements entfernen
         await self.db.execute(
             "DELETE FROM twitch_subscriptions WHERE streamer_name = ? AND guild_id = ?",
-            (streamer_name, str(ctx.guild.id))
+            (streamer_name, ctx.guild.id)
         )
         
         # Aus Cache entfernen
@@ -543,10 +520,7 @@ class TwitchIntegration(commands.Cog):
     @twitch_cmd.command(name="list")
     async def list_streamers(self, ctx):
         """Zeigt alle überwachten Streamer und deren Status an"""
-        streamers = await self.db.fetch_all(
-            "SELECT streamer_name, last_online FROM twitch_streamers WHERE guild_id = ? ORDER BY streamer_name",
-            (str(ctx.guild.id),)
-        )
+        streamers = await self.db.q.guild_streamers(ctx.guild)
         
         if not streamers:
             await ctx.send("❌ Es werden keine Streamer überwacht. Füge welche mit `!twitch add <streamer_name>` hinzu.")
@@ -565,7 +539,7 @@ class TwitchIntegration(commands.Cog):
                 for streamer_name, _ in streamers:
                     user_data = await self.db.fetch_one(
                         "SELECT user_id FROM twitch_streamers WHERE streamer_name = ? AND guild_id = ?",
-                        (streamer_name, str(ctx.guild.id))
+                        (streamer_name, ctx.guild.id)
                     )
                     
                     if user_data and user_data[0]:
@@ -592,7 +566,7 @@ class TwitchIntegration(commands.Cog):
                                         if user_id in streamer_map:
                                             live_streamers[streamer_map[user_id]] = stream
             except Exception as e:
-                print(f"Fehler beim Abrufen der Stream-Status: {e}")
+                logger.error(f"Fehler beim Abrufen der Stream-Status: {e}")
         
         # Embed für die Liste erstellen
         embed = discord.Embed(
@@ -633,7 +607,7 @@ class TwitchIntegration(commands.Cog):
         # Prüfen, ob Streamer überwacht wird
         exists = await self.db.fetch_one(
             "SELECT 1 FROM twitch_streamers WHERE streamer_name = ? AND guild_id = ?",
-            (streamer_name, str(ctx.guild.id))
+            (streamer_name, ctx.guild.id)
         )
         
         if not exists:
@@ -643,7 +617,7 @@ class TwitchIntegration(commands.Cog):
         # Prüfen, ob bereits abonniert
         already_subbed = await self.db.fetch_one(
             "SELECT 1 FROM twitch_subscriptions WHERE user_id = ? AND guild_id = ? AND streamer_name = ?",
-            (str(ctx.author.id), str(ctx.guild.id), streamer_name)
+            (ctx.author.id, ctx.guild.id, streamer_name)
         )
         
         if already_subbed:
@@ -653,7 +627,7 @@ class TwitchIntegration(commands.Cog):
         # Abonnement hinzufügen
         await self.db.execute(
             "INSERT INTO twitch_subscriptions (user_id, guild_id, streamer_name) VALUES (?, ?, ?)",
-            (str(ctx.author.id), str(ctx.guild.id), streamer_name)
+            (ctx.author.id, ctx.guild.id, streamer_name)
         )
         
         await ctx.send(f"✅ Du erhältst jetzt Benachrichtigungen, wenn `{streamer_name}` live geht.")
@@ -666,7 +640,7 @@ class TwitchIntegration(commands.Cog):
         # Abonnement entfernen
         success = await self.db.execute(
             "DELETE FROM twitch_subscriptions WHERE user_id = ? AND guild_id = ? AND streamer_name = ?",
-            (str(ctx.author.id), str(ctx.guild.id), streamer_name)
+            (ctx.author.id, ctx.guild.id, streamer_name)
         )
         
         await ctx.send(f"✅ Du erhältst keine Benachrichtigungen mehr für `{streamer_name}`.")
@@ -678,7 +652,7 @@ class TwitchIntegration(commands.Cog):
             "SELECT ts.streamer_name FROM twitch_subscriptions ts " +
             "JOIN twitch_streamers tst ON ts.streamer_name = tst.streamer_name AND ts.guild_id = tst.guild_id " +
             "WHERE ts.user_id = ? AND ts.guild_id = ?",
-            (str(ctx.author.id), str(ctx.guild.id))
+            (ctx.author.id, ctx.guild.id)
         )
         
         if not subs:
@@ -1,50 +1,29 @@
+import logging
 import discord
 from discord.ext import commands
-import aiosqlite
-from utils.db import DB_PATH
+from utils.db import Database
+from utils.config_cache import config_cache
 import asyncio
 from utils.permissions import is_admin
 
+logger = logging.getLogger(__name__)
+
 class WelcomeSystem(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.welcome_configs = {}
         self.pending_verifications = {}
-        # Lade Konfigurationen beim Start
-        self.bot.loop.create_task(self.load_configs())
-
-    async def load_configs(self):
-        """Lädt alle Server-Konfigurationen"""
-        try:
-            async with aiosqlite.connect(DB_PATH) as db:
-                async with db.execute('''
-                    SELECT guild_id, welcome_channel_id, rules_channel_id, 
-                           temp_role_id, verified_role_id, welcome_message, enabled
-                    FROM welcome_config
-                ''') as cursor:
-                    async for row in cursor:
-                        self.welcome_configs[row[0]] = {
-                            'welcome_channel_id': row[1],
-                            'rules_channel_id': row[2],
-                            'temp_role_id': row[3],
-                            'verified_role_id': row[4],
-                            'welcome_message': row[5],
-                            'enabled': row[6]
-                        }
-            print("✅ Willkommenssystem Konfigurationen geladen")
-        except Exception as e:
-            print(f"❌ Fehler beim Laden der Willkommenssystem Konfigurationen: {e}")
+        self.db = Database()
+        # Konfigurationen pro Server (wird beim ersten Zugriff geladen)
+        self.configs = config_cache("welcome_config")
 
     async def create_rules_message(self, guild_id):
         """Erstellt die Regelnachricht mit Button"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            async with db.execute('''
-                SELECT rule_number, rule_title, rule_content 
-                FROM server_rules 
-                WHERE guild_id = ? 
-                ORDER BY rule_number
-            ''', (guild_id,)) as cursor:
-                rules = await cursor.fetchall()
+        rules = await self.db.fetch_all('''
+            SELECT rule_number, rule_title, rule_content 
+            FROM server_rules 
+            WHERE guild_id = ? 
+            ORDER BY rule_number
+        ''', (guild_id,))
 
         embed = discord.Embed(
             title="📜 Serverregeln",
@@ -100,13 +79,11 @@ class WelcomeSystem(commands.Cog):
                 )
 
             # Speichere Konfiguration in der Datenbank
-            async with aiosqlite.connect(DB_PATH) as db:
-                await db.execute('''
-                    INSERT OR REPLACE INTO welcome_config 
-                    (guild_id, temp_role_id, verified_role_id, enabled) 
-                    VALUES (?, ?, ?, 1)
-                ''', (ctx.guild.id, unverified_role.id, verified_role.id))
-                await db.commit()
+            await self.configs.update(ctx.guild.id, {
+                'temp_role_id': unverified_role.id,
+                'verified_role_id': verified_role.id,
+                'enabled': 1
+            })
 
             # Bestätigungsnachricht
             embed = discord.Embed(
@@ -126,7 +103,7 @@ class WelcomeSystem(commands.Cog):
             await ctx.send(embed=embed)
 
         except Exception as e:
-            print(f"Fehler beim Setup des Willkommenssystems: {e}")
+            logger.error(f"Fehler beim Setup des Willkommenssystems: {e}")
             await ctx.send("❌ Es ist ein Fehler aufgetreten!")
 
     @welcome.command(name="channel")
@@ -134,18 +111,12 @@ class WelcomeSystem(commands.Cog):
     async def set_welcome_channel(self, ctx, channel: discord.TextChannel):
         """Setzt den Willkommenskanal"""
         try:
-            async with aiosqlite.connect(DB_PATH) as db:
-                await db.execute('''
-                    UPDATE welcome_config 
-                    SET welcome_channel_id = ?
-                    WHERE guild_id = ?
-                ''', (channel.id, ctx.guild.id))
-                await db.commit()
+            await self.configs.update(ctx.guild.id, {'welcome_channel_id': channel.id}, upsert=False)
 
             await ctx.send(f"✅ Willkommenskanal wurde auf {channel.mention} gesetzt!")
 
         except Exception as e:
-            print(f"Fehler beim Setzen des Willkommenskanals: {e}")
+            logger.error(f"Fehler beim Setzen des Willkommenskanals: {e}")
             await ctx.send("❌ Es ist ein Fehler aufgetreten!")
 
     @set_welcome_channel.error
@@ -159,13 +130,7 @@ class WelcomeSystem(commands.Cog):
     @is_admin()
     async def set_welcome_message(self, ctx, *, message: str):
         """Setzt die Willkommensnachricht"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute('''
-                INSERT OR REPLACE INTO welcome_config 
-                (guild_id, welcome_message) 
-                VALUES (?, ?)
-                ''', (ctx.guild.id, message))
-            await db.commit()
+        await self.configs.update(ctx.guild.id, {'welcome_message': message})
 
         await ctx.send(f"✅ Willkommensnachricht wurde gesetzt auf:\n{message}")
 
@@ -193,15 +158,9 @@ class WelcomeSystem(commands.Cog):
             await ctx.send("❌ Diese Rolle ist zu hoch für mich!")
             return
             
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute('''
-                INSERT OR REPLACE INTO welcome_config 
-                (guild_id, welcome_role_id) 
-                VALUES (?, ?)
-            ''', (ctx.guild.id, role.id))
-            await db.commit()
-            
-        self.welcome_configs.setdefault(ctx.guild.id, {})['welcome_role_id'] = role.id
+        if not await self.configs.update(ctx.guild.id, {'welcome_role_id': role.id}):
+            await ctx.send("❌ Die Willkommensrolle konnte nicht gespeichert werden!")
+            return
         
         embed = discord.Embed(
             title="✅ Willkommensrolle gesetzt",
@@ -216,35 +175,13 @@ class WelcomeSystem(commands.Cog):
         """Setzt den Verifikationskanal und die Rollen für das Verifikationssystem"""
         guild_id = ctx.guild.id
         
-        # Speichere die Einstellungen in der Datenbank
-        async with aiosqlite.connect(DB_PATH) as db:
-            # Prüfe, ob bereits ein Eintrag existiert
-            cursor = await db.execute('SELECT 1 FROM welcome_config WHERE guild_id = ?', (guild_id,))
-            if not await cursor.fetchone():
-                # Erstelle einen neuen Eintrag
-                await db.execute('''
-                    INSERT INTO welcome_config 
-                    (guild_id, temp_role_id, verified_role_id, rules_channel_id, enabled) 
-                    VALUES (?, ?, ?, ?, 1)
-                ''', (guild_id, temp_role.id, verified_role.id, channel.id))
-            else:
-                # Aktualisiere bestehenden Eintrag
-                await db.execute('''
-                    UPDATE welcome_config 
-                    SET temp_role_id = ?, verified_role_id = ?, rules_channel_id = ?, enabled = 1
-                    WHERE guild_id = ?
-                ''', (temp_role.id, verified_role.id, channel.id, guild_id))
-            
-            await db.commit()
-        
-        # Aktualisiere den Cache
-        if guild_id not in self.welcome_configs:
-            self.welcome_configs[guild_id] = {}
-            
-        self.welcome_configs[guild_id]['temp_role_id'] = temp_role.id
-        self.welcome_configs[guild_id]['verified_role_id'] = verified_role.id
-        self.welcome_configs[guild_id]['rules_channel_id'] = channel.id
-        self.welcome_configs[guild_id]['enabled'] = 1
+        # Speichere die Einstellungen in der Datenbank (legt den Eintrag bei Bedarf an)
+        await self.configs.update(guild_id, {
+            'temp_role_id': temp_role.id,
+            'verified_role_id': verified_role.id,
+            'rules_channel_id': channel.id,
+            'enabled': 1
+        })
         
         # Erstelle eine Verifikationsnachricht im angegebenen Kanal
         embed = discord.Embed(
@@ -263,27 +200,8 @@ class WelcomeSystem(commands.Cog):
     async def checkconfig(self, ctx):
         """Zeigt die aktuelle Konfiguration des Willkommenssystems"""
         # Aktualisiere zuerst die Konfiguration aus der Datenbank
-        async with aiosqlite.connect(DB_PATH) as db:
-            async with db.execute('''
-                SELECT welcome_channel_id, rules_channel_id, 
-                       temp_role_id, verified_role_id, welcome_message, enabled
-                FROM welcome_config
-                WHERE guild_id = ?
-            ''', (ctx.guild.id,)) as cursor:
-                config = await cursor.fetchone()
-                
-                if config:
-                    self.welcome_configs[ctx.guild.id] = {
-                        'welcome_channel_id': config[0],
-                        'rules_channel_id': config[1],
-                        'temp_role_id': config[2],
-                        'verified_role_id': config[3],
-                        'welcome_message': config[4],
-                        'enabled': config[5]
-                    }
-        
-        # Jetzt hole die Konfiguration aus dem Cache
-        config = self.welcome_configs.get(ctx.guild.id, {})
+        self.configs.invalidate(ctx.guild.id)
+        config = await self.configs.get(ctx.guild.id) or self.configs.blank()
         
         embed = discord.Embed(
             title="🔧 Willkommenssystem Konfiguration",
@@ -291,8 +209,8 @@ class WelcomeSystem(commands.Cog):
         )
         
         # Rollen
-        temp_role = ctx.guild.get_role(config.get('temp_role_id', 0))
-        verified_role = ctx.guild.get_role(config.get('verified_role_id', 0))
+        temp_role = ctx.guild.get_role(config.temp_role_id)
+        verified_role = ctx.guild.get_role(config.verified_role_id)
         
         embed.add_field(
             name="Rollen",
@@ -302,8 +220,8 @@ class WelcomeSystem(commands.Cog):
         )
         
         # Kanäle
-        welcome_channel = ctx.guild.get_channel(config.get('welcome_channel_id', 0))
-        rules_channel = ctx.guild.get_channel(config.get('rules_channel_id', 0))
+        welcome_channel = ctx.guild.get_channel(config.welcome_channel_id)
+        rules_channel = ctx.guild.get_channel(config.rules_channel_id)
         
         embed.add_field(
             name="Kanäle",
@@ -315,7 +233,7 @@ class WelcomeSystem(commands.Cog):
         # Status
         embed.add_field(
             name="Status",
-            value=f"System aktiv: {'✅' if config.get('enabled', False) else '❌'}",
+            value=f"System aktiv: {'✅' if config.enabled else '❌'}",
             inline=False
         )
         
@@ -392,73 +310,82 @@ class WelcomeSystem(commands.Cog):
                 
             return True
         except Exception as e:
-            print(f"Fehler beim Senden der Verifikationsanweisungen: {str(e)}")
+            logger.error(f"Fehler beim Senden der Verifikationsanweisungen: {str(e)}")
             return False
 
     @commands.Cog.listener()
     async def on_member_join(self, member):
         """Wird ausgeführt wenn ein neuer User dem Server beitritt"""
         try:
-            async with aiosqlite.connect(DB_PATH) as db:
-                async with db.execute('''
-                    SELECT welcome_channel_id, temp_role_id, verified_role_id, welcome_message, enabled, rules_channel_id 
-                    FROM welcome_config 
-                    WHERE guild_id = ?
-                ''', (member.guild.id,)) as cursor:
-                    config = await cursor.fetchone()
-
-                if not config or not config[4]:  # enabled check
-                    return
+            config = await self.configs.get(member.guild.id)
 
-                welcome_channel_id, temp_role_id, verified_role_id, welcome_message, _, rules_channel_id = config
+            if not config or not config.enabled:
+                return
+
+            welcome_channel_id = config.welcome_channel_id
+            temp_role_id = config.temp_role_id
+            welcome_message = config.welcome_message
+            rules_channel_id = config.rules_channel_id
+
+            # Füge Unverified-Rolle hinzu
+            if temp_role_id:
+                try:
+                    unverified_role = member.guild.get_role(temp_role_id)
+                    if unverified_role:
+                        await member.add_roles(unverified_role)
+                        logger.info(f"✅ Unverified-Rolle zu {member.name} hinzugefügt")
+                    else:
+                        logger.error(f"❌ Unverified-Rolle (ID: {temp_role_id}) nicht gefunden!")
+                except discord.Forbidden:
+                    logger.error(f"❌ Keine Berechtigung, die Unverified-Rolle zu {member.name} hinzuzufügen")
+                except Exception as e:
+                    logger.error(f"❌ Fehler beim Hinzufügen der Unverified-Rolle: {e}")
+            else:
+                logger.error(f"❌ Keine Unverified-Rolle konfiguriert für Server {member.guild.id}")
 
-                # Füge Unverified-Rolle hinzu
-                if temp_role_id:
+            # Füge die Willkommensrolle hinzu (!role)
+            if config.welcome_role_id:
+                welcome_role = member.guild.get_role(config.welcome_role_id)
+                if welcome_role:
                     try:
-                        unverified_role = member.guild.get_role(temp_role_id)
-                        if unverified_role:
-                            await member.add_roles(unverified_role)
-                            print(f"✅ Unverified-Rolle zu {member.name} hinzugefügt")
-                        else:
-                            print(f"❌ Unverified-Rolle (ID: {temp_role_id}) nicht gefunden!")
-                    except discord.Forbidden:
-                        print(f"❌ Keine Berechtigung, die Unverified-Rolle zu {member.name} hinzuzufügen")
-                    except Exception as e:
-                        print(f"❌ Fehler beim Hinzufügen der Unverified-Rolle: {e}")
+                        await member.add_roles(welcome_role)
+                        logger.info(f"✅ Willkommensrolle zu {member.name} hinzugefügt")
+                    except discord.HTTPException as e:
+                        logger.error(f"❌ Fehler beim Hinzufügen der Willkommensrolle: {e}")
                 else:
-                    print(f"❌ Keine Unverified-Rolle konfiguriert für Server {member.guild.id}")
+                    logger.error(f"❌ Willkommensrolle (ID: {config.welcome_role_id}) nicht gefunden!")
 
-                # Sende Willkommensnachricht
-                if welcome_channel_id:
-                    channel = member.guild.get_channel(welcome_channel_id)
-                    if channel:
-                        rules_channel = member.guild.get_channel(rules_channel_id) if rules_channel_id else None
-                        
-                        embed = discord.Embed(
-                            title=f"👋 Willkommen auf {member.guild.name}!",
-                            description=welcome_message or f"Willkommen {member.mention} auf unserem Server!",
-                            color=discord.Color.blue()
+            # Sende Willkommensnachricht
+            if welcome_channel_id:
+                channel = member.guild.get_channel(welcome_channel_id)
+                if channel:
+                    rules_channel = member.guild.get_channel(rules_channel_id) if rules_channel_id else None
+                    
+                    embed = discord.Embed(
+                        title=f"👋 Willkommen auf {member.guild.name}!",
+                        description=welcome_message or f"Willkommen {member.mention} auf unserem Server!",
+                        color=discord.Color.blue()
+                    )
+                    
+                    instructions = []
+                    if rules_channel:
+                        instructions.append(f"1️⃣ Lies dir bitte die Regeln in {rules_channel.mention} durch")
+                        instructions.append("2️⃣ Akzeptiere die Regeln mit ✅ um Zugriff auf alle Kanäle zu erhalten")
+                    
+                    if instructions:
+                        embed.add_field(
+                            name="📝 Nächste Schritte:",
+                            value="\n".join(instructions),
+                            inline=False
                         )
-                        
-                        instructions = []
-                        if rules_channel:
-                            instructions.append(f"1️⃣ Lies dir bitte die Regeln in {rules_channel.mention} durch")
-                            instructions.append("2️⃣ Akzeptiere die Regeln mit ✅ um Zugriff auf alle Kanäle zu erhalten")
-                        
-                        if instructions:
-                            embed.add_field(
-                                name="📝 Nächste Schritte:",
-                                value="\n".join(instructions),
-                                inline=False
-                            )
-                        
-                        embed.set_thumbnail(url=member.display_avatar.url)
-                        embed.set_footer(text=f"Du bist unser {len(member.guild.members)}. Mitglied!")
-                        
-                        await channel.send(embed=embed)
+                    
+                    embed.set_thumbnail(url=member.display_avatar.url)
+                    embed.set_footer(text=f"Du bist unser {len(member.guild.members)}. Mitglied!")
+                    
+                    await channel.send(embed=embed)
 
         except Exception as e:
-            print(f"Fehler im on_member_join Event: {e}")
+            logger.error(f"Fehler im on_member_join Event: {e}")
 
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload):
@@ -469,22 +396,18 @@ class WelcomeSystem(commands.Cog):
 
         try:
             # Lade die Konfiguration für den Server
-            async with aiosqlite.connect(DB_PATH) as db:
-                async with db.execute('''
-                    SELECT rules_channel_id, verified_role_id, temp_role_id
-                    FROM welcome_config
-                    WHERE guild_id = ?
-                ''', (payload.guild_id,)) as cursor:
-                    config = await cursor.fetchone()
+            config = await self.configs.get(payload.guild_id)
 
             if not config:
                 return
 
-            rules_channel_id, verified_role_id, temp_role_id = config
+            rules_channel_id = config.rules_channel_id
+            verified_role_id = config.verified_role_id
+            temp_role_id = config.temp_role_id
 
             # Debug-Ausgabe
-            print(f"Reaktion erkannt: User {payload.member.name}, Emoji {payload.emoji.name}")
-            print(f"Konfiguration: Rules Channel {rules_channel_id}, Verified Role {verified_role_id}")
+            logger.debug(f"Reaktion erkannt: User {payload.member.name}, Emoji {payload.emoji.name}")
+            logger.debug(f"Konfiguration: Rules Channel {rules_channel_id}, Verified Role {verified_role_id}")
 
             # Prüfe, ob die Reaktion im Verifizierungskanal ist und das richtige Emoji ist
             if payload.channel_id == rules_channel_id and str(payload.emoji) == "✅":
@@ -495,26 +418,26 @@ class WelcomeSystem(commands.Cog):
                 temp_role = guild.get_role(temp_role_id) if temp_role_id else None
                 
                 if not verified_role:
-                    print(f"❌ Verifizierte Rolle (ID: {verified_role_id}) nicht gefunden!")
+                    logger.error(f"❌ Verifizierte Rolle (ID: {verified_role_id}) nicht gefunden!")
                     return
                 
                 # Debug-Ausgabe
-                print(f"Verifizierung für {payload.member.name}: Entferne {temp_role.name if temp_role else 'keine'} Rolle, füge {verified_role.name} hinzu")
+                logger.debug(f"Verifizierung für {payload.member.name}: Entferne {temp_role.name if temp_role else 'keine'} Rolle, füge {verified_role.name} hinzu")
                 
                 # Entferne temporäre Rolle, falls vorhanden
                 if temp_role and temp_role in payload.member.roles:
                     try:
                         await payload.member.remove_roles(temp_role)
-                        print(f"✅ Temporäre Rolle von {payload.member.name} entfernt")
+                        logger.info(f"✅ Temporäre Rolle von {payload.member.name} entfernt")
                     except discord.Forbidden:
-                        print(f"❌ Keine Berechtigung, um die temporäre Rolle von {payload.member.name} zu entfernen")
+                        logger.error(f"❌ Keine Berechtigung, um die temporäre Rolle von {payload.member.name} zu entfernen")
                     except Exception as e:
-                        print(f"❌ Fehler beim Entfernen der temporären Rolle: {e}")
+                        logger.error(f"❌ Fehler beim Entfernen der temporären Rolle: {e}")
                 
                 # Füge verifizierte Rolle hinzu
                 try:
                     await payload.member.add_roles(verified_role)
-                    print(f"✅ Verifizierte Rolle zu {payload.member.name} hinzugefügt")
+                    logger.info(f"✅ Verifizierte Rolle zu {payload.member.name} hinzugefügt")
                     
                     # Sende Bestätigungsnachricht an den Benutzer
                     try:
@@ -524,37 +447,31 @@ class WelcomeSystem(commands.Cog):
                             color=discord.Color.green()
                         )
                         await payload.member.send(embed=embed)
-                        print(f"✅ Bestätigungsnachricht an {payload.member.name} gesendet")
+                        logger.info(f"✅ Bestätigungsnachricht an {payload.member.name} gesendet")
                     except discord.Forbidden:
-                        print(f"❌ Konnte keine DM an {payload.member.name} senden (DMs deaktiviert)")
+                        logger.warning(f"⚠️ Konnte keine DM an {payload.member.name} senden (DMs deaktiviert)")
                     except Exception as e:
-                        print(f"❌ Fehler beim Senden der Bestätigungsnachricht: {e}")
+                        logger.error(f"❌ Fehler beim Senden der Bestätigungsnachricht: {e}")
                         
                 except discord.Forbidden:
-                    print(f"❌ Keine Berechtigung, um die verifizierte Rolle zu {payload.member.name} hinzuzufügen")
+                    logger.error(f"❌ Keine Berechtigung, um die verifizierte Rolle zu {payload.member.name} hinzuzufügen")
                 except Exception as e:
-                    print(f"❌ Fehler beim Hinzufügen der verifizierten Rolle: {e}")
+                    logger.error(f"❌ Fehler beim Hinzufügen der verifizierten Rolle: {e}")
         
         except Exception as e:
-            print(f"❌ Fehler bei der Verarbeitung der Reaktion: {e}")
+            logger.error(f"❌ Fehler bei der Verarbeitung der Reaktion: {e}")
 
     @welcome.command(name="rules")
     @is_admin()
     async def set_rules_channel(self, ctx, channel: discord.TextChannel):
         """Setzt den Regelkanal"""
         try:
-            async with aiosqlite.connect(DB_PATH) as db:
-                await db.execute('''
-                    UPDATE welcome_config 
-                    SET rules_channel_id = ?
-                    WHERE guild_id = ?
-                ''', (channel.id, ctx.guild.id))
-                await db.commit()
+            await self.configs.update(ctx.guild.id, {'rules_channel_id': channel.id}, upsert=False)
 
             await ctx.send(f"✅ Regelkanal wurde auf {channel.mention} gesetzt!")
 
         except Exception as e:
-            print(f"Fehler beim Setzen des Regelkanals: {e}")
+            logger.error(f"Fehler beim Setzen des Regelkanals: {e}")
             await ctx.send("❌ Es ist ein Fehler aufgetreten!")
 
 class RulesView(discord.ui.View):
@@ -564,22 +481,14 @@ class RulesView(discord.ui.View):
     @discord.ui.button(label="Regeln akzeptieren", style=discord.ButtonStyle.green, custom_id="accept_rules")
     async def accept_rules(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Button zum Akzeptieren der Regeln"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            # Hole Rollen-IDs
-            async with db.execute('''
-                SELECT temp_role_id, verified_role_id 
-                FROM welcome_config 
-                WHERE guild_id = ?
-            ''', (interaction.guild_id,)) as cursor:
-                row = await cursor.fetchone()
-                if not row:
-                    return await interaction.response.send_message("❌ Willkommenssystem nicht eingerichtet!", ephemeral=True)
-                
-                temp_role_id, verified_role_id = row
+        # Hole Rollen-IDs
+        config = await config_cache("welcome_config").get(interaction.guild_id)
+        if not config:
+            return await interaction.response.send_message("❌ Willkommenssystem nicht eingerichtet!", ephemeral=True)
 
         # Hole Rollen
-        temp_role = interaction.guild.get_role(temp_role_id)
-        verified_role = interaction.guild.get_role(verified_role_id)
+        temp_role = interaction.guild.get_role(config.temp_role_id)
+        verified_role = interaction.guild.get_role(config.verified_role_id)
 
         if not all([temp_role, verified_role]):
             return await interaction.response.send_message("❌ Rollen nicht gefunden!", ephemeral=True)
@@ -10,5 +10,24 @@ WEATHER_API_KEY = os.getenv('WEATHER_API_KEY')
 TWITCH_CLIENT_ID = os.getenv('TWITCH_CLIENT_ID')
 TWITCH_CLIENT_SECRET = os.getenv('TWITCH_CLIENT_SECRET')
 
+# SQLite-Einstellungen (Pragmas für alle Verbindungen des Pools)
+DB_SYNCHRONOUS = os.getenv('DB_SYNCHRONOUS', 'NORMAL')      # OFF, NORMAL, FULL oder EXTRA
+DB_CACHE_SIZE = int(os.getenv('DB_CACHE_SIZE', '-16000'))   # negativ = Größe in KiB
+DB_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE', '67108864'))   # Bytes, 0 = deaktiviert
+DB_BUSY_TIMEOUT = int(os.getenv('DB_BUSY_TIMEOUT', '5000'))  # Millisekunden
+DB_WRITE_BATCH_SIZE = int(os.getenv('DB_WRITE_BATCH_SIZE', '100'))  # Aufträge pro Commit
+DB_DEBUG_BLOCKING = os.getenv('DB_DEBUG_BLOCKING', '0') == '1'  # Meldet blockierende DB-Aufrufe
+
+# Logging (siehe utils/logging_setup.py)
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')                     # DEBUG, INFO, WARNING, ERROR
+LOG_DEBUG_SAMPLE = float(os.getenv('LOG_DEBUG_SAMPLE', '0'))   # Anteil gesampelter DEBUG-Traces, z.B. 0.01
+LOG_FILE = os.getenv('LOG_FILE', '')                           # optionale Log-Datei (rotiert)
+
+# Eventplaner: Reaktionen werden gesammelt, die Event-Nachricht höchstens einmal pro Fenster bearbeitet
+EVENT_REFRESH_WINDOW = float(os.getenv('EVENT_REFRESH_WINDOW', '2.0'))  # Sekunden
+
+# Standard-Erinnerungen für neue Events (Minuten vor Beginn, kommagetrennt; pro Event änderbar)
+EVENT_REMINDER_OFFSETS = [int(m) for m in os.getenv('EVENT_REMINDER_OFFSETS', '1440,60,10').split(',') if m.strip()]
+
 # Debug-Print
 print(f"Token geladen: {'Ja' if DISCORD_TOKEN else 'Nein'}")
\ No newline at end of file
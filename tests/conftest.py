@@ -0,0 +1,41 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import utils.db as dbm  # noqa: E402
+
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    """Leere Datenbank im Temp-Verzeichnis (DB_PATH ist relativ zum Arbeitsverzeichnis)"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    monkeypatch.setattr(dbm, "_pools", {})
+    monkeypatch.setattr(dbm, "_schema_ready", False)
+    return dbm
+
+
+@pytest.fixture
+def run_db(fresh_db):
+    """Führt ein Szenario ``async def scenario(db)`` aus und schließt die Datenbank danach in jedem Fall"""
+    def run(scenario):
+        async def main():
+            try:
+                await fresh_db.init_db()
+                await scenario(fresh_db.Database())
+            finally:
+                await fresh_db.close_db()
+        asyncio.run(main())
+    return run
+
+
+@pytest.fixture
+def run():
+    """Führt ein Szenario ``async def scenario()`` ohne Datenbank in einem eigenen Event-Loop aus"""
+    def run(scenario):
+        asyncio.run(scenario())
+    return run
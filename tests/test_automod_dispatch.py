@@ -0,0 +1,47 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+from discord.ext import commands
+
+
+def _message(guild_id: int) -> SimpleNamespace:
+    author = SimpleNamespace(name="user", id=5, bot=False, roles=[],
+                             guild_permissions=SimpleNamespace(administrator=False))
+    return SimpleNamespace(content="hallo zusammen", guild=SimpleNamespace(id=guild_id), author=author,
+                           channel=SimpleNamespace(id=9, name="chat"))
+
+
+def test_one_automod_pass_per_message(run_db):
+    async def scenario(db):
+        bot = commands.Bot(command_prefix="!", intents=discord.Intents.default())
+        await bot._async_setup_hook()
+        await bot.load_extension("cogs.moderation_commands")
+        await bot.load_extension("cogs.automod_commands")
+
+        automod = bot.automod
+        assert bot.get_cog("ModerationCommands").automod is automod
+        assert bot.get_cog("AutoModCommands").automod is automod
+
+        calls = {"process_message": 0, "evaluate": 0}
+        process_message, evaluate = automod.process_message, automod.rules.evaluate
+
+        async def counted_process_message(message):
+            calls["process_message"] += 1
+            return await process_message(message)
+
+        def counted_evaluate(message, features):
+            calls["evaluate"] += 1
+            return evaluate(message, features)
+
+        automod.process_message = counted_process_message
+        automod.rules.evaluate = counted_evaluate
+        automod.enabled_guilds.add(1)
+
+        bot.dispatch("message", _message(1))
+        await asyncio.sleep(0.2)
+
+        assert calls == {"process_message": 1, "evaluate": 1}
+        await automod.close()
+
+    run_db(scenario)
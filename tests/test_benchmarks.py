@@ -0,0 +1,31 @@
+import json
+
+from benchmarks import automod_bench, db_bench
+
+
+def test_db_bench_smoke(run, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output = tmp_path / "db.json"
+    args = ["--scale", "0.001", "--ops", "20", "--concurrency", "2", "--variants", "pooled",
+            "--db", str(tmp_path / "fixture.db"), "--output", str(output)]
+
+    run(lambda: db_bench.main(args))
+
+    results = json.loads(output.read_text())["results"]["pooled"]
+    assert set(results) == set(db_bench.OPERATIONS) | {"mixed"}
+    assert all(results[name]["ops"] == 20 for name in db_bench.OPERATIONS)
+    assert results["mixed"]["ops"] == 20 * len(db_bench.OPERATIONS)
+
+
+def test_automod_bench_replays_a_recorded_stream(run, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    stream, output = tmp_path / "stream.jsonl", tmp_path / "automod.json"
+    synthetic = ["--messages", "300", "--guilds", "2", "--users", "50"]
+
+    run(lambda: automod_bench.main(synthetic + ["--record", str(stream)]))
+    assert len(stream.read_text().splitlines()) >= 300
+    run(lambda: automod_bench.main(["--replay", str(stream), "--checkpoints", "2", "--output", str(output)]))
+
+    report = json.loads(output.read_text())
+    assert report["meta"]["source"] != "synthetic"
+    assert report["results"]["violations"]
@@ -0,0 +1,26 @@
+import sqlite3
+
+import utils.db as dbm
+
+
+def test_sync_sqlite_calls_on_the_loop_are_reported(run, monkeypatch, tmp_path):
+    # enable_blocking_detection() ersetzt sqlite3.connect; monkeypatch stellt es danach wieder her
+    monkeypatch.setattr(sqlite3, "connect", sqlite3.connect)
+    monkeypatch.setattr(dbm, "blocking_calls", dbm.Counter())
+    dbm.enable_blocking_detection()
+
+    # Außerhalb eines Event-Loops (z.B. im aiosqlite-Thread) wird nichts gemeldet
+    sqlite3.connect(tmp_path / "ok.db").close()
+    assert not dbm.blocking_calls
+
+    async def scenario():
+        conn = sqlite3.connect(tmp_path / "blocking.db")
+        conn.execute("SELECT 1")
+        conn.close()
+
+    run(scenario)
+    assert sum(dbm.blocking_calls.values()) == 2  # connect und execute
+
+
+def test_database_has_no_blocking_helpers():
+    assert not [name for name in dir(dbm.Database) if name.endswith("_sync")]
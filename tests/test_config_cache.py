@@ -0,0 +1,42 @@
+import asyncio
+
+from utils.config_cache import CONFIG_TABLES, GuildConfigCache
+
+
+def test_update_during_initial_load_is_not_lost(run_db):
+    async def scenario(db):
+        cache = GuildConfigCache("channel_config", CONFIG_TABLES["channel_config"], db)
+        await cache.update(1, {"mod_log_channel_id": 10})
+        cache.invalidate()
+
+        # load() hat die Tabelle schon gelesen, als update() committet
+        read, release = asyncio.Event(), asyncio.Event()
+        fetch_all = db.fetch_all
+
+        async def stalled_fetch_all(query, params=()):
+            rows = await fetch_all(query, params)
+            read.set()
+            await release.wait()
+            return rows
+        db.fetch_all = stalled_fetch_all
+
+        loading = asyncio.create_task(cache.load())
+        await read.wait()
+        assert await cache.update(1, {"mod_log_channel_id": 20})
+        release.set()
+        await loading
+
+        assert (await cache.get(1)).mod_log_channel_id == 20
+
+    run_db(scenario)
+
+
+def test_welcome_role_is_stored_and_failed_updates_are_reported(run_db):
+    async def scenario(db):
+        cache = GuildConfigCache("welcome_config", CONFIG_TABLES["welcome_config"], db)
+        assert await cache.update(1, {"welcome_role_id": 42})
+        assert (await cache.get(1)).welcome_role_id == 42
+
+        assert not await cache.update(1, {"unbekannte_spalte": 1})
+
+    run_db(scenario)
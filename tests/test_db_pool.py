@@ -0,0 +1,121 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+INSERT_RULE = "INSERT INTO server_rules (guild_id, rule_number, rule_content) VALUES (?, ?, ?)"
+
+
+def test_cancelled_writer_waiter_does_not_block_later_writes(run_db, fresh_db):
+    async def scenario(db):
+        pool = fresh_db.get_pool()
+        holding = asyncio.Event()
+        release = asyncio.Event()
+
+        async def hold_writer():
+            async with pool.writer():
+                holding.set()
+                await release.wait()
+
+        async def wait_for_writer():
+            async with pool.writer():
+                pass
+
+        holder = asyncio.create_task(hold_writer())
+        await holding.wait()
+        waiter = asyncio.create_task(wait_for_writer())
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        release.set()
+        await holder
+
+        # Ohne Freigabe des abgebrochenen Auftrags hängt hier jeder weitere Schreibzugriff
+        await asyncio.wait_for(db.execute(INSERT_RULE, (1, 1, "x")), 2)
+        assert waiter.cancelled()
+        assert await db.fetch_one("SELECT rule_content FROM server_rules WHERE guild_id = 1") == ("x",)
+
+    run_db(scenario)
+
+
+def test_cancel_inside_transaction_rolls_back_and_keeps_writer(run_db, fresh_db):
+    async def scenario(db):
+        inside = asyncio.Event()
+
+        async def cancelled_transaction():
+            async with db.transaction() as tx:
+                await tx.execute(INSERT_RULE, (1, 1, "verworfen"))
+                inside.set()
+                await asyncio.Event().wait()
+
+        task = asyncio.create_task(cancelled_transaction())
+        await inside.wait()
+        task.cancel()
+        await asyncio.wait_for(asyncio.gather(task, return_exceptions=True), 2)
+        assert task.cancelled()
+
+        # Der Writer-Task läuft weiter, die abgebrochene Zeile wurde zurückgerollt
+        assert not fresh_db.get_pool()._writer_task.done()
+        await asyncio.wait_for(db.execute(INSERT_RULE, (1, 2, "danach")), 2)
+        assert await db.fetch_all("SELECT rule_content FROM server_rules WHERE guild_id = 1") == [("danach",)]
+
+    run_db(scenario)
+
+
+def test_named_write_queries_raise_database_errors(run_db):
+    async def scenario(db):
+        assert await db.q.forget_event_message(1) == 0
+        await db.execute("DROP TABLE event_messages")
+
+        # Ein Fehler darf nicht wie "keine Zeile geändert" aussehen
+        with pytest.raises(sqlite3.OperationalError):
+            await db.q.forget_event_message(1)
+        with pytest.raises(sqlite3.OperationalError):
+            await db.q.forget_event_message.many([(1,), (2,)])
+        assert await db.q.forget_event_message.many([]) == 0
+
+    run_db(scenario)
+
+
+def test_failed_job_in_a_batch_does_not_roll_back_the_others(run_db, fresh_db):
+    async def scenario(db):
+        pool = fresh_db.get_pool()
+        commits = pool.stats()["commits"]
+
+        def insert(number):
+            return lambda conn: conn.execute(INSERT_RULE, (1, number, f"regel {number}"))
+
+        async def failing(conn):
+            await conn.execute(INSERT_RULE, (1, 99, "verworfen"))
+            raise sqlite3.IntegrityError("absichtlich")
+
+        # Alle drei Aufträge landen vor dem ersten Commit in der Warteschlange
+        results = await asyncio.gather(pool.write(insert(1)), pool.write(failing), pool.write(insert(2)),
+                                       return_exceptions=True)
+
+        assert isinstance(results[1], sqlite3.IntegrityError)
+        assert await db.fetch_all("SELECT rule_number FROM server_rules ORDER BY rule_number") == [(1,), (2,)]
+        assert pool.stats()["commits"] == commits + 1
+        assert pool.stats()["failed_write_jobs"] == 1
+
+    run_db(scenario)
+
+
+def test_bulk_helpers_write_all_or_nothing(run_db):
+    async def scenario(db):
+        rows = [{"guild_id": 1, "rule_number": number, "rule_content": f"regel {number}"} for number in (1, 2)]
+        assert await db.upsert_many("server_rules", rows, ("guild_id", "rule_number")) == 2
+        assert await db.upsert("server_rules", {"guild_id": 1, "rule_number": 2, "rule_content": "neu"},
+                               ("guild_id", "rule_number"))
+
+        # Ein fehlerhafter Satz verwirft den ganzen Stapel
+        assert await db.executemany(INSERT_RULE, [(1, 3, "drei"), (1, 1, "doppelt")]) == 0
+
+        with pytest.raises(RuntimeError):
+            async with db.transaction() as tx:
+                await tx.execute(INSERT_RULE, (1, 4, "vier"))
+                raise RuntimeError("abbrechen")
+
+        assert await db.fetch_all("SELECT rule_number, rule_content FROM server_rules ORDER BY rule_number") == \
+            [(1, "regel 1"), (2, "neu")]
+
+    run_db(scenario)
@@ -0,0 +1,58 @@
+import asyncio
+from types import SimpleNamespace
+
+from utils.enforcement import EnforcementQueue
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+        self.deleted = []
+
+    async def delete_messages(self, messages, reason=None):
+        self.deleted.append([message.id for message in messages])
+
+
+class FakeUser:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.name = f"user{user_id}"
+        self.dms = []
+
+    async def send(self, embed=None):
+        self.dms.append(embed.fields[0].value)
+
+
+class FakeMessage:
+    def __init__(self, message_id, channel, author):
+        self.id = message_id
+        self.channel = channel
+        self.author = author
+        self.guild = SimpleNamespace(id=1)
+
+    async def delete(self):
+        self.channel.deleted.append([self.id])
+
+
+def test_violations_in_one_window_are_coalesced(run):
+    async def scenario():
+        queue = EnforcementQueue(SimpleNamespace(log_channels={}), action_window=0.01)
+        channel, user = FakeChannel(9), FakeUser(5)
+
+        queue.submit(FakeMessage(1, channel, user), "spam")
+        queue.submit(FakeMessage(2, channel, user), "spam")
+        queue.submit(FakeMessage(3, channel, user), "excessive_caps")
+        await asyncio.sleep(0.1)
+
+        assert channel.deleted == [[1, 2, 3]]
+        assert len(user.dms) == 1
+        assert user.dms[0].count("\n") == 1  # beide Gründe in einer DM
+
+        # Innerhalb des DM-Cooldowns wird nur noch gelöscht
+        queue.submit(FakeMessage(4, channel, user), "spam")
+        await queue.close()
+        assert len(user.dms) == 1
+        assert queue.counters["warnings_suppressed"] == 1
+        assert channel.deleted[-1] == [4]
+
+    run(scenario)
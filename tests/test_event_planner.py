@@ -0,0 +1,308 @@
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+import discord
+from discord.ext import commands
+
+GUILD = SimpleNamespace(id=1, name="Server")
+CHANNEL = SimpleNamespace(id=9)
+
+
+async def load_planner():
+    """Bot mit geladenem Eventplaner (die Datenbank ist bereits migriert)"""
+    bot = commands.Bot(command_prefix="!", intents=discord.Intents.default())
+    await bot._async_setup_hook()
+    await bot.load_extension("cogs.event_planner")
+    return bot, bot.get_cog("EventPlanner")
+
+
+async def add_event(db, start_time="2099-01-01T20:00:00+01:00", max_participants=0, message_id=None):
+    return await db.insert("events", {
+        "guild_id": GUILD.id, "channel_id": CHANNEL.id, "creator_id": 5, "title": "Spieleabend",
+        "start_time": start_time, "max_participants": max_participants, "message_id": message_id,
+    })
+
+
+def posted(message_id: int) -> SimpleNamespace:
+    return SimpleNamespace(id=message_id, guild=GUILD, channel=CHANNEL)
+
+
+def test_message_index_keeps_announcement_and_latest_copy(run_db):
+    async def scenario(db):
+        bot, planner = await load_planner()
+        event_id = await add_event(db)
+
+        await planner.register_event_message(posted(100), event_id, announcement=True)
+        for message_id in (101, 102, 103):
+            await planner.register_event_message(posted(message_id), event_id)
+
+        assert planner.event_messages == {100: event_id, 103: event_id}
+        assert await db.fetch_all("SELECT message_id FROM event_messages ORDER BY message_id") == [(100,), (103,)]
+        await bot.unload_extension("cogs.event_planner")
+
+    run_db(scenario)
+
+
+def test_message_index_drops_ended_events_on_load(run_db):
+    async def scenario(db):
+        bot, planner = await load_planner()
+        upcoming = await add_event(db)
+        ended = await add_event(db, start_time="2000-01-01T20:00:00+01:00")
+        await planner.register_event_message(posted(200), upcoming, announcement=True)
+        await planner.register_event_message(posted(201), ended, announcement=True)
+
+        await bot.reload_extension("cogs.event_planner")
+        planner = bot.get_cog("EventPlanner")
+        assert planner.event_messages == {200: upcoming}
+        assert await db.fetch_all("SELECT message_id FROM event_messages") == [(200,)]
+
+        # Reaktionen auf andere Nachrichten werden ohne Kanal-Lookup verworfen
+        def no_lookup(channel_id):
+            raise AssertionError("Kanal-Lookup für eine fremde Nachricht")
+        bot.get_channel = no_lookup
+        await planner.on_raw_reaction_add(SimpleNamespace(message_id=201, user_id=7, channel_id=9))
+        await bot.unload_extension("cogs.event_planner")
+
+    run_db(scenario)
+
+
+class FakePartialMessage:
+    def __init__(self, channel, message_id):
+        self.channel = channel
+        self.id = message_id
+
+    async def edit(self, embed):
+        if self.id in self.channel.deleted:
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Message")
+        self.channel.edits.append((self.id, [field.name for field in embed.fields]))
+
+
+class FakeChannel:
+    def __init__(self):
+        self.id = CHANNEL.id
+        self.edits = []
+        self.deleted = set()
+
+    def get_partial_message(self, message_id):
+        return FakePartialMessage(self, message_id)
+
+
+class FakeMember:
+    def __init__(self, user_id):
+        self.id = user_id
+        self.display_name = f"user{user_id}"
+        self.mention = f"<@{user_id}>"
+        self.dms = []
+
+    async def send(self, text):
+        self.dms.append(text)
+
+
+def fake_guild(channel):
+    return SimpleNamespace(id=GUILD.id, name=GUILD.name, get_channel=lambda channel_id: channel,
+                           get_member=FakeMember)
+
+
+def test_announcement_is_edited_in_place(run_db):
+    async def scenario(db):
+        bot, planner = await load_planner()
+        channel = FakeChannel()
+        guild = fake_guild(channel)
+        event_id = await add_event(db, message_id=300)
+        await db.q.set_participation(event_id, 7, "accepted")
+
+        roster = await planner.rosters.get(event_id)
+        await planner.edit_event_messages(guild, event_id, roster, [channel.get_partial_message(301)])
+        assert sorted(message_id for message_id, _ in channel.edits) == [300, 301]
+        assert "✅ Zusagen (1)" in channel.edits[0][1]
+
+        # Gelöschte Ankündigung: wird aus dem Event ausgetragen statt weiter bearbeitet
+        channel.deleted.add(300)
+        await planner.edit_event_messages(guild, event_id, roster)
+        assert await db.fetch_one("SELECT message_id FROM events WHERE event_id = ?", (event_id,)) == (None,)
+        await bot.unload_extension("cogs.event_planner")
+
+    run_db(scenario)
+
+
+def test_reactions_in_one_window_are_coalesced(run_db):
+    async def scenario(db):
+        bot, planner = await load_planner()
+        planner.refresher.window = 0.01
+        channel = FakeChannel()
+        guild = fake_guild(channel)
+        event_id = await add_event(db, message_id=400)
+        writes = []
+        write_many = db.q.set_participation.many
+
+        async def counted_many(rows):
+            writes.append(list(rows))
+            return await write_many(rows)
+        planner.db.q.set_participation.many = counted_many
+
+        members = [FakeMember(user_id) for user_id in (7, 8)]
+        planner.refresher.submit(guild, members[0], event_id, "declined")
+        planner.refresher.submit(guild, members[0], event_id, "accepted")
+        planner.refresher.submit(guild, members[1], event_id, "maybe")
+        await asyncio.sleep(0.1)
+
+        assert writes == [[(event_id, 7, "accepted"), (event_id, 8, "maybe")]]
+        assert [message_id for message_id, _ in channel.edits] == [400]
+        assert [len(member.dms) for member in members] == [1, 1]
+        await bot.unload_extension("cogs.event_planner")
+
+    run_db(scenario)
+
+
+def test_reaction_during_flush_is_written(run_db):
+    async def scenario(db):
+        bot, planner = await load_planner()
+        planner.refresher.window = 0.01
+        guild = fake_guild(FakeChannel())
+        event_id = await add_event(db, message_id=500)
+
+        # Der erste Flush hängt beim Laden der Teilnehmerliste fest
+        started, release = asyncio.Event(), asyncio.Event()
+        get_roster = planner.rosters.get
+
+        async def stalled_get(key):
+            started.set()
+            await release.wait()
+            return await get_roster(key)
+        planner.rosters.get = stalled_get
+
+        planner.refresher.submit(guild, FakeMember(7), event_id, "accepted")
+        await asyncio.wait_for(started.wait(), 1)
+        planner.refresher.submit(guild, FakeMember(8), event_id, "declined")
+        release.set()
+        await asyncio.sleep(0.1)
+
+        assert await db.fetch_all("SELECT user_id, status FROM event_participants ORDER BY user_id") == \
+            [(7, "accepted"), (8, "declined")]
+        assert planner.refresher.pending() == 0
+        await bot.unload_extension("cogs.event_planner")
+
+    run_db(scenario)
+
+
+def test_failed_write_is_retried(run_db):
+    async def scenario(db):
+        bot, planner = await load_planner()
+        planner.refresher.window = 0.01
+        guild = fake_guild(FakeChannel())
+        event_id = await add_event(db, message_id=600)
+        roster_before = await planner.rosters.get(event_id)
+
+        # Gesperrte Datenbank auf Ebene des Pools (wie ein echtes "database is locked")
+        pool = planner.db.pool
+        write = pool.write
+        locked = True
+
+        async def locked_write(job):
+            if locked:
+                raise sqlite3.OperationalError("database is locked")
+            return await write(job)
+        pool.write = locked_write
+
+        member = FakeMember(7)
+        planner.refresher.submit(guild, member, event_id, "accepted")
+        await asyncio.sleep(0.05)
+
+        # Nichts gespeichert: keine Bestätigung, kein erfundener Stand im Cache
+        assert member.dms == []
+        assert await planner.rosters.get(event_id) is roster_before
+        assert planner.refresher.pending() == 1
+
+        locked = False
+        await asyncio.sleep(0.1)
+        assert await db.fetch_all("SELECT user_id, status FROM event_participants") == [(7, "accepted")]
+        assert len(member.dms) == 1
+        await bot.unload_extension("cogs.event_planner")
+
+    run_db(scenario)
+
+
+def test_create_command_keeps_time_parameter_name(run_db):
+    async def scenario(db):
+        bot, planner = await load_planner()
+        assert bot.get_command("event create").signature == "<title> <date> <time> [description=Keine Beschreibung]"
+        await bot.unload_extension("cogs.event_planner")
+
+    run_db(scenario)
+
+
+def test_roster_cache_invalidation_reloads_from_database(run_db):
+    async def scenario(db):
+        bot, planner = await load_planner()
+        rosters = planner.rosters
+        event_id = await add_event(db)
+        await db.q.set_participation(event_id, 7, "accepted")
+
+        roster = await rosters.get(event_id)
+        assert await rosters.get(event_id) is roster
+        assert (rosters.hits, rosters.misses) == (1, 1)
+
+        # Schreibzugriff am Cache vorbei: erst nach invalidate sichtbar
+        await db.q.set_participation(event_id, 8, "declined")
+        assert not any(row.user_id == 8 for row in (await rosters.get(event_id)).rows)
+        rosters.invalidate(event_id)
+        assert len(rosters) == 0
+        reloaded = await rosters.get(event_id)
+        assert reloaded is not roster and rosters.misses == 2
+        assert sorted((row.user_id, row.status) for row in reloaded.rows) == [(7, "accepted"), (8, "declined")]
+
+        # Gelöschtes Event: kein Eintrag im Cache
+        await db.execute("DELETE FROM events WHERE event_id = ?", (event_id,))
+        rosters.invalidate(event_id)
+        assert await rosters.get(event_id) is None and len(rosters) == 0
+        await bot.unload_extension("cogs.event_planner")
+
+    run_db(scenario)
+
+
+class FakeContext:
+    """Minimaler Befehlskontext (Antworten landen in ``sent``)"""
+
+    def __init__(self, guild, author):
+        self.guild = guild
+        self.author = author
+        self.sent = []
+
+    async def send(self, content=None, embed=None):
+        self.sent.append(content or embed)
+        return SimpleNamespace(id=900 + len(self.sent), guild=self.guild, channel=CHANNEL,
+                               add_reaction=self._add_reaction)
+
+    async def _add_reaction(self, emoji):
+        pass
+
+
+def test_command_during_flush_does_not_leave_stale_roster(run_db):
+    async def scenario(db):
+        bot, planner = await load_planner()
+        planner.refresher.window = 0.01
+        guild = fake_guild(FakeChannel())
+        event_id = await add_event(db, message_id=700)
+
+        # Der Flush hat die Teilnehmerliste schon gelesen und hängt beim Schreiben
+        started, release = asyncio.Event(), asyncio.Event()
+        write_many = db.q.set_participation.many
+
+        async def stalled_many(rows):
+            started.set()
+            await release.wait()
+            return await write_many(rows)
+        planner.db.q.set_participation.many = stalled_many
+
+        planner.refresher.submit(guild, FakeMember(7), event_id, "accepted")
+        await asyncio.wait_for(started.wait(), 1)
+        await planner.update_participation(FakeContext(guild, FakeMember(8)), event_id, "declined")
+        release.set()
+        await asyncio.sleep(0.1)
+
+        roster = await planner.rosters.get(event_id)
+        assert sorted((row.user_id, row.status) for row in roster.rows) == [(7, "accepted"), (8, "declined")]
+        await bot.unload_extension("cogs.event_planner")
+
+    run_db(scenario)
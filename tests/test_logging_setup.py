@@ -0,0 +1,27 @@
+import ast
+import logging
+import os
+
+from utils.logging_setup import DebugSampler
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def _record(level: int) -> logging.LogRecord:
+    return logging.LogRecord("utils.automod", level, __file__, 1, "nachricht", (), None)
+
+
+def test_debug_sampler_only_thins_out_records_below_its_level():
+    dropping = DebugSampler(rate=0.0, level=logging.INFO)
+    assert not dropping.filter(_record(logging.DEBUG))
+    assert dropping.filter(_record(logging.INFO))
+    assert DebugSampler(rate=1.0, level=logging.INFO).filter(_record(logging.DEBUG))
+
+
+def test_automod_hot_path_has_no_print_calls():
+    for path in ("utils/automod.py", "cogs/automod_commands.py"):
+        with open(os.path.join(ROOT, path), encoding="utf-8") as source:
+            tree = ast.parse(source.read())
+        prints = [node.lineno for node in ast.walk(tree)
+                  if isinstance(node, ast.Call) and getattr(node.func, "id", None) == "print"]
+        assert prints == [], f"print() in {path}: Zeilen {prints}"
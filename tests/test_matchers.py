@@ -0,0 +1,39 @@
+from utils.matchers import DomainMatcher, WordMatcher
+
+
+def test_word_matcher_uses_word_boundaries_and_shared_prefixes():
+    matcher = WordMatcher(["spam", "spammer", "scam"])
+
+    assert matcher.find("kein spam bitte") == "spam"
+    assert matcher.find("der spammer ist da") == "spammer"
+    assert matcher.find("scam link") == "scam"
+    assert matcher.find("spamming und scammer") is None
+    assert matcher.pattern.pattern == r"\b(?:s(?:cam|pam(?:mer)?))\b"
+
+
+def test_word_matcher_updates_after_discard():
+    matcher = WordMatcher(["spam", "spammer"])
+    matcher.discard("spam")
+
+    assert "spam" not in matcher and len(matcher) == 1
+    assert matcher.find("nur spam") is None
+    assert matcher.find("ein spammer") == "spammer"
+
+    matcher.discard("spammer")
+    assert matcher.pattern is None and matcher.find("spammer") is None
+
+
+def test_domain_matcher_hits_subdomains_and_path_prefixes_only():
+    matcher = DomainMatcher(["discord.gg", "t.co", "example.com/invite", "*.ru", "grabify"])
+
+    assert matcher.find("join https://discord.gg/abc") == ("discord.gg/abc", "discord.gg")
+    assert matcher.find("www.discord.gg") == ("www.discord.gg", "discord.gg")
+    assert matcher.find("see reddit.com and bit.co") is None
+    assert matcher.find("example.com/invite/xyz.") == ("example.com/invite/xyz", "example.com/invite")
+    assert matcher.find("example.com/invites") is None
+    assert matcher.find("mail.yandex.ru") == ("mail.yandex.ru", "*.ru")
+    assert matcher.find("grabify.link/x") == ("grabify.link/x", "grabify")
+
+    matcher.discard("discord.gg")
+    assert matcher.find("discord.gg/abc") is None
+    assert matcher.find("t.co/x") == ("t.co/x", "t.co")
@@ -0,0 +1,18 @@
+from utils.message_features import MessageFeatures, count_chars
+
+
+def test_ascii_and_unicode_counts_agree():
+    assert count_chars("HALLO welt <:pog:123>") == (5, 12, 1)
+    # Nicht-ASCII: Umlaute zählen als Buchstaben, Zeichen ab U+10000 als Emoji
+    assert count_chars("ÄRGER über 😀😀") == (5, 9, 2)
+
+
+def test_features_are_computed_once_and_lazily():
+    features = MessageFeatures("Schau auf Discord.GG/abc und EXAMPLE.com!")
+    assert features.lower == "schau auf discord.gg/abc und example.com!"
+    assert features._counts is None and features._links is None
+
+    assert features.links == [("discord.gg", "/abc"), ("example.com", "")]
+    assert features.links is features.links
+    assert features.upper_count == 11
+    assert features.digest == hash(features.content)
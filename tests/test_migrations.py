@@ -0,0 +1,47 @@
+import aiosqlite
+
+from utils.migrations import MIGRATIONS, migrate
+
+
+def test_migrations_run_once_in_order(run, tmp_path):
+    async def scenario():
+        async with aiosqlite.connect(tmp_path / "bot.db") as conn:
+            assert await migrate(conn) == [migration.version for migration in MIGRATIONS]
+            assert await migrate(conn) == []
+            async with conn.execute("SELECT version FROM schema_version ORDER BY version") as cursor:
+                assert [row[0] for row in await cursor.fetchall()] == list(range(1, len(MIGRATIONS) + 1))
+
+    run(scenario)
+
+
+def test_legacy_temp_voice_columns_are_renamed(run, tmp_path):
+    async def scenario():
+        async with aiosqlite.connect(tmp_path / "bot.db") as conn:
+            # Ältere Installation vor den Migrationen
+            await conn.execute("CREATE TABLE temp_voice_config (guild_id INTEGER PRIMARY KEY, channel_id INTEGER, "
+                               "category_id INTEGER, max_per_user INTEGER DEFAULT 1)")
+            await conn.execute("INSERT INTO temp_voice_config VALUES (1, 10, 20, 3)")
+            await migrate(conn)
+
+            async with conn.execute("SELECT creator_channel_id, user_limit FROM temp_voice_config") as cursor:
+                assert await cursor.fetchall() == [(10, 3)]
+
+    run(scenario)
+
+
+def test_text_snowflakes_become_integers(run, tmp_path):
+    async def scenario():
+        async with aiosqlite.connect(tmp_path / "bot.db") as conn:
+            await conn.execute("CREATE TABLE reaction_roles (message_id TEXT, emoji TEXT, role_id TEXT, "
+                               "guild_id TEXT, channel_id TEXT, description TEXT, PRIMARY KEY (message_id, emoji))")
+            await conn.execute("INSERT INTO reaction_roles VALUES ('1234567890123456789', '✅', '42', '1', '9', NULL)")
+            await migrate(conn)
+
+            async with conn.execute("SELECT typeof(message_id), typeof(role_id), typeof(guild_id), message_id "
+                                    "FROM reaction_roles") as cursor:
+                assert await cursor.fetchall() == [("integer", "integer", "integer", 1234567890123456789)]
+            # Der Index aus Migration 3 wurde nach dem Umbau neu angelegt
+            async with conn.execute("SELECT name FROM sqlite_master WHERE name = 'idx_reaction_roles_guild'") as cursor:
+                assert await cursor.fetchone() is not None
+
+    run(scenario)
@@ -0,0 +1,25 @@
+import pytest
+
+from utils.queries import QUERIES, ReminderEvent
+
+
+def test_named_queries_return_typed_rows(run_db):
+    async def scenario(db):
+        event_id = await db.insert("events", {"guild_id": 1, "channel_id": 9, "creator_id": 5, "title": "Turnier",
+                                              "start_time": "2099-01-01T20:00:00+01:00"})
+        await db.q.set_participation.many([(event_id, 7, "accepted"), (event_id, 8, "declined")])
+
+        event = await db.q.reminder_event(event_id)
+        assert isinstance(event, ReminderEvent)
+        assert (event.guild_id, event.title) == (1, "Turnier")
+        assert await db.q.reminder_event(event_id + 1) is None
+        assert await db.q.accepted_participants(event_id) == [7]
+        assert await db.q.accepted_count(event_id) == 1
+
+        # Aufrufer werden pro Instanz einmal erzeugt
+        assert db.q.reminder_event is db.q.reminder_event
+        assert db.q.reminder_event.__doc__ == QUERIES["reminder_event"].sql
+        with pytest.raises(AttributeError):
+            db.q.gibt_es_nicht
+
+    run_db(scenario)
@@ -0,0 +1,15 @@
+from utils.query_audit import HOT_QUERIES, audit_query_plans
+
+
+def test_hot_queries_use_an_index(run_db):
+    async def scenario(db):
+        async with db.pool.reader() as conn:
+            failures = await audit_query_plans(conn)
+            # Gegenprobe: ein Full Scan wird auch wirklich erkannt
+            full_scan = await audit_query_plans(conn, {"scan": "SELECT event_id FROM events WHERE title = ?"})
+
+        assert HOT_QUERIES
+        assert failures == {}
+        assert list(full_scan) == ["scan"]
+
+    run_db(scenario)
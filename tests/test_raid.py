@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+
+from utils.raid import CALM_PERIOD, DUPLICATE_USERS, RaidDetector
+
+
+def _message(user_id: int) -> SimpleNamespace:
+    return SimpleNamespace(guild=SimpleNamespace(id=1), author=SimpleNamespace(id=user_id))
+
+
+def test_duplicate_content_from_many_accounts_starts_and_ends_lockdown():
+    changes = []
+    detector = RaidDetector(on_change=lambda guild_id, locked, reason: changes.append(locked))
+    text = "kostenlose nitro hier abholen"
+
+    results = [detector.record_message(_message(user_id), text, now=float(user_id))
+               for user_id in range(DUPLICATE_USERS)]
+
+    assert all(not flagged for flagged, _ in results[:-1])
+    flagged, earlier = results[-1]
+    assert flagged and len(earlier) == DUPLICATE_USERS - 1
+    assert detector.in_lockdown(1, now=DUPLICATE_USERS)
+
+    # Weitere Kopien sind markiert, liefern die früheren Kopien aber nicht erneut
+    assert detector.record_message(_message(99), text, now=DUPLICATE_USERS + 1.0) == (True, [])
+
+    assert not detector.in_lockdown(1, now=DUPLICATE_USERS + 1.0 + CALM_PERIOD)
+    assert changes == [True, False]
+
+
+def test_short_or_distinct_messages_are_not_flagged():
+    detector = RaidDetector()
+    for user_id in range(DUPLICATE_USERS * 2):
+        assert detector.record_message(_message(user_id), "gg", now=float(user_id)) == (False, [])
+        assert detector.record_message(_message(user_id), f"eigene nachricht nummer {'x' * user_id}",
+                                       now=float(user_id))[0] is False
+    assert not detector.in_lockdown(1, now=100.0)
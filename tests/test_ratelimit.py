@@ -0,0 +1,31 @@
+from utils.ratelimit import Cooldown, RepeatCounter, SlidingWindow, TimerWheel
+
+
+def test_sliding_window_counts_within_interval_and_sweeps_idle_keys():
+    window = SlidingWindow(idle_after=10.0, sweep_interval=5.0)
+    assert [window.hit("a", limit=3, interval=2.0, now=t) for t in (0.0, 0.5, 1.0, 1.5)] == [1, 2, 3, 3]
+    assert window.hit("a", limit=3, interval=2.0, now=3.2) == 2
+
+    window.hit("b", limit=3, interval=2.0, now=4.0)
+    window.hit("b", limit=3, interval=2.0, now=20.0)
+    assert len(window) == 1  # "a" war zu lange inaktiv
+
+
+def test_repeat_counter_expires_after_interval():
+    counter = RepeatCounter(TimerWheel(tick=1.0, slots=8))
+    assert [counter.hit("a", "hallo", interval=5.0, now=t) for t in (0.0, 1.0, 2.0)] == [1, 2, 3]
+    assert counter.hit("a", "anders", interval=5.0, now=2.0) == 1
+
+    assert counter.hit("a", "hallo", interval=5.0, now=6.0) == 1
+    # Auch Verzögerungen über eine Umdrehung des Rads hinaus laufen korrekt ab
+    assert counter.hit("b", "x", interval=20.0, now=6.0) == 1
+    assert counter.hit("b", "x", interval=20.0, now=15.0) == 2
+    assert counter.hit("b", "x", interval=20.0, now=27.0) == 1
+
+
+def test_cooldown_allows_once_per_period():
+    cooldown = Cooldown(10.0, sweep_interval=5.0)
+    assert [cooldown.ready("a", now=t) for t in (0.0, 5.0, 10.0)] == [True, False, True]
+    assert cooldown.ready("b", now=11.0)
+    cooldown.ready("c", now=30.0)
+    assert len(cooldown) == 1
@@ -0,0 +1,41 @@
+from types import SimpleNamespace
+
+from utils.message_features import MessageFeatures
+from utils.rules_engine import RuleEngine
+
+MESSAGE = SimpleNamespace(guild=SimpleNamespace(id=1))
+FEATURES = MessageFeatures("hallo")
+
+
+def test_cheap_likely_rules_run_first_and_stateful_rules_last():
+    calls = []
+
+    def check(name, hit=False):
+        def run(message, features):
+            calls.append(name)
+            return hit
+        return run
+
+    engine = RuleEngine()
+    engine.register("spam", check("spam"), stateful=True)
+    engine.register("teuer", check("teuer"), cost=50.0, hit_rate=0.01)
+    engine.register("billig", check("billig", hit=True), cost=1.0, hit_rate=0.05)
+
+    assert engine.order() == ["billig", "teuer", "spam"]
+    assert engine.evaluate(MESSAGE, FEATURES) == "billig"
+    # Abbruch beim ersten Treffer: spätere Regeln (auch zählende) sehen die Nachricht nicht
+    assert calls == ["billig"]
+
+
+def test_rules_can_be_disabled_per_guild():
+    engine = RuleEngine()
+    engine.register("links", lambda message, features: True)
+    engine.register("caps", lambda message, features: False)
+
+    engine.set_enabled(1, "links", False)
+    assert engine.evaluate(MESSAGE, FEATURES) is None
+    assert engine.evaluate(SimpleNamespace(guild=SimpleNamespace(id=2)), FEATURES) == "links"
+
+    engine.set_enabled(1, "links", True)
+    assert engine.disabled_rules(1) == set()
+    assert engine.evaluate(MESSAGE, FEATURES) == "links"
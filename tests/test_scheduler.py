@@ -0,0 +1,58 @@
+import asyncio
+import time
+
+from utils.scheduler import DeadlineScheduler
+
+
+async def _noop(key):
+    pass
+
+
+def test_reschedule_moves_the_deadline():
+    scheduler = DeadlineScheduler(_noop)
+    scheduler.schedule("a", 10.0)
+    scheduler.schedule("b", 20.0)
+    scheduler.schedule("a", 30.0)
+
+    assert scheduler.due_at("a") == 30.0
+    assert len(scheduler) == 2
+    # Der alte Heap-Eintrag von "a" wird übersprungen
+    assert scheduler.next_due() == 20.0
+    assert scheduler._pop_due(25.0) == ["b"]
+    assert scheduler._pop_due(35.0) == ["a"]
+    assert scheduler._heap == []
+
+
+def test_cancelled_entry_is_skipped():
+    scheduler = DeadlineScheduler(_noop)
+    scheduler.schedule("a", 10.0)
+    scheduler.schedule("b", 20.0)
+
+    assert scheduler.cancel("a")
+    assert not scheduler.cancel("a")
+    assert scheduler.due_at("a") is None
+    assert scheduler.next_due() == 20.0
+    assert scheduler._pop_due(100.0) == ["b"]
+
+
+def test_due_entries_fire_once_in_order(run):
+    async def scenario():
+        fired = []
+
+        async def callback(key):
+            fired.append(key)
+
+        scheduler = DeadlineScheduler(callback)
+        scheduler.start()
+        now = time.time()
+        scheduler.schedule("later", now + 0.05)
+        scheduler.schedule("soon", now + 0.02)
+        scheduler.schedule("cancelled", now + 0.01)
+        scheduler.cancel("cancelled")
+        await asyncio.sleep(0.2)
+        await scheduler.close()
+
+        assert fired == ["soon", "later"]
+        assert scheduler.fired == 2 and len(scheduler) == 0
+
+    run(scenario)
@@ -1,13 +1,21 @@
+import logging
 import discord
-import re
 import json
 import os
 import asyncio
 import aiosqlite
-from datetime import datetime, timedelta
-from collections import defaultdict, Counter
+from datetime import datetime
+from collections import defaultdict
 from typing import Dict, List, Set, Tuple, Optional
 from utils.db import DB_PATH, Database
+from utils.enforcement import EnforcementQueue
+from utils.matchers import DomainMatcher, WordMatcher
+from utils.message_features import MessageFeatures
+from utils.raid import RaidDetector
+from utils.ratelimit import RepeatCounter, SlidingWindow
+from utils.rules_engine import RuleEngine
+
+logger = logging.getLogger(__name__)
 
 class AutoMod:
     def __init__(self, bot=None):
@@ -19,28 +27,47 @@ class AutoMod:
         self.log_channels = {}
         self.whitelisted_roles = defaultdict(set)
         self.whitelisted_channels = defaultdict(set)
-        self.banned_words = defaultdict(set)
-        self.banned_links = defaultdict(set)
+        self.banned_words = defaultdict(WordMatcher)  # vorkompiliertes Pattern pro Server
+        self.banned_links = defaultdict(DomainMatcher)  # Domain-Trie pro Server
         
-        # Spam-Erkennung
-        self.message_history = defaultdict(list)  # {user_id: [message_timestamps]}
-        self.repeat_messages = defaultdict(Counter)  # {user_id: Counter(message_content)}
+        # Spam-Erkennung, jeweils pro (guild_id, user_id)
+        self.message_windows = SlidingWindow()  # Zeitstempel der letzten Nachrichten
+        self.repeat_messages = RepeatCounter()  # wiederholte Nachrichten
         self.caps_thresholds = defaultdict(lambda: 0.7)  # Standard: 70% Großbuchstaben
         self.emoji_thresholds = defaultdict(lambda: 0.3)  # Standard: 30% Emojis
         self.spam_thresholds = defaultdict(lambda: (5, 3))  # Standard: 5 Nachrichten in 3 Sekunden
         self.flood_settings = defaultdict(lambda: (5, 5))  # Standard: 5 Nachrichten in 5 Sekunden
         
-        # Cooldowns für Warnungen
-        self.warning_cooldowns = {}
+        # Löschungen, Warnungen und Logs laufen gebündelt über eine Warteschlange
+        self.enforcement = EnforcementQueue(self)
+        
+        # Serverweite Raid-Erkennung (Beitritts- und Nachrichtenwellen, gleiche Inhalte)
+        self.raid = RaidDetector(on_change=self._raid_changed)
+        
+        # Laden der Einstellungen (einmal pro Instanz, siehe setup)
+        self._setup_lock = asyncio.Lock()
+        self._setup_done = False
         
-        # Laden der Einstellungen
-        self.load_settings_task = None
+        # Prüfregeln (Name = Verstoßtyp); Kosten in µs und Trefferquote sind Startwerte,
+        # danach ordnet die Engine anhand der gemessenen Werte
+        self.rules = RuleEngine()
+        self.rules.register("banned_word", self.check_banned_words, cost=2.0, hit_rate=0.005)
+        self.rules.register("banned_link", self.check_banned_links, cost=1.0, hit_rate=0.002)
+        self.rules.register("excessive_caps", self.check_excessive_caps, cost=1.0, hit_rate=0.02)
+        self.rules.register("excessive_emojis", self.check_excessive_emojis, cost=1.0, hit_rate=0.01)
+        # Spam und Flood zählen jede Nachricht mit und laufen deshalb immer zuletzt
+        self.rules.register("spam", self.check_spam, cost=2.0, stateful=True)
+        self.rules.register("flood", self.check_flood, cost=2.0, stateful=True)
         
     async def setup(self, bot):
-        """Initialisiert den AutoMod mit dem Bot-Objekt"""
+        """Initialisiert den AutoMod mit dem Bot-Objekt (lädt die Einstellungen nur einmal)"""
         self.bot = bot
-        await self.load_settings()
-        print("✅ AutoMod-Einstellungen wurden geladen")
+        async with self._setup_lock:
+            if self._setup_done:
+                return
+            await self.load_settings()
+            self._setup_done = True
+        logger.info("✅ AutoMod-Einstellungen wurden geladen")
         
     async def load_settings(self):
         """Lädt alle AutoMod-Einstellungen aus der Datenbank"""
@@ -107,13 +134,15 @@ class AutoMod:
                 elif setting_type == 'flood_interval':
                     messages, _ = self.flood_settings[guild_id]
                     self.flood_settings[guild_id] = (messages, int(value))
+                elif setting_type.startswith('rule_'):
+                    self.rules.set_enabled(guild_id, setting_type[len('rule_'):], value == '1')
             
-            print("✅ AutoMod-Einstellungen geladen")
-            print(f"Aktivierte Server: {self.enabled_guilds}")
-            print(f"Spam-Einstellungen: {dict(self.spam_thresholds)}")
-            print(f"Flood-Einstellungen: {dict(self.flood_settings)}")
+            logger.info("✅ AutoMod-Einstellungen geladen")
+            logger.debug("Aktivierte Server: %s", self.enabled_guilds)
+            logger.debug("Spam-Einstellungen: %s", dict(self.spam_thresholds))
+            logger.debug("Flood-Einstellungen: %s", dict(self.flood_settings))
         except Exception as e:
-            print(f"❌ Fehler beim Laden der AutoMod-Einstellungen: {e}")
+            logger.exception("❌ Fehler beim Laden der AutoMod-Einstellungen: %s", e)
     
     async def is_enabled(self, guild_id: int) -> bool:
         """Prüft, ob AutoMod für diesen Server aktiviert ist"""
@@ -128,17 +157,17 @@ class AutoMod:
         
         # Prüfe Rollen-Whitelist
         if any(role.id in self.whitelisted_roles[guild_id] for role in message.author.roles):
-            print(f"🛡️ User {message.author.name} ist durch Rolle von AutoMod ausgenommen")
+            logger.debug("🛡️ User %s ist durch Rolle von AutoMod ausgenommen", message.author.name)
             return True
             
         # Prüfe Kanal-Whitelist
         if message.channel.id in self.whitelisted_channels[guild_id]:
-            print(f"🛡️ Kanal {message.channel.name} ist von AutoMod ausgenommen")
+            logger.debug("🛡️ Kanal %s ist von AutoMod ausgenommen", message.channel.name)
             return True
             
         # Prüfe Berechtigungen
         if message.author.guild_permissions.administrator:
-            print(f"🛡️ Admin {message.author.name} ist von AutoMod ausgenommen")
+            logger.debug("🛡️ Admin %s ist von AutoMod ausgenommen", message.author.name)
             return True
             
         return False
@@ -158,312 +187,186 @@ class AutoMod:
         if await self.is_exempt(message):
             return None
             
-        # Prüfe auf verbotene Wörter
-        if await self.check_banned_words(message):
-            return "banned_word"
-            
-        # Prüfe auf verbotene Links
-        if await self.check_banned_links(message):
-            return "banned_link"
-            
-        # Prüfe auf zu viele Großbuchstaben
-        if await self.check_excessive_caps(message):
-            return "excessive_caps"
-            
-        # Prüfe auf zu viele Emojis
-        if await self.check_excessive_emojis(message):
-            return "excessive_emojis"
-            
-        # Prüfe auf Spam
-        if await self.check_spam(message):
-            return "spam"
-            
-        # Prüfe auf Flood
-        if await self.check_flood(message):
-            return "flood"
+        # Nachricht einmal analysieren, alle Prüfungen nutzen das Ergebnis
+        features = MessageFeatures(message.content)
+        
+        # Serverweite Raten und Fingerabdrücke zählen, ggf. Lockdown auslösen
+        flagged, earlier_copies = self.raid.record_message(message, features.lower)
+        if self.raid.in_lockdown(guild_id):
+            # Bereits gepostete Kopien einer neu markierten Raid-Nachricht gesammelt löschen
+            for copy in earlier_copies:
+                self.enforcement.submit(copy, "raid")
+            return self._evaluate_lockdown(message, features, flagged)
             
+        # Erste Regel, die anschlägt, bestimmt den Verstoßtyp
+        return self.rules.evaluate(message, features)
+    
+    def _evaluate_lockdown(self, message: discord.Message, features: MessageFeatures, flagged: bool) -> Optional[str]:
+        """Günstige Prüfung während eines Raids: markierte Inhalte, Links, Wörter
+        
+        Spam- und Flood-Zähler pro User sowie CAPS/Emoji entfallen; gegen
+        viele Accounts mit gleichen Nachrichten hilft der Fingerabdruck.
+        """
+        if flagged:
+            return "raid"
+        guild_id = message.guild.id
+        for name, check in (("banned_link", self.check_banned_links), ("banned_word", self.check_banned_words)):
+            if self.rules.is_enabled(guild_id, name) and check(message, features):
+                return name
         return None
     
-    async def check_banned_words(self, message: discord.Message) -> bool:
+    async def record_join(self, member: discord.Member) -> None:
+        """Zählt einen Beitritt für die Raid-Erkennung"""
+        if member.bot or member.guild.id not in self.enabled_guilds:
+            return
+        self.raid.record_join(member.guild.id)
+        # Lockdown ggf. beenden, auch wenn gerade niemand schreibt
+        self.raid.in_lockdown(member.guild.id)
+    
+    def _raid_changed(self, guild_id: int, active: bool, reason: str) -> None:
+        """Meldet Beginn und Ende eines Lockdowns im Log-Kanal"""
+        if active:
+            logger.warning("🚨 Raid erkannt auf Server %s (%s), Lockdown aktiv", guild_id, reason)
+            embed = discord.Embed(
+                title="🚨 AutoMod: Raid erkannt",
+                description=(f"**Auslöser:** {reason}\n"
+                             "AutoMod prüft jetzt im Lockdown-Modus: gleiche Nachrichten von vielen "
+                             "Accounts werden gesammelt gelöscht."),
+                color=discord.Color.red(),
+                timestamp=datetime.now()
+            )
+        else:
+            logger.warning("✅ Lockdown auf Server %s beendet (%s)", guild_id, reason)
+            embed = discord.Embed(
+                title="✅ AutoMod: Lockdown beendet",
+                description=f"**Grund:** {reason}",
+                color=discord.Color.green(),
+                timestamp=datetime.now()
+            )
+        self.enforcement.announce(guild_id, embed)
+    
+    def check_banned_words(self, message: discord.Message, features: Optional[MessageFeatures] = None) -> bool:
         """Prüft, ob die Nachricht verbotene Wörter enthält"""
-        content = message.content.lower()
+        features = features or MessageFeatures(message.content)
         guild_id = message.guild.id
         
-        # Prüfe jedes verbotene Wort
-        for word in self.banned_words[guild_id]:
-            # Prüfe auf exakte Übereinstimmung mit Wortgrenzen
-            pattern = r'\b' + re.escape(word) + r'\b'
-            if re.search(pattern, content):
-                print(f"🔍 Verbotenes Wort gefunden: '{word}' in Nachricht von {message.author.name}")
-                return True
+        # Alle verbotenen Wörter in einem Durchlauf (mit Wortgrenzen)
+        word = self.banned_words[guild_id].find(features.lower)
+        if word:
+            logger.debug("🔍 Verbotenes Wort gefunden: '%s' in Nachricht von %s", word, message.author.name)
+            return True
                 
         return False
     
-    async def check_banned_links(self, message: discord.Message) -> bool:
+    def check_banned_links(self, message: discord.Message, features: Optional[MessageFeatures] = None) -> bool:
         """Prüft, ob die Nachricht verbotene Links enthält"""
-        content = message.content.lower()
         guild_id = message.guild.id
+        banned_links = self.banned_links[guild_id]
+        if not banned_links:
+            return False
+        features = features or MessageFeatures(message.content)
         
-        # Extrahiere alle URLs aus der Nachricht
-        urls = re.findall(r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+', content)
-        
-        # Prüfe auch auf Links ohne http/https
-        domain_pattern = r'(?:www\.)?([a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}'
-        domains = re.findall(domain_pattern, content)
-        
-        # Kombiniere URLs und Domains
-        all_links = urls + [''.join(domain) for domain in domains]
-        
-        # Prüfe jeden Link
-        for url in all_links:
-            for banned_link in self.banned_links[guild_id]:
-                if banned_link in url:
-                    print(f"🔍 Verbotener Link gefunden: '{url}' enthält '{banned_link}' in Nachricht von {message.author.name}")
-                    return True
+        # Jeden Host im Domain-Trie nachschlagen
+        hit = banned_links.match_links(features.links)
+        if hit:
+            url, banned_link = hit
+            logger.debug("🔍 Verbotener Link gefunden: '%s' trifft '%s' in Nachricht von %s", url, banned_link, message.author.name)
+            return True
                     
         return False
     
-    async def check_excessive_caps(self, message: discord.Message) -> bool:
+    def check_excessive_caps(self, message: discord.Message, features: Optional[MessageFeatures] = None) -> bool:
         """Prüft, ob die Nachricht zu viele Großbuchstaben enthält"""
-        content = message.content
+        features = features or MessageFeatures(message.content)
         guild_id = message.guild.id
         
         # Ignoriere kurze Nachrichten
-        if len(content) < 8:
+        if features.length < 8:
             return False
             
-        # Zähle Großbuchstaben
-        uppercase_count = sum(1 for c in content if c.isupper())
-        letter_count = sum(1 for c in content if c.isalpha())
+        letter_count = features.alpha_count
         
         # Verhindere Division durch Null
         if letter_count == 0:
             return False
             
         # Berechne Prozentsatz
-        caps_percentage = uppercase_count / letter_count
+        caps_percentage = features.upper_count / letter_count
         
         # Prüfe gegen Schwellenwert
         threshold = self.caps_thresholds[guild_id]
         is_excessive = caps_percentage > threshold
         
         if is_excessive:
-            print(f"🔍 Zu viele Großbuchstaben: {caps_percentage:.1%} > {threshold:.1%} in Nachricht von {message.author.name}")
+            logger.debug("🔍 Zu viele Großbuchstaben: %.1f%% > %.1f%% in Nachricht von %s",
+                         caps_percentage * 100, threshold * 100, message.author.name)
             
         return is_excessive
     
-    async def check_excessive_emojis(self, message: discord.Message) -> bool:
+    def check_excessive_emojis(self, message: discord.Message, features: Optional[MessageFeatures] = None) -> bool:
         """Prüft, ob die Nachricht zu viele Emojis enthält"""
-        content = message.content
+        features = features or MessageFeatures(message.content)
         guild_id = message.guild.id
         
         # Ignoriere kurze Nachrichten
-        if len(content) < 8:
+        if features.length < 8:
             return False
             
-        # Zähle Emojis (Unicode und Discord-Emojis)
-        emoji_pattern = re.compile(r'<a?:[a-zA-Z0-9_]+:\d+>|[\U00010000-\U0010ffff]')
-        emojis = emoji_pattern.findall(content)
-        
-        # Berechne Prozentsatz
-        emoji_percentage = len(emojis) / len(content)
+        # Berechne Prozentsatz (Unicode- und Discord-Emojis)
+        emoji_percentage = features.emoji_count / features.length
         
         # Prüfe gegen Schwellenwert
         threshold = self.emoji_thresholds[guild_id]
         is_excessive = emoji_percentage > threshold
         
         if is_excessive:
-            print(f"🔍 Zu viele Emojis: {emoji_percentage:.1%} > {threshold:.1%} in Nachricht von {message.author.name}")
+            logger.debug("🔍 Zu viele Emojis: %.1f%% > %.1f%% in Nachricht von %s",
+                         emoji_percentage * 100, threshold * 100, message.author.name)
             
         return is_excessive
     
-    async def check_spam(self, message: discord.Message) -> bool:
+    def check_spam(self, message: discord.Message, features: Optional[MessageFeatures] = None) -> bool:
         """Prüft, ob der User spammt (zu viele Nachrichten in kurzer Zeit)"""
-        user_id = message.author.id
         guild_id = message.guild.id
-        current_time = datetime.now()
-        
-        # Füge aktuelle Nachricht zur Historie hinzu
-        self.message_history[user_id].append(current_time)
-        
-        # Entferne alte Nachrichten aus der Historie
         messages, interval = self.spam_thresholds[guild_id]
-        threshold_time = current_time - timedelta(seconds=interval)
-        self.message_history[user_id] = [t for t in self.message_history[user_id] if t > threshold_time]
         
-        # Debug-Ausgabe
-        message_count = len(self.message_history[user_id])
-        print(f"🔍 Spam-Check: User {message.author.name}, Nachrichten: {message_count}/{messages} in {interval}s")
+        # Nachricht im Zeitfenster des Users zählen, ältere fallen heraus
+        message_count = self.message_windows.hit((guild_id, message.author.id), messages, interval)
+        
+        # Trace pro Nachricht, nur bei LOG_LEVEL=DEBUG (bzw. gesampelt)
+        logger.debug("🔍 Spam-Check: User %s, Nachrichten: %d/%d in %ss",
+                     message.author.name, message_count, messages, interval)
         
         # Prüfe Anzahl der Nachrichten im Zeitraum (>= statt >)
         return message_count >= messages
     
-    async def check_flood(self, message: discord.Message) -> bool:
+    def check_flood(self, message: discord.Message, features: Optional[MessageFeatures] = None) -> bool:
         """Prüft, ob der User den Chat flutet (wiederholte Nachrichten)"""
-        user_id = message.author.id
+        features = features or MessageFeatures(message.content)
         guild_id = message.guild.id
-        content = message.content
-        
-        # Aktualisiere Zähler für wiederholte Nachrichten
-        self.repeat_messages[user_id][content] += 1
-        
-        # Prüfe, ob der Schwellenwert überschritten wurde
         flood_count, flood_interval = self.flood_settings[guild_id]
-        current_count = self.repeat_messages[user_id][content]
         
-        # Debug-Ausgabe
-        print(f"🔍 Flood-Check: User {message.author.name}, Wiederholungen: {current_count}/{flood_count} (Nachricht: '{content[:20]}...')")
+        # Zähler läuft flood_interval Sekunden nach der ersten Wiederholung ab
+        current_count = self.repeat_messages.hit((guild_id, message.author.id), features.digest, flood_interval)
         
-        # Setze einen Timer, um den Zähler zurückzusetzen
-        if current_count == 1:
-            asyncio.create_task(self._reset_flood_counter(user_id, content, flood_interval))
+        # Trace pro Nachricht, nur bei LOG_LEVEL=DEBUG (bzw. gesampelt)
+        logger.debug("🔍 Flood-Check: User %s, Wiederholungen: %d/%d (Nachricht: '%.20s...')",
+                     message.author.name, current_count, flood_count, features.content)
             
         return current_count >= flood_count
     
-    async def _reset_flood_counter(self, user_id: int, content: str, interval: int):
-        """Setzt den Flood-Zähler nach dem Intervall zurück"""
-        await asyncio.sleep(interval)
-        if user_id in self.repeat_messages and content in self.repeat_messages[user_id]:
-            del self.repeat_messages[user_id][content]
-    
     async def take_action(self, message: discord.Message, violation_type: str) -> None:
-        """Führt eine Aktion basierend auf dem Verstoßtyp aus"""
-        try:
-            # Lösche die Nachricht
-            await message.delete()
-            print(f"🗑️ Nachricht von {message.author.name} wurde gelöscht (Grund: {violation_type})")
-            
-            # Prüfe Cooldown für Warnungen
-            user_id = message.author.id
-            guild_id = message.guild.id
-            cooldown_key = f"{guild_id}:{user_id}:{violation_type}"
-            
-            current_time = datetime.now()
-            if cooldown_key in self.warning_cooldowns:
-                if (current_time - self.warning_cooldowns[cooldown_key]).total_seconds() < 60:
-                    # Noch im Cooldown, keine Warnung senden
-                    return
-                    
-            # Setze Cooldown
-            self.warning_cooldowns[cooldown_key] = current_time
-            
-            # Sende Warnung an den User
-            warning_embed = discord.Embed(
-                title="⚠️ AutoMod-Warnung",
-                description=f"Deine Nachricht wurde entfernt, weil sie gegen unsere Regeln verstößt.",
-                color=discord.Color.orange()
-            )
-            
-            violation_descriptions = {
-                "banned_word": "Verbotenes Wort oder Ausdruck",
-                "banned_link": "Nicht erlaubter Link",
-                "excessive_caps": "Zu viele Großbuchstaben",
-                "excessive_emojis": "Zu viele Emojis",
-                "spam": "Zu viele Nachrichten in kurzer Zeit",
-                "flood": "Wiederholte Nachrichten (Flooding)"
-            }
-            
-            warning_embed.add_field(
-                name="Grund",
-                value=violation_descriptions.get(violation_type, "Regelverstoß"),
-                inline=False
-            )
-            
-            try:
-                await message.author.send(embed=warning_embed)
-                print(f"📨 Warnung an {message.author.name} gesendet")
-            except discord.Forbidden:
-                # User hat DMs deaktiviert
-                print(f"❌ Konnte keine DM an {message.author.name} senden (DMs deaktiviert)")
-                pass
-            
-            # Logge den Verstoß
-            await self.log_violation(message, violation_type)
-            
-        except discord.NotFound:
-            # Nachricht wurde bereits gelöscht
-            print(f"⚠️ Nachricht von {message.author.name} wurde bereits gelöscht")
-            pass
-        except Exception as e:
-            print(f"❌ Fehler bei AutoMod-Aktion: {e}")
-    
-    async def log_violation(self, message: discord.Message, violation_type: str) -> None:
-        """Loggt einen AutoMod-Verstoß im Log-Kanal"""
-        guild_id = message.guild.id
-        
-        # Prüfe, ob ein Log-Kanal konfiguriert ist
-        if guild_id not in self.log_channels:
-            print(f"⚠️ Kein Log-Kanal für Server {guild_id} konfiguriert")
-            return
-            
-        log_channel_id = self.log_channels[guild_id]
-        log_channel = self.bot.get_channel(log_channel_id)
-        
-        if not log_channel:
-            print(f"⚠️ Log-Kanal {log_channel_id} nicht gefunden")
-            return
-            
-        # Erstelle Embed für Log
-        log_embed = discord.Embed(
-            title="🤖 AutoMod: Nachricht entfernt",
-            description=f"Eine Nachricht von {message.author.mention} wurde automatisch entfernt.",
-            color=discord.Color.orange(),
-            timestamp=datetime.now()
-        )
-        
-        # Füge Informationen hinzu
-        log_embed.add_field(
-            name="User",
-            value=f"{message.author} (ID: {message.author.id})",
-            inline=True
-        )
-        
-        log_embed.add_field(
-            name="Kanal",
-            value=message.channel.mention,
-            inline=True
-        )
-        
-        violation_descriptions = {
-            "banned_word": "Verbotenes Wort oder Ausdruck",
-            "banned_link": "Nicht erlaubter Link",
-            "excessive_caps": "Zu viele Großbuchstaben",
-            "excessive_emojis": "Zu viele Emojis",
-            "spam": "Zu viele Nachrichten in kurzer Zeit",
-            "flood": "Wiederholte Nachrichten (Flooding)"
-        }
-        
-        log_embed.add_field(
-            name="Grund",
-            value=violation_descriptions.get(violation_type, "Regelverstoß"),
-            inline=False
-        )
-        
-        # Füge Nachrichteninhalt hinzu (gekürzt, falls zu lang)
-        content = message.content
-        if len(content) > 1024:
-            content = content[:1021] + "..."
-            
-        log_embed.add_field(
-            name="Nachrichteninhalt",
-            value=f"```{content}```",
-            inline=False
-        )
-        
-        # Sende Log
-        try:
-            await log_channel.send(embed=log_embed)
-            print(f"📝 Verstoß in Log-Kanal protokolliert")
-        except Exception as e:
-            print(f"❌ Fehler beim Senden des Logs: {e}")
+        """Reiht die Aktion für einen Verstoß ein (Löschen, Warnung, Log laufen gebündelt)"""
+        self.enforcement.submit(message, violation_type)
+
+    async def close(self) -> None:
+        """Arbeitet ausstehende Aktionen ab (beim Beenden des Bots)"""
+        await self.enforcement.close()
     
     # Konfigurationsmethoden
     async def enable(self, guild_id: int) -> None:
         """Aktiviert AutoMod für einen Server"""
-        await self.db.execute(
-            "INSERT OR REPLACE INTO automod_config (guild_id, enabled) VALUES (?, 1)",
-            (guild_id,)
-        )
+        await self.db.upsert("automod_config", {"guild_id": guild_id, "enabled": 1}, ("guild_id",))
         self.enabled_guilds.add(guild_id)
     
     async def disable(self, guild_id: int) -> None:
@@ -477,10 +380,8 @@ class AutoMod:
     
     async def set_log_channel(self, guild_id: int, channel_id: int) -> None:
         """Setzt den Log-Kanal für einen Server"""
-        await self.db.execute(
-            "INSERT OR REPLACE INTO automod_config (guild_id, log_channel_id) VALUES (?, ?)",
-            (guild_id, channel_id)
-        )
+        # Upsert statt REPLACE, damit der enabled-Status erhalten bleibt
+        await self.db.upsert("automod_config", {"guild_id": guild_id, "log_channel_id": channel_id}, ("guild_id",))
         self.log_channels[guild_id] = channel_id
     
     async def add_whitelist_role(self, guild_id: int, role_id: int) -> None:
@@ -555,46 +456,42 @@ class AutoMod:
         if link in self.banned_links[guild_id]:
             self.banned_links[guild_id].remove(link)
     
+    async def _store_settings(self, guild_id: int, settings: dict) -> None:
+        """Schreibt mehrere Einstellungen eines Servers in einer Transaktion"""
+        await self.db.upsert_many(
+            "automod_settings",
+            [{"guild_id": guild_id, "setting_type": setting_type, "value": str(value)}
+             for setting_type, value in settings.items()],
+            ("guild_id", "setting_type")
+        )
+    
     async def set_caps_threshold(self, guild_id: int, threshold: float) -> None:
         """Setzt den Schwellenwert für Großbuchstaben"""
-        await self.db.execute(
-            "INSERT OR REPLACE INTO automod_settings (guild_id, setting_type, value) VALUES (?, 'caps_threshold', ?)",
-            (guild_id, str(threshold))
-        )
+        await self._store_settings(guild_id, {"caps_threshold": threshold})
         self.caps_thresholds[guild_id] = threshold
     
     async def set_emoji_threshold(self, guild_id: int, threshold: float) -> None:
         """Setzt den Schwellenwert für Emojis"""
-        await self.db.execute(
-            "INSERT OR REPLACE INTO automod_settings (guild_id, setting_type, value) VALUES (?, 'emoji_threshold', ?)",
-            (guild_id, str(threshold))
-        )
+        await self._store_settings(guild_id, {"emoji_threshold": threshold})
         self.emoji_thresholds[guild_id] = threshold
     
     async def set_spam_settings(self, guild_id: int, messages: int, interval: int) -> None:
         """Setzt die Einstellungen für Spam-Erkennung"""
-        await self.db.execute(
-            "INSERT OR REPLACE INTO automod_settings (guild_id, setting_type, value) VALUES (?, 'spam_messages', ?)",
-            (guild_id, str(messages))
-        )
-        await self.db.execute(
-            "INSERT OR REPLACE INTO automod_settings (guild_id, setting_type, value) VALUES (?, 'spam_interval', ?)",
-            (guild_id, str(interval))
-        )
+        await self._store_settings(guild_id, {"spam_messages": messages, "spam_interval": interval})
         self.spam_thresholds[guild_id] = (messages, interval)
     
     async def set_flood_settings(self, guild_id: int, messages: int, interval: int) -> None:
         """Setzt die Einstellungen für Flood-Erkennung"""
-        await self.db.execute(
-            "INSERT OR REPLACE INTO automod_settings (guild_id, setting_type, value) VALUES (?, 'flood_messages', ?)",
-            (guild_id, str(messages))
-        )
-        await self.db.execute(
-            "INSERT OR REPLACE INTO automod_settings (guild_id, setting_type, value) VALUES (?, 'flood_interval', ?)",
-            (guild_id, str(interval))
-        )
+        await self._store_settings(guild_id, {"flood_messages": messages, "flood_interval": interval})
         self.flood_settings[guild_id] = (messages, interval)
     
+    async def set_rule_enabled(self, guild_id: int, rule: str, enabled: bool) -> None:
+        """Schaltet eine Prüfregel für einen Server an oder aus"""
+        if rule not in self.rules.names():
+            raise KeyError(rule)
+        await self._store_settings(guild_id, {f"rule_{rule}": int(enabled)})
+        self.rules.set_enabled(guild_id, rule, enabled)
+    
     async def get_status(self, guild_id: int) -> dict:
         """Gibt den Status der AutoMod-Einstellungen für einen Server zurück"""
         return {
@@ -607,5 +504,19 @@ class AutoMod:
             "caps_threshold": self.caps_thresholds[guild_id],
             "emoji_threshold": self.emoji_thresholds[guild_id],
             "spam_settings": self.spam_thresholds[guild_id],
-            "flood_settings": self.flood_settings[guild_id]
-        } 
\ No newline at end of file
+            "flood_settings": self.flood_settings[guild_id],
+            "disabled_rules": sorted(self.rules.disabled_rules(guild_id)),
+            "lockdown": self.raid.in_lockdown(guild_id)
+        } 
+
+
+def get_automod(bot) -> AutoMod:
+    """Gibt die gemeinsame AutoMod-Instanz des Bots zurück
+
+    Alle Cogs teilen sich diese Instanz (bot.automod), damit Einstellungen
+    nur einmal geladen werden und jede Nachricht genau einmal geprüft wird.
+    """
+    automod = getattr(bot, "automod", None)
+    if automod is None:
+        automod = bot.automod = AutoMod(bot)
+    return automod
@@ -0,0 +1,179 @@
+"""Write-Through-Cache für die Konfigurationstabellen mit einer Zeile pro Server
+
+Die Konfigurationen (welcome_config, ticket_config, ...) werden bei fast
+jedem Event gelesen, ändern sich aber nur durch Admin-Befehle. Jede Tabelle
+wird deshalb beim ersten Zugriff einmal komplett geladen, danach laufen
+Lesezugriffe ohne SQL. Änderungen gehen über update() in die Datenbank und
+direkt in den Cache.
+
+    config = await config_cache("ticket_config").get(guild.id)
+    if config and config.enabled:
+        category = guild.get_channel(config.category_id)
+
+Die Caches sind pro Tabelle geteilt, damit alle Cogs denselben Stand sehen.
+"""
+import logging
+import asyncio
+from collections import namedtuple
+from typing import Any, Dict, Optional, Set, Tuple
+
+import aiosqlite
+
+from utils.db import Database
+
+logger = logging.getLogger(__name__)
+
+# Tabelle -> Spalten (ohne guild_id, das ist immer der Primärschlüssel)
+CONFIG_TABLES: Dict[str, Tuple[str, ...]] = {
+    "welcome_config": ("welcome_channel_id", "rules_channel_id", "temp_role_id",
+                       "verified_role_id", "welcome_message", "enabled", "welcome_role_id"),
+    "ticket_config": ("category_id", "log_channel_id", "support_role_id", "ticket_counter",
+                      "archive_category_id", "enabled", "welcome_message"),
+    "twitch_config": ("client_id", "client_secret", "announcement_channel_id",
+                      "announcement_message", "ping_role_id", "enabled"),
+    "temp_voice_config": ("creator_channel_id", "category_id", "user_limit", "default_privacy"),
+    "channel_config": ("mod_log_channel_id",),
+}
+
+
+class GuildConfigCache:
+    """Hält alle Zeilen einer Konfigurationstabelle im Speicher
+
+    get() liefert ein namedtuple mit den Spalten aus CONFIG_TABLES oder None,
+    wenn für den Server keine Konfiguration existiert. Die Zeilen sind
+    unveränderlich; Änderungen laufen ausschließlich über update().
+    """
+
+    def __init__(self, table: str, columns: Tuple[str, ...], db: Optional[Database] = None):
+        self.table = table
+        self.columns = columns
+        self.db = db or Database()
+        self.row_type = namedtuple(f"{table.title().replace('_', '')}Row", columns)
+
+        self._select = f"SELECT guild_id, {', '.join(columns)} FROM {table}"
+        self._rows: Dict[int, Any] = {}
+        self._stale: Set[int] = set()
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    async def load(self):
+        """Lädt die komplette Tabelle (passiert beim ersten get() bzw. nach invalidate() automatisch)"""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            # Vor dem Lesen leeren: was update() währenddessen als veraltet
+            # markiert, fehlt womöglich im gelesenen Stand und bleibt markiert
+            self._stale.clear()
+            rows = await self.db.fetch_all(self._select)
+            self._rows = {row[0]: self.row_type._make(row[1:]) for row in rows}
+            self._loaded = True
+
+    async def _reload(self, guild_id: int):
+        """Liest die Zeile eines einzelnen Servers neu ein"""
+        row = await self.db.fetch_one(f"{self._select} WHERE guild_id = ?", (guild_id,))
+        self._store(guild_id, row)
+
+    def _store(self, guild_id: int, row: Optional[tuple]):
+        if row is None:
+            self._rows.pop(guild_id, None)
+        else:
+            self._rows[guild_id] = self.row_type._make(row[1:])
+        self._stale.discard(guild_id)
+
+    async def get(self, guild_id: int):
+        """Gibt die Konfiguration eines Servers zurück (None, wenn keine existiert)"""
+        if not self._loaded:
+            self.misses += 1
+            await self.load()
+        elif guild_id in self._stale:
+            self.misses += 1
+            await self._reload(guild_id)
+        else:
+            self.hits += 1
+        return self._rows.get(guild_id)
+
+    async def update(self, guild_id: int, values: Dict[str, Any], upsert: bool = True) -> bool:
+        """Schreibt Werte in die Datenbank und übernimmt die neue Zeile in den Cache
+
+        Mit upsert=True wird die Zeile bei Bedarf angelegt (fehlende Spalten
+        bekommen ihre Standardwerte), sonst werden nur bestehende Zeilen
+        geändert. Gibt True zurück, wenn danach eine Zeile existiert.
+        """
+        columns = list(values)
+        params = tuple(values.values())
+        if upsert:
+            assignments = ", ".join(f"{column} = excluded.{column}" for column in columns)
+            query = (f"INSERT INTO {self.table} (guild_id, {', '.join(columns)}) "
+                     f"VALUES (?, {', '.join('?' for _ in columns)}) "
+                     f"ON CONFLICT(guild_id) DO UPDATE SET {assignments}")
+            params = (guild_id,) + params
+        else:
+            assignments = ", ".join(f"{column} = ?" for column in columns)
+            query = f"UPDATE {self.table} SET {assignments} WHERE guild_id = ?"
+            params = params + (guild_id,)
+
+        async def job(conn: aiosqlite.Connection):
+            await conn.execute(query, params)
+            # Zeile in derselben Transaktion zurücklesen, damit Standardwerte im Cache landen
+            async with conn.execute(f"{self._select} WHERE guild_id = ?", (guild_id,)) as cursor:
+                return await cursor.fetchone()
+
+        try:
+            row = await self.db.pool.write(job)
+        except aiosqlite.Error as e:
+            logger.error(f"Datenbankfehler beim Aktualisieren von {self.table}: {e}")
+            self.invalidate(guild_id)
+            return False
+
+        if self._loaded:
+            self._store(guild_id, row)
+        else:
+            # Ein laufendes load() kann den Stand vor diesem Schreibzugriff gelesen haben
+            self._stale.add(guild_id)
+        return row is not None
+
+    def blank(self):
+        """Leere Zeile (alle Spalten None) für Server ohne Konfiguration"""
+        return self.row_type._make((None,) * len(self.columns))
+
+    def invalidate(self, guild_id: Optional[int] = None):
+        """Verwirft den Cache eines Servers (oder komplett) beim nächsten Zugriff"""
+        if guild_id is None:
+            self._rows.clear()
+            self._stale.clear()
+            self._loaded = False
+        else:
+            self._stale.add(guild_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Gibt Trefferquote und Größe des Caches zurück"""
+        total = self.hits + self.misses
+        return {
+            "table": self.table,
+            "rows": len(self._rows),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None,
+        }
+
+
+# Ein Cache pro Tabelle, geteilt von allen Cogs
+_caches: Dict[str, GuildConfigCache] = {}
+
+
+def config_cache(table: str) -> GuildConfigCache:
+    """Gibt den gemeinsamen Cache für eine Konfigurationstabelle zurück"""
+    cache = _caches.get(table)
+    if cache is None:
+        if table not in CONFIG_TABLES:
+            raise KeyError(f"Keine Konfigurationstabelle: {table}")
+        cache = _caches[table] = GuildConfigCache(table, CONFIG_TABLES[table])
+    return cache
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Gibt die Statistiken aller bisher benutzten Caches zurück"""
+    return {table: cache.stats() for table, cache in _caches.items()}
@@ -1,280 +1,544 @@
+import logging
 import sqlite3
 import aiosqlite
+import asyncio
 import os
+import time
+import traceback
+from collections import Counter
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple, Callable, Awaitable
+from utils.migrations import migrate
+from utils.queries import QUERIES, Query, read_statements
+from config import (DB_SYNCHRONOUS, DB_CACHE_SIZE, DB_MMAP_SIZE,
+                    DB_BUSY_TIMEOUT, DB_WRITE_BATCH_SIZE, DB_DEBUG_BLOCKING)
+
+logger = logging.getLogger(__name__)
 
 DB_PATH = "data/discord_bot.db"
 
+# Anzahl der Leseverbindungen pro Pool (zusätzlich zur einen Schreibverbindung)
+READER_POOL_SIZE = 4
+
+# Größe des Statement-Caches pro Verbindung (sqlite3-Standard: 128)
+STATEMENT_CACHE_SIZE = 256
+
 # Stelle sicher, dass das Verzeichnis existiert
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
+# Gemeldete blockierende Aufrufe pro Aufrufstelle (nur im Debug-Modus)
+blocking_calls: Counter = Counter()
+
+
+def _report_if_on_loop(action: str):
+    """Meldet einen sqlite3-Aufruf, wenn er im Thread des Event-Loops passiert"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # Kein laufender Loop in diesem Thread (z.B. aiosqlite-Worker) -> unkritisch
+        return
+
+    stack = traceback.extract_stack()[:-2]
+    caller = stack[-1]
+    location = f"{caller.filename}:{caller.lineno}"
+    blocking_calls[location] += 1
+    if blocking_calls[location] == 1:
+        # Jede Aufrufstelle nur einmal ausführlich melden
+        trace = ''.join(traceback.format_list(stack[-6:]))
+        logger.warning(f"⚠️ Blockierender Datenbankaufruf ({action}) im Event-Loop bei {location}:\n{trace}")
+
+
+class _LoopGuardConnection(sqlite3.Connection):
+    """sqlite3-Verbindung, die Aufrufe aus dem Event-Loop-Thread meldet"""
+
+    def execute(self, *args, **kwargs):
+        _report_if_on_loop("execute")
+        return super().execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        _report_if_on_loop("executemany")
+        return super().executemany(*args, **kwargs)
+
+    def executescript(self, *args, **kwargs):
+        _report_if_on_loop("executescript")
+        return super().executescript(*args, **kwargs)
+
+    def commit(self):
+        _report_if_on_loop("commit")
+        return super().commit()
+
+
+def enable_blocking_detection():
+    """Debug-Modus: meldet jeden synchronen sqlite3-Zugriff aus dem Event-Loop
+
+    aiosqlite öffnet und benutzt seine Verbindungen in eigenen Threads und
+    wird deshalb nie gemeldet. Muss vor dem Öffnen des Pools aufgerufen werden.
+    """
+    if getattr(sqlite3.connect, "_loop_guard", False):
+        return
+
+    original_connect = sqlite3.connect
+
+    def guarded_connect(*args, **kwargs):
+        _report_if_on_loop("connect")
+        kwargs.setdefault("factory", _LoopGuardConnection)
+        return original_connect(*args, **kwargs)
+
+    guarded_connect._loop_guard = True
+    sqlite3.connect = guarded_connect
+    logger.info("🔍 Debug-Modus: Blockierende Datenbankaufrufe im Event-Loop werden gemeldet")
+
+
+if DB_DEBUG_BLOCKING:
+    enable_blocking_detection()
+
+
+# Ein Schreibauftrag bekommt die Schreibverbindung und liefert ein Ergebnis
+WriteJob = Callable[[aiosqlite.Connection], Awaitable[Any]]
+
+
+class WriteAborted(Exception):
+    """Der Aufrufer eines writer()-Blocks wurde abgebrochen, die Transaktion wird zurückgerollt"""
+
+
+class ConnectionPool:
+    """Langlebiger Verbindungspool mit einer Schreib- und mehreren Leseverbindungen
+
+    Die Datenbank läuft im WAL-Modus, damit Leser nicht auf Schreiber warten.
+    Alle Schreibzugriffe laufen über eine Warteschlange, die von genau einem
+    Writer-Task abgearbeitet wird. Aufträge, die sich während eines Commits
+    ansammeln, werden gemeinsam in einer Transaktion (Group Commit) geschrieben.
+    """
+
+    def __init__(self, db_path: str = DB_PATH, readers: int = READER_POOL_SIZE,
+                 batch_size: int = DB_WRITE_BATCH_SIZE):
+        self.db_path = db_path
+        self.size = readers
+        self.batch_size = batch_size
+        self.is_open = False
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle_readers: Optional[asyncio.Queue] = None
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._open_lock: Optional[asyncio.Lock] = None
+
+        # Statistiken über die Wartezeit beim Ausleihen einer Verbindung
+        self._acquired = {"reader": 0, "writer": 0}
+        self._wait_total = {"reader": 0.0, "writer": 0.0}
+        self._wait_max = {"reader": 0.0, "writer": 0.0}
+
+        # Statistiken des Writer-Tasks
+        self._commits = 0
+        self._write_jobs = 0
+        self._failed_jobs = 0
+
+    async def _apply_pragmas(self, conn: aiosqlite.Connection):
+        """Setzt die konfigurierbaren Pragmas für eine Verbindung"""
+        await conn.execute(f"PRAGMA busy_timeout = {int(DB_BUSY_TIMEOUT)}")
+        await conn.execute(f"PRAGMA synchronous = {DB_SYNCHRONOUS}")
+        await conn.execute(f"PRAGMA cache_size = {int(DB_CACHE_SIZE)}")
+        await conn.execute(f"PRAGMA mmap_size = {int(DB_MMAP_SIZE)}")
+
+    async def open(self):
+        """Öffnet alle Verbindungen des Pools und startet den Writer-Task (nur einmal)"""
+        if self._open_lock is None:
+            self._open_lock = asyncio.Lock()
+
+        async with self._open_lock:
+            if self.is_open:
+                return
+
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            # Transaktionen steuert der Writer-Task selbst (BEGIN/COMMIT)
+            self._writer = await aiosqlite.connect(self.db_path, isolation_level=None,
+                                                  cached_statements=STATEMENT_CACHE_SIZE)
+            # WAL ist persistent und muss nur von einer Verbindung gesetzt werden
+            await self._writer.execute("PRAGMA journal_mode = WAL")
+            await self._apply_pragmas(self._writer)
+
+            self._idle_readers = asyncio.Queue()
+            for _ in range(self.size):
+                reader = await aiosqlite.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
+                await self._apply_pragmas(reader)
+                # Leseverbindungen dürfen niemals schreiben
+                await reader.execute("PRAGMA query_only = ON")
+                self._readers.append(reader)
+                self._idle_readers.put_nowait(reader)
+
+            self._write_queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._run_writer())
+
+            self.is_open = True
+            logger.info(f"✅ Datenbank-Pool geöffnet ({self.size} Leser, 1 Schreiber, WAL): {self.db_path}")
+
+    async def close(self):
+        """Arbeitet ausstehende Schreibaufträge ab und schließt alle Verbindungen"""
+        if not self.is_open:
+            return
+
+        self.is_open = False
+        if self._writer_task is not None:
+            # None beendet den Writer-Task, nachdem die Warteschlange leer ist
+            self._write_queue.put_nowait(None)
+            await self._writer_task
+            self._writer_task = None
+
+        for reader in self._readers:
+            await reader.close()
+        self._readers.clear()
+
+        if self._writer is not None:
+            await self._writer.close()
+            self._writer = None
+
+        logger.info(f"🔒 Datenbank-Pool geschlossen: {self.db_path}")
+
+    async def warm_statements(self, statements: List[str]) -> int:
+        """Kompiliert die übergebenen Abfragen auf jeder Leseverbindung vor
+
+        Die Abfragen laufen einmal mit NULL-Parametern (liefert keine Zeilen),
+        danach liegen die Statements im Cache der Verbindung. Gibt die Anzahl
+        der erfolgreich vorbereiteten Statements pro Verbindung zurück.
+        """
+        warmed = 0
+        for reader in self._readers:
+            warmed = 0
+            for query in statements:
+                try:
+                    async with reader.execute(query, (None,) * query.count("?")) as cursor:
+                        await cursor.fetchall()
+                    warmed += 1
+                except aiosqlite.Error as e:
+                    logger.warning(f"⚠️ Statement konnte nicht vorbereitet werden: {e}")
+        return warmed
+
+    def _record_wait(self, kind: str, waited: float):
+        """Merkt sich die Wartezeit für eine ausgeliehene Verbindung"""
+        self._acquired[kind] += 1
+        self._wait_total[kind] += waited
+        if waited > self._wait_max[kind]:
+            self._wait_max[kind] = waited
+
+    @asynccontextmanager
+    async def reader(self):
+        """Leiht eine Leseverbindung aus dem Pool aus"""
+        if not self.is_open:
+            await self.open()
+
+        start = time.perf_counter()
+        conn = await self._idle_readers.get()
+        self._record_wait("reader", time.perf_counter() - start)
+        try:
+            yield conn
+        finally:
+            self._idle_readers.put_nowait(conn)
+
+    async def write(self, job: WriteJob) -> Any:
+        """Reiht einen Schreibauftrag ein und wartet, bis er committet ist"""
+        if not self.is_open:
+            await self.open()
+
+        future = asyncio.get_running_loop().create_future()
+        self._write_queue.put_nowait((job, future, time.perf_counter()))
+        return await future
+
+    @asynccontextmanager
+    async def writer(self):
+        """Leiht die Schreibverbindung exklusiv aus
+
+        Der Block läuft innerhalb der Transaktion des Writer-Tasks und wird
+        zusammen mit ihr committet. Innerhalb des Blocks darf weder commit()
+        aufgerufen noch über Database geschrieben werden (sonst Deadlock).
+        """
+        loop = asyncio.get_running_loop()
+        acquired = loop.create_future()
+        released = loop.create_future()
+
+        async def job(conn):
+            if released.done():
+                # Der Aufrufer wurde abgebrochen, bevor er an der Reihe war
+                return
+            acquired.set_result(conn)
+            await released
+
+        done = asyncio.ensure_future(self.write(job))
+        try:
+            await asyncio.wait([acquired, done], return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            # Den eingereihten Auftrag freigeben, sonst wartet er ewig und blockiert den Writer-Task
+            if not released.done():
+                released.set_result(None)
+            raise
+        if not acquired.done():
+            # Der Auftrag ist gescheitert, bevor er die Verbindung bekam
+            await done
+
+        try:
+            yield acquired.result()
+        except BaseException as e:
+            # Ein CancelledError im Writer-Task sähe aus wie dessen eigener Abbruch
+            if isinstance(e, asyncio.CancelledError):
+                released.set_exception(WriteAborted("writer()-Block abgebrochen"))
+            else:
+                released.set_exception(e)
+            try:
+                await done
+            except BaseException:
+                pass
+            raise
+        else:
+            released.set_result(None)
+            await done
+
+    async def _run_writer(self):
+        """Writer-Task: arbeitet die Warteschlange in Batches ab"""
+        stopping = False
+        while not stopping:
+            item = await self._write_queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            while len(batch) < self.batch_size and not self._write_queue.empty():
+                item = self._write_queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                await self._commit_batch(batch)
+            except BaseException as e:
+                logger.error(f"Datenbankfehler im Writer-Task: {e!r}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e if isinstance(e, Exception) else WriteAborted(repr(e)))
+                if not isinstance(e, Exception):
+                    # Nur der Abbruch des Writer-Tasks selbst beendet die Schleife
+                    raise
+
+    async def _commit_batch(self, batch: List[Tuple[WriteJob, asyncio.Future, float]]):
+        """Schreibt alle Aufträge eines Batches in einer Transaktion"""
+        conn = self._writer
+        # Savepoints sorgen dafür, dass ein fehlerhafter Auftrag die anderen nicht mitreißt
+        use_savepoints = len(batch) > 1
+        outcomes = []
+
+        await conn.execute("BEGIN IMMEDIATE")
+        for job, future, queued_at in batch:
+            if future.done():
+                continue
+
+            self._record_wait("writer", time.perf_counter() - queued_at)
+            if use_savepoints:
+                await conn.execute("SAVEPOINT write_job")
+            try:
+                result = await job(conn)
+            except BaseException as e:
+                if use_savepoints:
+                    await conn.execute("ROLLBACK TO write_job")
+                    await conn.execute("RELEASE write_job")
+                else:
+                    await conn.execute("ROLLBACK")
+                if not isinstance(e, Exception):
+                    # Abbruch des Writer-Tasks: Auftrag scheitern lassen, Abbruch weiterreichen
+                    if conn.in_transaction:
+                        await conn.execute("ROLLBACK")
+                    self._failed_jobs += 1
+                    future.set_exception(WriteAborted(repr(e)))
+                    raise
+                if not use_savepoints:
+                    self._failed_jobs += 1
+                    future.set_exception(e)
+                    return
+                outcomes.append((future, e, None))
+            else:
+                if use_savepoints:
+                    await conn.execute("RELEASE write_job")
+                outcomes.append((future, None, result))
+
+        try:
+            await conn.execute("COMMIT")
+        except aiosqlite.Error:
+            if conn.in_transaction:
+                await conn.execute("ROLLBACK")
+            raise
+
+        self._commits += 1
+        for future, error, result in outcomes:
+            self._write_jobs += 1
+            if future.done():
+                continue
+            if error is not None:
+                self._failed_jobs += 1
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Gibt Poolgröße, Wartezeiten (in Millisekunden) und Writer-Statistiken zurück"""
+        stats = {
+            "db_path": self.db_path,
+            "open": self.is_open,
+            "readers": self.size,
+            "idle_readers": self._idle_readers.qsize() if self._idle_readers else 0,
+            "write_queue": self._write_queue.qsize() if self._write_queue else 0,
+            "commits": self._commits,
+            "write_jobs": self._write_jobs,
+            "failed_write_jobs": self._failed_jobs,
+            "jobs_per_commit": (self._write_jobs / self._commits) if self._commits else 0.0,
+        }
+        for kind in ("reader", "writer"):
+            count = self._acquired[kind]
+            stats[f"{kind}_acquires"] = count
+            stats[f"{kind}_wait_avg_ms"] = (self._wait_total[kind] / count * 1000) if count else 0.0
+            stats[f"{kind}_wait_max_ms"] = self._wait_max[kind] * 1000
+        return stats
+
+
+# Ein Pool pro Datenbankdatei, geteilt von allen Database-Instanzen
+_pools: Dict[str, ConnectionPool] = {}
+
+
+def get_pool(db_path: str = DB_PATH) -> ConnectionPool:
+    """Gibt den gemeinsamen Pool für eine Datenbankdatei zurück"""
+    pool = _pools.get(db_path)
+    if pool is None:
+        pool = _pools[db_path] = ConnectionPool(db_path)
+    return pool
+
+
+async def close_db():
+    """Schließt alle offenen Datenbank-Pools (beim Herunterfahren)"""
+    for pool in _pools.values():
+        await pool.close()
+
+
+# Wird nach dem ersten erfolgreichen Migrationslauf gesetzt
+_schema_ready = False
+
+
 async def init_db():
-    """Initialisiert die Datenbank"""
-    async with aiosqlite.connect(DB_PATH) as db:
-        # Tabelle für Willkommenssystem
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS welcome_config (
-                guild_id INTEGER PRIMARY KEY,
-                welcome_channel_id INTEGER,
-                rules_channel_id INTEGER,
-                temp_role_id INTEGER,
-                verified_role_id INTEGER,
-                welcome_message TEXT,
-                enabled BOOLEAN DEFAULT 0
-            )
-        ''')
-
-        # Tabelle für Warnungen
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS warnings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                user_name TEXT NOT NULL,
-                guild_id INTEGER NOT NULL,
-                reason TEXT,
-                moderator_id INTEGER NOT NULL,
-                moderator_name TEXT NOT NULL,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Tabelle für Kanal-Konfiguration
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS channel_config (
-                guild_id INTEGER PRIMARY KEY,
-                mod_log_channel_id INTEGER
-            )
-        ''')
-
-        # Tabelle für Timeouts
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS timeouts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                user_name TEXT NOT NULL,
-                guild_id INTEGER NOT NULL,
-                moderator_id INTEGER NOT NULL,
-                moderator_name TEXT NOT NULL,
-                duration_minutes INTEGER NOT NULL,
-                reason TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                expires_at DATETIME NOT NULL
-            )
-        ''')
-
-        # Tabelle für Kicks
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS kicks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                user_name TEXT NOT NULL,
-                guild_id INTEGER NOT NULL,
-                moderator_id INTEGER NOT NULL,
-                moderator_name TEXT NOT NULL,
-                reason TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Tabelle für Bans
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS bans (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                user_name TEXT NOT NULL,
-                guild_id INTEGER NOT NULL,
-                moderator_id INTEGER NOT NULL,
-                moderator_name TEXT NOT NULL,
-                reason TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                is_temporary BOOLEAN DEFAULT 0,
-                expires_at DATETIME
-            )
-        ''')
-
-        # Tabelle für Serverregeln
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS server_rules (
-                guild_id INTEGER NOT NULL,
-                rule_number INTEGER NOT NULL,
-                rule_title TEXT,
-                rule_content TEXT NOT NULL,
-                last_edited_by INTEGER,
-                last_edited_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                PRIMARY KEY (guild_id, rule_number)
-            )
-        ''')
-
-        # Tabelle für Moderationsaktionen
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS mod_actions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                moderator_id INTEGER NOT NULL,
-                action_type TEXT NOT NULL,
-                reason TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                expires_at DATETIME,
-                active BOOLEAN DEFAULT 1
-            )
-        ''')
-        
-        # Tabelle für Reaction Roles
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS reaction_roles (
-                message_id TEXT,
-                emoji TEXT,
-                role_id TEXT,
-                guild_id TEXT,
-                channel_id TEXT,
-                description TEXT,
-                PRIMARY KEY (message_id, emoji)
-            )
-        ''')
-
-        # Tabelle für Wetter-Einstellungen
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS weather_settings (
-                guild_id TEXT,
-                channel_id TEXT,
-                city TEXT,
-                update_time TEXT,
-                enabled INTEGER DEFAULT 0,
-                PRIMARY KEY (guild_id, city)
-            )
-        ''')
-        
-        # AutoMod-Konfigurationstabelle
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS automod_config (
-                guild_id INTEGER PRIMARY KEY,
-                enabled INTEGER DEFAULT 0,
-                log_channel_id INTEGER
-            )
-        ''')
-        
-        # AutoMod-Whitelist-Tabelle
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS automod_whitelist (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER NOT NULL,
-                role_id INTEGER,
-                channel_id INTEGER,
-                type TEXT NOT NULL,
-                UNIQUE(guild_id, role_id, type),
-                UNIQUE(guild_id, channel_id, type)
-            )
-        ''')
-        
-        # AutoMod-Filter-Tabelle
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS automod_filter (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER NOT NULL,
-                word TEXT NOT NULL,
-                type TEXT NOT NULL,
-                UNIQUE(guild_id, word, type)
-            )
-        ''')
-        
-        # AutoMod-Einstellungen-Tabelle
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS automod_settings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                guild_id INTEGER NOT NULL,
-                setting_type TEXT NOT NULL,
-                value TEXT NOT NULL,
-                UNIQUE(guild_id, setting_type)
-            )
-        ''')
-
-        # Temp Voice Channels Tables
-        await db.execute('''
-        CREATE TABLE IF NOT EXISTS temp_voice_config (
-            guild_id INTEGER PRIMARY KEY,
-            creator_channel_id INTEGER,
-            category_id INTEGER,
-            user_limit INTEGER DEFAULT 1,
-            default_privacy TEXT DEFAULT 'public'
-        )
-        ''')
-        
-        await db.execute('''
-        CREATE TABLE IF NOT EXISTS temp_voice_channels (
-            channel_id INTEGER PRIMARY KEY,
-            guild_id INTEGER,
-            owner_id INTEGER,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            privacy TEXT DEFAULT 'public'
-        )
-        ''')
-
-        # Ticket-System-Tabellen
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS ticket_config (
-                guild_id TEXT PRIMARY KEY,
-                category_id TEXT,
-                log_channel_id TEXT,
-                support_role_id TEXT,
-                ticket_counter INTEGER DEFAULT 0,
-                archive_category_id TEXT,
-                enabled BOOLEAN DEFAULT 0,
-                welcome_message TEXT DEFAULT 'Willkommen beim Support! Beschreibe dein Anliegen so detailliert wie möglich.'
-            )
-        ''')
-        
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS tickets (
-                ticket_id TEXT PRIMARY KEY,
-                guild_id TEXT,
-                channel_id TEXT,
-                user_id TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                closed_at TIMESTAMP,
-                closed_by TEXT,
-                status TEXT DEFAULT 'open',
-                title TEXT,
-                archived BOOLEAN DEFAULT 0
-            )
-        ''')
-
-        # Twitch-Integration Tabellen
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS twitch_config (
-                guild_id TEXT PRIMARY KEY,
-                client_id TEXT,
-                client_secret TEXT,
-                announcement_channel_id TEXT,
-                announcement_message TEXT DEFAULT '{streamer} ist jetzt live mit {game}! {url}',
-                ping_role_id TEXT,
-                enabled INTEGER DEFAULT 0
-            )
-        ''')
-        
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS twitch_streamers (
-                streamer_name TEXT,
-                guild_id TEXT,
-                last_stream_id TEXT,
-                last_online TIMESTAMP,
-                user_id TEXT,
-                PRIMARY KEY (streamer_name, guild_id)
-            )
-        ''')
-        
-        await db.execute('''
-            CREATE TABLE IF NOT EXISTS twitch_subscriptions (
-                user_id TEXT,
-                guild_id TEXT,
-                streamer_name TEXT,
-                PRIMARY KEY (user_id, guild_id, streamer_name)
-            )
-        ''')
-
-        await db.commit()
-        print("✅ Datenbank-Tabellen wurden initialisiert!")
+    """Bringt das Datenbankschema per Migrationen auf den aktuellen Stand
+
+    Läuft einmal pro Prozess; weitere Aufrufe (z.B. nach einem Reconnect)
+    führen kein DDL mehr aus.
+    """
+    global _schema_ready
+    if _schema_ready:
+        return
+
+    pool = get_pool()
+    async with pool.writer() as db:
+        applied = await migrate(db)
+
+    _schema_ready = True
+    await pool.warm_statements(read_statements())
+    if applied:
+        logger.info(f"✅ Datenbankschema aktualisiert (Migrationen {', '.join(map(str, applied))})")
+    else:
+        logger.info("✅ Datenbankschema ist aktuell")
+
+@lru_cache(maxsize=256)
+def _insert_sql(table: str, columns: Tuple[str, ...]) -> str:
+    """Baut das INSERT-Statement für eine Spaltenkombination (einmal pro Kombination)"""
+    placeholders = ', '.join('?' for _ in columns)
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+@lru_cache(maxsize=256)
+def _update_sql(table: str, columns: Tuple[str, ...], condition: str) -> str:
+    """Baut das UPDATE-Statement für eine Spaltenkombination (einmal pro Kombination)"""
+    set_clause = ', '.join(f"{column} = ?" for column in columns)
+    return f"UPDATE {table} SET {set_clause} WHERE {condition}"
+
+
+@lru_cache(maxsize=256)
+def _upsert_sql(table: str, columns: Tuple[str, ...], conflict: Tuple[str, ...]) -> str:
+    """Baut das INSERT ... ON CONFLICT DO UPDATE-Statement (einmal pro Kombination)"""
+    updates = [column for column in columns if column not in conflict]
+    if updates:
+        action = "DO UPDATE SET " + ', '.join(f"{column} = excluded.{column}" for column in updates)
+    else:
+        action = "DO NOTHING"
+    return f"{_insert_sql(table, columns)} ON CONFLICT({', '.join(conflict)}) {action}"
+
+
+def _bind(value: Any) -> Any:
+    """Discord-Objekte (Guild, Member, Channel, ...) werden über ihre ID gebunden"""
+    return getattr(value, "id", value)
+
+
+class QueryNamespace:
+    """Stellt die registrierten Abfragen aus utils.queries als Methoden bereit
+
+    ``db.q.<name>(*params)`` führt die Abfrage aus und gibt typisierte Zeilen
+    zurück. Die erzeugten Aufrufer werden pro Instanz zwischengespeichert.
+    """
+
+    def __init__(self, db: "Database"):
+        self._db = db
+
+    def __getattr__(self, name: str):
+        query = QUERIES.get(name)
+        if query is None:
+            raise AttributeError(f"Unbekannte Abfrage: {name}")
+        runner = self._make_runner(name, query)
+        setattr(self, name, runner)
+        return runner
+
+    def __dir__(self):
+        return list(QUERIES)
+
+    def _make_runner(self, name: str, query: Query):
+        db = self._db
+        sql, mode, row = query.sql, query.mode, query.row
+
+        if mode == "write":
+            # Direkt über den Pool: Fehler werden weitergereicht statt als 0 gemeldet
+            async def run(*params):
+                params = tuple(map(_bind, params))
+                cursor = await db.pool.write(lambda conn: conn.execute(sql, params))
+                return cursor.rowcount
+
+            async def many(rows):
+                """Führt die Abfrage für mehrere Parametersätze in einer Transaktion aus"""
+                params_seq = [tuple(map(_bind, params)) for params in rows]
+                if not params_seq:
+                    return 0
+
+                async def job(conn: aiosqlite.Connection):
+                    cursor = await conn.executemany(sql, params_seq)
+                    return cursor.rowcount
+
+                return await db.pool.write(job)
+
+            run.many = many
+        elif mode == "one":
+            async def run(*params):
+                result = await db.fetch_one(sql, tuple(map(_bind, params)))
+                if result is None or row is None:
+                    return result
+                return row._make(result)
+        elif mode == "scalar":
+            async def run(*params):
+                result = await db.fetch_one(sql, tuple(map(_bind, params)))
+                return result[0] if result else None
+        elif mode == "column":
+            async def run(*params):
+                return [result[0] for result in await db.fetch_all(sql, tuple(map(_bind, params)))]
+        else:
+            async def run(*params):
+                results = await db.fetch_all(sql, tuple(map(_bind, params)))
+                return results if row is None else list(map(row._make, results))
+
+        run.__name__ = name
+        run.__doc__ = sql
+        return run
+
 
 class Database:
     """Zentrale Datenbankklasse für den Discord Bot"""
@@ -283,66 +547,115 @@ class Database:
         """Initialisiert die Datenbankverbindung"""
         self.db_path = db_path
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.pool = get_pool(db_path)
+        # Registrierte Abfragen: self.q.open_ticket_for_user(guild, user)
+        self.q = QueryNamespace(self)
+
+    def stats(self) -> Dict[str, Any]:
+        """Gibt die Statistiken des gemeinsamen Verbindungspools zurück"""
+        return self.pool.stats()
     
     async def execute(self, query: str, params: tuple = ()) -> Optional[aiosqlite.Cursor]:
         """Führt eine SQL-Abfrage asynchron aus und gibt den Cursor zurück"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute(query, params)
-                await db.commit()
-                return cursor
+            return await self.pool.write(lambda db: db.execute(query, params))
         except aiosqlite.Error as e:
-            print(f"Datenbankfehler: {e}")
+            logger.error(f"Datenbankfehler: {e}")
             return None
     
+    async def executemany(self, query: str, params_seq) -> int:
+        """Führt eine SQL-Abfrage für mehrere Parametersätze in einer Transaktion aus
+
+        Gibt die Gesamtzahl der geänderten Zeilen zurück (0 bei Fehlern oder
+        leerer Liste). Schlägt ein Satz fehl, wird keiner übernommen.
+        """
+        params_seq = list(params_seq)
+        if not params_seq:
+            return 0
+
+        async def job(db: aiosqlite.Connection):
+            cursor = await db.executemany(query, params_seq)
+            return cursor.rowcount
+
+        try:
+            return await self.pool.write(job)
+        except aiosqlite.Error as e:
+            logger.error(f"Datenbankfehler: {e}")
+            return 0
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Führt mehrere Schreibvorgänge als eine Transaktion aus
+
+            async with db.transaction() as tx:
+                await tx.executemany("UPDATE ...", rows)
+                await tx.execute("DELETE ...", params)
+
+        ``tx`` ist die Schreibverbindung des Pools. Bei einer Ausnahme im
+        Block wird alles zurückgerollt und die Ausnahme weitergereicht.
+        Innerhalb des Blocks nicht über die anderen Database-Methoden
+        schreiben, die warten sonst auf die belegte Schreibverbindung.
+        """
+        async with self.pool.writer() as db:
+            yield db
+
     async def fetch_all(self, query: str, params: tuple = ()) -> List[Tuple]:
         """Führt eine SQL-Abfrage asynchron aus und gibt alle Ergebnisse zurück"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute(query, params)
-                return await cursor.fetchall()
+            async with self.pool.reader() as db:
+                async with db.execute(query, params) as cursor:
+                    return await cursor.fetchall()
         except aiosqlite.Error as e:
-            print(f"Datenbankfehler: {e}")
+            logger.error(f"Datenbankfehler: {e}")
             return []
     
     async def fetch_one(self, query: str, params: tuple = ()) -> Optional[Tuple]:
         """Führt eine SQL-Abfrage asynchron aus und gibt ein Ergebnis zurück"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute(query, params)
-                return await cursor.fetchone()
+            async with self.pool.reader() as db:
+                # Cursor schließen, damit keine Lesesperre offen bleibt
+                async with db.execute(query, params) as cursor:
+                    return await cursor.fetchone()
         except aiosqlite.Error as e:
-            print(f"Datenbankfehler: {e}")
+            logger.error(f"Datenbankfehler: {e}")
             return None
     
     async def insert(self, table: str, data: Dict[str, Any]) -> Optional[int]:
         """Fügt Daten in eine Tabelle ein und gibt die ID zurück"""
-        columns = ', '.join(data.keys())
-        placeholders = ', '.join(['?' for _ in data])
-        query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+        query = _insert_sql(table, tuple(data))
         
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute(query, tuple(data.values()))
-                await db.commit()
-                return cursor.lastrowid
+            cursor = await self.pool.write(lambda db: db.execute(query, tuple(data.values())))
+            return cursor.lastrowid
         except aiosqlite.Error as e:
-            print(f"Datenbankfehler beim Einfügen in {table}: {e}")
+            logger.error(f"Datenbankfehler beim Einfügen in {table}: {e}")
             return None
     
+    async def upsert(self, table: str, data: Dict[str, Any], conflict: Tuple[str, ...]) -> bool:
+        """Fügt eine Zeile ein oder aktualisiert sie, wenn ``conflict`` bereits existiert
+
+        ``conflict`` muss einem UNIQUE-Index bzw. dem Primärschlüssel entsprechen.
+        """
+        return await self.upsert_many(table, [data], conflict) > 0
+
+    async def upsert_many(self, table: str, rows: List[Dict[str, Any]], conflict: Tuple[str, ...]) -> int:
+        """Upsert für mehrere Zeilen mit denselben Spalten in einer Transaktion"""
+        if not rows:
+            return 0
+        columns = tuple(rows[0])
+        query = _upsert_sql(table, columns, tuple(conflict))
+        return await self.executemany(query, [tuple(row[column] for column in columns) for row in rows])
+
     async def update(self, table: str, data: Dict[str, Any], condition: str, params: tuple) -> bool:
         """Aktualisiert Daten in einer Tabelle und gibt True zurück, wenn erfolgreich"""
-        set_clause = ', '.join([f"{key} = ?" for key in data.keys()])
-        query = f"UPDATE {table} SET {set_clause} WHERE {condition}"
+        query = _update_sql(table, tuple(data), condition)
         all_params = tuple(data.values()) + params
         
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute(query, all_params)
-                await db.commit()
-                return cursor.rowcount > 0
+            cursor = await self.pool.write(lambda db: db.execute(query, all_params))
+            return cursor.rowcount > 0
         except aiosqlite.Error as e:
-            print(f"Datenbankfehler beim Aktualisieren von {table}: {e}")
+            logger.error(f"Datenbankfehler beim Aktualisieren von {table}: {e}")
             return False
     
     async def delete(self, table: str, condition: str, params: tuple) -> bool:
@@ -350,61 +663,8 @@ class Database:
         query = f"DELETE FROM {table} WHERE {condition}"
         
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute(query, params)
-                await db.commit()
-                return cursor.rowcount > 0
+            cursor = await self.pool.write(lambda db: db.execute(query, params))
+            return cursor.rowcount > 0
         except aiosqlite.Error as e:
-            print(f"Datenbankfehler beim Löschen aus {table}: {e}")
+            logger.error(f"Datenbankfehler beim Löschen aus {table}: {e}")
             return False
-            
-    # Synchrone Methoden für einfache Operationen
-    def execute_sync(self, query: str, params: tuple = ()) -> Optional[sqlite3.Cursor]:
-        """Führt eine SQL-Abfrage synchron aus und gibt den Cursor zurück"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                conn.commit()
-                return cursor
-        except sqlite3.Error as e:
-            print(f"Datenbankfehler: {e}")
-            return None
-    
-    def fetch_all_sync(self, query: str, params: tuple = ()) -> List[Tuple]:
-        """Führt eine SQL-Abfrage synchron aus und gibt alle Ergebnisse zurück"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                return cursor.fetchall()
-        except sqlite3.Error as e:
-            print(f"Datenbankfehler: {e}")
-            return []
-    
-    def fetch_one_sync(self, query: str, params: tuple = ()) -> Optional[Tuple]:
-        """Führt eine SQL-Abfrage synchron aus und gibt ein Ergebnis zurück"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                return cursor.fetchone()
-        except sqlite3.Error as e:
-            print(f"Datenbankfehler: {e}")
-            return None
-    
-    def insert_sync(self, table: str, data: Dict[str, Any]) -> Optional[int]:
-        """Fügt Daten synchron in eine Tabelle ein und gibt die ID zurück"""
-        columns = ', '.join(data.keys())
-        placeholders = ', '.join(['?' for _ in data])
-        query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
-        
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, tuple(data.values()))
-                conn.commit()
-                return cursor.lastrowid
-        except sqlite3.Error as e:
-            print(f"Datenbankfehler beim Einfügen in {table}: {e}")
-            return None 
\ No newline at end of file
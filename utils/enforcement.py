@@ -0,0 +1,353 @@
+"""Warteschlange für die Durchsetzung von AutoMod-Verstößen
+
+Statt pro Verstoß nacheinander Nachricht zu löschen, DM zu senden und ein
+Log-Embed zu schicken, legt AutoMod.take_action() den Verstoß nur in diese
+Warteschlange. Ein Hintergrund-Task arbeitet sie in kurzen Fenstern ab:
+
+- Löschungen werden pro Kanal gesammelt und als Bulk-Delete geschickt
+  (bis zu 100 Nachrichten pro API-Aufruf statt einem Aufruf pro Nachricht).
+- Warnungen per DM gibt es höchstens eine pro User und Cooldown, egal wie
+  viele Verstoßtypen er auslöst; mehrere Gründe landen in derselben DM.
+- Log-Einträge werden pro Server über LOG_WINDOW Sekunden gesammelt und als
+  ein Zusammenfassungs-Embed gesendet. Ein einzelner Verstoß wird wie bisher
+  ausführlich geloggt.
+
+Bei einem Raid mit hunderten Verstößen pro Sekunde entstehen so wenige
+REST-Aufrufe statt eines Rückstaus aus Einzelaufrufen, die in Discords
+Rate-Limits laufen. Tiefe und Verzögerung der Warteschlange liefert stats().
+"""
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import discord
+
+from utils.ratelimit import Cooldown
+
+logger = logging.getLogger(__name__)
+
+# Sammelphase für Löschungen und DMs (Sekunden)
+ACTION_WINDOW = 0.5
+
+# Log-Einträge eines Servers werden so lange zu einem Embed zusammengefasst (Sekunden)
+LOG_WINDOW = 5.0
+
+# Höchstens so viele Nachrichten löscht Discord in einem Bulk-Delete
+BULK_DELETE_LIMIT = 100
+
+# So viele Einzelverstöße stehen höchstens im Zusammenfassungs-Embed, der Rest wird nur gezählt
+LOG_SAMPLE_SIZE = 10
+
+# Eine Warnung per DM pro User und Server in diesem Zeitraum (Sekunden)
+WARNING_COOLDOWN = 60
+
+# Gleichzeitig laufende DM-Aufrufe
+DM_CONCURRENCY = 5
+
+VIOLATION_DESCRIPTIONS = {
+    "banned_word": "Verbotenes Wort oder Ausdruck",
+    "banned_link": "Nicht erlaubter Link",
+    "excessive_caps": "Zu viele Großbuchstaben",
+    "excessive_emojis": "Zu viele Emojis",
+    "spam": "Zu viele Nachrichten in kurzer Zeit",
+    "flood": "Wiederholte Nachrichten (Flooding)",
+    "raid": "Raid: gleiche Nachricht von vielen Accounts"
+}
+
+
+def describe_violation(violation_type: str) -> str:
+    return VIOLATION_DESCRIPTIONS.get(violation_type, "Regelverstoß")
+
+
+class _LogBatch:
+    """Gesammelte Log-Einträge eines Servers innerhalb eines Fensters"""
+
+    __slots__ = ("since", "total", "types", "users", "samples")
+
+    def __init__(self, since: float):
+        self.since = since
+        self.total = 0
+        self.types: Counter = Counter()
+        self.users: Counter = Counter()
+        self.samples: List[Tuple[discord.Message, str]] = []
+
+    def add(self, message: discord.Message, violation_type: str):
+        self.total += 1
+        self.types[violation_type] += 1
+        self.users[message.author.id] += 1
+        if len(self.samples) < LOG_SAMPLE_SIZE:
+            self.samples.append((message, violation_type))
+
+
+class EnforcementQueue:
+    """Sammelt Verstöße und setzt sie gebündelt durch (Löschen, DM, Log)"""
+
+    def __init__(self, automod, action_window: float = ACTION_WINDOW, log_window: float = LOG_WINDOW):
+        self.automod = automod
+        self.action_window = action_window
+        self.log_window = log_window
+        self.warning_cooldowns = Cooldown(WARNING_COOLDOWN)
+
+        # channel_id -> [(Nachricht, eingereiht um)]
+        self._deletions: Dict[int, List[Tuple[discord.Message, float]]] = {}
+        # (guild_id, user_id) -> (User, Verstoßtypen)
+        self._warnings: Dict[Tuple[int, int], Tuple[discord.abc.User, Set[str]]] = {}
+        # guild_id -> gesammelte Log-Einträge
+        self._logs: Dict[int, _LogBatch] = {}
+
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._dm_slots = asyncio.Semaphore(DM_CONCURRENCY)
+        self._announcements: Set[asyncio.Task] = set()
+
+        self.counters: Counter = Counter()
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.avg_lag = 0.0
+
+    def submit(self, message: discord.Message, violation_type: str):
+        """Reiht einen Verstoß ein (kehrt sofort zurück)"""
+        now = time.monotonic()
+        self.counters["submitted"] += 1
+        self._deletions.setdefault(message.channel.id, []).append((message, now))
+
+        key = (message.guild.id, message.author.id)
+        pending = self._warnings.get(key)
+        if pending is not None:
+            pending[1].add(violation_type)
+        elif self.warning_cooldowns.ready(key):
+            self._warnings[key] = (message.author, {violation_type})
+        else:
+            self.counters["warnings_suppressed"] += 1
+
+        if message.guild.id in self.automod.log_channels:
+            batch = self._logs.get(message.guild.id)
+            if batch is None:
+                batch = self._logs[message.guild.id] = _LogBatch(now)
+            batch.add(message, violation_type)
+
+        self._ensure_worker()
+        self._wakeup.set()
+
+    def depth(self) -> int:
+        """Anzahl ausstehender Aufträge (Löschungen, DMs, Log-Einträge)"""
+        return (sum(len(pending) for pending in self._deletions.values())
+                + len(self._warnings)
+                + sum(batch.total for batch in self._logs.values()))
+
+    def stats(self) -> Dict[str, Any]:
+        """Tiefe, Verzögerung und Zähler der Warteschlange"""
+        oldest = min((pending[0][1] for pending in self._deletions.values() if pending), default=None)
+        return {
+            "depth": self.depth(),
+            "pending_deletions": sum(len(pending) for pending in self._deletions.values()),
+            "pending_warnings": len(self._warnings),
+            "pending_log_entries": sum(batch.total for batch in self._logs.values()),
+            "oldest_pending_s": round(time.monotonic() - oldest, 3) if oldest is not None else 0.0,
+            "last_lag_s": round(self.last_lag, 3),
+            "avg_lag_s": round(self.avg_lag, 3),
+            "max_lag_s": round(self.max_lag, 3),
+            **self.counters,
+        }
+
+    def _ensure_worker(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # Kurz sammeln, damit gleichzeitige Verstöße gebündelt werden
+            await asyncio.sleep(self.action_window)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.exception("❌ Fehler in der AutoMod-Warteschlange: %s", e)
+            if self._logs:
+                # Offene Log-Fenster später erneut prüfen
+                self._wakeup.set()
+
+    async def flush(self, force: bool = False):
+        """Arbeitet Löschungen und DMs ab, Logs, deren Fenster abgelaufen ist (oder alle mit ``force``)"""
+        deletions, self._deletions = self._deletions, {}
+        warnings, self._warnings = self._warnings, {}
+
+        if deletions:
+            await asyncio.gather(*(self._delete_batch(pending) for pending in deletions.values()))
+        if warnings:
+            await asyncio.gather(*(self._send_warning(user, types) for user, types in warnings.values()))
+
+        now = time.monotonic()
+        due = [guild_id for guild_id, batch in self._logs.items() if force or now - batch.since >= self.log_window]
+        for guild_id in due:
+            await self._send_log(guild_id, self._logs.pop(guild_id))
+
+    async def close(self):
+        """Arbeitet alles Ausstehende ab und beendet den Hintergrund-Task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush(force=True)
+
+    def _record_lag(self, queued_at: float):
+        lag = time.monotonic() - queued_at
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.avg_lag = lag if not self.avg_lag else self.avg_lag * 0.9 + lag * 0.1
+
+    async def _delete_batch(self, pending: List[Tuple[discord.Message, float]]):
+        """Löscht die gesammelten Nachrichten eines Kanals (Bulk-Delete ab zwei Nachrichten)"""
+        # Dieselbe Nachricht kann nicht zweimal gelöscht werden
+        messages = list({message.id: message for message, _ in pending}.values())
+        channel = messages[0].channel
+        self._record_lag(pending[0][1])
+
+        for start in range(0, len(messages), BULK_DELETE_LIMIT):
+            chunk = messages[start:start + BULK_DELETE_LIMIT]
+            if len(chunk) > 1 and hasattr(channel, "delete_messages"):
+                try:
+                    await channel.delete_messages(chunk, reason="AutoMod")
+                    self.counters["bulk_deletes"] += 1
+                    self.counters["deleted"] += len(chunk)
+                    logger.info("🗑️ %d Nachrichten in #%s gelöscht (AutoMod)", len(chunk), channel)
+                    continue
+                except discord.HTTPException as e:
+                    # z.B. fehlende Berechtigung für Bulk-Delete: einzeln weiter versuchen
+                    logger.warning("⚠️ Bulk-Delete in #%s fehlgeschlagen, lösche einzeln: %s", channel, e)
+            for message in chunk:
+                await self._delete_one(message)
+
+    async def _delete_one(self, message: discord.Message):
+        try:
+            await message.delete()
+            self.counters["single_deletes"] += 1
+            self.counters["deleted"] += 1
+            logger.info("🗑️ Nachricht von %s wurde gelöscht (AutoMod)", message.author.name)
+        except discord.NotFound:
+            logger.warning("⚠️ Nachricht von %s wurde bereits gelöscht", message.author.name)
+        except discord.HTTPException as e:
+            self.counters["errors"] += 1
+            logger.error("❌ Fehler beim Löschen der Nachricht von %s: %s", message.author.name, e)
+
+    async def _send_warning(self, user: discord.abc.User, violation_types: Set[str]):
+        """Sendet eine DM mit allen Gründen aus dem aktuellen Fenster"""
+        warning_embed = discord.Embed(
+            title="⚠️ AutoMod-Warnung",
+            description="Deine Nachricht wurde entfernt, weil sie gegen unsere Regeln verstößt.",
+            color=discord.Color.orange()
+        )
+        warning_embed.add_field(
+            name="Grund",
+            value="\n".join(describe_violation(violation_type) for violation_type in sorted(violation_types)),
+            inline=False
+        )
+
+        async with self._dm_slots:
+            try:
+                await user.send(embed=warning_embed)
+                self.counters["warnings_sent"] += 1
+                logger.debug("📨 Warnung an %s gesendet", user.name)
+            except discord.Forbidden:
+                # User hat DMs deaktiviert
+                logger.info("Konnte keine DM an %s senden (DMs deaktiviert)", user.name)
+            except discord.HTTPException as e:
+                self.counters["errors"] += 1
+                logger.error("❌ Fehler beim Senden der Warnung an %s: %s", user.name, e)
+
+    def announce(self, guild_id: int, embed: discord.Embed):
+        """Sendet eine Meldung sofort (ohne Sammelfenster) in den Log-Kanal, z.B. Beginn eines Raids"""
+        if guild_id in self.automod.log_channels:
+            task = asyncio.create_task(self._send_announcement(guild_id, embed))
+            self._announcements.add(task)
+            task.add_done_callback(self._announcements.discard)
+
+    async def _send_announcement(self, guild_id: int, embed: discord.Embed):
+        log_channel = self._log_channel(guild_id)
+        if not log_channel:
+            return
+        try:
+            await log_channel.send(embed=embed)
+            self.counters["log_messages"] += 1
+        except Exception as e:
+            self.counters["errors"] += 1
+            logger.error("❌ Fehler beim Senden der AutoMod-Meldung: %s", e)
+
+    def _log_channel(self, guild_id: int) -> Optional[discord.abc.Messageable]:
+        log_channel_id = self.automod.log_channels.get(guild_id)
+        log_channel = self.automod.bot.get_channel(log_channel_id) if log_channel_id else None
+        if not log_channel:
+            logger.warning("⚠️ Log-Kanal %s nicht gefunden", log_channel_id)
+        return log_channel
+
+    async def _send_log(self, guild_id: int, batch: _LogBatch):
+        """Sendet die gesammelten Verstöße eines Servers als ein Embed"""
+        log_channel = self._log_channel(guild_id)
+        if not log_channel:
+            return
+
+        if batch.total == 1:
+            log_embed = self._single_log_embed(*batch.samples[0])
+        else:
+            log_embed = self._summary_log_embed(batch)
+
+        try:
+            await log_channel.send(embed=log_embed)
+            self.counters["log_messages"] += 1
+            logger.debug("📝 %d Verstöße in Log-Kanal protokolliert", batch.total)
+        except Exception as e:
+            self.counters["errors"] += 1
+            logger.error("❌ Fehler beim Senden des Logs: %s", e)
+
+    @staticmethod
+    def _single_log_embed(message: discord.Message, violation_type: str) -> discord.Embed:
+        log_embed = discord.Embed(
+            title="🤖 AutoMod: Nachricht entfernt",
+            description=f"Eine Nachricht von {message.author.mention} wurde automatisch entfernt.",
+            color=discord.Color.orange(),
+            timestamp=datetime.now()
+        )
+        log_embed.add_field(name="User", value=f"{message.author} (ID: {message.author.id})", inline=True)
+        log_embed.add_field(name="Kanal", value=message.channel.mention, inline=True)
+        log_embed.add_field(name="Grund", value=describe_violation(violation_type), inline=False)
+
+        # Nachrichteninhalt (gekürzt, falls zu lang)
+        content = message.content
+        if len(content) > 1024:
+            content = content[:1021] + "..."
+        log_embed.add_field(name="Nachrichteninhalt", value=f"```{content}```", inline=False)
+        return log_embed
+
+    @staticmethod
+    def _summary_log_embed(batch: _LogBatch) -> discord.Embed:
+        log_embed = discord.Embed(
+            title=f"🤖 AutoMod: {batch.total} Nachrichten entfernt",
+            description=f"{len(batch.users)} User in den letzten Sekunden.",
+            color=discord.Color.orange(),
+            timestamp=datetime.now()
+        )
+        log_embed.add_field(
+            name="Gründe",
+            value="\n".join(f"{describe_violation(violation_type)}: {count}"
+                            for violation_type, count in batch.types.most_common()),
+            inline=False
+        )
+
+        lines = []
+        for message, violation_type in batch.samples:
+            content = message.content if len(message.content) <= 60 else message.content[:57] + "..."
+            lines.append(f"{message.author.mention} in {message.channel.mention} ({violation_type}): `{content}`")
+        # Embed-Felder sind auf 1024 Zeichen begrenzt, überzählige Zeilen werden nur gezählt
+        while lines and len("\n".join(lines)) > 1000:
+            lines.pop()
+        if batch.total > len(lines):
+            lines.append(f"… und {batch.total - len(lines)} weitere")
+        log_embed.add_field(name="Verstöße", value="\n".join(lines), inline=False)
+        return log_embed
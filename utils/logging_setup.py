@@ -0,0 +1,108 @@
+"""Zentrale Logging-Konfiguration des Bots
+
+Alle Module loggen über ``logging.getLogger(__name__)``. setup_logging()
+hängt an den Root-Logger nur einen QueueHandler: Ein Log-Aufruf legt den
+Eintrag in eine Queue und kehrt sofort zurück, das Schreiben auf stderr
+(bzw. in die Datei) übernimmt ein eigener Thread (QueueListener). So
+blockiert auch eine langsame Konsole den Event-Loop nicht.
+
+Steuerung über die Umgebung (siehe config.py):
+
+    LOG_LEVEL=INFO          # DEBUG, INFO, WARNING, ERROR
+    LOG_DEBUG_SAMPLE=0      # Anteil der DEBUG-Einträge, der trotzdem geloggt wird (z.B. 0.01)
+    LOG_FILE=logs/bot.log   # zusätzlich in eine Datei schreiben (optional)
+
+Die Traces pro Nachricht (AutoMod-Prüfungen) laufen auf DEBUG. Sie sind
+standardmäßig aus; mit LOG_DEBUG_SAMPLE lässt sich bei LOG_LEVEL=INFO ein
+kleiner Teil davon stichprobenartig mitschreiben. Ist DEBUG nicht aktiv,
+kostet ein logger.debug(...) nur die Level-Prüfung, die Nachricht wird
+nicht formatiert. Mit Stichprobe entsteht der Eintrag, formatiert und
+geschrieben wird aber nur der gesampelte Anteil.
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from typing import Optional
+
+from config import LOG_LEVEL, LOG_DEBUG_SAMPLE, LOG_FILE
+
+LOG_FORMAT = "%(asctime)s %(levelname)-8s %(name)s: %(message)s"
+
+# Logger der eigenen Module, für die LOG_DEBUG_SAMPLE gilt
+BOT_LOGGERS = ("__main__", "cogs", "utils")
+
+# Bibliotheken, die auf DEBUG jede einzelne Operation loggen; bleiben mindestens auf INFO
+NOISY_LOGGERS = ("aiosqlite", "discord", "asyncio")
+
+# Laufender Listener (None, solange setup_logging() nicht aufgerufen wurde)
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class DebugSampler(logging.Filter):
+    """Lässt von den DEBUG-Einträgen nur einen zufälligen Anteil durch"""
+
+    def __init__(self, rate: float, level: int):
+        super().__init__()
+        self.rate = rate
+        self.level = level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.level:
+            return True
+        return random.random() < self.rate
+
+
+def setup_logging(level: Optional[str] = None, debug_sample: Optional[float] = None) -> logging.Logger:
+    """Richtet das Logging einmalig ein und gibt den Root-Logger zurück"""
+    global _listener
+    root = logging.getLogger()
+    if _listener is not None:
+        return root
+
+    level_name = (level or LOG_LEVEL).upper()
+    base_level = logging.getLevelName(level_name)
+    if not isinstance(base_level, int):
+        base_level = logging.INFO
+    sample = LOG_DEBUG_SAMPLE if debug_sample is None else debug_sample
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler(sys.stderr)]
+    if LOG_FILE:
+        os.makedirs(os.path.dirname(LOG_FILE) or ".", exist_ok=True)
+        handlers.append(logging.handlers.RotatingFileHandler(
+            LOG_FILE, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+    root.setLevel(base_level)
+    root.handlers.clear()
+    root.addHandler(queue_handler)
+
+    if 0 < sample and base_level > logging.DEBUG:
+        # Nur die eigenen Module lassen DEBUG durch (nicht discord.py oder
+        # aiosqlite); die Stichprobe entscheidet, was geschrieben wird.
+        queue_handler.addFilter(DebugSampler(sample, base_level))
+        for name in BOT_LOGGERS:
+            logging.getLogger(name).setLevel(logging.DEBUG)
+
+    for name in NOISY_LOGGERS:
+        logging.getLogger(name).setLevel(max(base_level, logging.INFO))
+
+    _listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return root
+
+
+def shutdown_logging():
+    """Schreibt ausstehende Einträge und beendet den Listener-Thread"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
@@ -0,0 +1,283 @@
+"""Vorkompilierte Matcher für die AutoMod-Filter
+
+WordMatcher (verbotene Wörter): Statt für jedes verbotene Wort ein eigenes
+Pattern zu bauen und die Nachricht pro Wort zu durchsuchen, werden alle
+Wörter eines Servers in einem Präfixbaum (Trie) gehalten und daraus ein
+einziger regulärer Ausdruck erzeugt. Gemeinsame Präfixe stehen darin nur einmal:
+
+    {"spam", "spammer", "scam"}  ->  \\b(?:s(?:cam|pam(?:mer)?))\\b
+
+Eine Nachricht wird so in einem Durchlauf (in C, durch das re-Modul)
+geprüft, unabhängig davon, wie viele Wörter auf der Liste stehen.
+
+DomainMatcher (verbotene Links): Die Hosts aller Links einer Nachricht
+werden mit einem gemeinsamen, vorkompilierten Pattern extrahiert und im
+Trie der umgedrehten Domain-Labels nachgeschlagen (``gg -> discord``).
+Ein Eintrag trifft die Domain selbst und alle Subdomains, aber keine
+Domains, die nur gleich enden (``t.co`` trifft nicht ``reddit.com``).
+"""
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Set, Tuple
+
+# Markiert im Trie das Ende eines Wortes
+_END = ""
+
+
+def _trie_pattern(node: Dict[str, dict]) -> str:
+    """Wandelt einen (Teil-)Trie in einen regulären Ausdruck um"""
+    optional = _END in node
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char != _END]
+    if not branches:
+        return ""
+
+    if len(branches) == 1:
+        pattern = branches[0]
+        if optional:
+            pattern = f"(?:{pattern})?" if len(pattern) > 1 else f"{pattern}?"
+        return pattern
+
+    if all(len(branch) == 1 for branch in branches):
+        pattern = f"[{''.join(branches)}]"
+    else:
+        pattern = f"(?:{'|'.join(branches)})"
+    return pattern + ("?" if optional else "")
+
+
+class WordMatcher:
+    """Menge verbotener Wörter mit einem gemeinsamen, vorkompilierten Pattern
+
+    Verhält sich wie ein set (add, remove, discard, in, len, Iteration).
+    Änderungen aktualisieren nur den Trie; das Pattern wird beim nächsten
+    find() einmal neu kompiliert. Ein Wort trifft wie bisher nur mit
+    Wortgrenzen (``\\bwort\\b``).
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._words = set()
+        self._trie: Dict[str, dict] = {}
+        self._pattern: Optional[Pattern] = None
+        self._dirty = False
+        for word in words:
+            self.add(word)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._words
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._words)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def add(self, word: str):
+        """Fügt ein Wort hinzu (O(Wortlänge), das Pattern wird später neu gebaut)"""
+        if not word or word in self._words:
+            return
+        self._words.add(word)
+        node = self._trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[_END] = {}
+        self._dirty = True
+
+    def discard(self, word: str):
+        """Entfernt ein Wort und räumt leere Äste im Trie auf"""
+        if word not in self._words:
+            return
+        self._words.remove(word)
+
+        parents = []
+        node = self._trie
+        for char in word:
+            parents.append((node, char))
+            node = node[char]
+        del node[_END]
+        # Von hinten alle Knoten entfernen, die jetzt leer sind
+        for parent, char in reversed(parents):
+            if parent[char]:
+                break
+            del parent[char]
+        self._dirty = True
+
+    def remove(self, word: str):
+        if word not in self._words:
+            raise KeyError(word)
+        self.discard(word)
+
+    @property
+    def pattern(self) -> Optional[Pattern]:
+        """Das kompilierte Pattern (None, wenn die Liste leer ist)"""
+        if self._dirty:
+            source = _trie_pattern(self._trie)
+            self._pattern = re.compile(rf"\b(?:{source})\b") if source else None
+            self._dirty = False
+        return self._pattern
+
+    def find(self, content: str) -> Optional[str]:
+        """Gibt das erste verbotene Wort in ``content`` zurück (oder None)
+
+        ``content`` muss bereits kleingeschrieben sein, wie die Wörter.
+        """
+        pattern = self.pattern
+        if pattern is None:
+            return None
+        match = pattern.search(content)
+        return match.group(0) if match else None
+
+
+# Links mit oder ohne Schema, Host in Gruppe 1, Pfad (optional) in Gruppe 2.
+# Wird für alle Server geteilt; erwartet kleingeschriebenen Text.
+LINK_PATTERN = re.compile(
+    r"(?<![\w.@-])(?:https?://)?"
+    r"((?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,63})\.?"
+    r"(?::\d{1,5})?"
+    r"(/[^\s<>\"']*)?"
+)
+
+_LABEL_PATTERN = re.compile(r"[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?")
+
+# Satzzeichen am Ende gehören meist nicht mehr zum Link ("siehe x.com/abc.")
+_TRAILING = ".,;:!?)]}*_~|"
+
+# Schlüssel für die Pfadregeln eines Trie-Knotens (Labels sind nie leer)
+_RULES = ""
+
+
+def extract_links(content: str) -> List[Tuple[str, str]]:
+    """Gibt (host, pfad) aller Links in ``content`` zurück (Pfad ohne Query, ggf. leer)"""
+    links = []
+    if "." not in content:
+        # Ohne Punkt kein Host, der Regex-Durchlauf kann entfallen
+        return links
+    for match in LINK_PATTERN.finditer(content):
+        path = (match.group(2) or "").rstrip(_TRAILING)
+        links.append((match.group(1), path.split("?", 1)[0].split("#", 1)[0]))
+    return links
+
+
+def _parse_entry(entry: str) -> Optional[Tuple[str, str]]:
+    """Zerlegt einen Listeneintrag ("discord.gg/invite", "*.ru", ...) in Host und Pfad"""
+    entry = entry.strip()
+    wildcard = entry.startswith(("*.", "."))
+    for prefix in ("https://", "http://", "*.", ".", "www."):
+        if entry.startswith(prefix):
+            entry = entry[len(prefix):]
+    if wildcard and _LABEL_PATTERN.fullmatch(entry):
+        # Ganze Top-Level-Domain, z.B. "*.ru"
+        return entry, ""
+    match = LINK_PATTERN.fullmatch(entry)
+    if not match:
+        return None
+    return match.group(1), (match.group(2) or "").rstrip("/")
+
+
+def _path_matches(path: str, prefix: str) -> bool:
+    """Pfadpräfix segmentweise: /invite trifft /invite und /invite/abc, aber nicht /invites"""
+    return not prefix or path == prefix or path.startswith(prefix + "/")
+
+
+class DomainMatcher:
+    """Menge verbotener Links mit Trie über die umgedrehten Domain-Labels
+
+    Verhält sich wie ein set der ursprünglichen Einträge. Einträge, die
+    keine Domain sind (z.B. einzelne Stichwörter), werden wie bisher als
+    Teilstring im Link gesucht; das bleibt eine kurze Liste.
+    """
+
+    def __init__(self, entries: Iterable[str] = ()):
+        self._entries: Dict[str, Optional[Tuple[str, str]]] = {}
+        self._trie: Dict[str, dict] = {}
+        self._keywords: Set[str] = set()
+        for entry in entries:
+            self.add(entry)
+
+    def __contains__(self, entry: str) -> bool:
+        return entry in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, entry: str):
+        if not entry or entry in self._entries:
+            return
+        parsed = self._entries[entry] = _parse_entry(entry)
+        if parsed is None:
+            self._keywords.add(entry)
+            return
+
+        host, path = parsed
+        node = self._trie
+        for label in reversed(host.split(".")):
+            node = node.setdefault(label, {})
+        node.setdefault(_RULES, {}).setdefault(path, set()).add(entry)
+
+    def discard(self, entry: str):
+        if entry not in self._entries:
+            return
+        parsed = self._entries.pop(entry)
+        if parsed is None:
+            self._keywords.discard(entry)
+            return
+
+        host, path = parsed
+        parents = []
+        node = self._trie
+        for label in reversed(host.split(".")):
+            parents.append((node, label))
+            node = node[label]
+
+        rules = node[_RULES]
+        rules[path].discard(entry)
+        if not rules[path]:
+            del rules[path]
+        if not rules:
+            del node[_RULES]
+        # Leer gewordene Knoten von hinten entfernen
+        for parent, label in reversed(parents):
+            if parent[label]:
+                break
+            del parent[label]
+
+    def remove(self, entry: str):
+        if entry not in self._entries:
+            raise KeyError(entry)
+        self.discard(entry)
+
+    def lookup(self, host: str, path: str = "") -> Optional[str]:
+        """Gibt den Eintrag zurück, der auf Host und Pfad passt (O(Anzahl Labels))"""
+        node = self._trie
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                return None
+            rules = node.get(_RULES)
+            if rules:
+                for prefix, entries in rules.items():
+                    if _path_matches(path, prefix):
+                        return next(iter(entries))
+        return None
+
+    def find(self, content: str) -> Optional[Tuple[str, str]]:
+        """Gibt (Link, Eintrag) für den ersten verbotenen Link in ``content`` zurück
+
+        ``content`` muss bereits kleingeschrieben sein.
+        """
+        if not self._entries:
+            return None
+        return self.match_links(extract_links(content))
+
+    def match_links(self, links: Iterable[Tuple[str, str]]) -> Optional[Tuple[str, str]]:
+        """Wie find(), aber für bereits extrahierte (host, pfad)-Paare"""
+        if not self._entries:
+            return None
+        for host, path in links:
+            entry = self.lookup(host, path)
+            if entry is None and self._keywords:
+                link = host + path
+                entry = next((keyword for keyword in self._keywords if keyword in link), None)
+            if entry is not None:
+                return host + path, entry
+        return None
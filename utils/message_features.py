@@ -0,0 +1,92 @@
+"""Merkmale einer Nachricht für die AutoMod-Prüfungen
+
+Jede Nachricht wird einmal analysiert, alle Prüfungen lesen danach nur
+noch das Ergebnis:
+
+    features = MessageFeatures(message.content)
+    features.lower          # kleingeschriebener Text (Wort- und Link-Filter)
+    features.upper_count    # Großbuchstaben
+    features.alpha_count    # Buchstaben insgesamt
+    features.emoji_count    # Unicode- und Discord-Emojis
+    features.links          # (host, pfad) aller Links
+    features.digest         # Hash des Inhalts (Flood-Erkennung)
+
+Die Zeichenzählung läuft in einem Durchlauf und nur, wenn eine Prüfung
+sie braucht. Reine ASCII-Nachrichten (der Normalfall) werden über
+bytes.translate in C gezählt. Links werden ebenfalls erst beim ersten
+Zugriff extrahiert.
+"""
+import re
+import string
+from typing import List, Optional, Tuple
+
+from utils.matchers import extract_links
+
+# Discord-Emojis (<:name:id> bzw. animiert <a:name:id>)
+CUSTOM_EMOJI_PATTERN = re.compile(r"<a?:[a-zA-Z0-9_]+:\d+>")
+
+_ASCII_UPPER = string.ascii_uppercase.encode()
+_ASCII_LETTERS = string.ascii_letters.encode()
+
+
+def count_chars(content: str) -> Tuple[int, int, int]:
+    """Zählt Großbuchstaben, Buchstaben und Emojis in einem Durchlauf
+
+    Als Emoji zählen Zeichen außerhalb der Basic Multilingual Plane
+    (U+10000 und höher) sowie Discord-Emojis.
+    """
+    custom = len(CUSTOM_EMOJI_PATTERN.findall(content)) if "<" in content else 0
+
+    if content.isascii():
+        raw = content.encode("ascii")
+        length = len(raw)
+        upper = length - len(raw.translate(None, _ASCII_UPPER))
+        alpha = length - len(raw.translate(None, _ASCII_LETTERS))
+        return upper, alpha, custom
+
+    upper = alpha = emoji = 0
+    for char in content:
+        if char.isalpha():
+            alpha += 1
+            if char.isupper():
+                upper += 1
+        if char > "\uffff":
+            emoji += 1
+    return upper, alpha, emoji + custom
+
+
+class MessageFeatures:
+    """Einmal berechnete Merkmale einer Nachricht, geteilt von allen Prüfungen"""
+
+    __slots__ = ("content", "length", "lower", "digest", "_counts", "_links")
+
+    def __init__(self, content: str):
+        self.content = content
+        self.length = len(content)
+        self.lower = content.lower()
+        self.digest = hash(content)
+        self._counts: Optional[Tuple[int, int, int]] = None
+        self._links: Optional[List[Tuple[str, str]]] = None
+
+    def _char_counts(self) -> Tuple[int, int, int]:
+        if self._counts is None:
+            self._counts = count_chars(self.content)
+        return self._counts
+
+    @property
+    def upper_count(self) -> int:
+        return self._char_counts()[0]
+
+    @property
+    def alpha_count(self) -> int:
+        return self._char_counts()[1]
+
+    @property
+    def emoji_count(self) -> int:
+        return self._char_counts()[2]
+
+    @property
+    def links(self) -> List[Tuple[str, str]]:
+        if self._links is None:
+            self._links = extract_links(self.lower)
+        return self._links
@@ -0,0 +1,661 @@
+"""Versionierte Schema-Migrationen für die Bot-Datenbank
+
+Jede Migration hat eine fortlaufende Versionsnummer und wird genau einmal
+ausgeführt. Die bereits angewendeten Versionen stehen in der Tabelle
+schema_version. Neue Schemaänderungen werden ausschließlich als neue
+Migration am Ende von MIGRATIONS ergänzt, bestehende werden nie verändert.
+"""
+import logging
+from typing import Any, Awaitable, Callable, List, NamedTuple, Set, Union
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+# Ein Schritt ist entweder eine SQL-Anweisung oder eine Funktion, die die Verbindung bekommt
+MigrationStep = Union[str, Callable[[aiosqlite.Connection], Awaitable[Any]]]
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    steps: List[MigrationStep]
+
+
+async def _table_columns(conn: aiosqlite.Connection, table: str) -> Set[str]:
+    """Gibt die Spaltennamen einer Tabelle zurück"""
+    async with conn.execute(f"PRAGMA table_info({table})") as cursor:
+        return {row[1] for row in await cursor.fetchall()}
+
+
+async def _rename_column(conn: aiosqlite.Connection, table: str, old: str, new: str):
+    """Benennt eine Spalte um, falls nur der alte Name existiert"""
+    columns = await _table_columns(conn, table)
+    if old in columns and new not in columns:
+        await conn.execute(f"ALTER TABLE {table} RENAME COLUMN {old} TO {new}")
+
+
+async def _normalize_temp_voice_columns(conn: aiosqlite.Connection):
+    """Vereinheitlicht alte Spaltennamen der Temp-Voice-Tabellen
+
+    Ältere Installationen verwenden channel_id/max_per_user bzw. creator_id.
+    Danach braucht TempChannels keine Ausweich-Abfragen mehr.
+    """
+    await _rename_column(conn, "temp_voice_config", "channel_id", "creator_channel_id")
+    await _rename_column(conn, "temp_voice_config", "max_per_user", "user_limit")
+    await _rename_column(conn, "temp_voice_channels", "creator_id", "owner_id")
+
+
+async def _rebuild_table(conn: aiosqlite.Connection, table: str, create_sql: str):
+    """Baut eine Tabelle mit neuem Schema neu auf und übernimmt alle Zeilen
+
+    SQLite kann den Typ einer Spalte nicht ändern. Beim Umkopieren wandelt
+    die INTEGER-Affinität der neuen Spalten numerische Texte ('1234')
+    automatisch in Zahlen um. Indizes der alten Tabelle gehen dabei verloren
+    und müssen danach neu angelegt werden.
+    """
+    old_columns = await _table_columns(conn, table)
+    await conn.execute(create_sql.format(table=f"{table}_new"))
+    columns = ", ".join(sorted(old_columns & await _table_columns(conn, f"{table}_new")))
+    await conn.execute(f"INSERT OR IGNORE INTO {table}_new ({columns}) SELECT {columns} FROM {table}")
+
+    # AUTOINCREMENT-Zähler übernehmen, damit gelöschte IDs nicht neu vergeben werden
+    async with conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)) as cursor:
+        sequence = await cursor.fetchone()
+
+    await conn.execute(f"DROP TABLE {table}")
+    await conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+    if sequence:
+        await conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (sequence[0], table))
+
+
+# Version 1: Ausgangsschema (vorher verteilt auf init_db und die Cogs)
+BASELINE: List[MigrationStep] = [
+    # Tabelle für Willkommenssystem
+    '''
+    CREATE TABLE IF NOT EXISTS welcome_config (
+        guild_id INTEGER PRIMARY KEY,
+        welcome_channel_id INTEGER,
+        rules_channel_id INTEGER,
+        temp_role_id INTEGER,
+        verified_role_id INTEGER,
+        welcome_message TEXT,
+        enabled BOOLEAN DEFAULT 0
+    )
+    ''',
+
+    # Tabelle für Warnungen
+    '''
+    CREATE TABLE IF NOT EXISTS warnings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        user_name TEXT NOT NULL,
+        guild_id INTEGER NOT NULL,
+        reason TEXT,
+        moderator_id INTEGER NOT NULL,
+        moderator_name TEXT NOT NULL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+
+    # Tabelle für Kanal-Konfiguration
+    '''
+    CREATE TABLE IF NOT EXISTS channel_config (
+        guild_id INTEGER PRIMARY KEY,
+        mod_log_channel_id INTEGER
+    )
+    ''',
+
+    # Tabelle für Timeouts
+    '''
+    CREATE TABLE IF NOT EXISTS timeouts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        user_name TEXT NOT NULL,
+        guild_id INTEGER NOT NULL,
+        moderator_id INTEGER NOT NULL,
+        moderator_name TEXT NOT NULL,
+        duration_minutes INTEGER NOT NULL,
+        reason TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        expires_at DATETIME NOT NULL
+    )
+    ''',
+
+    # Tabelle für Kicks
+    '''
+    CREATE TABLE IF NOT EXISTS kicks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        user_name TEXT NOT NULL,
+        guild_id INTEGER NOT NULL,
+        moderator_id INTEGER NOT NULL,
+        moderator_name TEXT NOT NULL,
+        reason TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+
+    # Tabelle für Bans
+    '''
+    CREATE TABLE IF NOT EXISTS bans (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        user_name TEXT NOT NULL,
+        guild_id INTEGER NOT NULL,
+        moderator_id INTEGER NOT NULL,
+        moderator_name TEXT NOT NULL,
+        reason TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        is_temporary BOOLEAN DEFAULT 0,
+        expires_at DATETIME
+    )
+    ''',
+
+    # Tabelle für Serverregeln
+    '''
+    CREATE TABLE IF NOT EXISTS server_rules (
+        guild_id INTEGER NOT NULL,
+        rule_number INTEGER NOT NULL,
+        rule_title TEXT,
+        rule_content TEXT NOT NULL,
+        last_edited_by INTEGER,
+        last_edited_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (guild_id, rule_number)
+    )
+    ''',
+
+    # Tabelle für Moderationsaktionen
+    '''
+    CREATE TABLE IF NOT EXISTS mod_actions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        guild_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        moderator_id INTEGER NOT NULL,
+        action_type TEXT NOT NULL,
+        reason TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        expires_at DATETIME,
+        active BOOLEAN DEFAULT 1
+    )
+    ''',
+
+    # Tabelle für Reaction Roles
+    '''
+    CREATE TABLE IF NOT EXISTS reaction_roles (
+        message_id TEXT,
+        emoji TEXT,
+        role_id TEXT,
+        guild_id TEXT,
+        channel_id TEXT,
+        description TEXT,
+        PRIMARY KEY (message_id, emoji)
+    )
+    ''',
+
+    # Tabelle für Wetter-Einstellungen
+    '''
+    CREATE TABLE IF NOT EXISTS weather_settings (
+        guild_id TEXT,
+        channel_id TEXT,
+        city TEXT,
+        update_time TEXT,
+        enabled INTEGER DEFAULT 0,
+        PRIMARY KEY (guild_id, city)
+    )
+    ''',
+
+    # AutoMod-Konfigurationstabelle
+    '''
+    CREATE TABLE IF NOT EXISTS automod_config (
+        guild_id INTEGER PRIMARY KEY,
+        enabled INTEGER DEFAULT 0,
+        log_channel_id INTEGER
+    )
+    ''',
+
+    # AutoMod-Whitelist-Tabelle
+    '''
+    CREATE TABLE IF NOT EXISTS automod_whitelist (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        guild_id INTEGER NOT NULL,
+        role_id INTEGER,
+        channel_id INTEGER,
+        type TEXT NOT NULL,
+        UNIQUE(guild_id, role_id, type),
+        UNIQUE(guild_id, channel_id, type)
+    )
+    ''',
+
+    # AutoMod-Filter-Tabelle
+    '''
+    CREATE TABLE IF NOT EXISTS automod_filter (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        guild_id INTEGER NOT NULL,
+        word TEXT NOT NULL,
+        type TEXT NOT NULL,
+        UNIQUE(guild_id, word, type)
+    )
+    ''',
+
+    # AutoMod-Einstellungen-Tabelle
+    '''
+    CREATE TABLE IF NOT EXISTS automod_settings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        guild_id INTEGER NOT NULL,
+        setting_type TEXT NOT NULL,
+        value TEXT NOT NULL,
+        UNIQUE(guild_id, setting_type)
+    )
+    ''',
+
+    # Temporäre Sprachkanäle
+    '''
+    CREATE TABLE IF NOT EXISTS temp_voice_config (
+        guild_id INTEGER PRIMARY KEY,
+        creator_channel_id INTEGER,
+        category_id INTEGER,
+        user_limit INTEGER DEFAULT 1,
+        default_privacy TEXT DEFAULT 'public'
+    )
+    ''',
+
+    '''
+    CREATE TABLE IF NOT EXISTS temp_voice_channels (
+        channel_id INTEGER PRIMARY KEY,
+        guild_id INTEGER,
+        owner_id INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        privacy TEXT DEFAULT 'public'
+    )
+    ''',
+
+    # Ticket-System-Tabellen
+    '''
+    CREATE TABLE IF NOT EXISTS ticket_config (
+        guild_id TEXT PRIMARY KEY,
+        category_id TEXT,
+        log_channel_id TEXT,
+        support_role_id TEXT,
+        ticket_counter INTEGER DEFAULT 0,
+        archive_category_id TEXT,
+        enabled BOOLEAN DEFAULT 0,
+        welcome_message TEXT DEFAULT 'Willkommen beim Support! Beschreibe dein Anliegen so detailliert wie möglich.'
+    )
+    ''',
+
+    '''
+    CREATE TABLE IF NOT EXISTS tickets (
+        ticket_id TEXT PRIMARY KEY,
+        guild_id TEXT,
+        channel_id TEXT,
+        user_id TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        closed_at TIMESTAMP,
+        closed_by TEXT,
+        status TEXT DEFAULT 'open',
+        title TEXT,
+        archived BOOLEAN DEFAULT 0
+    )
+    ''',
+
+    # Twitch-Integration Tabellen
+    '''
+    CREATE TABLE IF NOT EXISTS twitch_config (
+        guild_id TEXT PRIMARY KEY,
+        client_id TEXT,
+        client_secret TEXT,
+        announcement_channel_id TEXT,
+        announcement_message TEXT DEFAULT '{streamer} ist jetzt live mit {game}! {url}',
+        ping_role_id TEXT,
+        enabled INTEGER DEFAULT 0
+    )
+    ''',
+
+    '''
+    CREATE TABLE IF NOT EXISTS twitch_streamers (
+        streamer_name TEXT,
+        guild_id TEXT,
+        last_stream_id TEXT,
+        last_online TIMESTAMP,
+        user_id TEXT,
+        PRIMARY KEY (streamer_name, guild_id)
+    )
+    ''',
+
+    '''
+    CREATE TABLE IF NOT EXISTS twitch_subscriptions (
+        user_id TEXT,
+        guild_id TEXT,
+        streamer_name TEXT,
+        PRIMARY KEY (user_id, guild_id, streamer_name)
+    )
+    ''',
+
+    # Eventplaner-Tabellen
+    '''
+    CREATE TABLE IF NOT EXISTS events (
+        event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        guild_id INTEGER NOT NULL,
+        channel_id INTEGER NOT NULL,
+        creator_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        description TEXT,
+        location TEXT,
+        start_time TIMESTAMP NOT NULL,
+        end_time TIMESTAMP,
+        max_participants INTEGER DEFAULT 0,
+        reminder_sent BOOLEAN DEFAULT FALSE,
+        discord_event_id TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+
+    '''
+    CREATE TABLE IF NOT EXISTS event_participants (
+        event_id INTEGER,
+        user_id INTEGER,
+        status TEXT NOT NULL,  -- 'accepted', 'declined', 'maybe'
+        joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (event_id, user_id),
+        FOREIGN KEY (event_id) REFERENCES events (event_id) ON DELETE CASCADE
+    )
+    ''',
+]
+
+
+# Version 3: Indizes für die häufigsten Lookups (siehe utils/query_audit.py)
+HOT_PATH_INDEXES: List[MigrationStep] = [
+    # Moderation: Historie eines Users, aktive Timeouts
+    "CREATE INDEX IF NOT EXISTS idx_warnings_guild_user ON warnings (guild_id, user_id, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_timeouts_guild_user ON timeouts (guild_id, user_id, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_timeouts_guild_expires ON timeouts (guild_id, expires_at)",
+    "CREATE INDEX IF NOT EXISTS idx_kicks_guild_user ON kicks (guild_id, user_id, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_bans_guild_user ON bans (guild_id, user_id, timestamp)",
+
+    # Ticket-System: offenes Ticket eines Users, Ticket zu einem Kanal, Listen/Statistiken
+    "CREATE INDEX IF NOT EXISTS idx_tickets_guild_user_status ON tickets (guild_id, user_id, status)",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_channel ON tickets (channel_id, status)",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_guild_status_created ON tickets (guild_id, status, created_at)",
+
+    # Eventplaner: fällige Erinnerungen, Eventliste, Teilnehmer nach Status
+    "CREATE INDEX IF NOT EXISTS idx_events_reminder ON events (reminder_sent, start_time)",
+    "CREATE INDEX IF NOT EXISTS idx_events_guild_start ON events (guild_id, start_time)",
+    "CREATE INDEX IF NOT EXISTS idx_event_participants_status ON event_participants (event_id, status, user_id)",
+
+    # Twitch: Abonnenten eines Streamers, Streamer eines Servers
+    "CREATE INDEX IF NOT EXISTS idx_twitch_subscriptions_streamer ON twitch_subscriptions (guild_id, streamer_name, user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_twitch_streamers_guild ON twitch_streamers (guild_id, streamer_name)",
+
+    # Reaction Roles: Übersicht pro Server
+    "CREATE INDEX IF NOT EXISTS idx_reaction_roles_guild ON reaction_roles (guild_id)",
+]
+
+
+# Version 4: Discord-IDs (Snowflakes) überall als INTEGER statt TEXT.
+# Twitch-IDs (twitch_streamers.user_id, last_stream_id) und ticket_id bleiben Text.
+INTEGER_ID_TABLES = {
+    "reaction_roles": '''
+    CREATE TABLE {table} (
+        message_id INTEGER,
+        emoji TEXT,
+        role_id INTEGER,
+        guild_id INTEGER,
+        channel_id INTEGER,
+        description TEXT,
+        PRIMARY KEY (message_id, emoji)
+    )
+    ''',
+    "weather_settings": '''
+    CREATE TABLE {table} (
+        guild_id INTEGER,
+        channel_id INTEGER,
+        city TEXT,
+        update_time TEXT,
+        enabled INTEGER DEFAULT 0,
+        PRIMARY KEY (guild_id, city)
+    )
+    ''',
+    "ticket_config": '''
+    CREATE TABLE {table} (
+        guild_id INTEGER PRIMARY KEY,
+        category_id INTEGER,
+        log_channel_id INTEGER,
+        support_role_id INTEGER,
+        ticket_counter INTEGER DEFAULT 0,
+        archive_category_id INTEGER,
+        enabled BOOLEAN DEFAULT 0,
+        welcome_message TEXT DEFAULT 'Willkommen beim Support! Beschreibe dein Anliegen so detailliert wie möglich.'
+    )
+    ''',
+    "tickets": '''
+    CREATE TABLE {table} (
+        ticket_id TEXT PRIMARY KEY,
+        guild_id INTEGER,
+        channel_id INTEGER,
+        user_id INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        closed_at TIMESTAMP,
+        closed_by INTEGER,
+        status TEXT DEFAULT 'open',
+        title TEXT,
+        archived BOOLEAN DEFAULT 0
+    )
+    ''',
+    "twitch_config": '''
+    CREATE TABLE {table} (
+        guild_id INTEGER PRIMARY KEY,
+        client_id TEXT,
+        client_secret TEXT,
+        announcement_channel_id INTEGER,
+        announcement_message TEXT DEFAULT '{{streamer}} ist jetzt live mit {{game}}! {{url}}',
+        ping_role_id INTEGER,
+        enabled INTEGER DEFAULT 0
+    )
+    ''',
+    "twitch_streamers": '''
+    CREATE TABLE {table} (
+        streamer_name TEXT,
+        guild_id INTEGER,
+        last_stream_id TEXT,
+        last_online TIMESTAMP,
+        user_id TEXT,
+        PRIMARY KEY (streamer_name, guild_id)
+    )
+    ''',
+    "twitch_subscriptions": '''
+    CREATE TABLE {table} (
+        user_id INTEGER,
+        guild_id INTEGER,
+        streamer_name TEXT,
+        PRIMARY KEY (user_id, guild_id, streamer_name)
+    )
+    ''',
+    "events": '''
+    CREATE TABLE {table} (
+        event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        guild_id INTEGER NOT NULL,
+        channel_id INTEGER NOT NULL,
+        creator_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        description TEXT,
+        location TEXT,
+        start_time TIMESTAMP NOT NULL,
+        end_time TIMESTAMP,
+        max_participants INTEGER DEFAULT 0,
+        reminder_sent BOOLEAN DEFAULT FALSE,
+        discord_event_id INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+}
+
+
+async def _integer_snowflake_columns(conn: aiosqlite.Connection):
+    """Baut alle Tabellen mit TEXT-Snowflakes auf INTEGER-Spalten um"""
+    for table, create_sql in INTEGER_ID_TABLES.items():
+        await _rebuild_table(conn, table, create_sql)
+
+
+# Version 5: Welche Nachricht gehört zu welchem Event (Reaktionen ohne fetch_message zuordnen)
+EVENT_MESSAGES: List[MigrationStep] = [
+    '''
+    CREATE TABLE IF NOT EXISTS event_messages (
+        message_id INTEGER PRIMARY KEY,
+        event_id INTEGER NOT NULL,
+        guild_id INTEGER NOT NULL,
+        channel_id INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (event_id) REFERENCES events (event_id) ON DELETE CASCADE
+    )
+    ''',
+    "CREATE INDEX IF NOT EXISTS idx_event_messages_event ON event_messages (event_id)",
+]
+
+
+async def _event_announcement_message(conn: aiosqlite.Connection):
+    """Ergänzt events.message_id und übernimmt die bekannten Ankündigungen
+
+    Als Ankündigung gilt die älteste indizierte Event-Nachricht im Kanal des Events.
+    """
+    if "message_id" not in await _table_columns(conn, "events"):
+        await conn.execute("ALTER TABLE events ADD COLUMN message_id INTEGER")
+    await conn.execute('''
+        UPDATE events SET message_id = (
+            SELECT MIN(m.message_id) FROM event_messages m
+            WHERE m.event_id = events.event_id AND m.channel_id = events.channel_id
+        )
+        WHERE message_id IS NULL
+    ''')
+
+
+# Version 7: Mehrere Erinnerungen pro Event (Minuten vor Beginn); bestehende
+# Events behalten die bisherige Erinnerung 30 Minuten vorher
+EVENT_REMINDERS: List[MigrationStep] = [
+    '''
+    CREATE TABLE IF NOT EXISTS event_reminders (
+        event_id INTEGER NOT NULL,
+        offset_minutes INTEGER NOT NULL,
+        sent BOOLEAN DEFAULT FALSE,
+        PRIMARY KEY (event_id, offset_minutes),
+        FOREIGN KEY (event_id) REFERENCES events (event_id) ON DELETE CASCADE
+    )
+    ''',
+    '''
+    INSERT OR IGNORE INTO event_reminders (event_id, offset_minutes, sent)
+    SELECT event_id, 30, COALESCE(reminder_sent, FALSE) FROM events
+    ''',
+]
+
+
+# Version 8: Teilnehmerzahlen pro Status direkt in events, gepflegt per Trigger.
+# Teilnahmen müssen per UPSERT geschrieben werden: INSERT OR REPLACE löscht die
+# alte Zeile, ohne den DELETE-Trigger auszulösen, und würde doppelt zählen.
+PARTICIPANT_COUNT_TRIGGERS: List[MigrationStep] = [
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_event_participants_insert AFTER INSERT ON event_participants
+    BEGIN
+        UPDATE events SET
+            accepted_count = accepted_count + (NEW.status = 'accepted'),
+            declined_count = declined_count + (NEW.status = 'declined'),
+            maybe_count = maybe_count + (NEW.status = 'maybe')
+        WHERE event_id = NEW.event_id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_event_participants_update AFTER UPDATE OF status ON event_participants
+    BEGIN
+        UPDATE events SET
+            accepted_count = accepted_count + (NEW.status = 'accepted') - (OLD.status = 'accepted'),
+            declined_count = declined_count + (NEW.status = 'declined') - (OLD.status = 'declined'),
+            maybe_count = maybe_count + (NEW.status = 'maybe') - (OLD.status = 'maybe')
+        WHERE event_id = NEW.event_id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_event_participants_delete AFTER DELETE ON event_participants
+    BEGIN
+        UPDATE events SET
+            accepted_count = accepted_count - (OLD.status = 'accepted'),
+            declined_count = declined_count - (OLD.status = 'declined'),
+            maybe_count = maybe_count - (OLD.status = 'maybe')
+        WHERE event_id = OLD.event_id;
+    END
+    ''',
+]
+
+
+async def _event_participant_counts(conn: aiosqlite.Connection):
+    """Ergänzt die Zählerspalten in events und füllt sie aus event_participants"""
+    columns = await _table_columns(conn, "events")
+    for status in ("accepted", "declined", "maybe"):
+        if f"{status}_count" not in columns:
+            await conn.execute(f"ALTER TABLE events ADD COLUMN {status}_count INTEGER NOT NULL DEFAULT 0")
+    await conn.execute('''
+        UPDATE events SET
+            accepted_count = (SELECT COUNT(*) FROM event_participants p
+                              WHERE p.event_id = events.event_id AND p.status = 'accepted'),
+            declined_count = (SELECT COUNT(*) FROM event_participants p
+                              WHERE p.event_id = events.event_id AND p.status = 'declined'),
+            maybe_count = (SELECT COUNT(*) FROM event_participants p
+                           WHERE p.event_id = events.event_id AND p.status = 'maybe')
+    ''')
+
+
+async def _welcome_role_column(conn: aiosqlite.Connection):
+    """Ergänzt welcome_config.welcome_role_id (Rolle für jedes neue Mitglied)"""
+    if "welcome_role_id" not in await _table_columns(conn, "welcome_config"):
+        await conn.execute("ALTER TABLE welcome_config ADD COLUMN welcome_role_id INTEGER")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Ausgangsschema", BASELINE),
+    Migration(2, "Temp-Voice-Spaltennamen vereinheitlichen", [_normalize_temp_voice_columns]),
+    Migration(3, "Indizes für häufige Abfragen", HOT_PATH_INDEXES),
+    # Die Indizes der umgebauten Tabellen werden danach neu angelegt
+    Migration(4, "Discord-IDs als INTEGER speichern", [_integer_snowflake_columns] + HOT_PATH_INDEXES),
+    Migration(5, "Nachrichten-Index für Event-Embeds", EVENT_MESSAGES),
+    Migration(6, "Nachrichten-ID der Event-Ankündigung", [_event_announcement_message]),
+    Migration(7, "Mehrere Erinnerungen pro Event", EVENT_REMINDERS),
+    Migration(8, "Teilnehmerzahlen in events zählen", [_event_participant_counts] + PARTICIPANT_COUNT_TRIGGERS),
+    Migration(9, "Willkommensrolle in welcome_config", [_welcome_role_column]),
+]
+
+
+async def migrate(conn: aiosqlite.Connection) -> List[int]:
+    """Wendet alle ausstehenden Migrationen an und gibt deren Versionen zurück
+
+    Muss innerhalb einer Transaktion auf der Schreibverbindung laufen
+    (z.B. ConnectionPool.writer()), damit ein Fehler alles zurückrollt.
+    """
+    await conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    async with conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version") as cursor:
+        current = (await cursor.fetchone())[0]
+
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version <= current:
+            continue
+
+        for step in migration.steps:
+            if isinstance(step, str):
+                await conn.execute(step)
+            else:
+                await step(conn)
+
+        await conn.execute(
+            "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+            (migration.version, migration.description)
+        )
+        applied.append(migration.version)
+        logger.info(f"✅ Migration {migration.version} angewendet: {migration.description}")
+
+    return applied
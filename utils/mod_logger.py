@@ -1,36 +1,34 @@
 import discord
 from datetime import datetime
-import aiosqlite
-from utils.db import DB_PATH
+from utils.db import Database
+from utils.config_cache import config_cache
 
 class ModLogger:
     def __init__(self, bot):
         self.bot = bot
-        self.mod_log_channels = {}  # Cache für Mod-Log Channel IDs
+        self.db = Database()
+        self.configs = config_cache("channel_config")  # Cache für Mod-Log Channel IDs
 
     async def load_mod_channels(self):
         """Lädt die Mod-Log Channel IDs aus der Datenbank"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            async with db.execute('SELECT guild_id, mod_log_channel_id FROM channel_config') as cursor:
-                async for guild_id, channel_id in cursor:
-                    self.mod_log_channels[guild_id] = channel_id
+        await self.configs.load()
+
+    async def get_mod_channel_id(self, guild_id: int):
+        """Gibt die ID des Mod-Log Channels eines Servers zurück (oder None)"""
+        config = await self.configs.get(guild_id)
+        return config.mod_log_channel_id if config else None
 
     async def set_mod_channel(self, guild_id: int, channel_id: int):
         """Setzt den Mod-Log Channel für einen Server"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute('''
-                INSERT OR REPLACE INTO channel_config (guild_id, mod_log_channel_id)
-                VALUES (?, ?)
-            ''', (guild_id, channel_id))
-            await db.commit()
-        self.mod_log_channels[guild_id] = channel_id
+        await self.configs.update(guild_id, {"mod_log_channel_id": channel_id})
 
     async def log_mod_action(self, guild: discord.Guild, action_type: str, **kwargs):
         """Sendet eine Mod-Log Nachricht"""
-        if guild.id not in self.mod_log_channels:
+        channel_id = await self.get_mod_channel_id(guild.id)
+        if not channel_id:
             return
 
-        channel = self.bot.get_channel(self.mod_log_channels[guild.id])
+        channel = self.bot.get_channel(channel_id)
         if not channel:
             return
 
@@ -0,0 +1,295 @@
+"""Zentrale Registry der benannten SQL-Abfragen
+
+Jede Abfrage steht genau einmal hier und wird über ``Database.q`` aufgerufen:
+
+    channel_id = await db.q.open_ticket_for_user(guild, user)
+
+Da der SQL-Text pro Abfrage immer identisch ist, bleibt das kompilierte
+Statement im Statement-Cache jeder Poolverbindung liegen. Die Ergebniszeilen
+sind NamedTuples, Felder lassen sich also per Name oder wie bisher per
+Entpacken lesen.
+
+Modi:
+    one     -> eine Zeile (row-Typ) oder None
+    all     -> Liste von Zeilen (row-Typ)
+    column  -> Liste der ersten Spalte
+    scalar  -> erster Wert der ersten Zeile oder None
+    write   -> Anzahl der geänderten Zeilen (läuft über den Writer-Task);
+               ``.many(rows)`` schreibt mehrere Parametersätze in einer
+               Transaktion. Anders als Database.execute() reichen beide
+               Datenbankfehler (aiosqlite.Error) weiter, 0 heißt also
+               wirklich "keine Zeile geändert".
+
+Abfragen mit ``hot=True`` werden von ``python -m utils.query_audit`` auf
+Full Scans geprüft.
+"""
+from typing import Dict, NamedTuple, Optional, Type
+
+
+class Query(NamedTuple):
+    sql: str
+    mode: str = "all"
+    row: Optional[Type[tuple]] = None
+    hot: bool = True
+
+
+# Ergebniszeilen
+
+class ModAction(NamedTuple):
+    reason: str
+    moderator_name: str
+    timestamp: str
+
+
+class TimeoutEntry(NamedTuple):
+    reason: str
+    moderator_name: str
+    duration_minutes: int
+    timestamp: str
+    expires_at: str
+
+
+class TimeoutLogEntry(NamedTuple):
+    reason: str
+    moderator_name: str
+    duration_minutes: int
+    timestamp: str
+
+
+class ActiveTimeout(NamedTuple):
+    user_name: str
+    reason: str
+    moderator_name: str
+    expires_at: str
+
+
+class OpenTicket(NamedTuple):
+    ticket_id: str
+    user_id: int
+
+
+class TicketSummary(NamedTuple):
+    ticket_id: str
+    channel_id: int
+    user_id: int
+    title: str
+    created_at: str
+    status: str
+
+
+class PendingReminder(NamedTuple):
+    event_id: int
+    offset_minutes: int
+    start_time: str
+
+
+class ReminderOffset(NamedTuple):
+    offset_minutes: int
+    sent: bool
+
+
+class ReminderEvent(NamedTuple):
+    guild_id: int
+    channel_id: int
+    title: str
+    start_time: str
+    description: str
+    location: str
+
+
+class UpcomingEvent(NamedTuple):
+    event_id: int
+    title: str
+    start_time: str
+    creator_id: int
+    accepted_count: int
+
+
+class EventRosterRow(NamedTuple):
+    guild_id: int
+    channel_id: int
+    message_id: Optional[int]
+    creator_id: int
+    title: str
+    description: str
+    location: str
+    start_time: str
+    end_time: str
+    max_participants: int
+    user_id: Optional[int]
+    status: Optional[str]
+
+
+class EventMessage(NamedTuple):
+    message_id: int
+    event_id: int
+
+
+class UnindexedEvent(NamedTuple):
+    event_id: int
+    channel_id: int
+
+
+class StreamerStatus(NamedTuple):
+    streamer_name: str
+    last_online: str
+
+
+class ReactionRoleBinding(NamedTuple):
+    emoji: str
+    role_id: int
+
+
+class ReactionRole(NamedTuple):
+    message_id: int
+    emoji: str
+    role_id: int
+    channel_id: int
+    description: str
+
+
+QUERIES: Dict[str, Query] = {
+    # Moderation
+    "warnings_for_user": Query(
+        "SELECT reason, moderator_name, timestamp FROM warnings "
+        "WHERE user_id = ? AND guild_id = ? ORDER BY timestamp DESC",
+        "all", ModAction),
+    "warning_count": Query(
+        "SELECT COUNT(*) FROM warnings WHERE user_id = ? AND guild_id = ?",
+        "scalar"),
+    "timeouts_for_user": Query(
+        "SELECT reason, moderator_name, duration_minutes, timestamp, expires_at FROM timeouts "
+        "WHERE user_id = ? AND guild_id = ? ORDER BY timestamp DESC LIMIT 10",
+        "all", TimeoutEntry),
+    "timeout_log_for_user": Query(
+        "SELECT reason, moderator_name, duration_minutes, timestamp FROM timeouts "
+        "WHERE user_id = ? AND guild_id = ? ORDER BY timestamp DESC",
+        "all", TimeoutLogEntry),
+    "active_timeouts": Query(
+        "SELECT user_name, reason, moderator_name, expires_at FROM timeouts "
+        "WHERE guild_id = ? AND expires_at > ? ORDER BY expires_at ASC",
+        "all", ActiveTimeout),
+    "kicks_for_user": Query(
+        "SELECT reason, moderator_name, timestamp FROM kicks "
+        "WHERE user_id = ? AND guild_id = ? ORDER BY timestamp DESC",
+        "all", ModAction),
+    "bans_for_user": Query(
+        "SELECT reason, moderator_name, timestamp FROM bans "
+        "WHERE user_id = ? AND guild_id = ? ORDER BY timestamp DESC",
+        "all", ModAction),
+
+    # Tickets
+    "open_ticket_for_user": Query(
+        "SELECT channel_id FROM tickets WHERE guild_id = ? AND user_id = ? AND status = 'open'",
+        "scalar"),
+    "open_ticket_by_channel": Query(
+        "SELECT ticket_id, user_id FROM tickets WHERE channel_id = ? AND status = 'open'",
+        "one", OpenTicket),
+    "ticket_by_channel": Query(
+        "SELECT ticket_id FROM tickets WHERE channel_id = ?",
+        "scalar"),
+    "tickets_by_status": Query(
+        "SELECT ticket_id, channel_id, user_id, title, created_at, status FROM tickets "
+        "WHERE guild_id = ? AND status = ? ORDER BY created_at DESC LIMIT 25",
+        "all", TicketSummary),
+    "tickets_for_guild": Query(
+        "SELECT ticket_id, channel_id, user_id, title, created_at, status FROM tickets "
+        "WHERE guild_id = ? ORDER BY created_at DESC LIMIT 25",
+        "all", TicketSummary),
+
+    # Events
+    # Erinnerungen: werden beim Start einmal geladen und dann im Speicher geplant
+    "pending_event_reminders": Query(
+        "SELECT r.event_id, r.offset_minutes, e.start_time FROM event_reminders r "
+        "JOIN events e ON e.event_id = r.event_id WHERE r.sent = FALSE",
+        "all", PendingReminder, hot=False),
+    "event_reminder_offsets": Query(
+        "SELECT offset_minutes, sent FROM event_reminders WHERE event_id = ? ORDER BY offset_minutes DESC",
+        "all", ReminderOffset),
+    "reminder_event": Query(
+        "SELECT guild_id, channel_id, title, start_time, description, location FROM events WHERE event_id = ?",
+        "one", ReminderEvent),
+    "add_event_reminder": Query(
+        "INSERT OR REPLACE INTO event_reminders (event_id, offset_minutes, sent) VALUES (?, ?, FALSE)",
+        "write"),
+    # Eine gesendete Erinnerung erledigt auch alle früheren (größeren Abstand)
+    "mark_event_reminders_sent": Query(
+        "UPDATE event_reminders SET sent = TRUE WHERE event_id = ? AND offset_minutes >= ?",
+        "write"),
+    "reset_event_reminders": Query(
+        "UPDATE event_reminders SET sent = FALSE WHERE event_id = ?",
+        "write"),
+    "clear_event_reminders": Query(
+        "DELETE FROM event_reminders WHERE event_id = ?",
+        "write"),
+    "upcoming_events": Query(
+        "SELECT event_id, title, start_time, creator_id, accepted_count FROM events "
+        "WHERE guild_id = ? AND start_time >= ? ORDER BY start_time ASC",
+        "all", UpcomingEvent),
+    "accepted_participants": Query(
+        "SELECT user_id FROM event_participants WHERE event_id = ? AND status = 'accepted'",
+        "column"),
+    # Zähler werden per Trigger gepflegt (Migration 8)
+    "accepted_count": Query(
+        "SELECT accepted_count FROM events WHERE event_id = ?",
+        "scalar"),
+    # Event samt Teilnehmern in einer Abfrage (eine Zeile pro Teilnehmer, mindestens eine)
+    "event_roster": Query(
+        "SELECT e.guild_id, e.channel_id, e.message_id, e.creator_id, e.title, e.description, e.location, "
+        "e.start_time, e.end_time, e.max_participants, p.user_id, p.status FROM events e "
+        "LEFT JOIN event_participants p ON p.event_id = e.event_id WHERE e.event_id = ?",
+        "all", EventRosterRow),
+    "set_participation": Query(
+        "INSERT INTO event_participants (event_id, user_id, status) VALUES (?, ?, ?) "
+        "ON CONFLICT (event_id, user_id) DO UPDATE SET status = excluded.status",
+        "write"),
+    "set_event_message": Query(
+        "UPDATE events SET message_id = ? WHERE event_id = ?",
+        "write"),
+    # Nachrichten-Index: wird einmal beim Laden komplett gelesen
+    "event_message_index": Query(
+        "SELECT message_id, event_id FROM event_messages",
+        "all", EventMessage, hot=False),
+    "register_event_message": Query(
+        "INSERT OR REPLACE INTO event_messages (message_id, event_id, guild_id, channel_id) VALUES (?, ?, ?, ?)",
+        "write"),
+    "forget_event_message": Query(
+        "DELETE FROM event_messages WHERE message_id = ?",
+        "write"),
+    "forget_event_messages": Query(
+        "DELETE FROM event_messages WHERE event_id = ?",
+        "write"),
+    # Alle Nachrichten eines Events außer der angegebenen (Ankündigung, darf NULL sein)
+    "forget_event_copies": Query(
+        "DELETE FROM event_messages WHERE event_id = ? AND message_id IS NOT ?",
+        "write"),
+    "prune_event_messages": Query(
+        "DELETE FROM event_messages WHERE event_id NOT IN "
+        "(SELECT event_id FROM events WHERE COALESCE(end_time, start_time) >= ?)",
+        "write", hot=False),
+    "unindexed_upcoming_events": Query(
+        "SELECT event_id, channel_id FROM events e WHERE start_time >= ? "
+        "AND NOT EXISTS (SELECT 1 FROM event_messages m WHERE m.event_id = e.event_id)",
+        "all", UnindexedEvent, hot=False),
+
+    # Twitch
+    "stream_subscribers": Query(
+        "SELECT user_id FROM twitch_subscriptions WHERE guild_id = ? AND streamer_name = ?",
+        "column"),
+    "guild_streamers": Query(
+        "SELECT streamer_name, last_online FROM twitch_streamers WHERE guild_id = ? ORDER BY streamer_name",
+        "all", StreamerStatus),
+
+    # Reaction Roles
+    "reaction_roles_for_message": Query(
+        "SELECT emoji, role_id FROM reaction_roles WHERE message_id = ?",
+        "all", ReactionRoleBinding),
+    "reaction_roles_for_guild": Query(
+        "SELECT message_id, emoji, role_id, channel_id, description FROM reaction_roles WHERE guild_id = ?",
+        "all", ReactionRole),
+}
+
+
+def read_statements():
+    """Gibt den SQL-Text aller lesenden Abfragen zurück (zum Vorwärmen der Leser)"""
+    return [query.sql for query in QUERIES.values() if query.mode != "write"]
@@ -0,0 +1,70 @@
+"""EXPLAIN QUERY PLAN-Prüfung der häufigsten Abfragen
+
+Legt eine leere Datenbank mit dem aktuellen Schema an und prüft, dass keine
+der in utils.queries registrierten Abfragen eine Tabelle komplett durchsucht. Aufruf:
+
+    python -m utils.query_audit
+
+Der Exit-Code ist 1, sobald eine Abfrage auf einen Full Scan zurückfällt.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from typing import Dict, List
+
+import aiosqlite
+
+from utils.migrations import migrate
+from utils.queries import QUERIES
+
+# Name -> SQL aller registrierten Abfragen, die pro Nachricht, Reaktion oder
+# Loop-Durchlauf laufen (siehe utils.queries)
+HOT_QUERIES: Dict[str, str] = {name: query.sql for name, query in QUERIES.items() if query.hot}
+
+
+def find_full_scans(plan_details: List[str]) -> List[str]:
+    """Gibt alle Planschritte zurück, die eine Tabelle oder einen Index komplett lesen"""
+    return [
+        detail for detail in plan_details
+        if detail.startswith("SCAN ") and not detail.startswith("SCAN CONSTANT ROW")
+    ]
+
+
+async def explain(conn: aiosqlite.Connection, query: str) -> List[str]:
+    """Führt EXPLAIN QUERY PLAN mit NULL-Parametern aus und gibt die Planschritte zurück"""
+    params = (None,) * query.count("?")
+    async with conn.execute(f"EXPLAIN QUERY PLAN {query}", params) as cursor:
+        return [row[3] for row in await cursor.fetchall()]
+
+
+async def audit_query_plans(conn: aiosqlite.Connection, queries: Dict[str, str] = HOT_QUERIES) -> Dict[str, List[str]]:
+    """Prüft alle Abfragen und gibt die mit Full Scan samt betroffenen Planschritten zurück"""
+    failures = {}
+    for name, query in queries.items():
+        scans = find_full_scans(await explain(conn, query))
+        if scans:
+            failures[name] = scans
+    return failures
+
+
+async def main() -> int:
+    """Prüft die Abfragen gegen eine frische Datenbank mit allen Migrationen"""
+    with tempfile.TemporaryDirectory() as tmp:
+        async with aiosqlite.connect(os.path.join(tmp, "audit.db")) as conn:
+            await migrate(conn)
+            failures = await audit_query_plans(conn)
+
+    for name, scans in failures.items():
+        print(f"❌ {name}: {'; '.join(scans)}")
+
+    if failures:
+        print(f"❌ {len(failures)} von {len(HOT_QUERIES)} Abfragen nutzen keinen Index")
+        return 1
+
+    print(f"✅ Alle {len(HOT_QUERIES)} Abfragen nutzen einen Index")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,274 @@
+"""Raid-Erkennung für AutoMod (serverweite Bursts)
+
+Die normalen Prüfungen sehen nur einzelne User. Ein Raid besteht aber aus
+vielen Accounts, die gleichzeitig beitreten und dieselbe Nachricht posten.
+RaidDetector beobachtet deshalb pro Server:
+
+- die Nachrichten- und Beitrittsrate, jeweils gegen eine gelernte
+  Grundlast (gleitender Mittelwert). Als Surge gilt, was deutlich über
+  der Grundlast und über einer festen Untergrenze liegt; kleine Server
+  brauchen so keine eigenen Schwellen.
+- Fingerabdrücke der Nachrichteninhalte (normalisiert: ohne Erwähnungen,
+  Ziffern, Satzzeichen) mit der Zahl verschiedener Accounts, die sie in
+  FINGERPRINT_WINDOW Sekunden gepostet haben.
+
+Erkennt er einen Surge, schaltet er den Server in den Lockdown. AutoMod
+prüft dort nur noch günstig (markierte Fingerabdrücke, Links, Wörter) und
+löscht die bereits geposteten Kopien einer markierten Nachricht gesammelt.
+Ohne neuen Surge-Hinweis für CALM_PERIOD Sekunden endet der Lockdown von
+selbst.
+"""
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import discord
+
+# Nachrichtenrate: Fenster in Sekunden, Faktor über Grundlast, Untergrenze pro Fenster
+MESSAGE_BUCKET = 10.0
+MESSAGE_SURGE_FACTOR = 4.0
+MESSAGE_SURGE_FLOOR = 60
+
+# Beitrittsrate: Fenster in Sekunden, Faktor über Grundlast, Untergrenze pro Fenster
+JOIN_BUCKET = 60.0
+JOIN_SURGE_FACTOR = 5.0
+JOIN_SURGE_FLOOR = 10
+
+# Gewicht eines abgeschlossenen Fensters für die Grundlast
+BASELINE_ALPHA = 0.05
+
+# Gleicher Inhalt von so vielen verschiedenen Accounts in FINGERPRINT_WINDOW Sekunden gilt als Raid
+DUPLICATE_USERS = 5
+FINGERPRINT_WINDOW = 30.0
+
+# Kürzere (normalisierte) Nachrichten wie "gg" oder "hallo" bekommen keinen Fingerabdruck
+MIN_FINGERPRINT_LENGTH = 10
+
+# Höchstens so viele Fingerabdrücke pro Server (die ältesten fallen heraus)
+MAX_FINGERPRINTS = 2000
+
+# Lockdown endet nach so vielen Sekunden ohne neuen Surge-Hinweis
+CALM_PERIOD = 120.0
+
+_NOISE_PATTERN = re.compile(r"<[@#][!&]?\d+>|<a?:\w+:\d+>|[\d\W_]+")
+
+RaidCallback = Callable[[int, bool, str], None]
+
+
+def fingerprint(lower: str) -> Optional[int]:
+    """Fingerabdruck eines (kleingeschriebenen) Inhalts; None für zu kurze Nachrichten"""
+    normalized = _NOISE_PATTERN.sub("", lower)
+    if len(normalized) < MIN_FINGERPRINT_LENGTH:
+        return None
+    return hash(normalized)
+
+
+class AdaptiveRate:
+    """Ereignisse pro Fenster mit gelernter Grundlast
+
+    Die aktuelle Rate ist eine gleitende Schätzung aus laufendem und
+    vorherigem Fenster. Abgeschlossene Fenster fließen in die Grundlast
+    ein, solange sie nicht eingefroren ist (während eines Lockdowns soll
+    der Raid nicht zur neuen Normalität werden).
+    """
+
+    __slots__ = ("bucket", "start", "count", "previous", "baseline")
+
+    def __init__(self, bucket: float, now: float):
+        self.bucket = bucket
+        self.start = now
+        self.count = 0
+        self.previous = 0
+        self.baseline = 0.0
+
+    def _roll(self, now: float, learn: bool):
+        elapsed = int((now - self.start) // self.bucket)
+        if elapsed <= 0:
+            return
+        if learn:
+            self.baseline += BASELINE_ALPHA * (self.count - self.baseline)
+            # Leere Fenster dazwischen senken die Grundlast ebenfalls
+            self.baseline *= (1 - BASELINE_ALPHA) ** (elapsed - 1)
+        self.previous = self.count if elapsed == 1 else 0
+        self.count = 0
+        self.start += elapsed * self.bucket
+
+    def hit(self, now: float, learn: bool = True) -> float:
+        """Zählt ein Ereignis und gibt die aktuelle Rate (pro Fenster) zurück"""
+        self._roll(now, learn)
+        self.count += 1
+        return self.rate(now)
+
+    def rate(self, now: float) -> float:
+        weight = 1 - (now - self.start) / self.bucket
+        return self.count + self.previous * max(weight, 0.0)
+
+    def is_surge(self, now: float, factor: float, floor: float) -> bool:
+        return self.rate(now) >= max(floor, factor * self.baseline)
+
+
+class _Fingerprint:
+    """Wer hat einen Inhalt wann gepostet (plus die Nachrichten für Sammel-Löschungen)"""
+
+    __slots__ = ("users", "messages", "flagged", "last_seen")
+
+    def __init__(self):
+        self.users: Dict[int, float] = {}
+        # Fast jeder Inhalt kommt nur einmal vor, daher eine Liste statt eines deque
+        self.messages: List[Tuple[float, discord.Message]] = []
+        self.flagged = False
+        self.last_seen = 0.0
+
+
+class _GuildState:
+    __slots__ = ("messages", "joins", "fingerprints", "lockdown_since", "last_signal", "reason",
+                 "lockdown_messages", "lockdown_joins")
+
+    def __init__(self, now: float):
+        self.messages = AdaptiveRate(MESSAGE_BUCKET, now)
+        self.joins = AdaptiveRate(JOIN_BUCKET, now)
+        self.fingerprints: "OrderedDict[int, _Fingerprint]" = OrderedDict()
+        self.lockdown_since: Optional[float] = None
+        self.last_signal = 0.0
+        self.reason = ""
+        self.lockdown_messages = 0
+        self.lockdown_joins = 0
+
+
+class RaidDetector:
+    """Erkennt serverweite Bursts und verwaltet den Lockdown pro Server"""
+
+    def __init__(self, on_change: Optional[RaidCallback] = None):
+        self.on_change = on_change
+        self._guilds: Dict[int, _GuildState] = {}
+
+    def _state(self, guild_id: int, now: float) -> _GuildState:
+        state = self._guilds.get(guild_id)
+        if state is None:
+            state = self._guilds[guild_id] = _GuildState(now)
+        return state
+
+    def record_message(self, message: discord.Message, lower: str,
+                       now: Optional[float] = None) -> Tuple[bool, List[discord.Message]]:
+        """Zählt eine Nachricht
+
+        Gibt zurück, ob ihr Inhalt als Raid-Nachricht markiert ist, und beim
+        Markieren einmalig die früheren Kopien aus dem Zeitfenster.
+        """
+        now = time.monotonic() if now is None else now
+        state = self._state(message.guild.id, now)
+        locked = state.lockdown_since is not None
+        if locked:
+            state.lockdown_messages += 1
+
+        state.messages.hit(now, learn=not locked)
+        if state.messages.is_surge(now, MESSAGE_SURGE_FACTOR, MESSAGE_SURGE_FLOOR):
+            self._signal(message.guild.id, state, now, "Nachrichtenflut")
+
+        digest = fingerprint(lower)
+        if digest is None:
+            return False, []
+
+        threshold = now - FINGERPRINT_WINDOW
+        fingerprints = state.fingerprints
+        if not locked:
+            # Vorne stehen die am längsten nicht gesehenen Inhalte; abgelaufene fallen heraus
+            while fingerprints and next(iter(fingerprints.values())).last_seen <= threshold:
+                fingerprints.popitem(last=False)
+
+        entry = fingerprints.get(digest)
+        if entry is None:
+            entry = fingerprints[digest] = _Fingerprint()
+            if len(fingerprints) > MAX_FINGERPRINTS:
+                fingerprints.popitem(last=False)
+        else:
+            fingerprints.move_to_end(digest)
+
+        entry.last_seen = now
+        entry.users[message.author.id] = now
+        if len(entry.users) >= DUPLICATE_USERS:
+            # Erst bei Erreichen der Schwelle veraltete Einträge aussortieren
+            entry.users = {user_id: seen for user_id, seen in entry.users.items() if seen > threshold}
+
+        if entry.flagged:
+            self._signal(message.guild.id, state, now, "Gleiche Nachricht von vielen Accounts")
+            return True, []
+        if len(entry.users) < DUPLICATE_USERS:
+            entry.messages.append((now, message))
+            if len(entry.messages) > DUPLICATE_USERS * 4:
+                del entry.messages[0]
+            return False, []
+
+        entry.flagged = True
+        self._signal(message.guild.id, state, now, "Gleiche Nachricht von vielen Accounts")
+        earlier = [earlier for seen, earlier in entry.messages if seen > threshold]
+        entry.messages.clear()
+        return True, earlier
+
+    def record_join(self, guild_id: int, now: Optional[float] = None):
+        """Zählt einen Beitritt"""
+        now = time.monotonic() if now is None else now
+        state = self._state(guild_id, now)
+        locked = state.lockdown_since is not None
+        if locked:
+            state.lockdown_joins += 1
+        state.joins.hit(now, learn=not locked)
+        if state.joins.is_surge(now, JOIN_SURGE_FACTOR, JOIN_SURGE_FLOOR):
+            self._signal(guild_id, state, now, "Beitrittswelle")
+
+    def in_lockdown(self, guild_id: int, now: Optional[float] = None) -> bool:
+        """True, solange der Server im Lockdown ist (beendet ihn nach CALM_PERIOD ohne Surge)"""
+        state = self._guilds.get(guild_id)
+        if state is None or state.lockdown_since is None:
+            return False
+        now = time.monotonic() if now is None else now
+        if now - state.last_signal >= CALM_PERIOD:
+            self.release(guild_id, "Raten wieder normal")
+            return False
+        return True
+
+    def release(self, guild_id: int, reason: str = "Manuell beendet"):
+        """Beendet den Lockdown eines Servers und vergisst markierte Inhalte"""
+        state = self._guilds.get(guild_id)
+        if state is None or state.lockdown_since is None:
+            return
+        state.lockdown_since = None
+        state.reason = ""
+        state.fingerprints.clear()
+        if self.on_change:
+            self.on_change(guild_id, False, reason)
+
+    def status(self, guild_id: int, now: Optional[float] = None) -> Dict[str, Any]:
+        """Raten, Grundlast und Lockdown-Zustand eines Servers"""
+        now = time.monotonic() if now is None else now
+        state = self._guilds.get(guild_id)
+        if state is None:
+            return {"lockdown": False}
+        locked = self.in_lockdown(guild_id, now)
+        return {
+            "lockdown": locked,
+            "reason": state.reason,
+            "lockdown_for_s": round(now - state.lockdown_since) if locked else 0,
+            "lockdown_messages": state.lockdown_messages if locked else 0,
+            "lockdown_joins": state.lockdown_joins if locked else 0,
+            "message_rate": round(state.messages.rate(now), 1),
+            "message_baseline": round(state.messages.baseline, 1),
+            "message_bucket_s": MESSAGE_BUCKET,
+            "join_rate": round(state.joins.rate(now), 1),
+            "join_baseline": round(state.joins.baseline, 1),
+            "join_bucket_s": JOIN_BUCKET,
+            "flagged_contents": sum(entry.flagged for entry in state.fingerprints.values()),
+        }
+
+    def _signal(self, guild_id: int, state: _GuildState, now: float, reason: str):
+        """Surge-Hinweis: startet den Lockdown oder verlängert ihn"""
+        state.last_signal = now
+        if state.lockdown_since is not None:
+            return
+        state.lockdown_since = now
+        state.reason = reason
+        state.lockdown_messages = 0
+        state.lockdown_joins = 0
+        if self.on_change:
+            self.on_change(guild_id, True, reason)
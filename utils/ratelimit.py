@@ -0,0 +1,181 @@
+"""Ratenbegrenzung für die AutoMod-Erkennung (Spam, Flood, Warn-Cooldowns)
+
+Alle Strukturen sind pro (guild_id, user_id) geschlüsselt, begrenzt und
+räumen sich selbst auf, damit der Speicherverbrauch auch nach Wochen
+Laufzeit nicht wächst:
+
+- SlidingWindow: ein deque mit Zeitstempeln pro Schlüssel, höchstens so
+  lang wie das Limit. Alte Einträge fallen links heraus (O(1) pro Nachricht).
+- RepeatCounter: zählt identische Nachrichten über den Hash des Inhalts.
+  Das Zurücksetzen nach dem Intervall übernimmt ein gemeinsames Timer-Rad
+  statt eines eigenen asyncio-Tasks pro Nachricht.
+- Cooldown: merkt sich, wann eine Aktion pro Schlüssel wieder erlaubt ist.
+
+Es gibt keinen Hintergrund-Task: Abgelaufenes wird bei den Aufrufen selbst
+entfernt, inaktive Schlüssel spätestens alle SWEEP_INTERVAL Sekunden.
+"""
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, List, Optional, Tuple
+
+# Abstand zwischen zwei Aufräumläufen für inaktive Schlüssel (Sekunden)
+SWEEP_INTERVAL = 60.0
+
+# Schlüssel ohne neue Nachricht seit so vielen Sekunden werden verworfen
+IDLE_AFTER = 600.0
+
+
+class TimerWheel:
+    """Einfaches Timer-Rad: Einträge laufen nach einer Verzögerung ab
+
+    Die Zeit ist in Ticks zu ``tick`` Sekunden eingeteilt, jeder Tick hat
+    einen Slot. advance() sieht nur die Slots der seit dem letzten Aufruf
+    vergangenen Ticks an. Verzögerungen über eine Umdrehung hinaus bleiben
+    im Slot liegen, bis sie fällig sind.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 64):
+        self.tick = tick
+        self._slots: List[List[Tuple[float, Any]]] = [[] for _ in range(slots)]
+        self._current: Optional[int] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def schedule(self, item: Any, delay: float, now: float):
+        """Lässt ``item`` nach ``delay`` Sekunden ablaufen"""
+        if self._current is None:
+            self._current = math.floor(now / self.tick)
+        due = now + delay
+        due_tick = max(math.ceil(due / self.tick), self._current + 1)
+        self._slots[due_tick % len(self._slots)].append((due, item))
+        self._size += 1
+
+    def advance(self, now: float) -> List[Any]:
+        """Gibt alle bis ``now`` abgelaufenen Einträge zurück und entfernt sie"""
+        target = math.floor(now / self.tick)
+        if self._current is None:
+            self._current = target
+            return []
+
+        expired = []
+        # Nach einer langen Pause reicht eine volle Umdrehung
+        steps = min(target - self._current, len(self._slots))
+        for offset in range(1, steps + 1):
+            index = (self._current + offset) % len(self._slots)
+            slot = self._slots[index]
+            if not slot:
+                continue
+            pending = []
+            for due, item in slot:
+                if due <= now:
+                    expired.append(item)
+                else:
+                    pending.append((due, item))
+            self._slots[index] = pending
+        self._current = max(self._current, target)
+        self._size -= len(expired)
+        return expired
+
+
+class SlidingWindow:
+    """Zählt Ereignisse pro Schlüssel in einem gleitenden Zeitfenster"""
+
+    def __init__(self, idle_after: float = IDLE_AFTER, sweep_interval: float = SWEEP_INTERVAL):
+        self._windows: Dict[Hashable, Deque[float]] = {}
+        self.idle_after = idle_after
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def hit(self, key: Hashable, limit: int, interval: float, now: Optional[float] = None) -> int:
+        """Zählt ein Ereignis und gibt die Anzahl im Fenster (höchstens ``limit``) zurück"""
+        now = time.monotonic() if now is None else now
+        self._maybe_sweep(now)
+
+        window = self._windows.get(key)
+        if window is None or window.maxlen != limit:
+            # Neues Fenster oder geändertes Limit
+            window = self._windows[key] = deque(window or (), maxlen=max(1, limit))
+        window.append(now)
+
+        threshold = now - interval
+        while window and window[0] <= threshold:
+            window.popleft()
+        return len(window)
+
+    def reset(self, key: Hashable):
+        self._windows.pop(key, None)
+
+    def _maybe_sweep(self, now: float):
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self.sweep_interval
+        threshold = now - self.idle_after
+        for key in [key for key, window in self._windows.items() if not window or window[-1] <= threshold]:
+            del self._windows[key]
+
+
+class RepeatCounter:
+    """Zählt wiederholte, identische Nachrichten pro Schlüssel
+
+    Der Zähler eines Inhalts läuft ``interval`` Sekunden nach dessen
+    erstem Auftreten ab (wie zuvor der Reset-Task pro Nachricht).
+    """
+
+    def __init__(self, wheel: Optional[TimerWheel] = None):
+        self._counts: Dict[Hashable, Dict[int, int]] = {}
+        self._wheel = wheel or TimerWheel()
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def hit(self, key: Hashable, content: Hashable, interval: float, now: Optional[float] = None) -> int:
+        """Zählt ``content`` (Text oder dessen Hash) für ``key`` und gibt die Anzahl im laufenden Intervall zurück"""
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+
+        digest = hash(content)
+        counts = self._counts.setdefault(key, {})
+        count = counts[digest] = counts.get(digest, 0) + 1
+        if count == 1:
+            self._wheel.schedule((key, digest), interval, now)
+        return count
+
+    def _expire(self, now: float):
+        for key, digest in self._wheel.advance(now):
+            counts = self._counts.get(key)
+            if counts is None:
+                continue
+            counts.pop(digest, None)
+            if not counts:
+                del self._counts[key]
+
+
+class Cooldown:
+    """Erlaubt eine Aktion pro Schlüssel höchstens einmal in ``seconds`` Sekunden"""
+
+    def __init__(self, seconds: float, sweep_interval: float = SWEEP_INTERVAL):
+        self.seconds = seconds
+        self.sweep_interval = sweep_interval
+        self._until: Dict[Hashable, float] = {}
+        self._next_sweep = 0.0
+
+    def __len__(self) -> int:
+        return len(self._until)
+
+    def ready(self, key: Hashable, now: Optional[float] = None) -> bool:
+        """True, wenn die Aktion erlaubt ist; startet dann den Cooldown neu"""
+        now = time.monotonic() if now is None else now
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.sweep_interval
+            self._until = {entry: until for entry, until in self._until.items() if until > now}
+
+        if self._until.get(key, 0.0) > now:
+            return False
+        self._until[key] = now + self.seconds
+        return True
@@ -0,0 +1,152 @@
+"""Regel-Pipeline für AutoMod
+
+Jede Prüfung ist eine Regel: ein normaler (synchroner) Aufruf
+``check(message, features) -> bool``, registriert mit einer Kosten-
+schätzung in Mikrosekunden und einer erwarteten Trefferquote:
+
+    engine = RuleEngine()
+    engine.register("mentions", check_mentions, cost=1.0, hit_rate=0.01)
+    violation = engine.evaluate(message, features)   # Name der ersten Regel, die trifft
+
+Die Reihenfolge wird regelmäßig aus den gemessenen Laufzeiten und Treffern
+neu berechnet: Regeln mit kleinem Verhältnis Kosten / Trefferquote laufen
+zuerst, damit die Auswertung möglichst früh abbricht. Regeln mit Zustand
+(``stateful=True``, z.B. Spam-Zähler) laufen immer zuletzt und in der
+Reihenfolge der Registrierung, weil sie jede Nachricht mitzählen, die
+bis zu ihnen kommt. Regeln lassen sich pro Server abschalten.
+"""
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import discord
+
+from utils.message_features import MessageFeatures
+
+RuleCheck = Callable[[discord.Message, MessageFeatures], bool]
+
+# Nach so vielen ausgewerteten Nachrichten wird die Reihenfolge neu berechnet
+REORDER_EVERY = 1000
+
+# Gewicht der Anfangsschätzung (in Aufrufen), bis genug Messwerte vorliegen
+PRIOR_WEIGHT = 100
+
+
+class Rule:
+    """Eine registrierte Regel samt Zählern"""
+
+    __slots__ = ("name", "check", "cost", "hit_rate", "stateful", "index", "calls", "hits", "total_ns")
+
+    def __init__(self, name: str, check: RuleCheck, cost: float, hit_rate: float, stateful: bool, index: int):
+        self.name = name
+        self.check = check
+        self.cost = cost
+        self.hit_rate = hit_rate
+        self.stateful = stateful
+        self.index = index
+        self.calls = 0
+        self.hits = 0
+        self.total_ns = 0
+
+    def estimated_cost(self) -> float:
+        """Mittlere Laufzeit in µs, zu Beginn gemischt mit der Schätzung"""
+        return (self.cost * PRIOR_WEIGHT + self.total_ns / 1000) / (PRIOR_WEIGHT + self.calls)
+
+    def estimated_hit_rate(self) -> float:
+        """Trefferquote, zu Beginn gemischt mit der Schätzung"""
+        return (self.hit_rate * PRIOR_WEIGHT + self.hits) / (PRIOR_WEIGHT + self.calls)
+
+    def score(self) -> float:
+        """Erwartete Kosten pro Treffer; kleinere Werte laufen zuerst"""
+        return self.estimated_cost() / max(self.estimated_hit_rate(), 1e-6)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.calls, 4) if self.calls else None,
+            "avg_us": round(self.total_ns / self.calls / 1000, 2) if self.calls else None,
+            "stateful": self.stateful,
+        }
+
+
+class RuleEngine:
+    """Führt die registrierten Regeln in kostenoptimierter Reihenfolge aus"""
+
+    def __init__(self, reorder_every: int = REORDER_EVERY):
+        self.reorder_every = reorder_every
+        self._rules: Dict[str, Rule] = {}
+        self._order: List[Rule] = []
+        self._disabled: Dict[int, Set[str]] = {}
+        self._evaluations = 0
+
+    def register(self, name: str, check: RuleCheck, cost: float = 1.0, hit_rate: float = 0.01,
+                 stateful: bool = False) -> RuleCheck:
+        """Registriert (oder ersetzt) eine Regel; gibt ``check`` zurück (als Dekorator nutzbar)"""
+        previous = self._rules.get(name)
+        index = previous.index if previous else len(self._rules)
+        self._rules[name] = Rule(name, check, cost, hit_rate, stateful, index)
+        self.reorder()
+        return check
+
+    def rule(self, name: str, **options) -> Callable[[RuleCheck], RuleCheck]:
+        """Dekorator-Variante von register()"""
+        return lambda check: self.register(name, check, **options)
+
+    def unregister(self, name: str):
+        if self._rules.pop(name, None):
+            self.reorder()
+
+    def names(self) -> List[str]:
+        """Namen aller Regeln in Registrierungsreihenfolge"""
+        return sorted(self._rules, key=lambda name: self._rules[name].index)
+
+    def set_enabled(self, guild_id: int, name: str, enabled: bool):
+        """Schaltet eine Regel für einen Server an oder aus"""
+        disabled = self._disabled.setdefault(guild_id, set())
+        if enabled:
+            disabled.discard(name)
+            if not disabled:
+                del self._disabled[guild_id]
+        else:
+            disabled.add(name)
+
+    def is_enabled(self, guild_id: int, name: str) -> bool:
+        return name not in self._disabled.get(guild_id, ())
+
+    def disabled_rules(self, guild_id: int) -> Set[str]:
+        return set(self._disabled.get(guild_id, ()))
+
+    def reorder(self):
+        """Sortiert zustandslose Regeln nach erwarteten Kosten pro Treffer, zustandsbehaftete ans Ende"""
+        stateless = sorted((rule for rule in self._rules.values() if not rule.stateful), key=Rule.score)
+        stateful = sorted((rule for rule in self._rules.values() if rule.stateful), key=lambda rule: rule.index)
+        self._order = stateless + stateful
+
+    def evaluate(self, message: discord.Message, features: MessageFeatures) -> Optional[str]:
+        """Gibt den Namen der ersten Regel zurück, die anschlägt (oder None)"""
+        self._evaluations += 1
+        if self._evaluations % self.reorder_every == 0:
+            self.reorder()
+
+        disabled = self._disabled.get(message.guild.id)
+        clock = time.perf_counter_ns
+        for rule in self._order:
+            if disabled and rule.name in disabled:
+                continue
+            started = clock()
+            hit = rule.check(message, features)
+            rule.total_ns += clock() - started
+            rule.calls += 1
+            if hit:
+                rule.hits += 1
+                return rule.name
+        return None
+
+    def order(self) -> List[str]:
+        """Aktuelle Ausführungsreihenfolge"""
+        return [rule.name for rule in self._order]
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Zähler und Laufzeiten aller Regeln in Ausführungsreihenfolge"""
+        return [rule.stats() for rule in self._order]
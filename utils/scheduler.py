@@ -0,0 +1,120 @@
+"""Zeitplaner für Fälligkeiten (z.B. Event-Erinnerungen)
+
+Statt eine Tabelle regelmäßig nach fälligen Einträgen abzufragen, liegen
+alle Fälligkeiten in einem Heap im Speicher. Ein einziger Task schläft bis
+zur nächsten Fälligkeit und ruft dann den Callback mit dem Schlüssel des
+Eintrags auf. Neue, verschobene oder gelöschte Einträge wecken ihn, damit er
+seine Schlafdauer neu berechnet.
+
+Zeiten sind Unix-Zeitstempel (time.time()). Der Task schläft höchstens
+MAX_SLEEP Sekunden am Stück und gleicht sich so auch nach Uhrsprüngen oder
+Standby wieder mit der Wanduhr ab.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Längste Schlafdauer am Stück in Sekunden
+MAX_SLEEP = 3600.0
+
+DueCallback = Callable[[Hashable], Awaitable[None]]
+
+
+class DeadlineScheduler:
+    """Heap von Fälligkeiten mit genau einem schlafenden Task
+
+    Pro Schlüssel gibt es höchstens eine Fälligkeit; ``schedule`` mit einem
+    vorhandenen Schlüssel verschiebt sie. Veraltete Heap-Einträge werden
+    nicht gesucht und entfernt, sondern beim Herausnehmen übersprungen.
+    """
+
+    def __init__(self, callback: DueCallback, name: str = "scheduler"):
+        self.callback = callback
+        self.name = name
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        # Schlüssel -> (Fälligkeit, laufende Nummer des gültigen Heap-Eintrags)
+        self._entries: Dict[Hashable, Tuple[float, int]] = {}
+        self._counter = itertools.count()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.fired = 0
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def schedule(self, key: Hashable, when: float):
+        """Legt eine Fälligkeit an oder verschiebt sie"""
+        seq = next(self._counter)
+        self._entries[key] = (when, seq)
+        heapq.heappush(self._heap, (when, seq, key))
+        if self._heap[0][1] == seq:
+            # Neuer frühester Eintrag: der Task muss früher aufwachen
+            self._wake.set()
+
+    def cancel(self, key: Hashable) -> bool:
+        """Entfernt eine Fälligkeit (der Heap-Eintrag verfällt beim Herausnehmen)"""
+        return self._entries.pop(key, None) is not None
+
+    def due_at(self, key: Hashable) -> Optional[float]:
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def keys(self) -> List[Hashable]:
+        return list(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def next_due(self) -> Optional[float]:
+        """Zeitpunkt der nächsten gültigen Fälligkeit"""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def _drop_stale(self):
+        heap = self._heap
+        while heap and self._entries.get(heap[0][2], (None, None))[1] != heap[0][1]:
+            heapq.heappop(heap)
+
+    def _pop_due(self, now: float) -> List[Hashable]:
+        due = []
+        self._drop_stale()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, key = heapq.heappop(self._heap)
+            del self._entries[key]
+            due.append(key)
+            self._drop_stale()
+        return due
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            next_due = self.next_due()
+            timeout = MAX_SLEEP if next_due is None else min(max(next_due - time.time(), 0.0), MAX_SLEEP)
+            if timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout)
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+
+            for key in self._pop_due(time.time()):
+                self.fired += 1
+                try:
+                    await self.callback(key)
+                except Exception:
+                    logger.exception(f"❌ Fehler beim Ausführen der Fälligkeit {key!r} ({self.name})")